@@ -104,6 +104,12 @@ class ModelUpdater {
 
   private firstConnect = true;
 
+  /**
+   * The last run `change_seq` received (used to ask just for the runs changed
+   * since then when reconnecting).
+   */
+  private lastChangeSeq: number | undefined = undefined;
+
   constructor(modelContainer: ModelContainer) {
     this.modelContainer = modelContainer;
     this.sio = new WebsocketConn(`${baseUrlWs}/api/ws`);
@@ -115,6 +121,8 @@ class ModelUpdater {
     this.sio.on('runs_collected', (runs: any) => {
       // console.log('runs collected', runs);
       sortRuns(runs);
+      this.lastChangeSeq = undefined;
+      this.updateLastChangeSeq(runs);
 
       this.modelContainer.onModelUpdated(ModelType.RUNS, { isPending: false, data: runs });
     });
@@ -122,6 +130,7 @@ class ModelUpdater {
     this.sio.on('run_added', (data: any) => {
       // console.log('run added', data);
       const { run } = data;
+      this.updateLastChangeSeq([run]);
       const runsModel = this.modelContainer.getCurrentModel<Run[]>(ModelType.RUNS);
       // Runs should be reverse ordered by their id.
       if (runsModel !== undefined && runsModel.data !== undefined && !runsModel.isPending) {
@@ -149,6 +158,7 @@ class ModelUpdater {
       // console.log('run changed', run);
       const runId = run.run_id;
       const { changes } = run;
+      this.updateLastChangeSeq([changes]);
 
       const runsModel = this.modelContainer.getCurrentModel<Run[]>(ModelType.RUNS);
       if (runsModel !== undefined && runsModel.data !== undefined) {
@@ -172,6 +182,29 @@ class ModelUpdater {
       }
     });
 
+    this.sio.on('runs_changed_since', (data: any) => {
+      // Response to `start_listen_run_events` with `since`: just the runs
+      // which changed since then are received.
+      const changedRuns: Run[] = data.runs;
+      const runsModel = this.modelContainer.getCurrentModel<Run[]>(ModelType.RUNS);
+      if (runsModel !== undefined && runsModel.data !== undefined) {
+        const idToChangedRun = new Map(changedRuns.map((run) => [run.id, run]));
+        const newRunData = runsModel.data.map((run) => idToChangedRun.get(run.id) ?? run);
+        const existingIds = new Set(runsModel.data.map((run) => run.id));
+        changedRuns.forEach((run) => {
+          if (!existingIds.has(run.id)) {
+            newRunData.push(run);
+          }
+        });
+        sortRuns(newRunData);
+        this.modelContainer.onModelUpdated(ModelType.RUNS, {
+          isPending: false,
+          data: newRunData,
+        });
+      }
+      this.updateLastChangeSeq([data]);
+    });
+
     this.sio.on('response', (response: any) => {
       // console.log('response', response);
       const messageId = response.message_id;
@@ -197,7 +230,7 @@ class ModelUpdater {
         // On any new connection we have to start listening again
         // (either being the first or not as new connections later
         // on probably mean we missed updates).
-        this.sio.emit('start_listen_run_events');
+        this.startListeningRunEvents();
       } else {
         // i.e.: the server config is not pushed from the server (because it doesn't change once the
         // server is started), but if we disconnect and reconnect we need to request it again
@@ -216,29 +249,55 @@ class ModelUpdater {
     });
   }
 
+  private updateLastChangeSeq(items: { change_seq?: number }[]) {
+    items.forEach((item) => {
+      if (
+        item.change_seq !== undefined &&
+        (this.lastChangeSeq === undefined || item.change_seq > this.lastChangeSeq)
+      ) {
+        this.lastChangeSeq = item.change_seq;
+      }
+    });
+  }
+
+  private startListeningRunEvents() {
+    if (this.lastChangeSeq !== undefined) {
+      // Just the runs changed since the last change we know about are needed.
+      this.sio.emit('start_listen_run_events', { since: this.lastChangeSeq });
+    } else {
+      this.sio.emit('start_listen_run_events');
+    }
+  }
+
   private async fetchModelsData(startListening: boolean) {
     // Load data (actions/runs/config)
+    // When reconnecting the runs aren't loaded again if the changed runs
+    // can be requested when listening to the run events.
+    const loadRuns = !startListening || this.lastChangeSeq === undefined;
     const loadActionsPromise = loadAsync<Action[]>(`${baseUrl}/api/actionPackages`, 'GET');
-    const loadRunsPromise = loadAsync<Run[]>(`${baseUrl}/api/runs`, 'GET');
+    const loadRunsPromise = loadRuns ? loadAsync<Run[]>(`${baseUrl}/api/runs`, 'GET') : undefined;
     const loadConfigPromise = loadAsync<Run[]>(`${baseUrl}/config`, 'GET');
 
     const actions = await loadActionsPromise;
     const runs = await loadRunsPromise;
     const config = await loadConfigPromise;
 
-    if (runs.data !== undefined) {
-      sortRuns(runs.data);
-    }
-
     this.modelContainer.onModelUpdated(ModelType.ACTIONS, actions);
-    this.modelContainer.onModelUpdated(ModelType.RUNS, runs);
+    if (runs !== undefined) {
+      if (runs.data !== undefined) {
+        sortRuns(runs.data);
+        this.lastChangeSeq = undefined;
+        this.updateLastChangeSeq(runs.data);
+      }
+      this.modelContainer.onModelUpdated(ModelType.RUNS, runs);
+    }
     this.modelContainer.onModelUpdated(ModelType.SERVER_CONFIG, config);
 
     if (startListening) {
       // On any new connection we have to start listening again
       // (either being the first or not as new connections later
       // on probably mean we missed updates).
-      this.sio.emit('start_listen_run_events');
+      this.startListeningRunEvents();
     }
   }
 
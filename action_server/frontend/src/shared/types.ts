@@ -50,6 +50,7 @@ export interface Run {
   robot_env_hash?: string | null; // RCC environment hash if run_type='robot'
   stdout?: string | null; // Robot run stdout
   stderr?: string | null; // Robot run stderr
+  change_seq?: number; // Sequence of the last change of the run
 }
 
 export interface RunTableEntry extends Run {
@@ -150,16 +150,28 @@ export class WebsocketConn {
     if (dataStr) {
       // console.log('Received data', dataStr);
       const { event, data } = JSON.parse(dataStr);
-      if (event) {
-        if (data !== undefined) {
-          this.notify(event, data);
-        } else {
-          this.notify(event);
+      if (event === 'batch' && Array.isArray(data)) {
+        // Multiple events sent by the server in a single message.
+        // eslint-disable-next-line no-restricted-syntax
+        for (const batchItem of data) {
+          this.notifyEvent(batchItem.event, batchItem.data);
         }
+      } else {
+        this.notifyEvent(event, data);
       }
     }
   };
 
+  private notifyEvent(event: string | undefined, data: any) {
+    if (event) {
+      if (data !== undefined) {
+        this.notify(event, data);
+      } else {
+        this.notify(event);
+      }
+    }
+  }
+
   /**
    * Note: after starting the connection, handleClose
    * is always called even if it doesn't connect
@@ -0,0 +1,242 @@
+"""
+Spawning of the action processes through fork servers (Linux only).
+
+Starting a new python interpreter for each action process (and importing the
+actions library and its dependencies in it) may take from hundreds of
+milliseconds to seconds, which is paid each time a process is created (on each
+run when processes are not reused and after each reload).
+
+When enabled (`--fork-server`), a fork server (a "template" process, see:
+`_preload_actions/preload_actions_fork_server.py`) is started for each process
+key (action package environment and cwd), which pre-imports the actions
+library and then forks the action processes when requested. The forked
+processes connect back to the action server just like the processes started
+with `preload_actions_server_main --tcp`, so, the protocol to run the actions
+is the same in both cases.
+
+If the fork server can't be used (i.e.: it failed to start or the target
+python doesn't support passing file descriptors), `fork()` returns None and
+the caller starts a new interpreter as usual.
+"""
+
+import json
+import logging
+import os
+import socket
+import subprocess
+import sys
+import threading
+from typing import BinaryIO, Dict, Hashable, Optional, Sequence, Set
+
+log = logging.getLogger(__name__)
+
+# Timeout (in seconds) for a fork request (the first one also waits for the
+# fork server to import the actions library).
+_FORK_TIMEOUT = 60
+
+
+class ForkServerError(Exception):
+    pass
+
+
+def is_fork_server_supported() -> bool:
+    return sys.platform.startswith("linux") and hasattr(socket, "send_fds")
+
+
+class ForkedProcess:
+    """
+    A process forked by a fork server (provides the subset of the
+    `subprocess.Popen` API used by the `ProcessHandle`).
+
+    Note: the process is not a child of the action server (it's a child of the
+    fork server), so, its returncode is not available.
+    """
+
+    def __init__(self, pid: int, stdout: BinaryIO, stderr: BinaryIO):
+        self.pid = pid
+        self.stdout = stdout
+        self.stderr = stderr
+        self.stdin = None
+
+    def poll(self) -> Optional[int]:
+        # Whether it's alive must be checked with its pid.
+        return None
+
+
+class _ForkServer:
+    def __init__(
+        self, python_exe: str, subprocess_kwargs: dict, preload: Sequence[str]
+    ):
+        control, child_control = socket.socketpair(
+            socket.AF_UNIX, socket.SOCK_SEQPACKET
+        )
+        try:
+            cmdline = [
+                python_exe,
+                "-m",
+                "preload_actions_fork_server",
+                f"--control-fd={child_control.fileno()}",
+            ]
+            cmdline.extend(f"--preload={module}" for module in preload)
+
+            kwargs = dict(subprocess_kwargs)
+            # The output of the fork server itself goes to the action server
+            # output (the forked processes have their own pipes).
+            kwargs.update(
+                stdin=subprocess.DEVNULL,
+                stdout=None,
+                stderr=None,
+                pass_fds=(child_control.fileno(),),
+            )
+            self._process = subprocess.Popen(cmdline, **kwargs)
+        except BaseException:
+            control.close()
+            raise
+        finally:
+            child_control.close()
+
+        self._control = control
+        self._lock = threading.Lock()
+        log.debug("Started fork server (pid: %s).", self._process.pid)
+
+    @property
+    def pid(self) -> int:
+        return self._process.pid
+
+    def fork(self, host: str, port: int) -> ForkedProcess:
+        """
+        Forks a process which connects to the given host/port.
+
+        Raises:
+            ForkServerError: if it was not possible to fork the process.
+        """
+        stdout_read, stdout_write = os.pipe()
+        stderr_read, stderr_write = os.pipe()
+        try:
+            with self._lock:
+                try:
+                    self._control.settimeout(_FORK_TIMEOUT)
+                    socket.send_fds(
+                        self._control,
+                        [json.dumps({"host": host, "port": port}).encode("utf-8")],
+                        [stdout_write, stderr_write],
+                    )
+                    reply = self._control.recv(64 * 1024)
+                except OSError as e:
+                    raise ForkServerError(f"Error communicating with fork server: {e}")
+        except BaseException:
+            os.close(stdout_read)
+            os.close(stderr_read)
+            raise
+        finally:
+            # The forked process has its own copy.
+            os.close(stdout_write)
+            os.close(stderr_write)
+
+        try:
+            if not reply:
+                raise ForkServerError("Fork server exited.")
+            pid = json.loads(reply).get("pid")
+            if not pid:
+                raise ForkServerError(
+                    f"Fork server unable to fork: {json.loads(reply).get('error')}"
+                )
+        except BaseException:
+            os.close(stdout_read)
+            os.close(stderr_read)
+            raise
+
+        return ForkedProcess(
+            pid, os.fdopen(stdout_read, "rb"), os.fdopen(stderr_read, "rb")
+        )
+
+    def dispose(self) -> None:
+        # Closing the control socket makes the fork server exit (the processes
+        # it forked are not affected).
+        self._control.close()
+        try:
+            self._process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            # Note: just the fork server (not its subprocesses) must be killed.
+            self._process.kill()
+
+
+class ForkServers:
+    """
+    The fork servers used to spawn the action processes (one per process key).
+    """
+
+    def __init__(self, preload: Sequence[str] = ()):
+        self._preload = tuple(preload)
+        self._lock = threading.Lock()
+        self._key_to_fork_server: Dict[Hashable, _ForkServer] = {}
+        # Keys for which the fork server failed (not retried until disposed).
+        self._failed_keys: Set[Hashable] = set()
+
+    def fork(
+        self,
+        key: Hashable,
+        python_exe: str,
+        subprocess_kwargs: dict,
+        host: str,
+        port: int,
+    ) -> Optional[ForkedProcess]:
+        """
+        Forks a process (which connects to the given host/port) using the fork
+        server for the given key (started if needed).
+
+        Returns:
+            The forked process or None if the fork server can't be used for
+            the given key.
+        """
+        with self._lock:
+            if key in self._failed_keys:
+                return None
+            fork_server = self._key_to_fork_server.get(key)
+            if fork_server is None:
+                try:
+                    fork_server = _ForkServer(
+                        python_exe, subprocess_kwargs, self._preload
+                    )
+                except Exception:
+                    log.exception("Unable to start fork server.")
+                    self._failed_keys.add(key)
+                    return None
+                self._key_to_fork_server[key] = fork_server
+
+        try:
+            return fork_server.fork(host, port)
+        except Exception as e:
+            log.critical(
+                f"Unable to spawn process with fork server (pid: {fork_server.pid}): "
+                f"{e} (a new interpreter will be used for the action processes "
+                "of the related action package)."
+            )
+            with self._lock:
+                if self._key_to_fork_server.get(key) is fork_server:
+                    del self._key_to_fork_server[key]
+                self._failed_keys.add(key)
+            fork_server.dispose()
+            return None
+
+    def dispose_stale(self, valid_keys: Set[Hashable]) -> None:
+        """
+        Disposes the fork servers whose keys are no longer valid.
+        """
+        with self._lock:
+            stale = [
+                self._key_to_fork_server.pop(key)
+                for key in tuple(self._key_to_fork_server)
+                if key not in valid_keys
+            ]
+            self._failed_keys.intersection_update(valid_keys)
+        for fork_server in stale:
+            fork_server.dispose()
+
+    def dispose(self) -> None:
+        with self._lock:
+            fork_servers = list(self._key_to_fork_server.values())
+            self._key_to_fork_server.clear()
+            self._failed_keys.clear()
+        for fork_server in fork_servers:
+            fork_server.dispose()
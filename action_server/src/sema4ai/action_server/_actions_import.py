@@ -1,10 +1,11 @@
 import json
 import logging
+import os
 import subprocess
 import sys
 import typing
 from pathlib import Path
-from typing import Literal
+from typing import Literal, Sequence
 
 from termcolor import colored
 
@@ -14,6 +15,7 @@ from sema4ai.action_server.vendored_deps.termcolors import bold_yellow
 if typing.TYPE_CHECKING:
     from sema4ai.actions._protocols import ActionsListActionTypedDict
 
+    from sema4ai.action_server._action_package_handler import ActionPackageHandler
     from sema4ai.action_server._models import ActionPackage
 
 log = logging.getLogger(__name__)
@@ -49,22 +51,49 @@ class IHookOnActionsList(typing.Protocol):
 hook_on_actions_list: IHookOnActionsList = Callback(raise_exceptions=True)
 
 
-def import_action_package(
+# The maximum number of action packages collected concurrently (bootstrapping
+# the environment and collecting the actions metadata).
+MAX_IMPORT_WORKERS = 4
+
+
+class _CollectedActionPackage(typing.NamedTuple):
+    action_package: "ActionPackage"
+    import_path: Path
+    actions_list_result: list["ActionsListActionTypedDict"]
+    data_package_metadata: dict | None
+
+
+def import_action_packages(
     *,
     datadir: Path,
-    action_package_dir: str,
+    action_package_dirs: Sequence[str],
     disable_not_imported: bool,
     skip_lint: bool,
     whitelist: str,
-):
+    partial: bool = False,
+) -> list[str]:
     """
     Imports action packages based on directories given in the filesystem.
 
-    Note that the action package is expected to be in the proper directory at
+    Note that the action packages are expected to be in the proper directory at
     this point (meaning that it should have been extracted under the /datadir
     if given as a .zip or a path in the filesystem in any other place when
     running in dev mode).
 
+    The action packages are collected concurrently (up to `MAX_IMPORT_WORKERS`
+    at a time), but they're written to the database one at a time (in the
+    given order) and the actions which were not imported are only disabled
+    after all the action packages are imported.
+
+    Args:
+        partial: If True, just some of the action packages are being
+            reimported (so, `disable_not_imported` only disables the actions
+            of the given action packages which were not imported).
+
+    Returns:
+        The ids of the action packages imported (which were accepted in the
+        whitelist).
+
     Raises:
         ActionPackageError if it was not recognized as an action package.
 
@@ -72,11 +101,68 @@ def import_action_package(
         This can be a slow operation as it may require building the RCC
         environment.
     """
+    from concurrent.futures import ThreadPoolExecutor
+
+    def collect(action_package_dir: str) -> _CollectedActionPackage | None:
+        return _collect_action_package(
+            datadir=datadir,
+            action_package_dir=action_package_dir,
+            skip_lint=skip_lint,
+            whitelist=whitelist,
+        )
+
+    imported_action_package_ids: list[str] = []
+    imported_action_ids: set[str] = set()
+    max_workers = max(1, min(MAX_IMPORT_WORKERS, len(action_package_dirs)))
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="ImportActionPackage"
+    ) as executor:
+        futures = [executor.submit(collect, d) for d in action_package_dirs]
+        try:
+            for future in futures:
+                collected = future.result()
+                if collected is not None:
+                    action_package_id, action_ids = _add_actions_to_db(
+                        collected, whitelist=whitelist
+                    )
+                    imported_action_package_ids.append(action_package_id)
+                    imported_action_ids.update(action_ids)
+        except BaseException:
+            # Don't start collecting the remaining ones.
+            for future in futures:
+                future.cancel()
+            raise
+
+    if disable_not_imported:
+        _disable_not_imported_actions(
+            imported_action_ids,
+            imported_action_package_ids if partial else None,
+        )
+    return imported_action_package_ids
+
+
+def _collect_action_package(
+    *,
+    datadir: Path,
+    action_package_dir: str,
+    skip_lint: bool,
+    whitelist: str,
+) -> _CollectedActionPackage | None:
+    """
+    Bootstraps the environment of the action package and collects its actions
+    (from the cache if the package sources and environment didn't change).
+
+    Note: may be called concurrently for different action packages (so, it
+    must not access the database).
 
+    Returns:
+        The collected action package or None if it was not accepted in the
+        whitelist.
+    """
     from sema4ai.action_server._whitelist import accept_action_package
 
+    from . import _actions_metadata_cache
     from ._action_package_handler import ActionPackageHandler
-    from ._errors_action_server import ActionServerValidationError
     from ._gen_ids import gen_uuid
     from ._models import ActionPackage
     from ._robo_utils.process import build_python_launch_env
@@ -94,7 +180,7 @@ def import_action_package(
             log.info(
                 f"Action package: {action_package_name} not imported because it has no match in the whitelist: {whitelist!r}"
             )
-            return
+            return None
 
     condahash, use_env = action_package_handler.bootstrap_environment()
 
@@ -123,82 +209,176 @@ def import_action_package(
     )
     log.debug(f"Collecting actions for Action Package: {action_package_name}.")
 
-    env = build_python_launch_env(use_env)
+    cache_key = None
+    cached = None
+    if package_yaml_exists:
+        # Note: the hash is computed before collecting the metadata (so, if
+        # the sources change in the meanwhile, it's just collected again in
+        # the next import).
+        sources_hash = _actions_metadata_cache.compute_sources_hash(
+            _get_source_roots(action_package_handler)
+        )
+        cache_key = _actions_metadata_cache.compute_cache_key(
+            sources_hash, condahash, skip_lint
+        )
+        cached = _actions_metadata_cache.load_cached_metadata(
+            datadir, import_path, cache_key
+        )
 
+    if cached is not None:
+        log.info(
+            f"Action package: {action_package_name} unchanged (using cached actions metadata)."
+        )
+        actions_library = cached["actions_library"]
+        actions_library_version = tuple(cached["actions_library_version"])
+        _check_actions_library_version(
+            actions_library,
+            actions_library_version,
+            package_yaml_exists=package_yaml_exists,
+            original_package_yaml=original_package_yaml,
+        )
+        actions_list_result = cached["actions_list_result"]
+        data_package_metadata = cached["data_package_metadata"]
+        stderr = cached["stderr"]
+    else:
+        env = build_python_launch_env(use_env)
+        actions_library, actions_library_version = _get_actions_library_version(
+            env, import_path
+        )
+        _check_actions_library_version(
+            actions_library,
+            actions_library_version,
+            package_yaml_exists=package_yaml_exists,
+            original_package_yaml=original_package_yaml,
+        )
+        (
+            actions_list_result,
+            data_package_metadata,
+            stderr,
+        ) = _collect_actions_metadata(
+            env,
+            import_path,
+            skip_lint=skip_lint,
+            actions_library_version=actions_library_version,
+        )
+        if cache_key is not None:
+            _actions_metadata_cache.store_cached_metadata(
+                datadir,
+                import_path,
+                cache_key,
+                {
+                    "actions_library": actions_library,
+                    "actions_library_version": list(actions_library_version),
+                    "actions_list_result": actions_list_result,
+                    "data_package_metadata": data_package_metadata,
+                    "stderr": stderr,
+                },
+            )
+
+    # If it didn't fail the import, consider as warning (and thus print in yellow).
+    if stderr:
+        log.critical(bold_yellow(f"{stderr}\n"))
+
+    return _CollectedActionPackage(
+        action_package,
+        import_path,
+        typing.cast(list["ActionsListActionTypedDict"], actions_list_result),
+        data_package_metadata,
+    )
+
+
+def _get_source_roots(action_package_handler: "ActionPackageHandler") -> list[Path]:
+    """
+    Provides the directories with the sources of the action package (the
+    package root and the pythonpath entries outside of it).
+    """
+    import_path = action_package_handler.import_path
+    package_root = action_package_handler.package_root
+
+    roots = [import_path]
+    for entry in action_package_handler.get_pythonpath_entries():
+        path = Path(os.path.abspath(os.path.join(package_root, entry)))
+        if path != import_path and import_path not in path.parents:
+            roots.append(path)
+    return roots
+
+
+def _get_actions_library_version(env, import_path: Path) -> tuple[str, tuple[int, ...]]:
+    """
+    Returns:
+        The actions library (`sema4ai.actions` or `robocorp.actions`) and its
+        version.
+    """
     try:
         # any sema4ai.actions version will do at this point.
-        actions_library_version = _get_actions_version(
+        return "sema4ai.actions", _get_actions_version(
             env, import_path, "sema4ai.actions"
         )
     except Exception:
         ### TODO: Remove in the future!
 
-        found_actions = False
         # Still support robocorp.actions for now (but warn the user).
         try:
-            actions_library_version = _get_actions_version(
+            return "robocorp.actions", _get_actions_version(
                 env, import_path, "robocorp.actions"
             )
-            log.critical(
-                "Important: 'robocorp.actions' is deprecated!\n"
-                "Please change the 'robocorp-actions' dependency to 'sema4ai-actions'\n"
-                "in your package.yaml\n"
-                "(note: the public API should be the same with the exception that the\n"
-                "imports should come from 'sema4ai.actions' instead of 'robocorp.actions).\n"
-                "On future versions of the Action Server, using 'robocorp-actions' will no\n"
-                "longer be supported.\n"
-            )
-            found_actions = True
         except Exception:
             pass
 
-        if not found_actions:
-            raise  # The sema4ai.actions error, not the robocorp.actions one.
+        raise  # The sema4ai.actions error, not the robocorp.actions one.
 
-        expected_version = (0, 0, 7)
-        expected_version_str = ".".join(str(x) for x in expected_version)
-        if actions_library_version < expected_version:
-            actions_library_version_str = ".".join(
-                str(x) for x in actions_library_version
-            )
 
-            if package_yaml_exists:
-                raise ActionServerValidationError(
-                    f"Error, the `robocorp-actions` version is: {actions_library_version_str}.\n"
-                    f"Expected `robocorp-actions` version to be {expected_version_str} or higher.\n"
-                    f"Please update the version in: {original_package_yaml}\n"
-                )
-            else:
-                raise ActionServerValidationError(
-                    f"Error, the `robocorp-actions` version is: {actions_library_version_str}.\n"
-                    f"Expected it to be {expected_version_str} or higher.\n"
-                    f"Please update the `robocorp-actions` version in your python environment (python: {sys.executable})\n"
-                )
+def _check_actions_library_version(
+    actions_library: str,
+    actions_library_version: tuple[int, ...],
+    *,
+    package_yaml_exists: bool,
+    original_package_yaml: Path,
+) -> None:
+    from ._errors_action_server import ActionServerValidationError
 
-        min_version_for_encryption_with_auth_tag = (0, 2, 1)
-        if actions_library_version < min_version_for_encryption_with_auth_tag:
-            actions_library_version_str = ".".join(
-                str(x) for x in actions_library_version
-            )
-            log.critical(
-                f"Warning: the `robocorp-actions` version is: {actions_library_version_str}.\n"
-                f"To receive encrypted secrets, robocorp-actions 0.2.1 or newer is required.\n"
+    if actions_library != "robocorp.actions":
+        return
+
+    log.critical(
+        "Important: 'robocorp.actions' is deprecated!\n"
+        "Please change the 'robocorp-actions' dependency to 'sema4ai-actions'\n"
+        "in your package.yaml\n"
+        "(note: the public API should be the same with the exception that the\n"
+        "imports should come from 'sema4ai.actions' instead of 'robocorp.actions).\n"
+        "On future versions of the Action Server, using 'robocorp-actions' will no\n"
+        "longer be supported.\n"
+    )
+
+    expected_version = (0, 0, 7)
+    expected_version_str = ".".join(str(x) for x in expected_version)
+    if actions_library_version < expected_version:
+        actions_library_version_str = ".".join(str(x) for x in actions_library_version)
+
+        if package_yaml_exists:
+            raise ActionServerValidationError(
+                f"Error, the `robocorp-actions` version is: {actions_library_version_str}.\n"
+                f"Expected `robocorp-actions` version to be {expected_version_str} or higher.\n"
                 f"Please update the version in: {original_package_yaml}\n"
-                "(proceeding with initalization but actions receiving encrypted secrets will\n"
-                "not work properly -- on future versions of the action server, support for \n"
-                "this version of robocorp-actions will be removed)."
+            )
+        else:
+            raise ActionServerValidationError(
+                f"Error, the `robocorp-actions` version is: {actions_library_version_str}.\n"
+                f"Expected it to be {expected_version_str} or higher.\n"
+                f"Please update the `robocorp-actions` version in your python environment (python: {sys.executable})\n"
             )
 
-    _add_actions_to_db(
-        datadir,
-        env,
-        import_path,
-        action_package,
-        disable_not_imported=disable_not_imported,
-        skip_lint=skip_lint,
-        whitelist=whitelist,
-        actions_library_version=actions_library_version,
-    )
+    min_version_for_encryption_with_auth_tag = (0, 2, 1)
+    if actions_library_version < min_version_for_encryption_with_auth_tag:
+        actions_library_version_str = ".".join(str(x) for x in actions_library_version)
+        log.critical(
+            f"Warning: the `robocorp-actions` version is: {actions_library_version_str}.\n"
+            f"To receive encrypted secrets, robocorp-actions 0.2.1 or newer is required.\n"
+            f"Please update the version in: {original_package_yaml}\n"
+            "(proceeding with initalization but actions receiving encrypted secrets will\n"
+            "not work properly -- on future versions of the action server, support for \n"
+            "this version of robocorp-actions will be removed)."
+        )
 
 
 def _get_actions_version(
@@ -237,25 +417,22 @@ Python executable being used:
         raise RuntimeError(msg)
 
 
-def _add_actions_to_db(
-    datadir: Path,
+def _collect_actions_metadata(
     env: dict,
     import_path: Path,
-    action_package: "ActionPackage",
-    disable_not_imported: bool,
+    *,
     skip_lint: bool,
-    whitelist: str,
     actions_library_version: tuple[int, ...],
-):
-    from dataclasses import asdict
-
+) -> tuple[list, dict | None, str]:
+    """
+    Returns:
+        Tuple with the actions list, the data package metadata and the stderr
+        of the actions metadata collection.
+    """
     from sema4ai.actions._lint_action import format_lint_results
 
     from sema4ai.action_server._errors_action_server import ActionServerValidationError
-    from sema4ai.action_server._gen_ids import gen_uuid
-    from sema4ai.action_server._models import Action, ActionPackage, get_db
     from sema4ai.action_server._settings import get_python_exe_from_env
-    from sema4ai.action_server._whitelist import accept_action
 
     python = get_python_exe_from_env(env)
 
@@ -320,10 +497,7 @@ cli.main(["{command}"])
             f"stderr:{stderr.decode('utf-8', 'replace')}"
         )
 
-    # If it didn't fail the import, consider as warning (and thus print in yellow).
     decoded_stderr = stderr.decode("utf-8", "replace").strip()
-    if decoded_stderr:
-        log.critical(bold_yellow(f"{decoded_stderr}\n"))
 
     try:
         actions_list_result = json.loads(stdout)
@@ -331,80 +505,100 @@ cli.main(["{command}"])
         raise RuntimeError(
             f"It was not possible to load as json the contents >>{stdout!r}<<"
         )
-    else:
-        data_package_metadata = None
-        if command == "metadata":
-            metadata_result = actions_list_result
-            if not isinstance(metadata_result, dict):
-                raise RuntimeError(
-                    f"Expected sema4ai.actions metadata to provide dictionary. Found: >>{stdout!r}<<"
-                )
-            actions_list_result = metadata_result.get("actions")
-            if not isinstance(actions_list_result, list):
-                raise RuntimeError(
-                    f"Expected sema4ai.actions metadata to provide dictionary with 'actions' key. Found: >>{stdout!r}<<"
-                )
-            data_package_metadata = metadata_result.get("data")
-            if data_package_metadata is not None:
-                if not isinstance(data_package_metadata, dict):
-                    raise RuntimeError(
-                        f"Expected sema4ai.actions metadata to provide dictionary with 'data' key. Found: >>{stdout!r}<<"
-                    )
 
-        elif command == "list":
-            if not isinstance(actions_list_result, list):
+    data_package_metadata = None
+    if command == "metadata":
+        metadata_result = actions_list_result
+        if not isinstance(metadata_result, dict):
+            raise RuntimeError(
+                f"Expected sema4ai.actions metadata to provide dictionary. Found: >>{stdout!r}<<"
+            )
+        actions_list_result = metadata_result.get("actions")
+        if not isinstance(actions_list_result, list):
+            raise RuntimeError(
+                f"Expected sema4ai.actions metadata to provide dictionary with 'actions' key. Found: >>{stdout!r}<<"
+            )
+        data_package_metadata = metadata_result.get("data")
+        if data_package_metadata is not None:
+            if not isinstance(data_package_metadata, dict):
                 raise RuntimeError(
-                    f"Expected sema4ai.actions list to provide a list. Found: >>{stdout!r}<<"
+                    f"Expected sema4ai.actions metadata to provide dictionary with 'data' key. Found: >>{stdout!r}<<"
                 )
 
-        hook_on_actions_list(
-            action_package,
-            typing.cast(list["ActionsListActionTypedDict"], actions_list_result),
-            data_package_metadata,
-        )
+    elif command == "list":
+        if not isinstance(actions_list_result, list):
+            raise RuntimeError(
+                f"Expected sema4ai.actions list to provide a list. Found: >>{stdout!r}<<"
+            )
 
-        actions = []
-        for action_fields in actions_list_result:
-            action_name = action_fields["name"]
-            if whitelist:
-                if not accept_action(whitelist, action_package.name, action_name):
-                    log.info(
-                        f"Action: {action_package.name}/{action_name} not imported because it has no match in the whitelist: {whitelist!r}"
-                    )
-                    continue
+    return actions_list_result, data_package_metadata, decoded_stderr
 
-            filepath = Path(action_fields["file"]).absolute()
-            try:
-                filepath = filepath.relative_to(import_path)
-            except ValueError:
-                pass
-
-            managed_params_str: str = ""
-            if action_fields.get("managed_params_schema"):
-                managed_params_str = json.dumps(action_fields["managed_params_schema"])
-
-            options = action_fields.get("options") or {}
-            actions.append(
-                Action(
-                    id=gen_uuid("action"),
-                    action_package_id=action_package.id,
-                    name=action_name,
-                    docs=action_fields["docs"],
-                    file=filepath.as_posix(),
-                    lineno=action_fields["line"],
-                    input_schema=json.dumps(action_fields["input_schema"]),
-                    output_schema=json.dumps(action_fields["output_schema"]),
-                    enabled=True,
-                    is_consequential=options.get("is_consequential", None),
-                    managed_params_schema=managed_params_str,
-                    options=json.dumps(options),
+
+def _add_actions_to_db(
+    collected: _CollectedActionPackage,
+    *,
+    whitelist: str,
+) -> tuple[str, set[str]]:
+    """
+    Returns:
+        Tuple with the id of the action package and the ids of the actions
+        imported (in the database).
+    """
+    from dataclasses import asdict
+
+    from sema4ai.action_server._gen_ids import gen_uuid
+    from sema4ai.action_server._models import Action, ActionPackage, get_db
+    from sema4ai.action_server._whitelist import accept_action
+
+    action_package = collected.action_package
+    import_path = collected.import_path
+    actions_list_result = collected.actions_list_result
+
+    hook_on_actions_list(
+        action_package,
+        actions_list_result,
+        collected.data_package_metadata,
+    )
+
+    actions = []
+    for action_fields in actions_list_result:
+        action_name = action_fields["name"]
+        if whitelist:
+            if not accept_action(whitelist, action_package.name, action_name):
+                log.info(
+                    f"Action: {action_package.name}/{action_name} not imported because it has no match in the whitelist: {whitelist!r}"
                 )
+                continue
+
+        filepath = Path(action_fields["file"]).absolute()
+        try:
+            filepath = filepath.relative_to(import_path)
+        except ValueError:
+            pass
+
+        managed_params_str: str = ""
+        if action_fields.get("managed_params_schema"):
+            managed_params_str = json.dumps(action_fields["managed_params_schema"])
+
+        options = action_fields.get("options") or {}
+        actions.append(
+            Action(
+                id=gen_uuid("action"),
+                action_package_id=action_package.id,
+                name=action_name,
+                docs=action_fields["docs"],
+                file=filepath.as_posix(),
+                lineno=action_fields["line"],
+                input_schema=json.dumps(action_fields["input_schema"]),
+                output_schema=json.dumps(action_fields["output_schema"]),
+                enabled=True,
+                is_consequential=options.get("is_consequential", None),
+                managed_params_schema=managed_params_str,
+                options=json.dumps(options),
             )
+        )
 
     db = get_db()
-    if disable_not_imported:
-        all_previously_existing_actions = db.all(Action)
-
     try:
         existing_action_package = db.first(
             ActionPackage,
@@ -419,11 +613,7 @@ cli.main(["{command}"])
             for action in actions:
                 log.info("Found new action: %s", action.name)
                 db.insert(action)
-
-            if disable_not_imported:
-                for action in all_previously_existing_actions:
-                    log.info("Disabling action: %s", action.name)
-                    db.update_by_id(Action, action.id, dict(enabled=False))
+        return action_package.id, set(action.id for action in actions)
     else:
         # We already have an existing action package with the same name. This
         # means we'll have to update it instead of adding a new one.
@@ -467,9 +657,29 @@ cli.main(["{command}"])
                     log.info("Found new action: %s", action.name)
                     db.insert(action)
                     seen_action_ids.add(action.id)
+        return existing_action_package.id, seen_action_ids
+
 
-            if disable_not_imported:
-                for action in all_previously_existing_actions:
-                    if action.id not in seen_action_ids:
-                        log.info("Disabling action: %s", action.name)
-                        db.update_by_id(Action, action.id, dict(enabled=False))
+def _disable_not_imported_actions(
+    imported_action_ids: set[str], action_package_ids: Sequence[str] | None
+) -> None:
+    """
+    Disables the actions which were not imported (if `action_package_ids` is
+    given, only the actions of those action packages are considered).
+    """
+    from sema4ai.action_server._models import Action, get_db
+
+    db = get_db()
+    if action_package_ids is None:
+        actions = db.all(Action)
+    else:
+        actions = [
+            action
+            for action in db.all(Action)
+            if action.action_package_id in action_package_ids
+        ]
+    with db.transaction():
+        for action in actions:
+            if action.id not in imported_action_ids:
+                log.info("Disabling action: %s", action.name)
+                db.update_by_id(Action, action.id, dict(enabled=False))
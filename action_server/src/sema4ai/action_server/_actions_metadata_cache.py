@@ -0,0 +1,143 @@
+"""
+On-disk cache of the actions metadata of the imported action packages.
+
+Collecting the metadata of an action package requires launching the package
+python environment twice (to get the `sema4ai.actions` version and to run
+`cli.main(["metadata"])`), which is slow, so, the result is cached in the
+datadir (one file per action package directory).
+
+The cache key is a hash of the package sources (the `.py` files in the
+package root and in its pythonpath entries, along with the `package.yaml`),
+the conda hash of the package environment and the import options, so, any
+change in the sources or in the environment invalidates it.
+
+Note: packages without a managed environment (i.e.: without a `package.yaml`)
+are not cached, as their environment may change without notice.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import typing
+from pathlib import Path
+from typing import Iterable, Optional
+
+log = logging.getLogger(__name__)
+
+# Bump when the contents of the cache entries change.
+_CACHE_VERSION = 1
+
+# Directories which are not considered to be part of the package sources.
+_IGNORED_DIRS = frozenset(("__pycache__", "node_modules", "output"))
+
+
+class CachedActionsMetadata(typing.TypedDict):
+    # The actions library (`sema4ai.actions` or `robocorp.actions`) and its version.
+    actions_library: str
+    actions_library_version: list[int]
+    actions_list_result: list
+    data_package_metadata: Optional[dict]
+    # The stderr of the metadata collection (shown as a warning on a cache hit too).
+    stderr: str
+
+
+def _iter_source_files(root: Path) -> Iterable[Path]:
+    for dirpath, dirnames, filenames in os.walk(root):
+        # Prune in-place (sorted so that the hash is stable).
+        dirnames[:] = sorted(
+            d for d in dirnames if not d.startswith(".") and d not in _IGNORED_DIRS
+        )
+        for filename in sorted(filenames):
+            if filename.endswith(".py") or filename == "package.yaml":
+                yield Path(dirpath) / filename
+
+
+def compute_sources_hash(roots: Iterable[Path]) -> str:
+    """
+    Provides a hash of the contents of the sources in the given roots.
+    """
+    sha = hashlib.sha256()
+    for root in roots:
+        sha.update(root.as_posix().encode("utf-8"))
+        if not root.is_dir():
+            continue
+        for path in _iter_source_files(root):
+            try:
+                contents = path.read_bytes()
+            except OSError:
+                # i.e.: removed while iterating: just consider it as an empty file.
+                contents = b""
+            sha.update(b"\0")
+            sha.update(path.relative_to(root).as_posix().encode("utf-8"))
+            sha.update(b"\0")
+            sha.update(hashlib.sha256(contents).digest())
+    return sha.hexdigest()
+
+
+def compute_cache_key(sources_hash: str, condahash: str, skip_lint: bool) -> str:
+    from sema4ai.action_server import __version__
+
+    return hashlib.sha256(
+        json.dumps(
+            [_CACHE_VERSION, __version__, sources_hash, condahash, skip_lint]
+        ).encode("utf-8")
+    ).hexdigest()
+
+
+def _get_cache_file(datadir: Path, import_path: Path) -> Path:
+    path_hash = hashlib.sha256(import_path.as_posix().encode("utf-8")).hexdigest()
+    return datadir / "actions-metadata-cache" / f"{path_hash[:16]}.json"
+
+
+def load_cached_metadata(
+    datadir: Path, import_path: Path, cache_key: str
+) -> Optional[CachedActionsMetadata]:
+    """
+    Returns:
+        The cached metadata of the action package in the given directory or
+        None if it's not available for the given cache key.
+    """
+    cache_file = _get_cache_file(datadir, import_path)
+    try:
+        contents = cache_file.read_text(encoding="utf-8")
+    except OSError:
+        return None
+
+    try:
+        loaded = json.loads(contents)
+    except Exception:
+        log.debug(f"Invalid actions metadata cache file: {cache_file}")
+        return None
+
+    if not isinstance(loaded, dict) or loaded.get("cache_key") != cache_key:
+        return None
+    return typing.cast(CachedActionsMetadata, loaded.get("metadata"))
+
+
+def store_cached_metadata(
+    datadir: Path,
+    import_path: Path,
+    cache_key: str,
+    metadata: CachedActionsMetadata,
+) -> None:
+    """
+    Stores the metadata of the action package in the given directory (only the
+    last version is kept for a given directory).
+    """
+    cache_file = _get_cache_file(datadir, import_path)
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        # Written to a temporary file and then renamed so that a partially
+        # written file is never loaded.
+        tmp_file = cache_file.with_name(
+            f"{cache_file.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        tmp_file.write_text(
+            json.dumps({"cache_key": cache_key, "metadata": metadata}),
+            encoding="utf-8",
+        )
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        log.exception(f"Unable to write actions metadata cache: {cache_file}")
@@ -5,11 +5,12 @@ import socket as socket_module
 import subprocess
 import sys
 import threading
+import time
 from collections import namedtuple
 from contextlib import contextmanager
 from pathlib import Path
 from queue import Queue
-from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Set
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Set, Tuple, Union
 
 from sema4ai.actions._action_context import ActionContext
 from termcolor import colored
@@ -17,6 +18,14 @@ from termcolor import colored
 from sema4ai.action_server._models import Action, ActionPackage, Run
 from sema4ai.action_server._protocols import JSONValue
 
+from ._actions_fork_server import ForkedProcess, ForkServers, is_fork_server_supported
+from ._process_admission_queue import ProcessAdmissionQueue, ProcessQueueFullError
+from ._process_pool_warmer import (
+    ActionPackageProcesses,
+    KeyDemand,
+    parse_action_package_processes,
+)
+from ._process_recycling import ProcessRecyclePolicy, get_process_rss
 from ._settings import Settings, is_frozen
 
 if TYPE_CHECKING:
@@ -96,6 +105,7 @@ class ProcessHandle:
         settings: Settings,
         action_package: ActionPackage,
         post_run_args: Optional[tuple[str, ...]],
+        fork_servers: Optional[ForkServers] = None,
     ):
         from sema4ai.action_server._preload_actions.preload_actions_streams import (
             JsonRpcStreamWriter,
@@ -122,6 +132,13 @@ class ProcessHandle:
         # (upon reloading all running processes are marked as non-reusable).
         self.can_reuse = True
 
+        # When the process was last added to the idle processes.
+        self.idle_since = time.monotonic()
+
+        # Used by the recycling policies.
+        self.created_at = time.monotonic()
+        self.run_count = 0
+
         env = json.loads(action_package.env_json)
         _add_preload_actions_dir_to_env_pythonpath(env)
         env = build_python_launch_env(env)
@@ -134,6 +151,7 @@ class ProcessHandle:
         env["SEMA4AI_ACTION_SERVER_DATADIR"] = str(settings.datadir)
         # Also set RC_WORKITEM_DB_PATH directly for actions-work-items compatibility
         env["RC_WORKITEM_DB_PATH"] = str(settings.datadir / "workitems.db")
+        env["RC_WORKITEM_LEASE_SECONDS"] = str(settings.work_items_lease_seconds)
 
         if settings.reuse_processes:
             # When reusing processes we don't want to dump threads if
@@ -183,6 +201,10 @@ class ProcessHandle:
 
         self._read_queue: "Queue[dict]" = Queue()
 
+        # The result contents received inline from the last run (only set when
+        # the inputs/result are exchanged inline -- i.e.: no result json).
+        self._inline_result_contents: Optional[dict] = None
+
         if use_tcp:
             server_socket = _create_server_socket("127.0.0.1", 0)
             host, port = server_socket.getsockname()
@@ -202,7 +224,13 @@ class ProcessHandle:
 
             connection_future = run_in_thread(accept_connection)
 
-            self._process = subprocess.Popen(cmdline, **subprocess_kwargs)
+            self._process: Union[subprocess.Popen, ForkedProcess, None] = None
+            if fork_servers is not None:
+                self._process = fork_servers.fork(
+                    self.key, python_exe, subprocess_kwargs, host, port
+                )
+            if self._process is None:
+                self._process = subprocess.Popen(cmdline, **subprocess_kwargs)
             self._on_output = Callback()
 
             pid = self._process.pid
@@ -301,12 +329,13 @@ class ProcessHandle:
         run: Run,
         action_package: ActionPackage,
         action: Action,
-        input_json: Path,
+        input_json: Optional[Path],
         run_artifacts_dir: Path,
-        result_json: Path,
+        result_json: Optional[Path],
         headers: dict,
         cookies: dict,
         reuse_process: bool,
+        inputs: Optional[dict],
     ) -> int:
         from sema4ai.action_server._api_oauth2 import (
             get_resolved_provider_settings,
@@ -436,14 +465,20 @@ class ProcessHandle:
             "command": "run_action",
             "action_name": action.name,
             "action_file": f"{action.file}",
-            "input_json": f"{input_json}",
+            "input_json": f"{input_json}" if input_json is not None else "",
             "robot_artifacts": f"{run_artifacts_dir}",
-            "result_json": f"{result_json}",
+            "result_json": f"{result_json}" if result_json is not None else "",
             "headers": headers,
             "cookies": cookies,
             "reuse_process": reuse_process,
             "cwd": self._cwd,
         }
+        if input_json is None:
+            msg["inputs"] = inputs
+        if result_json is None:
+            msg["inline_result"] = True
+
+        self._inline_result_contents = None
         self._writer.write(msg)
 
         queue = self._read_queue
@@ -453,6 +488,10 @@ class ProcessHandle:
             # This means that the process was actually killed (or crashed).
             result_msg = {"returncode": 77}
 
+        inline_result_contents = result_msg.get("result")
+        if isinstance(inline_result_contents, dict):
+            self._inline_result_contents = inline_result_contents
+
         if self._post_run_args:
             log.debug("Calling post run command.")
             try:
@@ -548,18 +587,23 @@ class ProcessHandle:
         run: Run,
         action_package: ActionPackage,
         action: Action,
-        input_json: Path,
+        input_json: Optional[Path],
         run_artifacts_dir: Path,
         output_file: Path,
-        result_json: Path,
+        result_json: Optional[Path],
         headers: dict,
         cookies: dict,
         reuse_process: bool,
+        inputs: Optional[dict] = None,
     ) -> int:
         """
         Runs the action and returns the returncode from running the action.
 
         (returncode=0 means everything is Ok).
+
+        If `input_json` is None the `inputs` are sent inline to the process and
+        if `result_json` is None the result is received inline (and is
+        available afterwards through `pop_inline_result_contents()`).
         """
         with output_file.open("wb") as stream:
 
@@ -578,9 +622,24 @@ class ProcessHandle:
                     headers,
                     cookies,
                     reuse_process,
+                    inputs,
                 )
                 return returncode
 
+    def pop_inline_result_contents(self) -> Optional[dict]:
+        """
+        Returns:
+            The result contents (dict with "result", "message" and "status")
+            received inline in the last run (or None if not available).
+        """
+        ret = self._inline_result_contents
+        self._inline_result_contents = None
+        return ret
+
+
+def _get_idle_since(process_handle: ProcessHandle) -> float:
+    return process_handle.idle_since
+
 
 def _get_process_handle_key(settings: Settings, action_package: ActionPackage) -> _Key:
     """
@@ -606,6 +665,11 @@ class ActionsProcessPool:
 
         self._settings = settings
         self.action_package_id_to_action_package = action_package_id_to_action_package
+        # Cached as computing the keys is relatively slow (only updated on a
+        # reload).
+        self._key_to_action_package = self._compute_key_to_action_package(
+            action_package_id_to_action_package
+        )
 
         post_run_cmd = os.environ.get("SEMA4AI_ACTION_SERVER_POST_RUN_CMD")
         if not post_run_cmd:
@@ -633,9 +697,41 @@ class ActionsProcessPool:
         self._lock = threading.Lock()
         self._running_processes: Dict[_Key, Set[ProcessHandle]] = {}
         self._idle_processes: Dict[_Key, Set[ProcessHandle]] = {}
+        # The number of processes being spawned by the warmer/recycler.
+        self._spawning_count = 0
+        self._disposed = False
+
+        # The demand of processes of each key (used to decide how many idle
+        # processes are kept warm for it).
+        self._key_demand: Dict[_Key, KeyDemand] = {}
+        self._action_package_processes = parse_action_package_processes(
+            settings.action_package_processes
+        )
 
-        # Semaphore used to track running processes.
-        self._processes_running_semaphore = threading.Semaphore(self.max_processes)
+        self._recycle_policy = ProcessRecyclePolicy(
+            max_runs=settings.max_process_runs,
+            max_rss=settings.max_process_rss * 1024 * 1024,
+            max_age=settings.max_process_age,
+        )
+
+        self._fork_servers: Optional[ForkServers] = None
+        if settings.fork_server:
+            if is_fork_server_supported():
+                self._fork_servers = ForkServers(settings.fork_server_preload)
+            else:
+                log.warning(
+                    "--fork-server is only supported on Linux (a new interpreter "
+                    "will be used for each action process)."
+                )
+
+        self._warmer_thread: Optional[threading.Thread] = None
+        self._warmer_stop_event = threading.Event()
+        self._warmer_wakeup_event = threading.Event()
+
+        # Queue used to track running processes (and the runs waiting for one).
+        self._admission_queue = ProcessAdmissionQueue(
+            self.max_processes, settings.max_queued_runs
+        )
 
         self._warmup_processes()
 
@@ -643,24 +739,45 @@ class ActionsProcessPool:
         self,
         action_package_id_to_action_package: Dict[str, ActionPackage],
         actions: List[Action],
+        action_package_ids: Optional[Set[str]] = None,
     ):
         """
         On a reload, we need to kill all the related, idle processes and mark
         any running process as non-reusable.
+
+        Args:
+            action_package_ids: If given, just the processes of these action
+                packages are recycled (the ones from other action packages are
+                kept).
         """
+        # Computed before getting the lock (it's not a cheap operation).
+        key_to_action_package = self._compute_key_to_action_package(
+            action_package_id_to_action_package
+        )
         with self._lock:
             for key, idle_processes in tuple(self._idle_processes.items()):
+                if (
+                    action_package_ids is not None
+                    and key.action_package_id not in action_package_ids
+                ):
+                    continue
                 for process in idle_processes:
                     process.kill()
                 self._idle_processes.pop(key)
 
             for key, running_processes in tuple(self._running_processes.items()):
+                if (
+                    action_package_ids is not None
+                    and key.action_package_id not in action_package_ids
+                ):
+                    continue
                 for process in running_processes:
                     process.can_reuse = False
 
             self.action_package_id_to_action_package = (
                 action_package_id_to_action_package
             )
+            self._key_to_action_package = key_to_action_package
 
             # We just want the actions which are enabled.
             self.actions = [action for action in actions if action.enabled]
@@ -668,7 +785,16 @@ class ActionsProcessPool:
             # An iterator which keeps cycling over the actions.
             self._cycle_actions_iterator = itertools.cycle(self.actions)
 
+            # Forget the demand of keys which are no longer valid.
+            for key in tuple(self._key_demand):
+                if key not in key_to_action_package:
+                    del self._key_demand[key]
+
+        if self._fork_servers is not None:
+            self._fork_servers.dispose_stale(set(key_to_action_package))
+
         self._warmup_processes()
+        self._warmer_wakeup_event.set()
 
     @property
     def _reuse_processes(self) -> bool:
@@ -696,14 +822,269 @@ class ActionsProcessPool:
             action.action_package_id
         ]
 
+        process_handle, spawn_time = self._spawn_process(action_package)
+        assert self._lock.locked(), "Lock must be acquired at this point."
+        self._get_key_demand(process_handle.key).on_spawned(spawn_time)
+        self._add_to_idle_processes(process_handle)
+
+    def _spawn_process(
+        self, action_package: ActionPackage
+    ) -> Tuple[ProcessHandle, float]:
+        """
+        Note: may be called without holding the lock (so, it must not change
+        the pool state).
+
+        Returns:
+            The process spawned and the time (in seconds) it took to spawn it.
+        """
+        initial_time = time.monotonic()
         process_handle = ProcessHandle(
-            self._settings, action_package, self._post_run_cmd_args
+            self._settings,
+            action_package,
+            self._post_run_cmd_args,
+            self._fork_servers,
+        )
+        return process_handle, time.monotonic() - initial_time
+
+    def _get_key_demand(self, key: _Key) -> KeyDemand:
+        demand = self._key_demand.get(key)
+        if demand is None:
+            demand = self._key_demand[key] = KeyDemand()
+        return demand
+
+    def _get_action_package_processes(self, key: _Key) -> ActionPackageProcesses:
+        action_package = self.action_package_id_to_action_package.get(
+            key.action_package_id
         )
+        if action_package is not None:
+            ret = self._action_package_processes.get(action_package.name)
+            if ret is not None:
+                return ret
+        return ActionPackageProcesses()
+
+    def _compute_key_to_action_package(
+        self, action_package_id_to_action_package: Dict[str, ActionPackage]
+    ) -> Dict[_Key, ActionPackage]:
+        ret: Dict[_Key, ActionPackage] = {}
+        for action_package in action_package_id_to_action_package.values():
+            try:
+                key = _get_process_handle_key(self._settings, action_package)
+            except Exception:
+                # i.e.: its directory no longer exists (an error is shown if
+                # some of its actions is run).
+                continue
+            ret[key] = action_package
+        return ret
+
+    def _get_target_idle_unlocked(self, key: _Key, now: float) -> int:
+        """
+        Provides the number of idle processes which should be kept warm for
+        the given key.
+        """
         assert self._lock.locked(), "Lock must be acquired at this point."
-        self._add_to_idle_processes(process_handle)
+        demand = self._key_demand.get(key)
+        target = (
+            0
+            if demand is None
+            else demand.get_target_idle(now, self._settings.idle_process_ttl)
+        )
+        return self._get_action_package_processes(key).bound(target)
+
+    def _should_keep_idle_unlocked(self, key: _Key) -> bool:
+        """
+        Returns:
+            Whether a process (which just finished running) for the given key
+            should be kept in the idle processes.
+        """
+        assert self._lock.locked(), "Lock must be acquired at this point."
+        curr_idle_for_key = len(self._idle_processes.get(key, ()))
+        max_idle = self._get_action_package_processes(key).max_idle
+        if max_idle is not None and curr_idle_for_key >= max_idle:
+            return False
+
+        if self._get_idle_processes_count_unlocked() < self.min_processes:
+            return True
+
+        return curr_idle_for_key < self._get_target_idle_unlocked(key, time.monotonic())
+
+    def start_warmer(self, interval: float = 1.0) -> None:
+        """
+        Starts a thread which (every `interval` seconds or when the demand
+        changes) spawns the idle processes needed for each key and retires the
+        idle processes of cold keys (see: `adjust_warm_processes`).
+        """
+        if self._warmer_thread is not None:
+            return
+
+        def warmer_loop():
+            while not self._warmer_stop_event.is_set():
+                self._warmer_wakeup_event.wait(interval)
+                self._warmer_wakeup_event.clear()
+                if self._warmer_stop_event.is_set():
+                    break
+                try:
+                    self.adjust_warm_processes()
+                except Exception:
+                    log.exception("Process Pool: Error adjusting warm processes.")
+
+        self._warmer_thread = threading.Thread(
+            target=warmer_loop, name="ActionsProcessPoolWarmer", daemon=True
+        )
+        self._warmer_thread.start()
+
+    def stop_warmer(self) -> None:
+        self._warmer_stop_event.set()
+        self._warmer_wakeup_event.set()
+        if self._warmer_thread is not None:
+            self._warmer_thread.join(timeout=5)
+            self._warmer_thread = None
+
+    def adjust_warm_processes(self) -> None:
+        """
+        Spawns the idle processes needed for each key (based on its demand and
+        its action package min/max idle processes) and retires the idle
+        processes above the needed ones which are idle for more than the idle
+        TTL (but the global `min_processes` are always kept).
+        """
+        now = time.monotonic()
+        idle_ttl = self._settings.idle_process_ttl
+        to_spawn: List[ActionPackage] = []
+
+        with self._lock:
+            key_to_action_package = self._key_to_action_package
+
+            # Retire the idle processes not needed (oldest first).
+            for key, idle_processes in self._idle_processes.items():
+                excess = len(idle_processes) - self._get_target_idle_unlocked(key, now)
+                for process_handle in sorted(idle_processes, key=_get_idle_since):
+                    if excess <= 0:
+                        break
+                    if now - process_handle.idle_since < idle_ttl:
+                        break
+                    if self._get_idle_processes_count_unlocked() <= self.min_processes:
+                        break
+                    log.debug(
+                        f"Process Pool: Retiring idle process ({process_handle.pid})."
+                    )
+                    idle_processes.discard(process_handle)
+                    process_handle.kill()
+                    excess -= 1
+
+            # Spawn the idle processes needed (the hottest keys first).
+            total = self._count_total_processes()
+            keys = sorted(
+                key_to_action_package,
+                key=lambda key: self._get_key_demand(key).get_request_rate(now),
+                reverse=True,
+            )
+            for key in keys:
+                missing = self._get_target_idle_unlocked(key, now) - len(
+                    self._idle_processes.get(key, ())
+                )
+                while missing > 0 and total < self.max_processes:
+                    to_spawn.append(key_to_action_package[key])
+                    missing -= 1
+                    total += 1
+            self._spawning_count += len(to_spawn)
+
+        # Processes are spawned without holding the lock.
+        for action_package in to_spawn:
+            process_handle = None
+            spawn_time = 0.0
+            try:
+                process_handle, spawn_time = self._spawn_process(action_package)
+                log.debug(f"Process Pool: Warmed up process ({process_handle.pid}).")
+            except Exception:
+                log.exception(
+                    f"Process Pool: Unable to warm up process for: {action_package.name}."
+                )
+            finally:
+                with self._lock:
+                    self._spawning_count -= 1
+                    if process_handle is not None:
+                        self._add_spawned_process_unlocked(process_handle, spawn_time)
+
+    def _add_spawned_process_unlocked(
+        self, process_handle: ProcessHandle, spawn_time: float
+    ) -> None:
+        """
+        Adds a process spawned without holding the lock to the idle processes
+        (and records the time it took to spawn it in its key demand).
+        """
+        assert self._lock.locked(), "Lock must be acquired at this point."
+        if self._disposed or process_handle.key not in self._key_to_action_package:
+            # Disposed or reloaded in the meanwhile.
+            process_handle.kill()
+        else:
+            self._get_key_demand(process_handle.key).on_spawned(spawn_time)
+            self._add_to_idle_processes(process_handle)
+
+    def _get_process_rss(self, process_handle: ProcessHandle) -> Optional[int]:
+        """
+        Provides the RSS of the given process if the recycle policy needs it.
+
+        Note: walks `/proc`, so, it should be called without holding the lock.
+        """
+        if not self._recycle_policy.max_rss or not self._reuse_processes:
+            return None
+        return get_process_rss(process_handle.pid)
+
+    def _get_recycle_reason_unlocked(
+        self, process_handle: ProcessHandle, rss: Optional[int]
+    ) -> Optional[str]:
+        assert self._lock.locked(), "Lock must be acquired at this point."
+        if not self._recycle_policy.is_enabled():
+            return None
+        return self._recycle_policy.get_recycle_reason(
+            rss,
+            process_handle.run_count,
+            time.monotonic() - process_handle.created_at,
+        )
+
+    def _recycle_process_unlocked(self, process_handle: ProcessHandle) -> None:
+        """
+        Replaces the given process (no longer in the pool) in the background:
+        the replacement is spawned (and added to the idle processes) before the
+        given process is killed.
+        """
+        assert self._lock.locked(), "Lock must be acquired at this point."
+        from sema4ai.action_server._robo_utils.run_in_thread import run_in_thread
+
+        action_package = self.action_package_id_to_action_package.get(
+            process_handle.key.action_package_id
+        )
+        if action_package is None:
+            process_handle.kill()
+            return
+
+        # The replacement is accounted as being spawned (so that the pool
+        # doesn't create another one in the meanwhile).
+        self._spawning_count += 1
+
+        def recycle():
+            new_process_handle = None
+            spawn_time = 0.0
+            try:
+                new_process_handle, spawn_time = self._spawn_process(action_package)
+            except Exception:
+                log.exception(
+                    f"Process Pool: Unable to spawn replacement for process ({process_handle.pid})."
+                )
+            finally:
+                with self._lock:
+                    self._spawning_count -= 1
+                    if new_process_handle is not None:
+                        self._add_spawned_process_unlocked(
+                            new_process_handle, spawn_time
+                        )
+                process_handle.kill()
+
+        run_in_thread(recycle, name="ActionsProcessPoolRecycler", daemon=True)
 
     def dispose(self):
+        self.stop_warmer()
         with self._lock:
+            self._disposed = True
             for processes in itertools.chain(
                 self._idle_processes.values(), self._running_processes.values()
             ):
@@ -712,6 +1093,9 @@ class ActionsProcessPool:
             self._idle_processes.clear()
             self._running_processes.clear()
 
+        if self._fork_servers is not None:
+            self._fork_servers.dispose()
+
     def get_idle_processes_count(self) -> int:
         with self._lock:
             return self._get_idle_processes_count_unlocked()
@@ -736,7 +1120,7 @@ class ActionsProcessPool:
 
     def _count_total_processes(self) -> int:
         assert self._lock.locked(), "Lock must be acquired at this point."
-        count = 0
+        count = self._spawning_count
         for v in itertools.chain(
             self._running_processes.values(), self._idle_processes.values()
         ):
@@ -745,6 +1129,7 @@ class ActionsProcessPool:
 
     def _add_to_idle_processes(self, process_handle: ProcessHandle):
         assert self._lock.locked(), "Lock must be acquired at this point."
+        process_handle.idle_since = time.monotonic()
         processes = self._idle_processes.get(process_handle.key)
         if processes is None:
             processes = self._idle_processes[process_handle.key] = set()
@@ -773,11 +1158,37 @@ class ActionsProcessPool:
                 one_action = next(self._cycle_actions_iterator)
                 self._create_process(one_action)
 
+    def get_queue_stats(self) -> dict:
+        """
+        Returns:
+            The stats of the queue of runs waiting for a process (see:
+            `ProcessAdmissionQueue.get_stats`).
+        """
+        ret = self._admission_queue.get_stats()
+        ret["max_processes"] = self.max_processes
+        ret["running_processes"] = self.get_running_processes_count()
+        ret["idle_processes"] = self.get_idle_processes_count()
+        return ret
+
     @contextmanager
     def obtain_process_for_action(
-        self, action: Action, runtime_info: Optional["RunRuntimeInfo"] = None
+        self,
+        action: Action,
+        runtime_info: Optional["RunRuntimeInfo"] = None,
+        priority: int = 0,
     ) -> Iterator[ProcessHandle]:
-        import time
+        """
+        Provides a process to run the given action (waits in the admission queue
+        if all the processes are in use).
+
+        Args:
+            priority: Runs with a higher priority get a process before the ones
+                with a lower priority (runs with the same priority are FIFO).
+
+        Raises:
+            ProcessQueueFullError: if the maximum number of queued runs was reached.
+            CancelledError: if the run was cancelled while waiting for a process.
+        """
         from concurrent.futures import CancelledError
 
         action_package: ActionPackage = self.action_package_id_to_action_package[
@@ -786,37 +1197,26 @@ class ActionsProcessPool:
 
         key = _get_process_handle_key(self._settings, action_package)
         process_handle: Optional[ProcessHandle] = None
-        acquired_process_semaphore = False
+        acquired_process_slot = False
 
-        # Only print more info regarding delaying after 10 seconds elapse.
-        print_delayed_at = time.monotonic() + 10
+        with self._lock:
+            self._get_key_demand(key).on_request(time.monotonic())
 
         try:
             while True:
-                if acquired_process_semaphore:
+                if acquired_process_slot:
                     # If we had previously acquired, release it now (for some reason we haven't
-                    # been able to create a process after acquiring the semaphore).
-                    self._processes_running_semaphore.release()
-                    acquired_process_semaphore = False
+                    # been able to create a process after acquiring the slot).
+                    self._admission_queue.release()
+                    acquired_process_slot = False
 
-                if runtime_info is not None and runtime_info.is_canceled():
-                    raise CancelledError(
-                        f"Action: {action.name} cancelled while waiting for process."
-                    )
-
-                # Each 2 seconds check again if we can acquire a process.
                 # Important: do it without acquiring `self._lock` (as it could lead
                 # to a deadlock if one depends on the other)
-                if not self._processes_running_semaphore.acquire(timeout=2):
-                    if time.monotonic() > print_delayed_at:
-                        log.info(
-                            f"Delayed running action: {action.name} because "
-                            f"{self.max_processes} actions are already running ("
-                            f"waiting for another action to finish running)."
-                        )
-                        print_delayed_at = time.monotonic() + 10
-                    continue
-                acquired_process_semaphore = True
+                self._admission_queue.acquire(priority, runtime_info, action.name)
+                acquired_process_slot = True
+                # Time waiting for a process after being admitted (i.e.: if no
+                # idle process is available it has to be spawned).
+                admitted_time = time.monotonic()
 
                 with self._lock:
                     processes = self._idle_processes.get(key)
@@ -860,22 +1260,28 @@ class ActionsProcessPool:
                                 f"{self.max_processes} actions are already running "
                                 "(waiting for another action to finish running). "
                                 "THIS IS UNEXPECTED AT THIS POINT "
-                                "(the semaphore with the max number of processes is "
-                                "not working as expected)."
+                                "(the admission queue with the max number of processes "
+                                "is not working as expected)."
                             )
 
                 if process_handle is not None:
+                    with self._lock:
+                        self._get_key_demand(key).on_acquired(
+                            time.monotonic() - admitted_time
+                        )
+                    # The warmer may need to replace the idle process used.
+                    self._warmer_wakeup_event.set()
                     break
                 else:
                     continue
         except BaseException as e:
-            if not isinstance(e, CancelledError):
+            if not isinstance(e, (CancelledError, ProcessQueueFullError)):
                 log.exception(
                     "CRITICAL ERROR IN Action Server Process Pool! This may make the Action Server unresponsive. Please report error!"
                 )
 
-            if acquired_process_semaphore:
-                self._processes_running_semaphore.release()
+            if acquired_process_slot:
+                self._admission_queue.release()
 
             raise
 
@@ -884,16 +1290,19 @@ class ActionsProcessPool:
                 "Expected process_handle to be not None at this point!"
             )
 
-        if not acquired_process_semaphore:
+        if not acquired_process_slot:
             raise AssertionError(
-                "Expected 'acquired_process_semaphore' to be True at this point!"
+                "Expected 'acquired_process_slot' to be True at this point!"
             )
 
         try:
             yield process_handle
         finally:
-            self._processes_running_semaphore.release()
+            self._admission_queue.release()
+            # Sampled before getting the lock (it's not a cheap operation).
+            rss = self._get_process_rss(process_handle)
             with self._lock:
+                process_handle.run_count += 1
                 self._remove_from_running_processes(process_handle)
                 if process_handle.is_alive():
                     if self._reuse_processes:
@@ -905,12 +1314,20 @@ class ActionsProcessPool:
                             # We cannot reuse it!
                             process_handle.kill()
 
-                        elif self.min_processes <= curr_idle:
+                        elif not self._should_keep_idle_unlocked(process_handle.key):
                             log.debug(
-                                f"Process Pool: Exited process ({process_handle.pid}) -- min processes already satisfied."
+                                f"Process Pool: Exited process ({process_handle.pid}) -- min processes already satisfied "
+                                f"(idle: {curr_idle})."
                             )
                             # We cannot reuse it!
                             process_handle.kill()
+                        elif recycle_reason := self._get_recycle_reason_unlocked(
+                            process_handle, rss
+                        ):
+                            log.info(
+                                f"Process Pool: Recycling process ({process_handle.pid}) -- {recycle_reason}."
+                            )
+                            self._recycle_process_unlocked(process_handle)
                         else:
                             log.debug(
                                 f"Process Pool: Adding back to pool ({process_handle.pid})."
@@ -927,6 +1344,7 @@ class ActionsProcessPool:
             # especially when not reusing processes, but if some process
             # crashes it's also needed).
             self._warmup_processes()
+            self._warmer_wakeup_event.set()
 
 
 _actions_process_pool: Optional[ActionsProcessPool] = None
@@ -943,8 +1361,12 @@ def setup_actions_process_pool(
     _actions_process_pool = ActionsProcessPool(
         settings, action_package_id_to_action_package, actions
     )
-    yield
-    _actions_process_pool = None
+    _actions_process_pool.start_warmer()
+    try:
+        yield
+    finally:
+        _actions_process_pool.stop_warmer()
+        _actions_process_pool = None
 
 
 def get_actions_process_pool() -> ActionsProcessPool:
@@ -3,7 +3,8 @@ import json
 import logging
 import time
 import typing
-from typing import Any, Callable, Dict, Protocol, Tuple
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Protocol, Tuple
 
 from fastapi import HTTPException, Request, Response
 from fastapi.exceptions import RequestValidationError
@@ -15,11 +16,14 @@ from ._settings import (
     HEADER_ACTION_SERVER_RUN_ID,
     HEADER_ACTIONS_ASYNC_CALLBACK,
     HEADER_ACTIONS_ASYNC_TIMEOUT,
+    HEADER_ACTIONS_PRIORITY,
     HEADER_ACTIONS_REQUEST_ID,
 )
 
 if typing.TYPE_CHECKING:
+    from ._actions_process_pool import ProcessHandle
     from ._models import Action, ActionPackage, Run
+    from ._settings import Settings
 
 log = logging.getLogger(__name__)
 
@@ -54,6 +58,79 @@ def _create_run_artifacts_dir(action: "Action", run_id: str) -> str:
     return path
 
 
+def _prepare_action_io(
+    settings: "Settings", relative_artifacts_dir: str, inputs: dict
+) -> Tuple[Optional[Path], Optional[Path]]:
+    """
+    Prepares the json files used to exchange the inputs/result with the
+    action process.
+
+    Returns:
+        A tuple with the (input_json, result_json) paths. Both are None when the
+        inputs/result are exchanged inline with the action process (in which
+        case the inputs are only written to the run artifacts if
+        `settings.persist_action_io` is set).
+    """
+    run_artifacts_dir = settings.artifacts_dir / relative_artifacts_dir
+    input_json = run_artifacts_dir / "__action_server_inputs.json"
+
+    if settings.inline_action_io:
+        if settings.persist_action_io:
+            input_json.write_bytes(json.dumps(inputs).encode("utf-8"))
+        return None, None
+
+    input_json.write_bytes(json.dumps(inputs).encode("utf-8"))
+    return input_json, run_artifacts_dir / "__action_server_result.json"
+
+
+def _load_action_result_contents(
+    settings: "Settings",
+    relative_artifacts_dir: str,
+    process_handle: "ProcessHandle",
+    result_json: Optional[Path],
+) -> Tuple[Optional[dict], Optional[str]]:
+    """
+    Loads the result of running an action (either from the result json or
+    from the contents received inline from the action process).
+
+    Returns:
+        A tuple with the (result_contents, error_message). If the error
+        message is not None, the result contents could not be loaded.
+    """
+    if result_json is None:
+        result_contents = process_handle.pop_inline_result_contents()
+        if result_contents is None:
+            return None, (
+                "It was not possible to collect the contents of the "
+                "result (not received from the action process)."
+            )
+
+        if settings.persist_action_io:
+            persist_at = (
+                settings.artifacts_dir
+                / relative_artifacts_dir
+                / "__action_server_result.json"
+            )
+            try:
+                persist_at.write_text(json.dumps(result_contents), "utf-8")
+            except Exception:
+                log.exception(f"Error writing result to: {persist_at}")
+        return result_contents, None
+
+    try:
+        run_result_str: str = result_json.read_text("utf-8", "replace")
+    except Exception:
+        return None, (
+            "It was not possible to collect the contents of the "
+            "result (json not created)."
+        )
+
+    try:
+        return json.loads(run_result_str), None
+    except Exception:
+        return None, f"Error loading the contents of {run_result_str} as json."
+
+
 def _create_run(
     action: "Action",
     run_id: str,
@@ -80,25 +157,33 @@ def _create_run(
         relative_artifacts_dir=relative_artifacts_dir,
         request_id=request_id,
     )
-    with db.transaction():
-        with db.cursor() as cursor:
-            db.execute_update_returning(
-                cursor,
-                "UPDATE counter SET value=value+1 WHERE id=? RETURNING value",
-                [RUN_ID_COUNTER],
-            )
-            counter_record = cursor.fetchall()
-            if not counter_record:
-                raise RuntimeError(
-                    f"Error. No counter found for run_id. Counters in db: {db.all(Counter)}"
+    global_runs_state = get_global_runs_state()
+    run_kwargs["change_seq"] = global_runs_state.next_change_seq()
+    runs_writer = global_runs_state.runs_writer
+    if runs_writer is not None:
+        # Group commit: the run is written to the db by the runs writer thread.
+        run_kwargs["numbered_id"] = runs_writer.next_numbered_id()
+        run = Run(**run_kwargs)
+        runs_writer.insert_run(run)
+    else:
+        with db.transaction():
+            with db.cursor() as cursor:
+                db.execute_update_returning(
+                    cursor,
+                    "UPDATE counter SET value=value+1 WHERE id=? RETURNING value",
+                    [RUN_ID_COUNTER],
                 )
-            run_kwargs["numbered_id"] = counter_record[0][0]
+                counter_record = cursor.fetchall()
+                if not counter_record:
+                    raise RuntimeError(
+                        f"Error. No counter found for run_id. Counters in db: {db.all(Counter)}"
+                    )
+                run_kwargs["numbered_id"] = counter_record[0][0]
 
-        run = Run(**run_kwargs)
-        db.insert(run)
+            run = Run(**run_kwargs)
+            db.insert(run)
 
     # Ok, transaction finished properly. Let's add it to our in-memory cache.
-    global_runs_state = get_global_runs_state()
     global_runs_state.on_run_inserted(run)
 
     return run
@@ -113,6 +198,9 @@ def _update_run(run: "Run", initial_time: float, run_finished: bool, **changes):
     if run_finished:
         changes["run_time"] = time.monotonic() - initial_time
 
+    global_runs_state = get_global_runs_state()
+    changes["change_seq"] = global_runs_state.next_change_seq()
+
     db = get_db()
     changes_repr = []
     for k, v in changes.items():
@@ -127,11 +215,18 @@ def _update_run(run: "Run", initial_time: float, run_finished: bool, **changes):
     url = f"{get_settings().base_url}/runs/{run.id}"
 
     log.info(f"Updating run {run.id} with changes: {changes_str} (see: {url})")
-    with db.transaction():
-        db.update(run, *fields_changed)
+    runs_writer = global_runs_state.runs_writer
+    if runs_writer is not None:
+        runs_writer.update_run(run, fields_changed, finished=run_finished)
+    else:
+        from ._run_rollups import add_finished_run
+
+        with db.transaction():
+            db.update(run, *fields_changed)
+            if run_finished:
+                add_finished_run(db, run)
 
     # Ok, transaction finished properly. Let's update our in-memory cache.
-    global_runs_state = get_global_runs_state()
     global_runs_state.on_run_changed(run, changes)
 
 
@@ -257,7 +352,18 @@ class _ActionsRunner:
         if timeout is not None:
             timeout = float(timeout)
 
+        priority = headers.get(HEADER_ACTIONS_PRIORITY, 0)
+        try:
+            priority = int(priority)
+        except (TypeError, ValueError):
+            raise RequestValidationError(
+                [
+                    f"The {HEADER_ACTIONS_PRIORITY} header must be an integer. Found: {priority!r}"
+                ]
+            )
+
         self.request_id: str = headers.get(HEADER_ACTIONS_REQUEST_ID, "")
+        self.priority: int = priority
         self.timeout: Optional[float] = timeout
         self.callback_url: Optional[str] = headers.get(
             HEADER_ACTIONS_ASYNC_CALLBACK, None
@@ -390,6 +496,9 @@ class _ActionsRunner:
             ActionsProcessPool,
             ProcessHandle,
         )
+        from sema4ai.action_server._process_admission_queue import (
+            ProcessQueueFullError,
+        )
         from sema4ai.action_server._runs_state_cache import get_global_runs_state
 
         action_package: "ActionPackage" = self.action_package
@@ -421,25 +530,16 @@ class _ActionsRunner:
                 # running in parallel (i.e.: the process pool may be full).
                 initial_time = time.monotonic()  # Initial time
                 process_handle_ctx = actions_process_pool.obtain_process_for_action(
-                    action, runtime_info
+                    action, runtime_info, self.priority
                 )
                 with process_handle_ctx as process_handle:
                     initial_time = time.monotonic()
-                    input_json = (
-                        settings.artifacts_dir
-                        / relative_artifacts_path
-                        / "__action_server_inputs.json"
+                    input_json, result_json = _prepare_action_io(
+                        settings, relative_artifacts_path, inputs
                     )
-                    input_json.write_bytes(json.dumps(inputs).encode("utf-8"))
 
                     run_artifacts_dir = settings.artifacts_dir / relative_artifacts_path
 
-                    result_json = (
-                        settings.artifacts_dir
-                        / relative_artifacts_path
-                        / "__action_server_result.json"
-                    )
-
                     output_file = (
                         settings.artifacts_dir
                         / relative_artifacts_path
@@ -472,23 +572,14 @@ class _ActionsRunner:
                             headers,
                             cookies,
                             reuse_process,
+                            inputs=inputs,
                         )
 
-                    error_msg = None
-                    try:
-                        run_result_str: str = result_json.read_text("utf-8", "replace")
-                    except Exception:
-                        error_msg = (
-                            "It was not possible to collect the contents of the "
-                            "result (json not created)."
-                        )
-                    else:
-                        try:
-                            result_contents = json.loads(run_result_str)
-                        except Exception:
-                            error_msg = f"Error loading the contents of {run_result_str} as json."
+                    result_contents, error_msg = _load_action_result_contents(
+                        settings, relative_artifacts_path, process_handle, result_json
+                    )
 
-                    if error_msg is not None:
+                    if error_msg is not None or result_contents is None:
                         if runtime_info.is_canceled():
                             # When cancelled, these errors are expected (so, throw error that it's cancelled
                             # instead of the error message).
@@ -546,6 +637,9 @@ class _ActionsRunner:
                             f"Action {action.name} cancelled (run_id={run.id})"
                         )
                         _set_run_as_finished_cancelled(run, str(e), initial_time)
+                    elif isinstance(e, ProcessQueueFullError):
+                        log.info(f"Action {action.name} rejected: {e} (run_id={run.id})")
+                        _set_run_as_finished_failed(run, str(e), initial_time)
                     else:
                         log.exception(f"Action {action.name} failed (run_id={run.id})")
                         _set_run_as_finished_failed(run, str(e), initial_time)
@@ -554,6 +648,8 @@ class _ActionsRunner:
                         f"INTERNAL ERROR (unexpected) IN ACTION SERVER! Error setting run {run.id} as finished."
                     )
 
+                if isinstance(e, ProcessQueueFullError):
+                    raise HTTPException(status_code=429, detail=str(e))
                 raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -779,7 +875,7 @@ async def execute_action_for_scheduler(
     from sema4ai.action_server._runs_state_cache import get_global_runs_state
     from sema4ai.action_server._settings import get_settings
 
-    from ._models import Run, get_db
+    from ._models import get_db
 
     settings = get_settings()
     global_runs_state = get_global_runs_state()
@@ -787,9 +883,10 @@ async def execute_action_for_scheduler(
 
     db = get_db()
 
-    # Get the run from the database
-    with db.connect():
-        run = db.first(Run, "SELECT * FROM run WHERE id = ?", [run_id])
+    # Get the run (it may still not be committed to the db if group commits
+    # are being used, so, get it through the runs state).
+    with global_runs_state.semaphore:
+        run = global_runs_state.get_run_from_id(run_id)
 
     def _execute_in_thread():
         with db.connect():
@@ -802,21 +899,12 @@ async def execute_action_for_scheduler(
                 )
                 with process_handle_ctx as process_handle:
                     initial_time = time.monotonic()
-                    input_json = (
-                        settings.artifacts_dir
-                        / relative_artifacts_dir
-                        / "__action_server_inputs.json"
+                    input_json, result_json = _prepare_action_io(
+                        settings, relative_artifacts_dir, inputs
                     )
-                    input_json.write_bytes(json.dumps(inputs).encode("utf-8"))
 
                     run_artifacts_dir = settings.artifacts_dir / relative_artifacts_dir
 
-                    result_json = (
-                        settings.artifacts_dir
-                        / relative_artifacts_dir
-                        / "__action_server_result.json"
-                    )
-
                     output_file = (
                         settings.artifacts_dir
                         / relative_artifacts_dir
@@ -847,20 +935,14 @@ async def execute_action_for_scheduler(
                             {},  # headers - empty for scheduler
                             {},  # cookies - empty for scheduler
                             reuse_process,
+                            inputs=inputs,
                         )
 
-                    error_msg = None
-                    try:
-                        run_result_str: str = result_json.read_text("utf-8", "replace")
-                    except Exception:
-                        error_msg = "Failed to read action result (json not created)."
-                    else:
-                        try:
-                            result_contents = json.loads(run_result_str)
-                        except Exception:
-                            error_msg = f"Error parsing action result as JSON."
+                    result_contents, error_msg = _load_action_result_contents(
+                        settings, relative_artifacts_dir, process_handle, result_json
+                    )
 
-                    if error_msg is not None:
+                    if error_msg is not None or result_contents is None:
                         if runtime_info.is_canceled():
                             raise CancelledError(f"Run cancelled, action: {action.name}")
                         _set_run_as_finished_failed(run, error_msg, initial_time)
@@ -1,4 +1,5 @@
 import logging
+import typing
 
 from fastapi import params
 from starlette.authentication import AuthCredentials, AuthenticationBackend, BaseUser
@@ -8,6 +9,9 @@ from starlette.types import Receive, Scope, Send
 
 from sema4ai.action_server._app import _CustomFastAPI
 
+if typing.TYPE_CHECKING:
+    from sema4ai.action_server._models import Action, ActionPackage
+
 log = logging.getLogger(__name__)
 
 
@@ -109,6 +113,7 @@ class _ActionRoutes:
         self.action_package_id_to_action_package: dict[str, ActionPackage] = {}
         self.actions: list[Action] = []
         self.registered_route_names: set[str] = set()
+        self._action_package_id_to_route_names: dict[str, set[str]] = {}
         self.mcp_server_setup_helper: McpServerSetupHelper = McpServerSetupHelper()
         self._session_manager: StreamableHTTPSessionManager | None = None
         self._sse_transport: SseServerTransport | None = None
@@ -230,7 +235,16 @@ class _ActionRoutes:
         self.sse_server = Starlette(debug=False, routes=routes, middleware=middleware)
         app.mount("/sse", self.sse_server)
 
-    def register_actions(self) -> None:
+    def register_actions(self, action_package_ids: set[str] | None = None) -> None:
+        """
+        Registers the routes (and MCP tools) of the enabled actions in the
+        database.
+
+        Args:
+            action_package_ids: If given, just the actions of these action
+                packages are registered (the ones from other action packages
+                must be already registered).
+        """
         import json
 
         from sema4ai.action_server._settings import (
@@ -251,12 +265,18 @@ class _ActionRoutes:
         )
 
         actions = db.all(Action)
-        registered_route_names: set[str] = set()
+        registered_route_names: set[str] = set(self.registered_route_names)
         for action in actions:
             if not action.enabled:
                 # Disabled actions should not be registered.
                 continue
 
+            if (
+                action_package_ids is not None
+                and action.action_package_id not in action_package_ids
+            ):
+                continue
+
             doc_desc: str | None = ""
             if action.docs:
                 doc_desc = get_action_description_from_docs(action.docs)
@@ -323,6 +343,9 @@ class _ActionRoutes:
                 openapi_extra=openapi_extra,
             )
             registered_route_names.add(route_name)
+            self._action_package_id_to_route_names.setdefault(
+                action_package.id, set()
+            ).add(route_name)
 
             self.mcp_server_setup_helper.register_action(
                 func_internal, action_package, action, display_name, doc_desc
@@ -332,16 +355,93 @@ class _ActionRoutes:
         self.actions = actions
         self.registered_route_names = registered_route_names
 
-    def unregister_actions(self):
+    def unregister_actions(self, action_package_ids: set[str] | None = None):
+        """
+        Unregisters the routes (and MCP tools) of the registered actions.
+
+        Args:
+            action_package_ids: If given, just the actions of these action
+                packages are unregistered.
+        """
         from sema4ai.action_server._app import get_app
 
+        if action_package_ids is None:
+            route_names = self.registered_route_names
+            self._action_package_id_to_route_names = {}
+        else:
+            route_names = set()
+            for action_package_id in action_package_ids:
+                route_names.update(
+                    self._action_package_id_to_route_names.pop(action_package_id, ())
+                )
+
         # We need to iterate backwards to remove with indexes.
         app = get_app()
         i = len(app.router.routes)
         for route in reversed(app.router.routes):
             i -= 1
-            if route.path_format in self.registered_route_names:
+            if route.path_format in route_names:
                 log.debug("Unregistering route: %s", route.path_format)
                 del app.router.routes[i]
 
-        self.mcp_server_setup_helper.unregister_actions()
+        self.registered_route_names = self.registered_route_names - route_names
+        self.mcp_server_setup_helper.unregister_actions(action_package_ids)
+
+    def reload_actions(self) -> set[str]:
+        """
+        Swaps the routes (and MCP tools) of the action packages whose actions
+        changed in the database since they were registered (the routes of the
+        other action packages are kept as is).
+
+        Returns:
+            The ids of the action packages which changed.
+        """
+        from ._models import Action, ActionPackage, get_db
+
+        db = get_db()
+        new_action_packages = db.all(ActionPackage)
+        new_actions = db.all(Action)
+
+        changed_action_package_ids = _get_changed_action_package_ids(
+            self.action_package_id_to_action_package,
+            self.actions,
+            dict((p.id, p) for p in new_action_packages),
+            new_actions,
+        )
+        if changed_action_package_ids:
+            self.unregister_actions(changed_action_package_ids)
+            self.register_actions(changed_action_package_ids)
+        return changed_action_package_ids
+
+
+def _get_changed_action_package_ids(
+    old_id_to_action_package: "dict[str, ActionPackage]",
+    old_actions: "list[Action]",
+    new_id_to_action_package: "dict[str, ActionPackage]",
+    new_actions: "list[Action]",
+) -> set[str]:
+    def group_by_package(actions: "list[Action]") -> "dict[str, list[Action]]":
+        ret: "dict[str, list[Action]]" = {}
+        for action in actions:
+            ret.setdefault(action.action_package_id, []).append(action)
+        for package_actions in ret.values():
+            package_actions.sort(key=lambda action: action.id)
+        return ret
+
+    old_id_to_actions = group_by_package(old_actions)
+    new_id_to_actions = group_by_package(new_actions)
+
+    changed: set[str] = set()
+    for action_package_id in set(old_id_to_action_package).union(
+        new_id_to_action_package
+    ):
+        old_package = old_id_to_action_package.get(action_package_id)
+        new_package = new_id_to_action_package.get(action_package_id)
+        if old_package != new_package:
+            changed.add(action_package_id)
+
+        elif old_id_to_actions.get(action_package_id) != new_id_to_actions.get(
+            action_package_id
+        ):
+            changed.add(action_package_id)
+    return changed
@@ -5,11 +5,17 @@ Provides aggregated run statistics including:
 - Summary metrics (total runs, success rate, average duration)
 - Runs grouped by day
 - Runs grouped by action
+- Run time histogram
+
+Note: the `run` table is not scanned: the stats of the finished runs are read
+from the rollups (see: `_run_rollups`) and just the runs still not finished
+(which are found through the status index) are read from the `run` table.
 """
 
+import json
 import logging
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional
 
 from fastapi.routing import APIRouter
 
@@ -51,6 +57,33 @@ class RunsByAction:
     avg_duration_ms: float
 
 
+@dataclass
+class RunTimeHistogram:
+    """Number of (passed/failed) runs in each run time bucket."""
+
+    # Upper bounds (inclusive) of the buckets (the last bucket has the runs
+    # above the last bound).
+    bounds_ms: List[float]
+    counts: List[int]
+
+
+# The stats of the runs: finished runs come from the rollups and the ones still
+# not finished are added from the `run` table.
+_RUN_STATS_CTE = """
+WITH run_stats(day, action_id, status, run_count, run_time_count, run_time_sum)
+AS (
+    SELECT day, action_id, status, run_count, run_time_count, run_time_sum
+    FROM run_rollup
+    UNION ALL
+    SELECT date(start_time), action_id, status, 1, 0, 0.0
+    FROM run
+    WHERE status IN (?, ?)
+)
+"""
+
+_RUN_STATS_CTE_VALUES = [RunStatus.NOT_RUN, RunStatus.RUNNING]
+
+
 def _empty_summary() -> AnalyticsSummary:
     """Returns an empty analytics summary when no runs exist."""
     return AnalyticsSummary(
@@ -63,7 +96,15 @@ def _empty_summary() -> AnalyticsSummary:
 
 def _calculate_summary_metrics(row: tuple) -> AnalyticsSummary:
     """Calculates summary metrics from database row."""
-    total_runs, passed_runs, failed_runs, avg_duration, runs_today = row
+    (
+        total_runs,
+        passed_runs,
+        failed_runs,
+        run_time_sum,
+        run_time_count,
+        runs_today,
+    ) = row
+    avg_duration = (run_time_sum / run_time_count) if run_time_count else None
 
     # Calculate success rate from completed runs only
     passed_runs = passed_runs or 0
@@ -104,24 +145,29 @@ def get_analytics_summary() -> AnalyticsSummary:
             # Get all statistics in a single query for better performance
             db.execute_query(
                 cursor,
-                """
+                _RUN_STATS_CTE
+                + """
                 SELECT
-                    COUNT(*) as total_runs,
-                    SUM(CASE WHEN status = ? THEN 1 ELSE 0 END) as passed_runs,
-                    SUM(CASE WHEN status = ? THEN 1 ELSE 0 END) as failed_runs,
-                    AVG(CASE
-                        WHEN run_time IS NOT NULL AND status IN (?, ?)
-                        THEN run_time
-                        ELSE NULL
-                    END) as avg_duration,
+                    SUM(run_count) as total_runs,
+                    SUM(CASE WHEN status = ? THEN run_count ELSE 0 END)
+                        as passed_runs,
+                    SUM(CASE WHEN status = ? THEN run_count ELSE 0 END)
+                        as failed_runs,
+                    SUM(CASE WHEN status IN (?, ?) THEN run_time_sum ELSE 0 END)
+                        as run_time_sum,
+                    SUM(CASE WHEN status IN (?, ?) THEN run_time_count ELSE 0 END)
+                        as run_time_count,
                     SUM(CASE
-                        WHEN start_time >= date('now', 'start of day')
-                        THEN 1
+                        WHEN day >= date('now', 'start of day')
+                        THEN run_count
                         ELSE 0
                     END) as runs_today
-                FROM run
+                FROM run_stats
                 """,
-                [
+                _RUN_STATS_CTE_VALUES
+                + [
+                    RunStatus.PASSED,
+                    RunStatus.FAILED,
                     RunStatus.PASSED,
                     RunStatus.FAILED,
                     RunStatus.PASSED,
@@ -130,7 +176,7 @@ def get_analytics_summary() -> AnalyticsSummary:
             )
 
             row = cursor.fetchone()
-            if not row or row[0] == 0:
+            if not row or not row[0]:
                 return _empty_summary()
 
             return _calculate_summary_metrics(row)
@@ -153,18 +199,19 @@ def get_runs_by_day(days: int = 30) -> List[RunsByDay]:
             # Use SQLite date functions for cleaner date handling
             db.execute_query(
                 cursor,
-                """
+                _RUN_STATS_CTE
+                + """
                 SELECT
-                    date(start_time) as run_date,
-                    COUNT(*) as total,
-                    SUM(CASE WHEN status = ? THEN 1 ELSE 0 END) as passed,
-                    SUM(CASE WHEN status = ? THEN 1 ELSE 0 END) as failed
-                FROM run
-                WHERE start_time >= date('now', ? || ' days')
-                GROUP BY date(start_time)
+                    day as run_date,
+                    SUM(run_count) as total,
+                    SUM(CASE WHEN status = ? THEN run_count ELSE 0 END) as passed,
+                    SUM(CASE WHEN status = ? THEN run_count ELSE 0 END) as failed
+                FROM run_stats
+                WHERE day >= date('now', ? || ' days')
+                GROUP BY day
                 ORDER BY run_date ASC
                 """,
-                [RunStatus.PASSED, RunStatus.FAILED, -days],
+                _RUN_STATS_CTE_VALUES + [RunStatus.PASSED, RunStatus.FAILED, -days],
             )
 
             return [
@@ -192,25 +239,31 @@ def get_runs_by_action() -> List[RunsByAction]:
             # Get run statistics with action and package names in a single query
             db.execute_query(
                 cursor,
-                """
+                _RUN_STATS_CTE
+                + """
                 SELECT
                     a.name as action_name,
                     ap.name as package_name,
-                    COUNT(*) as total,
-                    SUM(CASE WHEN r.status = ? THEN 1 ELSE 0 END) as passed,
-                    SUM(CASE WHEN r.status = ? THEN 1 ELSE 0 END) as failed,
-                    AVG(CASE
-                        WHEN r.run_time IS NOT NULL AND r.status IN (?, ?)
-                        THEN r.run_time
-                        ELSE NULL
-                    END) as avg_duration
-                FROM run r
+                    SUM(r.run_count) as total,
+                    SUM(CASE WHEN r.status = ? THEN r.run_count ELSE 0 END)
+                        as passed,
+                    SUM(CASE WHEN r.status = ? THEN r.run_count ELSE 0 END)
+                        as failed,
+                    SUM(CASE WHEN r.status IN (?, ?) THEN r.run_time_sum ELSE 0 END)
+                        as run_time_sum,
+                    SUM(CASE
+                        WHEN r.status IN (?, ?) THEN r.run_time_count ELSE 0
+                    END) as run_time_count
+                FROM run_stats r
                 JOIN action a ON r.action_id = a.id
                 JOIN action_package ap ON a.action_package_id = ap.id
                 GROUP BY a.id, a.name, ap.name
                 ORDER BY total DESC
                 """,
-                [
+                _RUN_STATS_CTE_VALUES
+                + [
+                    RunStatus.PASSED,
+                    RunStatus.FAILED,
                     RunStatus.PASSED,
                     RunStatus.FAILED,
                     RunStatus.PASSED,
@@ -225,7 +278,66 @@ def get_runs_by_action() -> List[RunsByAction]:
                     total=row[2],
                     passed=row[3] or 0,
                     failed=row[4] or 0,
-                    avg_duration_ms=round(_seconds_to_milliseconds(row[5]), 1),
+                    avg_duration_ms=round(
+                        _seconds_to_milliseconds(row[5] / row[6] if row[6] else None),
+                        1,
+                    ),
                 )
                 for row in cursor.fetchall()
             ]
+
+
+@analytics_api_router.get("/run-time-histogram", response_model=RunTimeHistogram)
+def get_run_time_histogram(
+    days: int = 30, action_id: Optional[str] = None
+) -> RunTimeHistogram:
+    """
+    Returns the histogram of the run time of the passed/failed runs.
+
+    Args:
+        days: Number of days to look back (default 30)
+        action_id: If given, only the runs of this action are considered.
+
+    Returns:
+        RunTimeHistogram with the buckets bounds (in milliseconds) and counts.
+    """
+    from sema4ai.action_server._run_rollups import RUN_TIME_HISTOGRAM_BOUNDS
+
+    where = "status IN (?, ?) AND day >= date('now', ? || ' days')"
+    values: list = [RunStatus.PASSED, RunStatus.FAILED, -days]
+    if action_id is not None:
+        where += " AND action_id = ?"
+        values.append(action_id)
+
+    counts = [0] * (len(RUN_TIME_HISTOGRAM_BOUNDS) + 1)
+    db = get_db()
+    with db.connect():
+        with db.cursor() as cursor:
+            db.execute_query(
+                cursor,
+                f"SELECT run_time_histogram FROM run_rollup WHERE {where}",
+                values,
+            )
+            for (histogram_json,) in cursor.fetchall():
+                for i, count in enumerate(json.loads(histogram_json)):
+                    counts[i] += count
+
+    return RunTimeHistogram(
+        bounds_ms=[bound * 1000 for bound in RUN_TIME_HISTOGRAM_BOUNDS],
+        counts=counts,
+    )
+
+
+@analytics_api_router.get("/process-queue", response_model=dict)
+def get_process_queue_stats() -> dict:
+    """
+    Returns the stats of the queue of runs waiting for an action process.
+
+    Returns:
+        A dict with the current queue length, the number of rejected runs and
+        the histograms of the queue length and wait time (which can be used to
+        size `--max-processes`).
+    """
+    from sema4ai.action_server._actions_process_pool import get_actions_process_pool
+
+    return get_actions_process_pool().get_queue_stats()
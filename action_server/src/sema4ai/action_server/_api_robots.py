@@ -526,6 +526,7 @@ async def run_robot_task(
         RunStatus,
         get_db,
     )
+    from sema4ai.action_server._run_rollups import add_finished_run
 
     # Get settings for paths
     settings = get_settings()
@@ -557,24 +558,37 @@ async def run_robot_task(
         robot_package_path=request.robot_package_path,
         robot_task_name=request.task_name,
         robot_env_hash="",  # Will be populated when environment is created
+        change_seq=get_global_runs_state().next_change_seq(),
     )
 
     # Insert the run record with an atomic numbered ID
+    runs_writer = get_global_runs_state().runs_writer
     with db.transaction():
-        with db.cursor() as cursor:
-            db.execute_update_returning(
-                cursor,
-                "UPDATE counter SET value=value+1 WHERE id=? RETURNING value",
-                [RUN_ID_COUNTER],
+        if runs_writer is not None:
+            # With group commits the numbered ids are provided by the runs writer.
+            # The run is inserted directly (not by the runs writer), so, the
+            # counter must be advanced in this transaction too (otherwise the
+            # same numbered id could be provided again after a restart).
+            run_kwargs["numbered_id"] = runs_writer.next_numbered_id()
+            db.execute(
+                "UPDATE counter SET value=MAX(value, ?) WHERE id=?",
+                [run_kwargs["numbered_id"], RUN_ID_COUNTER],
             )
-            counter_record = cursor.fetchall()
-            if not counter_record:
-                raise RuntimeError(
-                    f"Error. No counter found for run_id. Counters in db: {db.all(Counter)}"
+        else:
+            with db.cursor() as cursor:
+                db.execute_update_returning(
+                    cursor,
+                    "UPDATE counter SET value=value+1 WHERE id=? RETURNING value",
+                    [RUN_ID_COUNTER],
                 )
-            run_kwargs["numbered_id"] = counter_record[0][0]
-            run = Run(**run_kwargs)  # type: ignore[arg-type]
-            db.insert(run)
+                counter_record = cursor.fetchall()
+                if not counter_record:
+                    raise RuntimeError(
+                        f"Error. No counter found for run_id. Counters in db: {db.all(Counter)}"
+                    )
+                run_kwargs["numbered_id"] = counter_record[0][0]
+        run = Run(**run_kwargs)  # type: ignore[arg-type]
+        db.insert(run)
 
     # Notify run state listeners
     get_global_runs_state().on_run_inserted(run)
@@ -636,9 +650,12 @@ async def run_robot_task(
         try:
             # Update run status to running
             run.status = RunStatus.RUNNING
+            run.change_seq = get_global_runs_state().next_change_seq()
             with db.transaction():
-                db.update(run, "status")
-            get_global_runs_state().on_run_changed(run, {"status": RunStatus.RUNNING})
+                db.update(run, "status", "change_seq")
+            get_global_runs_state().on_run_changed(
+                run, {"status": RunStatus.RUNNING, "change_seq": run.change_seq}
+            )
 
             # Get environment variables for the robot task
             # Use env_config_file (conda.yaml or package.yaml) for environment creation
@@ -770,8 +787,10 @@ async def run_robot_task(
                 run.status = RunStatus.FAILED
                 run.error_message = result.message
 
+            run.change_seq = get_global_runs_state().next_change_seq()
             with db.transaction():
-                db.update(run, "status", "result", "error_message")
+                db.update(run, "status", "result", "error_message", "change_seq")
+                add_finished_run(db, run)
 
             get_global_runs_state().on_run_changed(
                 run,
@@ -779,6 +798,7 @@ async def run_robot_task(
                     "status": run.status,
                     "result": run.result,
                     "error_message": run.error_message,
+                    "change_seq": run.change_seq,
                 },
             )
 
@@ -786,10 +806,17 @@ async def run_robot_task(
             log.exception("Error executing robot task")
             run.status = RunStatus.FAILED
             run.error_message = str(e)
+            run.change_seq = get_global_runs_state().next_change_seq()
             with db.transaction():
-                db.update(run, "status", "error_message")
+                db.update(run, "status", "error_message", "change_seq")
+                add_finished_run(db, run)
             get_global_runs_state().on_run_changed(
-                run, {"status": RunStatus.FAILED, "error_message": str(e)}
+                run,
+                {
+                    "status": RunStatus.FAILED,
+                    "error_message": str(e),
+                    "change_seq": run.change_seq,
+                },
             )
 
     background_tasks.add_task(_execute_robot)
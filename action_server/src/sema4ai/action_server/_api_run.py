@@ -15,20 +15,62 @@ log = logging.getLogger(__name__)
 run_api_router = APIRouter(prefix="/api/runs")
 
 
+# Header with the `before` to be used to get the next page of `/api/runs`
+# (only available if there may be more runs).
+NEXT_BEFORE_HEADER = "X-Next-Before"
+
+
 @run_api_router.get("", response_model=List[RunListItemModel])
 def list_runs(
+    response: fastapi.Response,
     run_type: Optional[str] = fastapi.Query(
         default=None, description="Filter by run type (e.g., 'action', 'robot')"
     ),
+    before: Optional[int] = fastapi.Query(
+        default=None,
+        description=(
+            "Only list runs with a numbered_id lower than this one (to get the "
+            f"next page use the value of the `{NEXT_BEFORE_HEADER}` header)"
+        ),
+    ),
+    limit: int = fastapi.Query(
+        default=200, ge=1, le=1000, description="Max number of runs to list"
+    ),
+    fields: Optional[List[str]] = fastapi.Query(
+        default=None,
+        description=(
+            "Fields to be provided for each run (i.e.: to skip large fields "
+            "such as `inputs` and `result`). If not given all fields are provided."
+        ),
+    ),
 ):
+    from fastapi.exceptions import HTTPException
+    from starlette import status
+    from starlette.responses import JSONResponse
+
     from ._runs_state_cache import get_global_runs_state
 
     global_runs_state = get_global_runs_state()
     with global_runs_state.semaphore:
-        runs = global_runs_state.get_current_run_state()
-        if run_type:
-            runs = [r for r in runs if getattr(r, "run_type", "action") == run_type]
-        return [RunListItemModel(**r.__dict__) for r in runs]
+        try:
+            runs = global_runs_state.list_runs(
+                before=before, limit=limit, run_type=run_type, fields=fields
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+            ) from e
+
+    headers = {}
+    if len(runs) == limit and runs and "numbered_id" in runs[-1]:
+        headers[NEXT_BEFORE_HEADER] = str(runs[-1]["numbered_id"])
+
+    if fields:
+        # Partial runs (not validated by the response model).
+        return JSONResponse(runs, headers=headers)
+
+    response.headers.update(headers)
+    return [RunListItemModel(**r) for r in runs]
 
 
 def get_run_by_id(run_id: str) -> Run:
@@ -13,6 +13,8 @@ from fastapi import HTTPException
 from fastapi.routing import APIRouter
 from pydantic import BaseModel, Field, field_validator
 
+from sema4ai.action_server._db_executor import run_in_db_executor
+
 log = logging.getLogger(__name__)
 
 schedules_api_router = APIRouter(prefix="/api/schedules")
@@ -444,6 +446,17 @@ async def list_schedules(
     schedule_type: Optional[str] = None,
 ):
     """List all schedules with optional filters."""
+    return await run_in_db_executor(
+        _list_schedules, enabled, action_id, group_id, schedule_type
+    )
+
+
+def _list_schedules(
+    enabled: Optional[bool] = None,
+    action_id: Optional[str] = None,
+    group_id: Optional[str] = None,
+    schedule_type: Optional[str] = None,
+):
     from sema4ai.action_server._models import Action, Schedule, ScheduleGroup, get_db
 
     db = get_db()
@@ -490,6 +503,10 @@ async def list_schedules(
 @schedules_api_router.get("/stats", response_model=ScheduleStatsResponse)
 async def get_schedule_stats():
     """Get schedule statistics for dashboard."""
+    return await run_in_db_executor(_get_schedule_stats)
+
+
+def _get_schedule_stats():
     from datetime import timedelta
 
     from sema4ai.action_server._database import datetime_to_str
@@ -582,10 +599,17 @@ async def get_schedule_stats():
 @schedules_api_router.post("", response_model=ScheduleResponse)
 async def create_schedule(request: ScheduleCreateRequest):
     """Create a new schedule."""
+    return await run_in_db_executor(_create_schedule, request)
+
+
+def _create_schedule(request: ScheduleCreateRequest):
     from sema4ai.action_server._database import datetime_to_str
     from sema4ai.action_server._gen_ids import gen_uuid
     from sema4ai.action_server._models import Action, Schedule, ScheduleGroup, get_db
-    from sema4ai.action_server._scheduler import get_scheduler
+    from sema4ai.action_server._scheduler import (
+        get_scheduler,
+        notify_schedule_changed,
+    )
 
     db = get_db()
     now = datetime.now(timezone.utc)
@@ -691,6 +715,9 @@ async def create_schedule(request: ScheduleCreateRequest):
         with db.transaction():
             db.insert(schedule)
 
+    if schedule.enabled:
+        notify_schedule_changed(schedule_id, schedule.next_run_at)
+
     log.info(f"Created schedule {schedule_id}: {request.name}")
 
     return _schedule_to_response(schedule, action_name, depends_on_name, group_name)
@@ -699,6 +726,10 @@ async def create_schedule(request: ScheduleCreateRequest):
 @schedules_api_router.get("/{schedule_id}", response_model=ScheduleResponse)
 async def get_schedule(schedule_id: str):
     """Get a specific schedule by ID."""
+    return await run_in_db_executor(_get_schedule, schedule_id)
+
+
+def _get_schedule(schedule_id: str):
     from sema4ai.action_server._models import Schedule, get_db
 
     db = get_db()
@@ -720,9 +751,16 @@ async def get_schedule(schedule_id: str):
 @schedules_api_router.patch("/{schedule_id}", response_model=ScheduleResponse)
 async def update_schedule(schedule_id: str, request: ScheduleUpdateRequest):
     """Update an existing schedule."""
+    return await run_in_db_executor(_update_schedule, schedule_id, request)
+
+
+def _update_schedule(schedule_id: str, request: ScheduleUpdateRequest):
     from sema4ai.action_server._database import datetime_to_str
     from sema4ai.action_server._models import Action, Schedule, ScheduleGroup, get_db
-    from sema4ai.action_server._scheduler import get_scheduler
+    from sema4ai.action_server._scheduler import (
+        get_scheduler,
+        notify_schedule_changed,
+    )
 
     db = get_db()
     now = datetime.now(timezone.utc)
@@ -877,6 +915,10 @@ async def update_schedule(schedule_id: str, request: ScheduleUpdateRequest):
 
         action_name, depends_on_name, group_name = _get_related_names(db, schedule)
 
+    notify_schedule_changed(
+        schedule_id, schedule.next_run_at if schedule.enabled else None
+    )
+
     log.info(f"Updated schedule {schedule_id}")
 
     return _schedule_to_response(schedule, action_name, depends_on_name, group_name)
@@ -885,7 +927,16 @@ async def update_schedule(schedule_id: str, request: ScheduleUpdateRequest):
 @schedules_api_router.delete("/{schedule_id}")
 async def delete_schedule(schedule_id: str):
     """Delete a schedule."""
+    return await run_in_db_executor(_delete_schedule, schedule_id)
+
+
+def _delete_schedule(schedule_id: str):
     from sema4ai.action_server._models import Schedule, ScheduleExecution, get_db
+    from sema4ai.action_server._rate_limiter import get_rate_limiter
+    from sema4ai.action_server._scheduler import (
+        get_schedule_rate_limit_key,
+        notify_schedule_changed,
+    )
 
     db = get_db()
     with db.connect():
@@ -903,6 +954,9 @@ async def delete_schedule(schedule_id: str):
             )
             db.execute("DELETE FROM schedule WHERE id = ?", [schedule_id])
 
+    notify_schedule_changed(schedule_id, None)
+    get_rate_limiter().remove(get_schedule_rate_limit_key(schedule_id))
+
     log.info(f"Deleted schedule {schedule_id}")
 
     return {"status": "deleted", "id": schedule_id}
@@ -924,15 +978,18 @@ async def trigger_schedule(schedule_id: str):
     db = get_db()
     now = datetime.now(timezone.utc)
 
-    with db.connect():
-        try:
-            schedule = db.first(
-                Schedule, "SELECT * FROM schedule WHERE id = ?", [schedule_id]
-            )
-        except KeyError:
-            raise HTTPException(
-                status_code=404, detail=f"Schedule not found: {schedule_id}"
-            )
+    def get_schedule() -> Schedule:
+        with db.connect():
+            try:
+                return db.first(
+                    Schedule, "SELECT * FROM schedule WHERE id = ?", [schedule_id]
+                )
+            except KeyError:
+                raise HTTPException(
+                    status_code=404, detail=f"Schedule not found: {schedule_id}"
+                )
+
+    schedule = await run_in_db_executor(get_schedule)
 
     scheduler = get_scheduler()
     if scheduler is None:
@@ -943,12 +1000,15 @@ async def trigger_schedule(schedule_id: str):
     await scheduler._execute_schedule(schedule, execution_id, now)
 
     # Get the execution record
-    with db.connect():
-        execution = db.first(
-            ScheduleExecution,
-            "SELECT * FROM schedule_execution WHERE id = ?",
-            [execution_id],
-        )
+    def get_execution() -> ScheduleExecution:
+        with db.connect():
+            return db.first(
+                ScheduleExecution,
+                "SELECT * FROM schedule_execution WHERE id = ?",
+                [execution_id],
+            )
+
+    execution = await run_in_db_executor(get_execution)
 
     return ExecutionResponse(
         id=execution.id,
@@ -973,9 +1033,16 @@ async def trigger_schedule(schedule_id: str):
 @schedules_api_router.post("/{schedule_id}/enable")
 async def enable_schedule(schedule_id: str):
     """Enable a schedule."""
+    return await run_in_db_executor(_enable_schedule, schedule_id)
+
+
+def _enable_schedule(schedule_id: str):
     from sema4ai.action_server._database import datetime_to_str
     from sema4ai.action_server._models import Schedule, get_db
-    from sema4ai.action_server._scheduler import get_scheduler
+    from sema4ai.action_server._scheduler import (
+        get_scheduler,
+        notify_schedule_changed,
+    )
 
     db = get_db()
     now = datetime.now(timezone.utc)
@@ -1004,14 +1071,23 @@ async def enable_schedule(schedule_id: str):
         with db.transaction():
             db.update_by_id(Schedule, schedule_id, updates)
 
+    notify_schedule_changed(
+        schedule_id, updates.get("next_run_at", schedule.next_run_at)
+    )
+
     return {"status": "enabled", "id": schedule_id}
 
 
 @schedules_api_router.post("/{schedule_id}/disable")
 async def disable_schedule(schedule_id: str):
     """Disable a schedule."""
+    return await run_in_db_executor(_disable_schedule, schedule_id)
+
+
+def _disable_schedule(schedule_id: str):
     from sema4ai.action_server._database import datetime_to_str
     from sema4ai.action_server._models import Schedule, get_db
+    from sema4ai.action_server._scheduler import notify_schedule_changed
 
     db = get_db()
     now = datetime.now(timezone.utc)
@@ -1035,12 +1111,18 @@ async def disable_schedule(schedule_id: str):
                 },
             )
 
+    notify_schedule_changed(schedule_id, None)
+
     return {"status": "disabled", "id": schedule_id}
 
 
 @schedules_api_router.post("/{schedule_id}/duplicate", response_model=ScheduleResponse)
 async def duplicate_schedule(schedule_id: str, new_name: Optional[str] = None):
     """Duplicate/clone a schedule."""
+    return await run_in_db_executor(_duplicate_schedule, schedule_id, new_name)
+
+
+def _duplicate_schedule(schedule_id: str, new_name: Optional[str] = None):
     from sema4ai.action_server._database import datetime_to_str
     from sema4ai.action_server._gen_ids import gen_uuid
     from sema4ai.action_server._models import Schedule, get_db
@@ -1117,6 +1199,10 @@ async def duplicate_schedule(schedule_id: str, new_name: Optional[str] = None):
 )
 async def list_executions(schedule_id: str, limit: int = 50, offset: int = 0):
     """Get execution history for a schedule."""
+    return await run_in_db_executor(_list_executions, schedule_id, limit, offset)
+
+
+def _list_executions(schedule_id: str, limit: int = 50, offset: int = 0):
     from sema4ai.action_server._models import Schedule, ScheduleExecution, get_db
 
     db = get_db()
@@ -1171,11 +1257,11 @@ async def list_executions(schedule_id: str, limit: int = 50, offset: int = 0):
 @schedules_api_router.post("/validate-cron", response_model=CronValidateResponse)
 async def validate_cron(request: CronValidateRequest):
     """Validate a cron expression and show next runs."""
-    try:
-        from croniter import croniter
+    from sema4ai.action_server._scheduler import _get_compiled_cron
 
-        # Validate expression
-        croniter(request.cron_expression)
+    try:
+        # Validate expression (the parsed expression is cached)
+        _get_compiled_cron(request.cron_expression, "UTC")
     except ImportError:
         return CronValidateResponse(
             valid=True,
@@ -1203,27 +1289,17 @@ async def validate_cron(request: CronValidateRequest):
         pass
 
     # Get next runs
-    from sema4ai.action_server._scheduler import SchedulerEngine
-
-    scheduler = SchedulerEngine()
-    next_runs = []
+    import itertools
 
-    try:
-        import pytz
-
-        tz = pytz.timezone(request.timezone)
-    except ImportError:
-        from zoneinfo import ZoneInfo
-
-        tz = ZoneInfo(request.timezone)
+    from sema4ai.action_server._scheduler import _iter_cron_next
 
     base = datetime.now(timezone.utc)
-    for _ in range(10):
-        next_run = scheduler._compute_cron_next(
-            request.cron_expression, request.timezone, base
+    next_runs = [
+        next_run.isoformat()
+        for next_run in itertools.islice(
+            _iter_cron_next(request.cron_expression, request.timezone, base), 10
         )
-        next_runs.append(next_run.isoformat())
-        base = next_run
+    ]
 
     return CronValidateResponse(
         valid=True,
@@ -1259,17 +1335,11 @@ async def preview_runs(request: PreviewRunsRequest):
     )
 
     scheduler = SchedulerEngine()
-    next_runs = []
-    base = datetime.now(timezone.utc)
-
-    for _ in range(request.count):
-        next_run = scheduler.compute_next_run(schedule, base)
-        if next_run is None:
-            break
-        next_runs.append(next_run.isoformat())
-        base = next_run
+    next_runs = scheduler.compute_next_runs(
+        schedule, datetime.now(timezone.utc), request.count
+    )
 
-    return PreviewRunsResponse(next_runs=next_runs)
+    return PreviewRunsResponse(next_runs=[next_run.isoformat() for next_run in next_runs])
 
 
 @schedules_api_router.get("/timezones")
@@ -1298,6 +1368,10 @@ async def list_timezones():
 @schedule_groups_api_router.get("", response_model=GroupListResponse)
 async def list_groups():
     """List all schedule groups."""
+    return await run_in_db_executor(_list_groups)
+
+
+def _list_groups():
     from sema4ai.action_server._models import Schedule, ScheduleGroup, get_db
 
     db = get_db()
@@ -1333,6 +1407,10 @@ async def list_groups():
 @schedule_groups_api_router.post("", response_model=GroupResponse)
 async def create_group(request: GroupCreateRequest):
     """Create a new schedule group."""
+    return await run_in_db_executor(_create_group, request)
+
+
+def _create_group(request: GroupCreateRequest):
     from sema4ai.action_server._database import datetime_to_str
     from sema4ai.action_server._gen_ids import gen_uuid
     from sema4ai.action_server._models import ScheduleGroup, get_db
@@ -1384,6 +1462,10 @@ async def create_group(request: GroupCreateRequest):
 @schedule_groups_api_router.patch("/{group_id}", response_model=GroupResponse)
 async def update_group(group_id: str, request: GroupUpdateRequest):
     """Update a schedule group."""
+    return await run_in_db_executor(_update_group, group_id, request)
+
+
+def _update_group(group_id: str, request: GroupUpdateRequest):
     from sema4ai.action_server._models import ScheduleGroup, get_db
 
     db = get_db()
@@ -1456,6 +1538,10 @@ async def update_group(group_id: str, request: GroupUpdateRequest):
 @schedule_groups_api_router.delete("/{group_id}")
 async def delete_group(group_id: str):
     """Delete a schedule group."""
+    return await run_in_db_executor(_delete_group, group_id)
+
+
+def _delete_group(group_id: str):
     from sema4ai.action_server._models import Schedule, ScheduleGroup, get_db
 
     db = get_db()
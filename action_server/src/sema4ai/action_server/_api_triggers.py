@@ -9,10 +9,12 @@ import logging
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
-from fastapi import HTTPException, Request
+from fastapi import HTTPException, Request, Response
 from fastapi.routing import APIRouter
 from pydantic import BaseModel, Field
 
+from sema4ai.action_server._db_executor import run_in_db_executor
+
 log = logging.getLogger(__name__)
 
 triggers_api_router = APIRouter(prefix="/api/triggers")
@@ -49,6 +51,10 @@ class TriggerCreateRequest(BaseModel):
     rate_limit_enabled: bool = False
     rate_limit_max_per_minute: int = Field(default=60, ge=1)
 
+    # Webhook ingestion
+    async_ack: bool = False  # Respond 202 right away and execute afterwards.
+    delivery_id_header: Optional[str] = None  # Header used for deduplication.
+
 
 class TriggerUpdateRequest(BaseModel):
     """Request to update a trigger."""
@@ -73,6 +79,10 @@ class TriggerUpdateRequest(BaseModel):
     rate_limit_enabled: Optional[bool] = None
     rate_limit_max_per_minute: Optional[int] = Field(default=None, ge=1)
 
+    # Webhook ingestion
+    async_ack: Optional[bool] = None
+    delivery_id_header: Optional[str] = None
+
 
 class TriggerResponse(BaseModel):
     """Response with trigger details."""
@@ -107,6 +117,10 @@ class TriggerResponse(BaseModel):
     rate_limit_enabled: bool
     rate_limit_max_per_minute: int
 
+    # Webhook ingestion
+    async_ack: bool = False
+    delivery_id_header: Optional[str] = None
+
 
 class TriggerListResponse(BaseModel):
     """Response with list of triggers."""
@@ -132,7 +146,8 @@ class InvocationResponse(BaseModel):
 class WebhookInvokeResponse(BaseModel):
     """Response for webhook invocation."""
 
-    status: str  # 'accepted', 'rejected', 'rate_limited', 'error'
+    # 'accepted', 'queued', 'duplicate', 'rejected', 'rate_limited', 'error'
+    status: str
     invocation_id: Optional[str] = None
     run_id: Optional[str] = None
     work_item_id: Optional[str] = None
@@ -191,6 +206,8 @@ def _trigger_to_response(
         trigger_count=trigger.trigger_count,
         rate_limit_enabled=trigger.rate_limit_enabled,
         rate_limit_max_per_minute=trigger.rate_limit_max_per_minute,
+        async_ack=trigger.async_ack,
+        delivery_id_header=trigger.delivery_id_header,
     )
 
 
@@ -206,6 +223,14 @@ async def list_triggers(
     action_id: Optional[str] = None,
 ):
     """List all triggers with optional filters."""
+    return await run_in_db_executor(_list_triggers, enabled, trigger_type, action_id)
+
+
+def _list_triggers(
+    enabled: Optional[bool] = None,
+    trigger_type: Optional[str] = None,
+    action_id: Optional[str] = None,
+):
     from sema4ai.action_server._models import Action, Trigger, get_db
 
     db = get_db()
@@ -257,6 +282,10 @@ async def list_triggers(
 @triggers_api_router.post("", response_model=TriggerResponse)
 async def create_trigger(request: TriggerCreateRequest):
     """Create a new trigger."""
+    return await run_in_db_executor(_create_trigger, request)
+
+
+def _create_trigger(request: TriggerCreateRequest):
     from sema4ai.action_server._database import datetime_to_str
     from sema4ai.action_server._gen_ids import gen_uuid
     from sema4ai.action_server._models import Action, Trigger, get_db
@@ -305,11 +334,15 @@ async def create_trigger(request: TriggerCreateRequest):
             updated_at=datetime_to_str(now),
             rate_limit_enabled=request.rate_limit_enabled,
             rate_limit_max_per_minute=request.rate_limit_max_per_minute,
+            async_ack=request.async_ack,
+            delivery_id_header=request.delivery_id_header or None,
         )
 
         with db.transaction():
             db.insert(trigger)
 
+    # Compile the template upfront (so that invocations just render it).
+    get_trigger_engine().get_compiled_template(trigger)
     log.info(f"Created trigger {trigger_id}: {request.name}")
 
     return _trigger_to_response(trigger, action_name)
@@ -318,6 +351,10 @@ async def create_trigger(request: TriggerCreateRequest):
 @triggers_api_router.get("/{trigger_id}", response_model=TriggerResponse)
 async def get_trigger(trigger_id: str):
     """Get a specific trigger by ID."""
+    return await run_in_db_executor(_get_trigger, trigger_id)
+
+
+def _get_trigger(trigger_id: str):
     from sema4ai.action_server._models import Action, Trigger, get_db
 
     db = get_db()
@@ -349,8 +386,13 @@ async def get_trigger(trigger_id: str):
 @triggers_api_router.patch("/{trigger_id}", response_model=TriggerResponse)
 async def update_trigger(trigger_id: str, request: TriggerUpdateRequest):
     """Update an existing trigger."""
+    return await run_in_db_executor(_update_trigger, trigger_id, request)
+
+
+def _update_trigger(trigger_id: str, request: TriggerUpdateRequest):
     from sema4ai.action_server._database import datetime_to_str
     from sema4ai.action_server._models import Action, Trigger, get_db
+    from sema4ai.action_server._triggers import get_trigger_engine
 
     db = get_db()
     now = datetime.now(timezone.utc)
@@ -401,6 +443,10 @@ async def update_trigger(trigger_id: str, request: TriggerUpdateRequest):
             updates["rate_limit_enabled"] = request.rate_limit_enabled
         if request.rate_limit_max_per_minute is not None:
             updates["rate_limit_max_per_minute"] = request.rate_limit_max_per_minute
+        if request.async_ack is not None:
+            updates["async_ack"] = request.async_ack
+        if request.delivery_id_header is not None:
+            updates["delivery_id_header"] = request.delivery_id_header or None
 
         with db.transaction():
             db.update_by_id(Trigger, trigger_id, updates)
@@ -422,6 +468,9 @@ async def update_trigger(trigger_id: str, request: TriggerUpdateRequest):
             except KeyError:
                 pass
 
+    engine = get_trigger_engine()
+    engine.invalidate_template(trigger_id)
+    engine.get_compiled_template(trigger)
     log.info(f"Updated trigger {trigger_id}")
 
     return _trigger_to_response(trigger, action_name)
@@ -430,7 +479,16 @@ async def update_trigger(trigger_id: str, request: TriggerUpdateRequest):
 @triggers_api_router.delete("/{trigger_id}")
 async def delete_trigger(trigger_id: str):
     """Delete a trigger."""
+    return await run_in_db_executor(_delete_trigger, trigger_id)
+
+
+def _delete_trigger(trigger_id: str):
     from sema4ai.action_server._models import Trigger, TriggerInvocation, get_db
+    from sema4ai.action_server._rate_limiter import get_rate_limiter
+    from sema4ai.action_server._triggers import (
+        get_trigger_engine,
+        get_trigger_rate_limit_key,
+    )
 
     db = get_db()
     with db.connect():
@@ -448,6 +506,8 @@ async def delete_trigger(trigger_id: str):
             )
             db.execute("DELETE FROM trigger WHERE id = ?", [trigger_id])
 
+    get_rate_limiter().remove(get_trigger_rate_limit_key(trigger_id))
+    get_trigger_engine().invalidate_template(trigger_id)
     log.info(f"Deleted trigger {trigger_id}")
 
     return {"status": "deleted", "id": trigger_id}
@@ -458,6 +518,10 @@ async def delete_trigger(trigger_id: str):
 )
 async def list_invocations(trigger_id: str, limit: int = 50, offset: int = 0):
     """Get invocation history for a trigger."""
+    return await run_in_db_executor(_list_invocations, trigger_id, limit, offset)
+
+
+def _list_invocations(trigger_id: str, limit: int = 50, offset: int = 0):
     from sema4ai.action_server._models import Trigger, TriggerInvocation, get_db
 
     db = get_db()
@@ -500,6 +564,10 @@ async def list_invocations(trigger_id: str, limit: int = 50, offset: int = 0):
 @triggers_api_router.get("/{trigger_id}/secret", response_model=SecretResponse)
 async def get_trigger_secret(trigger_id: str):
     """Get the webhook secret for a trigger."""
+    return await run_in_db_executor(_get_trigger_secret, trigger_id)
+
+
+def _get_trigger_secret(trigger_id: str):
     from sema4ai.action_server._models import Trigger, get_db
 
     db = get_db()
@@ -524,6 +592,10 @@ async def get_trigger_secret(trigger_id: str):
 @triggers_api_router.post("/{trigger_id}/regenerate-secret", response_model=SecretResponse)
 async def regenerate_trigger_secret(trigger_id: str):
     """Regenerate the webhook secret for a trigger."""
+    return await run_in_db_executor(_regenerate_trigger_secret, trigger_id)
+
+
+def _regenerate_trigger_secret(trigger_id: str):
     from sema4ai.action_server._database import datetime_to_str
     from sema4ai.action_server._models import Trigger, get_db
     from sema4ai.action_server._triggers import get_trigger_engine
@@ -564,11 +636,19 @@ async def regenerate_trigger_secret(trigger_id: str):
 
 @triggers_api_router.post("/webhook/{trigger_id}", response_model=WebhookInvokeResponse)
 @triggers_api_router.put("/webhook/{trigger_id}", response_model=WebhookInvokeResponse)
-async def invoke_webhook(trigger_id: str, request: Request):
+async def invoke_webhook(trigger_id: str, request: Request, response: Response):
     """
     Public webhook endpoint for triggering actions.
 
     This endpoint is called by external systems to invoke a trigger.
+
+    If the trigger has `async_ack` set, the webhook is stored in the inbox and
+    a 202 is returned right away (redeliveries -- with the same delivery id
+    header -- get a 200 with a "duplicate" status).
+
+    If the trigger is rate limited, the remaining quota is provided in the
+    `X-RateLimit-Limit`, `X-RateLimit-Remaining` and `X-RateLimit-Reset`
+    (seconds until the current window ends) headers.
     """
     from sema4ai.action_server._triggers import get_trigger_engine
 
@@ -605,17 +685,31 @@ async def invoke_webhook(trigger_id: str, request: Request):
     # Map status to HTTP response
     status = result.get("status", "error")
 
+    rate_limit_headers: Dict[str, str] = {}
+    rate_limit = result.get("rate_limit")
+    if rate_limit is not None:
+        rate_limit_headers = rate_limit.to_headers()
+        response.headers.update(rate_limit_headers)
+
     if status == "rejected":
         raise HTTPException(status_code=401, detail=result.get("message", "Rejected"))
     elif status == "rate_limited":
         raise HTTPException(
-            status_code=429, detail=result.get("message", "Rate limited")
+            status_code=429,
+            detail=result.get("message", "Rate limited"),
+            headers={
+                **rate_limit_headers,
+                "Retry-After": rate_limit_headers.get("X-RateLimit-Reset", "60"),
+            },
         )
     elif status == "error":
         raise HTTPException(
             status_code=500, detail=result.get("message", "Internal error")
         )
 
+    if status == "queued":
+        response.status_code = 202
+
     return WebhookInvokeResponse(
         status=status,
         invocation_id=result.get("invocation_id"),
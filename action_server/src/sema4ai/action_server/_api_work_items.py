@@ -6,6 +6,7 @@ by producer-consumer automation workflows.
 """
 
 import logging
+import threading
 from typing import Any, Dict, List, Optional
 
 import fastapi
@@ -13,6 +14,7 @@ from fastapi import File, UploadFile
 from fastapi.routing import APIRouter
 from pydantic import BaseModel
 
+from sema4ai.action_server._db_executor import run_in_db_executor
 from sema4ai.action_server._settings import get_settings
 
 log = logging.getLogger(__name__)
@@ -49,7 +51,10 @@ class WorkItemListResponse(BaseModel):
     """Response with list of work items."""
 
     items: List[WorkItemResponse]
+    # Total number of items in the queue (with the given state, if any).
     total: int
+    # Cursor to get the next page (None if this is the last page).
+    next_cursor: Optional[str] = None
 
 
 class QueueStatsResponse(BaseModel):
@@ -63,8 +68,32 @@ class QueueStatsResponse(BaseModel):
     total: int
 
 
+class BulkItemResult(BaseModel):
+    """Result of one of the items of a bulk creation."""
+
+    index: int
+    id: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BulkCreateResponse(BaseModel):
+    """Response of a bulk creation of work items."""
+
+    queue_name: str
+    created: int
+    failed: int
+    results: List[BulkItemResult]
+
+
 # Lazy initialization of adapter
 _adapter = None
+_adapter_lock = threading.Lock()
+
+# Number of items written to the database at once in a bulk creation.
+_BULK_CHUNK_SIZE = 1000
+
+# Maximum size (in chars) of a single item in a bulk creation.
+_BULK_MAX_ITEM_SIZE = 16 * 1024 * 1024
 
 
 def _get_adapter():
@@ -83,18 +112,53 @@ def _get_adapter():
         log.warning("actions-work-items package not installed, work items API disabled")
         return None
 
-    settings = get_settings()
-    db_path = settings.datadir / "workitems.db"
-    files_dir = settings.datadir / "work_item_files"
+    # May be called from multiple threads of the db executor.
+    with _adapter_lock:
+        if _adapter is not None:
+            return _adapter
 
-    _adapter = SQLiteAdapter(
-        db_path=str(db_path),
-        queue_name="default",
-        files_dir=str(files_dir),
-    )
+        settings = get_settings()
+        db_path = settings.datadir / "workitems.db"
+        files_dir = settings.datadir / "work_item_files"
+
+        _adapter = SQLiteAdapter(
+            db_path=str(db_path),
+            queue_name="default",
+            files_dir=str(files_dir),
+            lease_seconds=settings.work_items_lease_seconds,
+        )
     return _adapter
 
 
+async def sweep_expired_leases(interval: float, max_attempts: int) -> None:
+    """
+    Periodically returns the work items whose lease expired to their queue
+    (i.e.: items reserved by a process which was killed or which stopped
+    renewing its lease), moving them to the dead-letter queue after
+    `max_attempts`.
+
+    Note: nothing is done while the work items database doesn't exist (so
+    that it's not created on servers which don't use work items).
+
+    Runs until cancelled.
+    """
+    import asyncio
+
+    while True:
+        await asyncio.sleep(interval)
+        if _adapter is None and not (get_settings().datadir / "workitems.db").exists():
+            continue
+
+        adapter = _get_adapter()
+        if adapter is None:
+            log.info("Work items not available: stopping the lease sweeper.")
+            return
+        try:
+            await run_in_db_executor(adapter.requeue_expired, max_attempts)
+        except Exception:
+            log.exception("Error requeueing work items with expired leases.")
+
+
 def _check_adapter():
     """Get adapter or raise 503 if not available."""
     adapter = _get_adapter()
@@ -113,6 +177,10 @@ async def create_work_item(request: WorkItemCreate):
 
     This is typically used by producer tasks to create work for consumers.
     """
+    return await run_in_db_executor(_create_work_item, request)
+
+
+def _create_work_item(request: WorkItemCreate):
     adapter = _check_adapter()
 
     item_id = adapter.seed_input(
@@ -121,6 +189,250 @@ async def create_work_item(request: WorkItemCreate):
     )
 
     item = adapter.get_item(item_id)
+    return _item_to_response(item)
+
+
+class _BulkItemsParser:
+    """
+    Incrementally parses the items of a bulk creation request (either a JSON
+    array or NDJSON -- one item per line) as the request body is received.
+
+    Each item is the payload (a JSON object or null) of a work item.
+    """
+
+    def __init__(self, ndjson: bool):
+        import codecs
+        import json
+
+        self._ndjson = ndjson
+        self._decoder = json.JSONDecoder()
+        self._utf8_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._index = 0
+
+        # JSON array state.
+        self._started = False
+        self._finished = False
+        self._expect_separator = False
+        self._failed = False
+
+    def feed(self, data: bytes) -> List[tuple]:
+        """
+        Returns:
+            A list with (index, payload, error) for each item fully received.
+        """
+        self._buffer += self._utf8_decoder.decode(data)
+        return self._parse(final=False)
+
+    def close(self) -> List[tuple]:
+        self._buffer += self._utf8_decoder.decode(b"", final=True)
+        items = self._parse(final=True)
+        if not self._ndjson and not self._failed:
+            if not self._started:
+                raise ValueError("Expected a JSON array or NDJSON content.")
+            if not self._finished:
+                items.append(self._error("Unexpected end of JSON array."))
+        return items
+
+    @property
+    def items_received(self) -> int:
+        return self._index
+
+    def _next_index(self) -> int:
+        index = self._index
+        self._index += 1
+        return index
+
+    def _error(self, msg: str) -> tuple:
+        return (self._next_index(), None, msg)
+
+    def _item(self, payload: Any) -> tuple:
+        if payload is not None and not isinstance(payload, dict):
+            return self._error("Expected a JSON object (or null) as the payload.")
+        return (self._next_index(), payload, None)
+
+    def _parse(self, final: bool) -> List[tuple]:
+        if self._ndjson:
+            return self._parse_ndjson(final)
+        return self._parse_json_array(final)
+
+    def _parse_ndjson(self, final: bool) -> List[tuple]:
+        import json
+
+        lines = self._buffer.split("\n")
+        # The last line may still be incomplete.
+        self._buffer = "" if final else lines.pop()
+
+        items = []
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                payload = json.loads(line)
+            except ValueError as e:
+                items.append(self._error(f"Invalid JSON: {e}"))
+            else:
+                items.append(self._item(payload))
+
+        if len(self._buffer) > _BULK_MAX_ITEM_SIZE:
+            raise ValueError("Item too large in bulk request.")
+        return items
+
+    def _parse_json_array(self, final: bool) -> List[tuple]:
+        import json
+
+        items: List[tuple] = []
+        buf = self._buffer
+        pos = 0
+        while not self._failed:
+            while pos < len(buf) and buf[pos].isspace():
+                pos += 1
+            if pos == len(buf):
+                break
+
+            c = buf[pos]
+            if not self._started:
+                if c != "[":
+                    raise ValueError("Expected a JSON array or NDJSON content.")
+                self._started = True
+                pos += 1
+            elif self._finished:
+                items.append(self._error("Unexpected content after JSON array."))
+                self._failed = True
+            elif c == "]":
+                self._finished = True
+                pos += 1
+            elif self._expect_separator:
+                if c != ",":
+                    items.append(self._error(f"Expected ',' or ']' (found: {c!r})."))
+                    self._failed = True
+                else:
+                    self._expect_separator = False
+                    pos += 1
+            else:
+                try:
+                    payload, end = self._decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError as e:
+                    if final:
+                        items.append(self._error(f"Invalid JSON: {e}"))
+                        self._failed = True
+                    # Otherwise the item may still be incomplete.
+                    break
+
+                if end == len(buf) and not final and isinstance(payload, (int, float)):
+                    # A number may still be incomplete (more digits may follow).
+                    break
+                items.append(self._item(payload))
+                self._expect_separator = True
+                pos = end
+
+        self._buffer = "" if self._failed else buf[pos:]
+        if len(self._buffer) > _BULK_MAX_ITEM_SIZE:
+            raise ValueError("Item too large in bulk request.")
+        return items
+
+
+@work_items_api_router.post("/bulk", response_model=BulkCreateResponse)
+async def create_work_items_bulk(
+    request: fastapi.Request,
+    queue_name: Optional[str] = None,
+):
+    """
+    Seed multiple input work items into a queue.
+
+    The body may be a JSON array or NDJSON (`Content-Type: application/x-ndjson`)
+    where each item is the payload of a work item. The body is processed as it's
+    received and the items are written in chunks (each chunk in a single
+    transaction).
+
+    Returns the id (or the error) for each item (by its index in the request).
+    """
+    adapter = await run_in_db_executor(_check_adapter)
+
+    content_type = request.headers.get("content-type", "")
+    parser = _BulkItemsParser(ndjson="ndjson" in content_type)
+
+    results: List[BulkItemResult] = []
+    chunk_indexes: List[int] = []
+    chunk_payloads: List[Any] = []
+
+    def on_items(items: List[tuple]) -> None:
+        for index, payload, error in items:
+            if error is not None:
+                results.append(BulkItemResult(index=index, error=error))
+            else:
+                chunk_indexes.append(index)
+                chunk_payloads.append(payload)
+
+    async def write_chunk() -> None:
+        if not chunk_payloads:
+            return
+        item_ids = await run_in_db_executor(
+            adapter.seed_inputs, list(chunk_payloads), queue_name
+        )
+        results.extend(
+            BulkItemResult(index=index, id=item_id)
+            for index, item_id in zip(chunk_indexes, item_ids)
+        )
+        chunk_indexes.clear()
+        chunk_payloads.clear()
+
+    try:
+        async for data in request.stream():
+            on_items(parser.feed(data))
+            if len(chunk_payloads) >= _BULK_CHUNK_SIZE:
+                await write_chunk()
+        on_items(parser.close())
+    except ValueError as e:
+        if not results and not chunk_payloads:
+            raise fastapi.HTTPException(status_code=400, detail=str(e))
+        # Some items were already received: write those and report the error.
+        results.append(BulkItemResult(index=parser.items_received, error=str(e)))
+
+    await write_chunk()
+
+    results.sort(key=lambda result: result.index)
+    created = sum(1 for result in results if result.id is not None)
+    return BulkCreateResponse(
+        queue_name=queue_name or "default",
+        created=created,
+        failed=len(results) - created,
+        results=results,
+    )
+
+
+def _encode_cursor(item: Dict[str, Any]) -> str:
+    import base64
+    import json
+
+    data = json.dumps([item["created_at"], item["id"]]).encode("utf-8")
+    return base64.urlsafe_b64encode(data).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> tuple:
+    import base64
+    import json
+
+    try:
+        created_at, item_id = json.loads(base64.urlsafe_b64decode(cursor))
+        return (str(created_at), str(item_id))
+    except Exception:
+        raise fastapi.HTTPException(status_code=400, detail=f"Invalid cursor: {cursor}")
+
+
+def _parse_state(state: Optional[str]):
+    if not state:
+        return None
+    try:
+        from actions.work_items import State
+
+        return State(state.upper())
+    except (ValueError, ImportError):
+        raise fastapi.HTTPException(status_code=400, detail=f"Invalid state: {state}")
+
+
+def _item_to_response(item: Dict[str, Any]) -> WorkItemResponse:
     return WorkItemResponse(
         id=item["id"],
         queue_name=item["queue_name"],
@@ -140,60 +452,82 @@ async def list_work_items(
     queue_name: Optional[str] = None,
     state: Optional[str] = None,
     limit: int = 100,
+    cursor: Optional[str] = None,
 ):
     """
-    List work items in a queue.
+    List work items in a queue (newest first).
 
     Args:
         queue_name: Queue to list (default: default)
         state: Filter by state (PENDING, IN_PROGRESS, DONE, FAILED)
         limit: Maximum items to return
+        cursor: The `next_cursor` of the previous page (to get the next page)
     """
-    adapter = _check_adapter()
+    return await run_in_db_executor(_list_work_items, queue_name, state, limit, cursor)
 
-    # Convert state string to enum if provided
-    state_enum = None
-    if state:
-        try:
-            from actions.work_items import State
 
-            state_enum = State(state.upper())
-        except (ValueError, ImportError):
-            raise fastapi.HTTPException(
-                status_code=400, detail=f"Invalid state: {state}"
-            )
+def _list_work_items(
+    queue_name: Optional[str] = None,
+    state: Optional[str] = None,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+):
+    adapter = _check_adapter()
+
+    state_enum = _parse_state(state)
+    before = _decode_cursor(cursor) if cursor else None
 
     items = adapter.list_items(
         queue_name=queue_name,
         state=state_enum,
         limit=limit,
+        before=before,
     )
 
-    response_items = [
-        WorkItemResponse(
-            id=item["id"],
-            queue_name=item["queue_name"],
-            state=item["state"],
-            payload=item.get("payload"),
-            parent_id=item.get("parent_id"),
-            error_code=item.get("error_code"),
-            error_message=item.get("error_message"),
-            files=item.get("files", []),
-            created_at=item["created_at"],
-            updated_at=item["updated_at"],
-        )
-        for item in items
-    ]
+    stats = adapter.get_queue_stats(queue_name=queue_name or "default")
+    total = stats[state_enum.value.lower()] if state_enum else stats["total"]
 
     return WorkItemListResponse(
-        items=response_items,
-        total=len(response_items),
+        items=[_item_to_response(item) for item in items],
+        total=total,
+        next_cursor=_encode_cursor(items[-1]) if len(items) == limit else None,
     )
 
 
+@work_items_api_router.get("/export")
+async def export_work_items(
+    queue_name: Optional[str] = None,
+    state: Optional[str] = None,
+):
+    """
+    Export all the work items in a queue (oldest first) as NDJSON.
+
+    The items are streamed as they're read from the database (in batches),
+    so, this may be used for queues of any size.
+    """
+    import json
+
+    from starlette.responses import StreamingResponse
+
+    adapter = await run_in_db_executor(_check_adapter)
+    state_enum = _parse_state(state)
+
+    # Note: a sync iterator is iterated by starlette in a thread (so, reading
+    # the items doesn't block the event loop).
+    def iter_lines():
+        for item in adapter.iter_items(queue_name=queue_name, state=state_enum):
+            yield json.dumps(item) + "\n"
+
+    return StreamingResponse(iter_lines(), media_type="application/x-ndjson")
+
+
 @work_items_api_router.get("/stats", response_model=QueueStatsResponse)
 async def get_queue_stats(queue_name: Optional[str] = None):
     """Get statistics for a queue."""
+    return await run_in_db_executor(_get_queue_stats, queue_name)
+
+
+def _get_queue_stats(queue_name: Optional[str] = None):
     adapter = _check_adapter()
 
     queue = queue_name or "default"
@@ -208,6 +542,10 @@ async def get_queue_stats(queue_name: Optional[str] = None):
 @work_items_api_router.get("/{item_id}", response_model=WorkItemResponse)
 async def get_work_item(item_id: str):
     """Get details of a specific work item."""
+    return await run_in_db_executor(_get_work_item, item_id)
+
+
+def _get_work_item(item_id: str):
     adapter = _check_adapter()
 
     try:
@@ -217,23 +555,16 @@ async def get_work_item(item_id: str):
             status_code=404, detail=f"Work item not found: {item_id}"
         )
 
-    return WorkItemResponse(
-        id=item["id"],
-        queue_name=item["queue_name"],
-        state=item["state"],
-        payload=item.get("payload"),
-        parent_id=item.get("parent_id"),
-        error_code=item.get("error_code"),
-        error_message=item.get("error_message"),
-        files=item.get("files", []),
-        created_at=item["created_at"],
-        updated_at=item["updated_at"],
-    )
+    return _item_to_response(item)
 
 
 @work_items_api_router.delete("/{item_id}")
 async def delete_work_item(item_id: str):
     """Delete a work item and its files."""
+    return await run_in_db_executor(_delete_work_item, item_id)
+
+
+def _delete_work_item(item_id: str):
     adapter = _check_adapter()
 
     try:
@@ -254,17 +585,18 @@ async def upload_file(
     """
     Upload a file attachment to a work item.
     """
-    adapter = _check_adapter()
+    adapter = await run_in_db_executor(_check_adapter)
 
     try:
-        adapter.get_item(item_id)
+        await run_in_db_executor(adapter.get_item, item_id)
     except ValueError:
         raise fastapi.HTTPException(
             status_code=404, detail=f"Work item not found: {item_id}"
         )
 
     content = await file.read()
-    adapter.add_file(
+    await run_in_db_executor(
+        adapter.add_file,
         item_id=item_id,
         name=file.filename or "unnamed",
         original_name=file.filename or "unnamed",
@@ -282,6 +614,10 @@ async def upload_file(
 @work_items_api_router.get("/{item_id}/files")
 async def list_files(item_id: str):
     """List files attached to a work item."""
+    return await run_in_db_executor(_list_files, item_id)
+
+
+def _list_files(item_id: str):
     adapter = _check_adapter()
 
     try:
@@ -298,6 +634,10 @@ async def list_files(item_id: str):
 @work_items_api_router.get("/{item_id}/files/{filename}")
 async def download_file(item_id: str, filename: str):
     """Download a file from a work item."""
+    return await run_in_db_executor(_download_file, item_id, filename)
+
+
+def _download_file(item_id: str, filename: str):
     adapter = _check_adapter()
 
     try:
@@ -319,6 +659,10 @@ async def download_file(item_id: str, filename: str):
 @work_items_api_router.delete("/{item_id}/files/{filename}")
 async def delete_file(item_id: str, filename: str):
     """Delete a file from a work item."""
+    return await run_in_db_executor(_delete_file, item_id, filename)
+
+
+def _delete_file(item_id: str, filename: str):
     adapter = _check_adapter()
 
     try:
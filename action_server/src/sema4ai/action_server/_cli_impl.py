@@ -162,6 +162,85 @@ def _add_start_server_command(command_parser, defaults):
         ),
         default=20,
     )
+    start_parser.add_argument(
+        "--max-queued-runs",
+        type=int,
+        help=(
+            "The maximum number of runs which may be waiting for a process when "
+            "`--max-processes` actions are already running (when reached, new "
+            "requests are rejected with a 429 status code). 0 means no limit."
+        ),
+        default=0,
+    )
+    start_parser.add_argument(
+        "--action-package-processes",
+        action="append",
+        metavar="NAME=MIN:MAX",
+        help=(
+            "The minimum/maximum number of idle processes kept warm for the given "
+            "action package (i.e.: `my-package=2:4`). Besides that, idle processes "
+            "are kept warm based on the request rate of each action package. "
+            "May be passed multiple times."
+        ),
+    )
+    start_parser.add_argument(
+        "--idle-process-ttl",
+        type=float,
+        help=(
+            "Idle processes (above `--min-processes`) of action packages which "
+            "received no requests in this time (in seconds) are retired."
+        ),
+        default=300.0,
+    )
+    start_parser.add_argument(
+        "--max-process-runs",
+        type=int,
+        help=(
+            "When `--reuse-processes` is used, a process is replaced by a new one "
+            "(in the background) after running this number of actions. "
+            "0 means no limit."
+        ),
+        default=0,
+    )
+    start_parser.add_argument(
+        "--max-process-rss",
+        type=int,
+        help=(
+            "When `--reuse-processes` is used, a process is replaced by a new one "
+            "(in the background) when its memory (RSS in MB, including its "
+            "subprocesses -- Linux only) reaches this value after running an "
+            "action. 0 means no limit."
+        ),
+        default=0,
+    )
+    start_parser.add_argument(
+        "--max-process-age",
+        type=float,
+        help=(
+            "When `--reuse-processes` is used, a process is replaced by a new one "
+            "(in the background) when it's older than this value (in seconds) "
+            "after running an action. 0 means no limit."
+        ),
+        default=0,
+    )
+    start_parser.add_argument(
+        "--fork-server",
+        action="store_true",
+        help=(
+            "Linux only: instead of starting a new python interpreter for each "
+            "action process, fork the action processes from a process (one per "
+            "environment) which already has the actions library imported."
+        ),
+    )
+    start_parser.add_argument(
+        "--fork-server-preload",
+        action="append",
+        metavar="MODULE",
+        help=(
+            "Additional module to be imported in the fork server (i.e.: a heavy "
+            "dependency used by the actions). May be passed multiple times."
+        ),
+    )
     start_parser.add_argument(
         "--reuse-processes",
         action="store_true",
@@ -175,6 +254,58 @@ def _add_start_server_command(command_parser, defaults):
             "interfere with a subsequent run)."
         ),
     )
+    start_parser.add_argument(
+        "--inline-action-io",
+        action="store_true",
+        help=(
+            "By default the inputs and the result of an action run are exchanged "
+            "with the action process through json files written in the run artifacts "
+            "directory. With this flag they're sent inline through the socket used "
+            "to communicate with the action process (so, no files are written for "
+            "the inputs/result unless `--persist-action-io` is also used)."
+        ),
+    )
+    start_parser.add_argument(
+        "--persist-action-io",
+        action="store_true",
+        help=(
+            "When used with `--inline-action-io`, the inputs and the result of each "
+            "run are still written to the run artifacts directory (for auditing or "
+            "debugging purposes)."
+        ),
+    )
+    start_parser.add_argument(
+        "--work-items-lease-seconds",
+        type=float,
+        help=(
+            "For how long (in seconds) a reserved work item is kept in progress "
+            "without being released or having its lease renewed (afterwards it's "
+            "returned to its queue)."
+        ),
+        default=1800.0,
+    )
+    start_parser.add_argument(
+        "--work-items-max-attempts",
+        type=int,
+        help=(
+            "Number of times a work item may be reserved and have its lease expire "
+            "before it's moved to the dead-letter queue ('<queue>_dead_letter')."
+        ),
+        default=3,
+    )
+    start_parser.add_argument(
+        "--db-durability",
+        choices=["strict", "group"],
+        help=(
+            "How run state changes are written to the database. 'strict' (default) "
+            "commits each change before proceeding. 'group' queues the changes to a "
+            "single writer thread which coalesces them into group commits every few "
+            "milliseconds (much higher throughput with many short runs, at the cost "
+            "of possibly losing the last few milliseconds of run state changes if "
+            "the process crashes)."
+        ),
+        default="strict",
+    )
 
     start_parser.add_argument(
         "--full-openapi-spec",
@@ -590,12 +721,19 @@ def _import_actions(
     base_args: ArgumentsNamespaceBaseImportOrStart,
     settings: "Settings",
     disable_not_imported: bool,
+    action_package_dirs: Optional[Sequence[str]] = None,
+    imported_action_package_ids: Optional[list[str]] = None,
 ) -> int:
     """
     Args:
         base_args: The base arguments collected from the cli input.
         settings: The settings for the action server.
         disable_not_imported: Whether actions which were not imported should be disabled.
+        action_package_dirs: If given, just these action packages (which must
+            be in `base_args.dir`) are reimported (and only their actions which
+            were not imported are disabled).
+        imported_action_package_ids: If given, the ids of the imported action
+            packages are added to it.
 
     Returns: 0 if everything is correct and some other number if some error happened
         while importing the actions.
@@ -606,15 +744,18 @@ def _import_actions(
     if not base_args.dir:
         base_args.dir = ["."]
 
+    import_dirs = base_args.dir if action_package_dirs is None else action_package_dirs
     try:
-        for action_package_dir in base_args.dir:
-            _actions_import.import_action_package(
-                datadir=settings.datadir,
-                action_package_dir=os.path.abspath(action_package_dir),
-                skip_lint=base_args.skip_lint,
-                disable_not_imported=disable_not_imported,
-                whitelist=base_args.whitelist,
-            )
+        action_package_ids = _actions_import.import_action_packages(
+            datadir=settings.datadir,
+            action_package_dirs=[os.path.abspath(d) for d in import_dirs],
+            skip_lint=base_args.skip_lint,
+            disable_not_imported=disable_not_imported,
+            whitelist=base_args.whitelist,
+            partial=action_package_dirs is not None,
+        )
+        if imported_action_package_ids is not None:
+            imported_action_package_ids.extend(action_package_ids)
     except ActionServerValidationError as e:
         log.critical(
             bold_red(
@@ -844,6 +985,7 @@ def _command_requiring_datadir(
     from sema4ai.action_server.migrations import MigrationStatus
 
     from ._models import Run, RunStatus, run_status_to_str
+    from ._run_rollups import add_finished_run
     from ._runs_state_cache import use_runs_state_ctx
 
     settings: "Settings" = setup_info.settings
@@ -977,6 +1119,10 @@ information from this datadir.
                     values=[RunStatus.NOT_RUN, RunStatus.RUNNING],
                 )
                 if runs_to_cancel:
+                    with db.cursor() as cursor:
+                        db.execute_query(cursor, "SELECT MAX(change_seq) FROM run")
+                        change_seq = cursor.fetchone()[0] or 0
+
                     with db.transaction():
                         for run in runs_to_cancel:
                             current_status_str = run_status_to_str(run.status)
@@ -986,9 +1132,14 @@ information from this datadir.
                                     f"Run {run.id} marked as cancelled in Action Server Start (when the Action Server was last shutdown its state was: '{current_status_str}')"
                                 )
                             run.status = RunStatus.CANCELLED
-                            db.update(run, "status", "error_message")
+                            change_seq += 1
+                            run.change_seq = change_seq
+                            db.update(run, "status", "error_message", "change_seq")
+                            add_finished_run(db, run)
 
-                with use_runs_state_ctx(db):
+                with use_runs_state_ctx(
+                    db, group_commit=settings.db_durability == "group"
+                ):
                     from ._server import start_server
 
                     settings.artifacts_dir.mkdir(parents=True, exist_ok=True)
@@ -71,6 +71,83 @@ class DBRules:
         self.foreign_keys: Set[str] = set()
 
 
+class _ConnectionPool:
+    """
+    Keeps the connections which are not currently in use by any thread so that
+    they can be reused (instead of opening/closing a new connection whenever
+    a thread calls `Database.connect()`).
+
+    A connection is only used by one thread at a time (but may be used by
+    different threads over its lifetime).
+    """
+
+    # Max number of statements kept (prepared) in the cache of each connection.
+    CACHED_STATEMENTS = 256
+
+    # Negative values mean KiB (so, 16 MB of page cache per connection).
+    CACHE_SIZE = -16000
+
+    # Up to 256 MB of the db may be memory-mapped.
+    MMAP_SIZE = 256 * 1024 * 1024
+
+    def __init__(self, db_path: Path, max_idle: int = 16):
+        self._db_path = db_path
+        self._max_idle = max_idle
+        self._idle: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @property
+    def is_memory(self) -> bool:
+        return str(self._db_path) == ":memory:"
+
+    def _create_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self._db_path,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=self.CACHED_STATEMENTS,
+        )
+        conn.execute("PRAGMA foreign_keys = ON")
+        if not self.is_memory:
+            # WAL makes it possible for readers to proceed while there's a writer
+            # (and with it synchronous=NORMAL is still safe against corruption).
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute(f"PRAGMA cache_size = {self.CACHE_SIZE}")
+            conn.execute(f"PRAGMA mmap_size = {self.MMAP_SIZE}")
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        if not self.is_memory:
+            # Note: in-memory connections are never reused (each one is a new db).
+            with self._lock:
+                if self._idle:
+                    return self._idle.pop()
+        return self._create_connection()
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        if conn.in_transaction:
+            # Should not really happen, but let's be safe and not give a
+            # connection with a pending transaction to another thread.
+            conn.rollback()
+
+        if not self.is_memory:
+            with self._lock:
+                if not self._closed and len(self._idle) < self._max_idle:
+                    self._idle.append(conn)
+                    return
+        conn.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            idle = self._idle
+            self._idle = []
+        for conn in idle:
+            conn.close()
+
+
 class Database:
     """
     Some notes:
@@ -80,7 +157,9 @@ class Database:
         No 2 connections should be writing at the same time (ideally, use a
         single thread for writing).
 
-        This class makes it so that there's only one connection per thread.
+        This class makes it so that there's only one connection per thread
+        (connections are kept in a pool and reused when a thread stops using
+        them).
     """
 
     verbose = 0
@@ -99,6 +178,7 @@ class Database:
         self._counter = itertools.count(0)
         self._write_lock = threading.RLock()
         self._classes: List[type] = []
+        self._pool = _ConnectionPool(self._db_path)
 
     @property
     def db_path(self) -> Path:
@@ -134,13 +214,20 @@ class Database:
             yield
             return
 
-        with closing(sqlite3.connect(self._db_path, isolation_level=None)) as conn:
-            conn.execute("PRAGMA foreign_keys = ON")
-            self._tlocal.conn = conn
-            try:
-                yield
-            finally:
-                self._tlocal.conn = None
+        conn = self._pool.acquire()
+        self._tlocal.conn = conn
+        try:
+            yield
+        finally:
+            self._tlocal.conn = None
+            self._pool.release(conn)
+
+    def close(self) -> None:
+        """
+        Closes the connections which are not currently in use (connections in
+        use are closed when the related `connect()` context manager exits).
+        """
+        self._pool.close()
 
     def _next_savepoint_name(self):
         return f"savepoint_{next(self._counter)}"
@@ -0,0 +1,77 @@
+"""
+Executor for the (blocking) database accesses done from `async` code.
+
+The `Database` (as well as the work items `SQLiteAdapter`) is synchronous, so,
+calling it directly from an `async def` endpoint (or from the scheduler/trigger
+engines) stalls the event loop (and with it every other request, including
+run submissions and websockets). Such accesses must be done through
+`run_in_db_executor` instead, which runs them in a dedicated thread pool (so
+that they also don't compete with the threads used by the sync endpoints).
+
+Note: the `Database` connections are thread-local, so, the function being run
+must do its own `db.connect()`.
+"""
+import asyncio
+import contextvars
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# SQLite only allows one writer at a time, so, many more threads than that
+# wouldn't help (reads are concurrent in WAL mode).
+DB_EXECUTOR_MAX_WORKERS = 8
+
+_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_db_executor() -> ThreadPoolExecutor:
+    global _executor
+
+    executor = _executor
+    if executor is None:
+        with _lock:
+            executor = _executor
+            if executor is None:
+                executor = _executor = ThreadPoolExecutor(
+                    max_workers=DB_EXECUTOR_MAX_WORKERS,
+                    thread_name_prefix="DBExecutor",
+                )
+    return executor
+
+
+async def run_in_db_executor(func: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Runs the given (blocking) function in the db executor and waits for its
+    result without blocking the event loop.
+
+    Exceptions raised by the function are raised to the caller.
+    """
+    loop = asyncio.get_running_loop()
+    # The context is copied (as `asyncio.to_thread` does).
+    ctx = contextvars.copy_context()
+    return await loop.run_in_executor(
+        get_db_executor(), functools.partial(ctx.run, func, *args, **kwargs)
+    )
+
+
+def shutdown_db_executor() -> None:
+    """
+    Waits for the pending database accesses and stops the executor (a new one
+    is created if it's requested again afterwards).
+    """
+    global _executor
+
+    with _lock:
+        executor = _executor
+        _executor = None
+
+    if executor is not None:
+        log.debug("Shutting down the db executor.")
+        executor.shutdown(wait=True)
@@ -110,6 +110,12 @@ class Run:
     robot_task_name: Optional[str] = None  # Name of robot task if run_type='robot'
     robot_env_hash: Optional[str] = None  # RCC environment hash if run_type='robot'
 
+    # Sequence of the last change (insertion/update) of the run (increases
+    # with each change of any run, so, it's possible to get what changed
+    # since some point).
+    change_seq: int = 0
+    _db_rules.indexes.add("Run.change_seq")
+
 
 @dataclass
 class UserSession:
@@ -359,6 +365,14 @@ class Trigger:  # Table name: trigger
     rate_limit_enabled: bool = False
     rate_limit_max_per_minute: int = 60
 
+    # Webhook ingestion
+    # If True, a webhook is acknowledged (202) as soon as it's stored in the
+    # inbox (see: WebhookInboxEntry) and is executed afterwards.
+    async_ack: bool = False
+    # Header with the delivery id (used to deduplicate redeliveries when
+    # `async_ack` is set). If not given, well-known headers are checked.
+    delivery_id_header: Optional[str] = None
+
 
 class TriggerInvocationStatus:
     """Status values for trigger invocations."""
@@ -392,6 +406,91 @@ class TriggerInvocation:  # Table name: trigger_invocation
     error_message: Optional[str]  # Error message if status='error'
 
 
+@dataclass
+class RateLimitState:  # Table name: rate_limit_state
+    """
+    Persisted state of a rate limit window (see: `_rate_limiter.RateLimiter`).
+    """
+
+    id: str  # primary key ("<key>/<window_seconds>")
+    _db_rules.unique_indexes.add("RateLimitState.id")
+
+    key: str  # The rate limited entity (i.e.: "trigger:<trigger_id>")
+    _db_rules.indexes.add("RateLimitState.key")
+
+    window_seconds: float
+    window_start: float  # Start of the current window (epoch seconds)
+    current_count: int  # Hits in the current window
+    previous_count: int  # Hits in the previous window
+
+
+class WebhookInboxStatus:
+    """Status values for webhook inbox entries."""
+
+    PENDING = "pending"
+    PROCESSING = "processing"
+    DONE = "done"
+    ERROR = "error"
+
+
+@dataclass
+class WebhookInboxEntry:  # Table name: webhook_inbox_entry
+    """A webhook received (and acknowledged) but possibly still not executed."""
+
+    id: str  # primary key (uuid -- also used as the invocation id)
+    _db_rules.unique_indexes.add("WebhookInboxEntry.id")
+
+    trigger_id: str  # FK to trigger
+    _db_rules.indexes.add("WebhookInboxEntry.trigger_id")
+
+    # "<trigger_id>:<delivery_id>" (None if the delivery id is not available)
+    dedup_key: Optional[str]
+    _db_rules.unique_indexes.add("WebhookInboxEntry.dedup_key")
+
+    received_at: str  # ISO datetime
+    source_ip: Optional[str]
+    payload_json: Optional[str]
+    headers_json: Optional[str]
+
+    status: str  # See WebhookInboxStatus
+    _db_rules.indexes.add("WebhookInboxEntry.status")
+
+    attempts: int = 0
+    processed_at: Optional[str] = None
+    error_message: Optional[str] = None
+    # ISO datetime before which a failed entry isn't retried (None: right away)
+    next_attempt_at: Optional[str] = None
+
+
+@dataclass
+class RunRollup:  # Table name: run_rollup
+    """
+    Aggregated stats of the finished runs of an action in a day with a given
+    status (see: `_run_rollups`).
+    """
+
+    id: str  # primary key ("<day>/<action_id>/<status>")
+    _db_rules.unique_indexes.add("RunRollup.id")
+
+    day: str  # Day of the run start time (YYYY-MM-DD)
+    _db_rules.indexes.add("RunRollup.day")
+
+    action_id: str  # action ID (empty for robot runs)
+    _db_rules.indexes.add("RunRollup.action_id")
+
+    status: int  # See RunStatus
+
+    run_count: int
+    run_time_count: int  # Number of runs with a run time
+    run_time_sum: float  # Sum of the run times (in seconds)
+    run_time_min: Optional[float]
+    run_time_max: Optional[float]
+
+    # json list with the number of runs in each run time bucket (see:
+    # `_run_rollups.RUN_TIME_HISTOGRAM_BOUNDS`).
+    run_time_histogram: str
+
+
 def run_status_to_str(run_status: int) -> str:
     """
     Args:
@@ -432,6 +531,9 @@ def get_all_model_classes():
         ScheduleExecution,
         Trigger,
         TriggerInvocation,
+        RateLimitState,
+        WebhookInboxEntry,
+        RunRollup,
     ]
 
 
@@ -457,13 +559,16 @@ def load_db(db_path: Union[Path, str]) -> Iterator["Database"]:
         raise AssertionError("There is already a global initialized database.")
 
     db = Database(db_path)
-    with db.connect():
-        db.initialize(get_all_model_classes())
-        _global_db = db
-        try:
-            yield db
-        finally:
-            _global_db = None
+    try:
+        with db.connect():
+            db.initialize(get_all_model_classes())
+            _global_db = db
+            try:
+                yield db
+            finally:
+                _global_db = None
+    finally:
+        db.close()
 
 
 @contextmanager
@@ -526,6 +631,7 @@ class RunListItemModel(BaseModel):
     robot_env_hash: Optional[str] = None
     stdout: Optional[str] = None
     stderr: Optional[str] = None
+    change_seq: int = 0
 
     class Config:
         from_attributes = True
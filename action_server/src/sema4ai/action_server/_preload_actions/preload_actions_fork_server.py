@@ -0,0 +1,185 @@
+"""
+This module is a fork server for the processes which run the actions (Linux only).
+
+It pre-imports the actions library (along with its dependencies and any other
+module requested with `--preload`) and then waits for requests from the
+action-server (in the control socket given in `--control-fd`) to fork workers.
+
+Each forked worker connects back to the action-server and serves the requests
+to run actions just as if it was started with
+`preload_actions_server_main --tcp --host=<host> --port=<port>` (but without
+having to pay for starting the interpreter and importing the actions library
+again).
+
+Protocol (the control socket is a `SOCK_SEQPACKET` unix socket):
+
+- Request: `{"host": <host>, "port": <port>}` along with 2 file descriptors
+  (to be used as the stdout and stderr of the worker).
+- Reply: `{"pid": <worker pid>}` or `{"error": <error message>}`.
+
+When the control socket is closed by the action-server the fork server exits
+(the forked workers are not affected).
+
+Note: the user modules are not pre-imported (they're instrumented by the
+logging when imported while running an action, so, they must be imported in
+the worker).
+
+Important: this will run in the target environment and can't really import anything
+from the action server.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import signal
+import socket
+import sys
+import traceback
+
+# The modules needed to run actions (the first one found of each entry is used).
+_PRELOAD_MODULES = (
+    ("sema4ai.actions.cli", "robocorp.actions.cli"),
+    ("sema4ai.actions._request", "robocorp.actions._request"),
+    ("sema4ai.actions._managed_parameters", "robocorp.actions._managed_parameters"),
+    (
+        "sema4ai.actions._customization._plugin_manager",
+        "robocorp.tasks._customization._plugin_manager",
+    ),
+    ("pydantic",),
+)
+
+# Max size of a request in the control socket.
+_MAX_MESSAGE_SIZE = 64 * 1024
+
+
+def _import_first(module_names) -> None:
+    for module_name in module_names:
+        try:
+            importlib.import_module(module_name)
+            return
+        except ImportError:
+            continue
+
+
+def preload(extra_modules=()) -> None:
+    try:
+        import preload_actions_server_main  # type: ignore  # noqa
+        import preload_actions_streams  # type: ignore  # noqa
+    except ImportError:
+        from . import preload_actions_server_main  # noqa
+        from . import preload_actions_streams  # noqa
+
+    for module_names in _PRELOAD_MODULES:
+        _import_first(module_names)
+
+    for module_name in extra_modules:
+        try:
+            importlib.import_module(module_name)
+        except Exception:
+            sys.stderr.write(f"Fork server: unable to preload: {module_name}\n")
+            traceback.print_exc()
+
+
+def _run_worker(host: str, port: int) -> None:
+    try:
+        import preload_actions_server_main  # type: ignore
+    except ImportError:
+        from . import preload_actions_server_main  # noqa
+
+    rfile, wfile = preload_actions_server_main.socket_connect(host, port)
+    preload_actions_server_main.serve(rfile, wfile)
+
+
+def fork_worker(control: socket.socket, request: dict, fds) -> int:
+    """
+    Forks a worker (which connects to the host/port in the request).
+
+    Returns:
+        The pid of the worker.
+    """
+    if len(fds) != 2:
+        raise RuntimeError(f"Expected 2 file descriptors (stdout/stderr). Found: {fds}")
+    host = request["host"]
+    port = int(request["port"])
+
+    sys.stdout.flush()
+    sys.stderr.flush()
+    pid = os.fork()
+    if pid != 0:
+        return pid
+
+    # Forked worker (must never return to the fork server loop).
+    exit_code = 1
+    try:
+        control.close()
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        stdout_fd, stderr_fd = fds
+        os.dup2(stdout_fd, 1)
+        os.dup2(stderr_fd, 2)
+        os.close(stdout_fd)
+        os.close(stderr_fd)
+        _run_worker(host, port)
+        exit_code = 0
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(exit_code)
+    return pid  # Unreachable
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Fork server for action processes")
+    parser.add_argument(
+        "--control-fd",
+        type=int,
+        required=True,
+        help="The file descriptor of the control socket",
+    )
+    parser.add_argument(
+        "--preload",
+        action="append",
+        default=[],
+        help="Additional module to be pre-imported",
+    )
+    args = parser.parse_args(args=args)
+
+    control = socket.socket(fileno=args.control_fd)
+    preload(args.preload)
+
+    # The forked workers are reaped automatically.
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+
+    while True:
+        try:
+            msg, fds, _flags, _addr = socket.recv_fds(control, _MAX_MESSAGE_SIZE, 2)
+        except OSError:
+            break
+
+        if not msg:
+            # The action-server closed the control socket.
+            for fd in fds:
+                os.close(fd)
+            break
+
+        try:
+            reply = {"pid": fork_worker(control, json.loads(msg), fds)}
+        except Exception as e:
+            reply = {"error": f"{e.__class__.__name__}: {e}"}
+        finally:
+            for fd in fds:
+                os.close(fd)
+
+        control.sendall(json.dumps(reply).encode("utf-8"))
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception:
+        # Critical error (the logging may not be set up properly).
+        traceback.print_exc()
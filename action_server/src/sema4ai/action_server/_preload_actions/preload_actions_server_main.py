@@ -108,6 +108,20 @@ def add_arguments(parser):
     parser.add_argument("--port", default=-1, type=int, help="Bind to this port")
 
 
+def _get_teardown_module():
+    """
+    Provides the `preload_actions_teardown` module (imported by `preload_actions`
+    when the actions are run) or None if it still wasn't imported.
+
+    Note: it may be imported as a top-level module or relative to this package
+    (when the top-level import isn't available), so, both names are checked.
+    """
+    teardown_module = sys.modules.get("preload_actions_teardown")
+    if teardown_module is None and __package__:
+        teardown_module = sys.modules.get(f"{__package__}.preload_actions_teardown")
+    return teardown_module
+
+
 class MessagesHandler:
     def __init__(self, read_stream, write_stream):
         try:
@@ -174,6 +188,10 @@ class MessagesHandler:
         #
         # env["ROBOT_ARTIFACTS"] = robot_artifacts
         # env["S4_ACTION_RESULT_LOCATION"] = result_json
+        #
+        # When the inputs/result are exchanged inline, `input_json` and
+        # `result_json` are empty, the inputs are in `inputs` and the result is
+        # sent back in the reply (along with the returncode).
         command = message.get("command")
         if command == "run_action":
             try:
@@ -184,6 +202,8 @@ class MessagesHandler:
                 from robocorp.actions import cli  # type: ignore
 
             returncode = 1
+            inline_result = bool(message.get("inline_result"))
+            inline_inputs_path = None
             try:
                 action_name = message["action_name"]
                 action_file = message["action_file"]
@@ -196,7 +216,19 @@ class MessagesHandler:
                 cwd = message["cwd"]
 
                 os.environ["ROBOT_ARTIFACTS"] = robot_artifacts
-                os.environ["S4_ACTION_RESULT_LOCATION"] = result_json
+                if result_json:
+                    os.environ["S4_ACTION_RESULT_LOCATION"] = result_json
+                else:
+                    os.environ.pop("S4_ACTION_RESULT_LOCATION", None)
+
+                if not input_json:
+                    input_json = inline_inputs_path = self._write_inline_inputs(
+                        message["inputs"]
+                    )
+
+                teardown_module = _get_teardown_module()
+                if teardown_module is not None:
+                    teardown_module.last_result_contents = None
 
                 if reuse_process:
                     # Setup is skipped (for callbacks which still haven't been
@@ -252,7 +284,45 @@ class MessagesHandler:
                 traceback.print_exc()
 
             finally:
-                self._jsonrpc_stream_writer.write({"returncode": returncode})
+                if inline_inputs_path:
+                    try:
+                        os.remove(inline_inputs_path)
+                    except OSError:
+                        pass
+
+                reply: Dict[str, Any] = {"returncode": returncode}
+                if inline_result:
+                    teardown_module = _get_teardown_module()
+                    if teardown_module is not None:
+                        reply["result"] = teardown_module.last_result_contents
+                        teardown_module.last_result_contents = None
+                if not self._jsonrpc_stream_writer.write(reply) and inline_result:
+                    # i.e.: the result could not be serialized: the returncode
+                    # must still be provided (without it the server would hang).
+                    self._jsonrpc_stream_writer.write({"returncode": returncode})
+
+    def _write_inline_inputs(self, inputs) -> str:
+        """
+        The actions library only accepts the inputs from a file, so, inputs
+        received inline are written to a scratch file private to this process
+        (in shared memory when available), which is removed after the run.
+        """
+        import json
+        import tempfile
+
+        base_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+        try:
+            fd, inputs_path = tempfile.mkstemp(
+                prefix="s4_action_inputs_", suffix=".json", dir=base_dir
+            )
+        except OSError:
+            fd, inputs_path = tempfile.mkstemp(
+                prefix="s4_action_inputs_", suffix=".json"
+            )
+
+        with os.fdopen(fd, "w", encoding="utf-8") as stream:
+            json.dump(inputs, stream)
+        return inputs_path
 
     def _plugin_manager_kwargs(self, managed_parameters) -> Dict[str, Any]:
         try:
@@ -314,6 +384,14 @@ def main(args=None):
     else:
         rfile, wfile = binary_stdio()
 
+    serve(rfile, wfile)
+
+
+def serve(rfile, wfile):
+    """
+    Serves the requests to run actions received in the given streams (also
+    used by the workers forked by `preload_actions_fork_server`).
+    """
     try:
         import preload_actions_autoexit  # type: ignore
     except ImportError:
@@ -322,6 +400,11 @@ def main(args=None):
     pid = os.environ.get("SEMA4AI_ACTION_SERVER_PARENT_PID", 0)
     if pid:
         preload_actions_autoexit.exit_when_pid_exists(pid)
+
+    # This process is reused to run the actions many times: let the actions
+    # library keep the actions collected (re-collected only if the action
+    # file changes).
+    os.environ["S4_ACTIONS_CACHE_COLLECTED_ACTIONS"] = "1"
     server = MessagesHandler(rfile, wfile)
     server.start()
 
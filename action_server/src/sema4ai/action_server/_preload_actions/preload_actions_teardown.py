@@ -8,24 +8,32 @@ except ImportError:
     # old
     from robocorp.actions import IAction, teardown  # type:ignore
 
+# The contents of the last result (kept in memory so that the preloaded actions
+# server can send it back inline when the result location is not set).
+last_result_contents = None
+
 
 @teardown
 def on_teardown_save_result(action: IAction):
+    global last_result_contents
+
     S4_ACTION_RESULT_LOCATION = os.environ.get("S4_ACTION_RESULT_LOCATION", "")
 
+    result = action.result
+    dump = result
+    if hasattr(result, "model_dump"):
+        # Support for pydantic
+        dump = result.model_dump(mode="json")
+
+    contents_to_write = {
+        "result": dump,
+        "message": action.message,
+        "status": action.status.value,
+    }
+
     if S4_ACTION_RESULT_LOCATION:
-        result = action.result
         p = Path(S4_ACTION_RESULT_LOCATION)
         p.parent.mkdir(parents=True, exist_ok=True)
-        dump = result
-        if hasattr(result, "model_dump"):
-            # Support for pydantic
-            dump = result.model_dump(mode="json")
-
-        contents_to_write = {
-            "result": dump,
-            "message": action.message,
-            "status": action.status.value,
-        }
-
         p.write_text(json.dumps(contents_to_write))
+    else:
+        last_result_contents = contents_to_write
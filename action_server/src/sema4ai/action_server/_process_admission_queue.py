@@ -0,0 +1,217 @@
+"""
+Admission queue used by the actions process pool to decide which run gets the
+next process slot when the pool is saturated.
+
+Waiters are woken up in FIFO order (higher priorities first, when a priority
+is given), as soon as a slot is released or as soon as the related run is
+cancelled (no polling is done).
+"""
+import heapq
+import itertools
+import logging
+import threading
+import time
+import typing
+from bisect import bisect_left
+from contextlib import nullcontext
+from typing import Optional, Sequence
+
+if typing.TYPE_CHECKING:
+    from sema4ai.action_server._runs_state_cache import RunRuntimeInfo
+
+log = logging.getLogger(__name__)
+
+# Upper bounds (in seconds) for the buckets of the wait time histogram.
+_WAIT_TIME_BUCKETS = (0.005, 0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+
+# Upper bounds for the buckets of the queue length histogram.
+_QUEUE_LENGTH_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+class ProcessQueueFullError(RuntimeError):
+    """
+    Raised when a run can't wait for a process because the maximum number of
+    queued runs was reached.
+    """
+
+
+class Histogram:
+    """
+    A simple (cumulative) histogram with fixed bucket upper bounds.
+
+    Note: not thread-safe (the owner must synchronize the access).
+    """
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        # The last entry is for values above the last bound (+Inf).
+        self._counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def to_dict(self) -> dict:
+        buckets = []
+        cumulative = 0
+        for i, count in enumerate(self._counts):
+            cumulative += count
+            le = self.bounds[i] if i < len(self.bounds) else "+Inf"
+            buckets.append({"le": le, "count": cumulative})
+        return {"buckets": buckets, "count": self.count, "sum": self.sum}
+
+
+class _Waiter:
+    __slots__ = ["priority", "seq", "event", "granted", "abandoned"]
+
+    def __init__(self, priority: int, seq: int):
+        self.priority = priority
+        self.seq = seq
+        self.event = threading.Event()
+        self.granted = False
+        self.abandoned = False
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        # Higher priority first, then FIFO.
+        return (-self.priority, self.seq) < (-other.priority, other.seq)
+
+
+class ProcessAdmissionQueue:
+    def __init__(self, max_slots: int, max_queue_depth: int = 0):
+        """
+        Args:
+            max_slots: The number of slots (i.e.: processes which may be running).
+            max_queue_depth: The maximum number of runs that may be waiting for a
+                slot (0 means no limit).
+        """
+        self._lock = threading.Lock()
+        self._free_slots = max_slots
+        self._max_queue_depth = max_queue_depth
+
+        # Heap with the waiters (abandoned waiters are only removed when popped).
+        self._waiters: list[_Waiter] = []
+        self._seq = itertools.count()
+
+        # Number of waiters which weren't abandoned.
+        self._queued = 0
+        self._rejected = 0
+
+        self._wait_time_histogram = Histogram(_WAIT_TIME_BUCKETS)
+        self._queue_length_histogram = Histogram(_QUEUE_LENGTH_BUCKETS)
+
+    def acquire(
+        self,
+        priority: int = 0,
+        runtime_info: Optional["RunRuntimeInfo"] = None,
+        description: str = "",
+    ) -> None:
+        """
+        Blocks until a slot is available.
+
+        Raises:
+            ProcessQueueFullError: if the max queue depth was reached.
+            CancelledError: if the run was cancelled while waiting.
+        """
+        from concurrent.futures import CancelledError
+
+        initial_time = time.monotonic()
+        with self._lock:
+            if self._free_slots > 0 and not self._queued:
+                self._free_slots -= 1
+                self._queue_length_histogram.observe(0)
+                self._wait_time_histogram.observe(0.0)
+                return
+
+            if self._max_queue_depth > 0 and self._queued >= self._max_queue_depth:
+                self._rejected += 1
+                raise ProcessQueueFullError(
+                    f"Unable to run: {description} because the maximum number of "
+                    f"queued runs ({self._max_queue_depth}) was reached."
+                )
+
+            waiter = _Waiter(priority, next(self._seq))
+            heapq.heappush(self._waiters, waiter)
+            self._queued += 1
+            self._queue_length_histogram.observe(self._queued)
+
+        def on_cancel(*args, **kwargs):
+            waiter.event.set()
+
+        cancel_ctx: typing.ContextManager = (
+            runtime_info.on_cancel.register(on_cancel)
+            if runtime_info is not None
+            else nullcontext()
+        )
+        try:
+            with cancel_ctx:
+                while True:
+                    # Cleared before checking the state so that a `release()`
+                    # or cancellation done after the check is not lost.
+                    waiter.event.clear()
+                    if waiter.granted:
+                        break
+
+                    if runtime_info is not None and runtime_info.is_canceled():
+                        raise CancelledError(
+                            f"Action: {description} cancelled while waiting for process."
+                        )
+
+                    # Only print more info regarding delaying after 10 seconds elapse.
+                    if not waiter.event.wait(10):
+                        log.info(
+                            f"Delayed running action: {description} because "
+                            f"all the available processes are in use "
+                            f"(waiting for another action to finish running)."
+                        )
+        except BaseException:
+            with self._lock:
+                if waiter.granted:
+                    # We got the slot right when exiting: pass it on.
+                    self._release_unlocked()
+                else:
+                    waiter.abandoned = True
+                    self._queued -= 1
+            raise
+
+        with self._lock:
+            self._wait_time_histogram.observe(time.monotonic() - initial_time)
+
+    def release(self) -> None:
+        with self._lock:
+            self._release_unlocked()
+
+    def _release_unlocked(self) -> None:
+        assert self._lock.locked(), "Lock must be acquired at this point."
+        while self._waiters:
+            waiter = heapq.heappop(self._waiters)
+            if waiter.abandoned:
+                continue
+            waiter.granted = True
+            self._queued -= 1
+            waiter.event.set()
+            return
+        self._free_slots += 1
+
+    def get_queued_count(self) -> int:
+        with self._lock:
+            return self._queued
+
+    def get_stats(self) -> dict:
+        """
+        Returns:
+            A dict with the current queue length and the histograms for the
+            queue length (seen by each new run) and the time waited to obtain
+            a slot (in seconds).
+        """
+        with self._lock:
+            return {
+                "queued": self._queued,
+                "free_slots": self._free_slots,
+                "max_queue_depth": self._max_queue_depth,
+                "rejected": self._rejected,
+                "queue_length": self._queue_length_histogram.to_dict(),
+                "wait_time_seconds": self._wait_time_histogram.to_dict(),
+            }
@@ -0,0 +1,137 @@
+"""
+Helpers to decide how many idle processes the `ActionsProcessPool` keeps warm
+for each key (action package, env, cwd).
+
+For each key the demand is tracked:
+
+- the request rate (exponentially decayed count of the requests),
+- the time it takes to spawn a process,
+- the time that requests had to wait for a process to be available (after
+  being admitted -- i.e.: the time waiting for a process to be spawned).
+
+The number of idle processes kept warm for a key is then the number of
+requests expected to arrive while a new process is spawned (at least 1 if the
+key received requests in the idle TTL and 1 more if requests are still waiting
+for processes to be spawned), bounded by the min/max idle processes configured
+for its action package.
+
+The keys which didn't receive requests in the idle TTL are considered cold (and
+their idle processes above the minimum are retired).
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence
+
+# Time constant (in seconds) of the request rate.
+_REQUEST_RATE_TIME_CONSTANT = 60.0
+
+# Weight of a new sample in the (exponentially weighted) averages of the spawn
+# and acquire wait times.
+_SMOOTHING = 0.3
+
+# Time used for the spawn time until a process is spawned for the key.
+_DEFAULT_SPAWN_TIME = 1.0
+
+# If the (smoothed) time waiting for a process is above this value, the
+# requests are waiting for processes to be spawned (so, one more process is
+# kept warm).
+_ACQUIRE_WAIT_THRESHOLD = 0.1
+
+
+class KeyDemand:
+    """
+    The demand of processes for a given key.
+
+    Note: not thread-safe (the pool lock must be held when using it).
+    """
+
+    def __init__(self) -> None:
+        self.last_request_time: Optional[float] = None
+        # The request rate (requests/second) at `last_request_time`.
+        self._request_rate = 0.0
+        self.spawn_time = _DEFAULT_SPAWN_TIME
+        self.acquire_wait = 0.0
+
+    def on_request(self, now: float) -> None:
+        self._request_rate = (
+            self.get_request_rate(now) + 1.0 / _REQUEST_RATE_TIME_CONSTANT
+        )
+        self.last_request_time = now
+
+    def on_acquired(self, wait_time: float) -> None:
+        self.acquire_wait += _SMOOTHING * (wait_time - self.acquire_wait)
+
+    def on_spawned(self, spawn_time: float) -> None:
+        self.spawn_time += _SMOOTHING * (spawn_time - self.spawn_time)
+
+    def get_request_rate(self, now: float) -> float:
+        if self.last_request_time is None:
+            return 0.0
+        elapsed = max(0.0, now - self.last_request_time)
+        return self._request_rate * math.exp(-elapsed / _REQUEST_RATE_TIME_CONSTANT)
+
+    def get_target_idle(self, now: float, idle_ttl: float) -> int:
+        """
+        Provides the number of idle processes which should be kept warm.
+        """
+        if self.last_request_time is None or now - self.last_request_time > idle_ttl:
+            return 0
+
+        target = max(1, math.ceil(self.get_request_rate(now) * self.spawn_time))
+        if self.acquire_wait > _ACQUIRE_WAIT_THRESHOLD:
+            target += 1
+        return target
+
+
+@dataclass
+class ActionPackageProcesses:
+    # The minimum number of idle processes always kept warm.
+    min_idle: int = 0
+    # The maximum number of idle processes kept (None means no limit).
+    max_idle: Optional[int] = None
+
+    def bound(self, target: int) -> int:
+        target = max(target, self.min_idle)
+        if self.max_idle is not None:
+            target = min(target, self.max_idle)
+        return target
+
+
+def parse_action_package_processes(
+    entries: Sequence[str],
+) -> Dict[str, ActionPackageProcesses]:
+    """
+    Parses the processes settings of action packages.
+
+    Args:
+        entries: Entries in the format `<action package name>=<min>:<max>`
+            (either `<min>` or `<max>` may be empty -- i.e.: `pkg=1:`, `pkg=:4`
+            -- and `pkg=<min>` is the same as `pkg=<min>:`).
+
+    Raises:
+        ActionServerValidationError: if some entry is not valid.
+    """
+    from sema4ai.action_server._errors_action_server import (
+        ActionServerValidationError,
+    )
+
+    ret: Dict[str, ActionPackageProcesses] = {}
+    for entry in entries:
+        name, sep, bounds = entry.partition("=")
+        name = name.strip()
+        min_str, _, max_str = bounds.partition(":")
+        try:
+            if not sep or not name:
+                raise ValueError()
+            min_idle = int(min_str) if min_str.strip() else 0
+            max_idle = int(max_str) if max_str.strip() else None
+            if min_idle < 0 or (max_idle is not None and max_idle < min_idle):
+                raise ValueError()
+        except ValueError:
+            raise ActionServerValidationError(
+                f"Invalid action package processes: {entry!r} (expected "
+                "`<action package name>=<min>:<max>`, with 0 <= min <= max)."
+            )
+        ret[name] = ActionPackageProcesses(min_idle, max_idle)
+    return ret
@@ -0,0 +1,104 @@
+"""
+Recycling policies of the processes reused by the `ActionsProcessPool`.
+
+When processes are reused they may keep on growing (i.e.: due to leaks in
+user libraries or caches such as browser drivers), so, when a process is
+returned to the pool it's recycled (replaced by a new process in the
+background) if it ran too many times, if its memory (RSS, including its
+subprocesses) is too big or if it's too old.
+"""
+
+import os
+import sys
+from dataclasses import dataclass
+from typing import Iterator, Optional, Set
+
+_PROC_DIR = "/proc"
+
+
+def _iter_process_tree(pid: int) -> Iterator[int]:
+    """
+    Provides the pid given and the pids of its subprocesses (requires the
+    `/proc/<pid>/task/<tid>/children` files, otherwise just the given pid is
+    provided).
+    """
+    visited: Set[int] = set()
+    pending = [pid]
+    while pending:
+        curr = pending.pop()
+        if curr in visited:
+            continue
+        visited.add(curr)
+        yield curr
+
+        task_dir = os.path.join(_PROC_DIR, str(curr), "task")
+        try:
+            tids = os.listdir(task_dir)
+        except OSError:
+            continue
+        for tid in tids:
+            try:
+                with open(os.path.join(task_dir, tid, "children")) as stream:
+                    pending.extend(int(child) for child in stream.read().split())
+            except (OSError, ValueError):
+                continue
+
+
+def get_process_rss(pid: int) -> Optional[int]:
+    """
+    Provides the RSS (in bytes) of the given process and its subprocesses.
+
+    Returns:
+        The RSS or None if it's not available (i.e.: not on Linux or the
+        process exited).
+    """
+    if not sys.platform.startswith("linux"):
+        return None
+
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    total = None
+    for curr in _iter_process_tree(pid):
+        try:
+            with open(os.path.join(_PROC_DIR, str(curr), "statm")) as stream:
+                rss_pages = int(stream.read().split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        total = (total or 0) + rss_pages * page_size
+    return total
+
+
+@dataclass
+class ProcessRecyclePolicy:
+    # The max number of runs of a process (0 means no limit).
+    max_runs: int = 0
+    # The max RSS (in bytes) of a process and its subprocesses (0 means no limit).
+    max_rss: int = 0
+    # The max age (in seconds) of a process (0 means no limit).
+    max_age: float = 0
+
+    def is_enabled(self) -> bool:
+        return bool(self.max_runs or self.max_rss or self.max_age)
+
+    def get_recycle_reason(
+        self, rss: Optional[int], run_count: int, age: float
+    ) -> Optional[str]:
+        """
+        Args:
+            rss: The RSS of the process (as provided by `get_process_rss`) or
+                None if it's not available.
+
+        Returns:
+            Why the given process should be recycled or None if it should be
+            kept.
+        """
+        if self.max_runs and run_count >= self.max_runs:
+            return f"ran {run_count} times (max: {self.max_runs})"
+
+        if self.max_age and age >= self.max_age:
+            return f"age: {age:.1f}s (max: {self.max_age}s)"
+
+        if self.max_rss and rss is not None and rss >= self.max_rss:
+            mb = 1024 * 1024
+            return f"RSS: {rss // mb}MB (max: {self.max_rss // mb}MB)"
+
+        return None
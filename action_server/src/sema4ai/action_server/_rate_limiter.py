@@ -0,0 +1,305 @@
+"""
+Rate limiter shared by the triggers and the scheduler.
+
+Each (key, window) uses a sliding window counter: only the number of hits in
+the current and in the previous (fixed) windows are kept and the number of hits
+in the last `window_seconds` is estimated by weighting the previous window by
+how much of it still overlaps the sliding window.
+
+This means that checking a limit is O(1) and that the memory used per key is
+constant (regardless of the limit or of how many hits are done), so, a burst
+of webhooks doesn't cost CPU/memory proportional to its size.
+
+The state is kept in memory (in shards, each with its own lock) and may be
+persisted to the server database (so that the limits are kept on a restart).
+"""
+import logging
+import threading
+import time
+import typing
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+if typing.TYPE_CHECKING:
+    from sema4ai.action_server._database import Database
+
+log = logging.getLogger(__name__)
+
+_N_SHARDS = 16
+
+
+class RateLimit(NamedTuple):
+    limit: int  # Max number of hits in the window.
+    window_seconds: float
+
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+
+    # The values for the most restrictive of the limits checked.
+    limit: int
+    remaining: int
+    reset_after: float  # Seconds until the current window ends.
+
+    def to_headers(self) -> Dict[str, str]:
+        import math
+
+        return {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(math.ceil(self.reset_after)),
+        }
+
+
+class _WindowCounter:
+    __slots__ = ["window_start", "current_count", "previous_count"]
+
+    def __init__(
+        self, window_start: float, current_count: int = 0, previous_count: int = 0
+    ):
+        self.window_start = window_start
+        self.current_count = current_count
+        self.previous_count = previous_count
+
+    def advance(self, window_seconds: float, now: float) -> None:
+        window_start = now - (now % window_seconds)
+        elapsed_windows = round((window_start - self.window_start) / window_seconds)
+        if elapsed_windows <= 0:
+            return
+        if elapsed_windows == 1:
+            self.previous_count = self.current_count
+        else:
+            self.previous_count = 0
+        self.current_count = 0
+        self.window_start = window_start
+
+    def estimate(self, window_seconds: float, now: float) -> float:
+        previous_weight = 1.0 - (now - self.window_start) / window_seconds
+        return self.previous_count * previous_weight + self.current_count
+
+
+class _Shard:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        # key -> window_seconds -> counter
+        self.counters: Dict[str, Dict[float, _WindowCounter]] = {}
+        self.dirty: Set[str] = set()
+        self.removed: Set[str] = set()
+
+
+class RateLimiter:
+    def __init__(self, n_shards: int = _N_SHARDS) -> None:
+        self._shards = [_Shard() for _i in range(n_shards)]
+
+    def _get_shard(self, key: str) -> _Shard:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def _get_counters(
+        self, shard: _Shard, key: str, limits: Sequence[RateLimit], now: float
+    ) -> List[Tuple[RateLimit, _WindowCounter]]:
+        windows = shard.counters.get(key)
+        if windows is None:
+            windows = shard.counters[key] = {}
+
+        ret = []
+        for rate_limit in limits:
+            window_seconds = float(rate_limit.window_seconds)
+            counter = windows.get(window_seconds)
+            if counter is None:
+                counter = windows[window_seconds] = _WindowCounter(
+                    now - (now % window_seconds)
+                )
+            else:
+                counter.advance(window_seconds, now)
+            ret.append((rate_limit, counter))
+        return ret
+
+    def _acquire(
+        self, key: str, limits: Sequence[RateLimit], now: Optional[float], hit: str
+    ) -> RateLimitResult:
+        if now is None:
+            now = time.time()
+
+        shard = self._get_shard(key)
+        with shard.lock:
+            counters = self._get_counters(shard, key, limits, now)
+            estimates = [
+                counter.estimate(rate_limit.window_seconds, now)
+                for rate_limit, counter in counters
+            ]
+            allowed = all(
+                estimate + 1 <= rate_limit.limit
+                for (rate_limit, _counter), estimate in zip(counters, estimates)
+            )
+            if hit == "always" or (hit == "if_allowed" and allowed):
+                for _rate_limit, counter in counters:
+                    counter.current_count += 1
+                estimates = [estimate + 1 for estimate in estimates]
+                shard.dirty.add(key)
+                shard.removed.discard(key)
+
+        result = None
+        for (rate_limit, counter), estimate in zip(counters, estimates):
+            remaining = max(0, int(rate_limit.limit - estimate))
+            reset_after = counter.window_start + rate_limit.window_seconds - now
+            if result is None or remaining < result.remaining:
+                result = RateLimitResult(
+                    allowed, rate_limit.limit, remaining, reset_after
+                )
+        assert result is not None, "At least one rate limit must be given."
+        return result
+
+    def acquire(
+        self, key: str, limits: Sequence[RateLimit], now: Optional[float] = None
+    ) -> RateLimitResult:
+        """
+        Checks whether a hit is allowed for all the given limits and records
+        it if it is (atomically).
+
+        Args:
+            key: The entity being rate limited (i.e.: "trigger:<trigger_id>").
+            limits: The limits to check.
+            now: The current time (epoch seconds).
+        """
+        return self._acquire(key, limits, now, hit="if_allowed")
+
+    def check(
+        self, key: str, limits: Sequence[RateLimit], now: Optional[float] = None
+    ) -> RateLimitResult:
+        """
+        Checks whether a hit is allowed for all the given limits (without
+        recording it).
+        """
+        return self._acquire(key, limits, now, hit="never")
+
+    def hit(
+        self, key: str, limits: Sequence[RateLimit], now: Optional[float] = None
+    ) -> RateLimitResult:
+        """
+        Records a hit (regardless of whether it's allowed).
+        """
+        return self._acquire(key, limits, now, hit="always")
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the state of the given key (i.e.: when the related entity is
+        deleted).
+        """
+        shard = self._get_shard(key)
+        with shard.lock:
+            shard.counters.pop(key, None)
+            shard.dirty.discard(key)
+            shard.removed.add(key)
+
+    def load(self, db: "Database") -> None:
+        """
+        Loads the state persisted in the database (expected to be called with
+        the db connected).
+        """
+        from sema4ai.action_server._models import RateLimitState
+
+        states = db.all(RateLimitState)
+        for state in states:
+            shard = self._get_shard(state.key)
+            with shard.lock:
+                windows = shard.counters.setdefault(state.key, {})
+                windows[float(state.window_seconds)] = _WindowCounter(
+                    state.window_start, state.current_count, state.previous_count
+                )
+        log.debug("Loaded the state of %s rate limit window(s).", len(states))
+
+    def flush(self, db: "Database") -> None:
+        """
+        Persists the state changed since the last flush in the database
+        (expected to be called with the db connected).
+        """
+        upserts: List[tuple] = []
+        removed: List[str] = []
+
+        for shard in self._shards:
+            with shard.lock:
+                for key in shard.dirty:
+                    for window_seconds, counter in shard.counters[key].items():
+                        upserts.append(
+                            (
+                                f"{key}/{window_seconds:g}",
+                                key,
+                                window_seconds,
+                                counter.window_start,
+                                counter.current_count,
+                                counter.previous_count,
+                            )
+                        )
+                removed.extend(shard.removed)
+                shard.dirty.clear()
+                shard.removed.clear()
+
+        if not upserts and not removed:
+            return
+
+        with db.transaction():
+            for key in removed:
+                db.execute("DELETE FROM rate_limit_state WHERE key = ?", [key])
+            for values in upserts:
+                db.execute(
+                    "INSERT OR REPLACE INTO rate_limit_state(id, key, window_seconds, "
+                    "window_start, current_count, previous_count) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    list(values),
+                )
+
+
+_global_rate_limiter: Optional[RateLimiter] = None
+_global_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get the global rate limiter (shared by the triggers and the scheduler)."""
+    global _global_rate_limiter
+    if _global_rate_limiter is None:
+        with _global_rate_limiter_lock:
+            if _global_rate_limiter is None:
+                _global_rate_limiter = RateLimiter()
+    return _global_rate_limiter
+
+
+def set_rate_limiter(rate_limiter: Optional[RateLimiter]) -> None:
+    """Set the global rate limiter."""
+    global _global_rate_limiter
+    _global_rate_limiter = rate_limiter
+
+
+async def persist_rate_limits(interval: float) -> None:
+    """
+    Loads the persisted rate limits state and then periodically persists the
+    changes (until cancelled, at which point a last flush is done).
+    """
+    import asyncio
+
+    from sema4ai.action_server._db_executor import run_in_db_executor
+    from sema4ai.action_server._models import get_db
+
+    rate_limiter = get_rate_limiter()
+
+    def load() -> None:
+        db = get_db()
+        with db.connect():
+            rate_limiter.load(db)
+
+    def flush() -> None:
+        db = get_db()
+        with db.connect():
+            rate_limiter.flush(db)
+
+    await run_in_db_executor(load)
+    try:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await run_in_db_executor(flush)
+            except Exception:
+                log.exception("Error persisting the rate limits state.")
+    finally:
+        try:
+            flush()
+        except Exception:
+            log.exception("Error persisting the rate limits state.")
@@ -3,6 +3,7 @@ import logging
 import os
 import subprocess
 import sys
+import threading
 import time
 from contextlib import contextmanager
 from pathlib import Path
@@ -37,6 +38,10 @@ class Rcc(object):
         self.config_location = os.environ.get(
             "S4_ACTION_SERVER_RCC_CONFIG_LOCATION", ""
         )
+        # Packages sharing the same environment may be imported concurrently
+        # (the environment must be created just once).
+        self._env_locks_lock = threading.Lock()
+        self._env_locks: Dict[str, threading.Lock] = {}
 
     def _compute_env(self):
         env = os.environ.copy()
@@ -239,44 +244,52 @@ class Rcc(object):
         rebuilt and the command will need to be called again.
         """
 
-        env_info_dir = datadir / "env-info"
-        env_info_dir.mkdir(parents=True, exist_ok=True)
-
-        env_info_cache_file = env_info_dir / f"{package_yaml_hash}.json"
-        if env_info_cache_file.exists():
-            try:
-                contents = env_info_cache_file.read_text(encoding="utf-8")
-                if contents:
-                    loaded = json.loads(contents)
-                    loaded["lastUsage"] = self._get_curr_time_as_str()
-                    env_info = EnvInfo(loaded["environ"])
-                    python_exe = env_info.env.get("PYTHON_EXE")
-                    if not python_exe or not os.path.exists(python_exe):
-                        os.remove(env_info_cache_file)
-                    else:
-                        return ActionResult(True, None, env_info)
-            except Exception:
-                return ActionResult(
-                    success=False,
-                    message=(
-                        f"It was not possible to get the environment info from:\n{env_info_cache_file}\n"
-                        "to proceed delete that file or fix it (note: if the caches\n"
-                        "were cleared they will need to be cleared again after restoring\n"
-                        "the environment)."
-                    ),
-                )
+        with self._get_env_lock(package_yaml_hash):
+            env_info_dir = datadir / "env-info"
+            env_info_dir.mkdir(parents=True, exist_ok=True)
+
+            env_info_cache_file = env_info_dir / f"{package_yaml_hash}.json"
+            if env_info_cache_file.exists():
+                try:
+                    contents = env_info_cache_file.read_text(encoding="utf-8")
+                    if contents:
+                        loaded = json.loads(contents)
+                        loaded["lastUsage"] = self._get_curr_time_as_str()
+                        env_info = EnvInfo(loaded["environ"])
+                        python_exe = env_info.env.get("PYTHON_EXE")
+                        if not python_exe or not os.path.exists(python_exe):
+                            os.remove(env_info_cache_file)
+                        else:
+                            return ActionResult(True, None, env_info)
+                except Exception:
+                    return ActionResult(
+                        success=False,
+                        message=(
+                            f"It was not possible to get the environment info from:\n{env_info_cache_file}\n"
+                            "to proceed delete that file or fix it (note: if the caches\n"
+                            "were cleared they will need to be cleared again after restoring\n"
+                            "the environment)."
+                        ),
+                    )
 
-        env_info_result = self._create_env_and_get_vars(
-            package_yaml, package_yaml_hash, devenv
-        )
-        if env_info_result.success:
-            assert isinstance(env_info_result.result, EnvInfo)
-            dump = {
-                "environ": env_info_result.result.env,
-                "lastUsage": self._get_curr_time_as_str(),
-            }
-            env_info_cache_file.write_text(json.dumps(dump), encoding="utf-8")
-        return env_info_result
+            env_info_result = self._create_env_and_get_vars(
+                package_yaml, package_yaml_hash, devenv
+            )
+            if env_info_result.success:
+                assert isinstance(env_info_result.result, EnvInfo)
+                dump = {
+                    "environ": env_info_result.result.env,
+                    "lastUsage": self._get_curr_time_as_str(),
+                }
+                env_info_cache_file.write_text(json.dumps(dump), encoding="utf-8")
+            return env_info_result
+
+    def _get_env_lock(self, package_yaml_hash: str) -> threading.Lock:
+        with self._env_locks_lock:
+            lock = self._env_locks.get(package_yaml_hash)
+            if lock is None:
+                lock = self._env_locks[package_yaml_hash] = threading.Lock()
+            return lock
 
     def _get_curr_time_as_str(self):
         from datetime import datetime
@@ -0,0 +1,209 @@
+"""
+Rollups of the finished runs (used by the analytics).
+
+Instead of aggregating the whole `run` table on each analytics request, the
+stats of the finished runs are kept per day x action x status in the
+`run_rollup` table (count, run time sum/min/max and a run time histogram).
+
+A run is added to the rollups when it finishes (in the same transaction in
+which its final status is written). The runs which finished before the rollups
+existed are added by a one-time backfill (done in the migration which created
+the table).
+"""
+
+import json
+import typing
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+from sema4ai.action_server._models import RunStatus
+
+if typing.TYPE_CHECKING:
+    from sema4ai.action_server._database import Database
+    from sema4ai.action_server._models import Run
+
+# Upper bounds (in seconds, inclusive) of the run time histogram buckets (there's
+# an additional bucket for the run times above the last bound).
+RUN_TIME_HISTOGRAM_BOUNDS: Tuple[float, ...] = (
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    30,
+    60,
+    300,
+    900,
+)
+
+FINISHED_RUN_STATUSES = (RunStatus.PASSED, RunStatus.FAILED, RunStatus.CANCELLED)
+
+_ADD_FINISHED_RUN_SQL = """
+INSERT INTO run_rollup(
+    id, day, action_id, status, run_count, run_time_count, run_time_sum,
+    run_time_min, run_time_max, run_time_histogram
+) VALUES (
+    date(?) || '/' || ? || '/' || ?, date(?), ?, ?, 1, ?, ?, ?, ?, ?
+)
+ON CONFLICT(id) DO UPDATE SET
+    run_count = run_count + 1,
+    run_time_count = run_time_count + excluded.run_time_count,
+    run_time_sum = run_time_sum + excluded.run_time_sum,
+    run_time_min = COALESCE(
+        MIN(run_time_min, excluded.run_time_min), run_time_min, excluded.run_time_min
+    ),
+    run_time_max = COALESCE(
+        MAX(run_time_max, excluded.run_time_max), run_time_max, excluded.run_time_max
+    ),
+    run_time_histogram = CASE
+        WHEN ? IS NULL THEN run_time_histogram
+        ELSE json_set(
+            run_time_histogram,
+            '$[' || ? || ']',
+            json_extract(run_time_histogram, '$[' || ? || ']') + 1
+        )
+    END
+"""
+
+
+def get_run_time_bucket(run_time: float) -> int:
+    """
+    Provides the index of the histogram bucket of the given run time.
+    """
+    return bisect_left(RUN_TIME_HISTOGRAM_BOUNDS, run_time)
+
+
+def _new_histogram() -> List[int]:
+    return [0] * (len(RUN_TIME_HISTOGRAM_BOUNDS) + 1)
+
+
+def _histogram_to_json(histogram: List[int]) -> str:
+    # Compact (as written by `json_set` when updated in the db).
+    return json.dumps(histogram, separators=(",", ":"))
+
+
+def add_finished_run(db: "Database", run: "Run") -> None:
+    """
+    Adds a finished run to the rollups.
+
+    Note: must be called in the transaction in which the run (final) status is
+    written (so that the rollups are always consistent with the runs).
+    """
+    bucket: Optional[int] = None
+    histogram = _new_histogram()
+    if run.run_time is not None:
+        bucket = get_run_time_bucket(run.run_time)
+        histogram[bucket] = 1
+
+    # Note: positional placeholders (the values used more than once in the
+    # sql are repeated).
+    key = [run.start_time, run.action_id, run.status]
+    db.execute(
+        _ADD_FINISHED_RUN_SQL,
+        [
+            *key,
+            *key,
+            0 if run.run_time is None else 1,
+            run.run_time or 0.0,
+            run.run_time,
+            run.run_time,
+            _histogram_to_json(histogram),
+            bucket,
+            bucket,
+            bucket,
+        ],
+    )
+
+
+def backfill_run_rollups(db: "Database") -> None:
+    """
+    Rebuilds the rollups from the finished runs in the `run` table.
+
+    Note: must be called in a transaction.
+    """
+    from sema4ai.action_server._models import RunRollup
+
+    bucket_case = " ".join(
+        f"WHEN run_time <= {bound!r} THEN {i}"
+        for i, bound in enumerate(RUN_TIME_HISTOGRAM_BOUNDS)
+    )
+    with db.cursor() as cursor:
+        # Note: grouped by the bucket too (the histogram is built afterwards).
+        db.execute_query(
+            cursor,
+            f"""
+            SELECT
+                date(start_time),
+                action_id,
+                status,
+                CASE
+                    WHEN run_time IS NULL THEN NULL
+                    {bucket_case}
+                    ELSE {len(RUN_TIME_HISTOGRAM_BOUNDS)}
+                END AS bucket,
+                COUNT(*),
+                COUNT(run_time),
+                TOTAL(run_time),
+                MIN(run_time),
+                MAX(run_time)
+            FROM run
+            WHERE status IN (?, ?, ?)
+            GROUP BY 1, 2, 3, 4
+            """,
+            list(FINISHED_RUN_STATUSES),
+        )
+        rows = cursor.fetchall()
+
+    id_to_rollup: Dict[str, RunRollup] = {}
+    id_to_histogram: Dict[str, List[int]] = {}
+    for (
+        day,
+        action_id,
+        status,
+        bucket,
+        run_count,
+        run_time_count,
+        run_time_sum,
+        run_time_min,
+        run_time_max,
+    ) in rows:
+        rollup_id = f"{day}/{action_id}/{status}"
+        rollup = id_to_rollup.get(rollup_id)
+        if rollup is None:
+            rollup = id_to_rollup[rollup_id] = RunRollup(
+                id=rollup_id,
+                day=day,
+                action_id=action_id,
+                status=status,
+                run_count=0,
+                run_time_count=0,
+                run_time_sum=0.0,
+                run_time_min=None,
+                run_time_max=None,
+                run_time_histogram="",
+            )
+            id_to_histogram[rollup_id] = _new_histogram()
+
+        rollup.run_count += run_count
+        rollup.run_time_count += run_time_count
+        rollup.run_time_sum += run_time_sum
+        if run_time_min is not None:
+            rollup.run_time_min = (
+                run_time_min
+                if rollup.run_time_min is None
+                else min(rollup.run_time_min, run_time_min)
+            )
+            rollup.run_time_max = (
+                run_time_max
+                if rollup.run_time_max is None
+                else max(rollup.run_time_max, run_time_max)
+            )
+        if bucket is not None:
+            id_to_histogram[rollup_id][bucket] += run_count
+
+    db.execute("DELETE FROM run_rollup")
+    for rollup_id, rollup in id_to_rollup.items():
+        rollup.run_time_histogram = _histogram_to_json(id_to_histogram[rollup_id])
+        db.insert(rollup)
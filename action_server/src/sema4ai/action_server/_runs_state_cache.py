@@ -9,11 +9,12 @@ import threading
 import typing
 from contextlib import contextmanager
 from dataclasses import asdict, dataclass
-from typing import Any, Dict, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional, Sequence
 
 if typing.TYPE_CHECKING:
     from ._database import Database
     from ._models import Run
+    from ._runs_writer import RunsWriter
 
 
 log = logging.getLogger(__name__)
@@ -49,7 +50,7 @@ class RunRuntimeInfo:
 
 
 class RunsState:
-    def __init__(self, db: "Database"):
+    def __init__(self, db: "Database", runs_writer: Optional["RunsWriter"] = None):
         # Clients that want to register/unregister must use this semaphore
         # to avoid racing conditions.
         #
@@ -72,6 +73,42 @@ class RunsState:
         self._db = db
         self._run_id_to_runtime_info: dict[str, RunRuntimeInfo] = {}
 
+        # When set, run changes are written to the db by this writer (in group
+        # commits), so, changes which still weren't committed must be gotten
+        # from it.
+        self.runs_writer = runs_writer
+
+        # The last `Run.change_seq` provided (loaded from the db on first use).
+        self._change_seq: Optional[int] = None
+        self._change_seq_lock = threading.Lock()
+
+    def next_change_seq(self) -> int:
+        """
+        Provides the `change_seq` to be set in a run which is being inserted
+        or changed.
+        """
+        with self._change_seq_lock:
+            if self._change_seq is None:
+                self._change_seq = self._load_last_change_seq()
+            self._change_seq += 1
+            return self._change_seq
+
+    def get_last_change_seq(self) -> int:
+        """
+        Provides the `change_seq` of the last change done in a run.
+        """
+        with self._change_seq_lock:
+            if self._change_seq is None:
+                self._change_seq = self._load_last_change_seq()
+            return self._change_seq
+
+    def _load_last_change_seq(self) -> int:
+        db = self._db
+        with db.connect(), db.cursor() as cursor:
+            db.execute_query(cursor, "SELECT MAX(change_seq) FROM run")
+            row = cursor.fetchone()
+        return (row[0] if row else None) or 0
+
     def get_current_run_state(self, offset: int = 0, limit: int = 200) -> list["Run"]:
         from ._database import Database
         from ._models import Run
@@ -81,11 +118,107 @@ class RunsState:
         ), "Clients getting the current run state must acquire the semaphore."
         db: Database = self._db
 
+        if self.runs_writer is not None:
+            # Wait for the pending changes (at most a group commit interval).
+            self.runs_writer.flush()
+
         with db.connect():
             return self._db.all(
                 Run, offset=offset, limit=limit, order_by="numbered_id DESC"
             )
 
+    def get_runs_changed_since(self, change_seq: int, limit: int) -> list["Run"]:
+        """
+        Provides the runs changed after the given `change_seq` (in the order
+        in which those were changed).
+
+        Args:
+            limit: The max number of runs to be returned.
+        """
+        from ._models import Run
+
+        assert (
+            self.semaphore._value == 0
+        ), "Clients getting the current run state must acquire the semaphore."
+        db = self._db
+
+        if self.runs_writer is not None:
+            # Wait for the pending changes (at most a group commit interval).
+            self.runs_writer.flush()
+
+        with db.connect():
+            return db.select(
+                Run,
+                "SELECT * FROM run WHERE change_seq > ? ORDER BY change_seq LIMIT ?",
+                [change_seq, limit],
+            )
+
+    def list_runs(
+        self,
+        *,
+        before: Optional[int] = None,
+        limit: int = 200,
+        run_type: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Lists the runs (newest first) with keyset pagination on the
+        `numbered_id`.
+
+        Args:
+            before: If given only runs with a `numbered_id` lower than this
+                one are provided (i.e.: the `numbered_id` of the last run of
+                the previous page).
+            limit: The max number of runs to be returned.
+            run_type: If given only runs of this type are provided.
+            fields: The fields (columns) to be provided (all if not given).
+
+        Raises:
+            ValueError: if some field is not a `Run` field.
+        """
+        import dataclasses
+
+        from ._models import Run
+
+        assert (
+            self.semaphore._value == 0
+        ), "Clients getting the current run state must acquire the semaphore."
+
+        all_fields = [f.name for f in dataclasses.fields(Run)]
+        if fields:
+            for field in fields:
+                if field not in all_fields:
+                    raise ValueError(f"Invalid run field: {field!r}")
+            # Keep the declaration order.
+            columns = [f for f in all_fields if f in fields]
+        else:
+            columns = all_fields
+
+        where = []
+        values: List[Any] = []
+        if before is not None:
+            where.append("numbered_id < ?")
+            values.append(before)
+        if run_type:
+            where.append("run_type = ?")
+            values.append(run_type)
+
+        # Note: the columns were validated above (can't be used for injection).
+        sql = f"SELECT {', '.join(columns)} FROM run"
+        if where:
+            sql += f" WHERE {' AND '.join(where)}"
+        sql += " ORDER BY numbered_id DESC LIMIT ?"
+        values.append(limit)
+
+        if self.runs_writer is not None:
+            # Wait for the pending changes (at most a group commit interval).
+            self.runs_writer.flush()
+
+        db = self._db
+        with db.connect(), db.cursor() as cursor:
+            db.execute_query(cursor, sql, values)
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
     def get_run_from_id(self, run_id: str) -> "Run":
         """
         Returns the run associated with the run id (or throws a KeyError if not found).
@@ -99,6 +232,11 @@ class RunsState:
         ), "Clients getting the current run state must acquire the semaphore."
         db: Database = self._db
 
+        if self.runs_writer is not None:
+            run = self.runs_writer.get_pending_run(run_id)
+            if run is not None:
+                return run
+
         with db.connect():
             return db.first(Run, "SELECT * FROM run WHERE id = ?", [run_id])
 
@@ -115,6 +253,11 @@ class RunsState:
         ), "Clients getting the current run state must acquire the semaphore."
         db: Database = self._db
 
+        if self.runs_writer is not None:
+            run = self.runs_writer.get_pending_run_by_request_id(request_id)
+            if run is not None:
+                return run
+
         with db.connect():
             return db.first(Run, "SELECT * FROM run WHERE request_id = ?", [request_id])
 
@@ -188,13 +331,28 @@ _runs_state: Optional[RunsState] = None
 
 
 @contextmanager
-def use_runs_state_ctx(db: "Database"):
+def use_runs_state_ctx(db: "Database", group_commit: bool = False):
+    """
+    Args:
+        group_commit: If True, run changes are written to the db by a single
+            writer thread which coalesces them into group commits (otherwise
+            each change is committed in the thread that does it).
+    """
     global _runs_state
-    _runs_state = RunsState(db)
+
+    runs_writer: Optional["RunsWriter"] = None
+    if group_commit:
+        from ._runs_writer import RunsWriter
+
+        runs_writer = RunsWriter(db)
+        runs_writer.start()
+
+    _runs_state = RunsState(db, runs_writer)
     try:
         yield _runs_state
     finally:
-        pass
+        if runs_writer is not None:
+            runs_writer.stop()
     _runs_state = None
 
 
@@ -0,0 +1,243 @@
+"""
+Write-behind queue for the runs state (used when `--db-durability=group`).
+
+Instead of committing each run insertion/status change in its own transaction
+(in the thread which changed it), the changes are queued to a single writer
+thread which owns its connection and coalesces the changes done in the last
+few milliseconds into a single (group) commit.
+
+Until a change is committed, the latest state of the run is kept in memory so
+that `RunsState` can still provide read-your-writes semantics.
+"""
+import dataclasses
+import logging
+import threading
+import time
+import typing
+from typing import Dict, List, Optional, Set
+
+if typing.TYPE_CHECKING:
+    from ._database import Database
+    from ._models import Run
+
+log = logging.getLogger(__name__)
+
+
+class _PendingRun:
+    __slots__ = ["run", "insert", "fields", "finished"]
+
+    def __init__(self, run: "Run", insert: bool):
+        # Snapshot with the latest state of the run.
+        self.run = run
+        # Whether the run must still be inserted in the db.
+        self.insert = insert
+        # The fields which must be updated (when not inserting).
+        self.fields: Set[str] = set()
+        # Whether the run finished (and must be added to the rollups).
+        self.finished = False
+
+
+class RunsWriter:
+    # Time (in seconds) that the writer waits to collect more changes after
+    # receiving a change (before committing).
+    GROUP_COMMIT_INTERVAL = 0.005
+
+    def __init__(self, db: "Database"):
+        self._db = db
+        self._lock = threading.Condition()
+
+        # Run id -> pending changes (the dict order is the insertion order,
+        # which is the order in which runs must be inserted in the db).
+        self._pending: Dict[str, _PendingRun] = {}
+        # Runs being committed right now (still needed for read-your-writes).
+        self._committing: Dict[str, _PendingRun] = {}
+
+        # Used to know when some change was committed (for `flush()`).
+        self._enqueued_seq = 0
+        self._committed_seq = 0
+
+        self._next_numbered_id = 0
+        self._max_numbered_id = 0
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        from ._models import RUN_ID_COUNTER, Counter
+
+        db = self._db
+        with db.connect():
+            counter = db.first(
+                Counter, "SELECT * FROM counter WHERE id = ?", [RUN_ID_COUNTER]
+            )
+        self._next_numbered_id = self._max_numbered_id = counter.value
+
+        self._thread = threading.Thread(
+            target=self._run, name="RunsWriter", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Commits all the pending changes and stops the writer thread.
+        """
+        with self._lock:
+            self._stopped = True
+            self._lock.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def next_numbered_id(self) -> int:
+        """
+        Provides the `numbered_id` for a new run (the related counter in the db
+        is updated when the runs are committed).
+        """
+        with self._lock:
+            self._next_numbered_id += 1
+            return self._next_numbered_id
+
+    def insert_run(self, run: "Run") -> None:
+        with self._lock:
+            self._check_not_stopped()
+            self._pending[run.id] = _PendingRun(dataclasses.replace(run), True)
+            self._on_enqueued()
+
+    def update_run(
+        self, run: "Run", fields: typing.Iterable[str], finished: bool = False
+    ) -> None:
+        """
+        Args:
+            finished: Whether this change is the one which finished the run.
+        """
+        with self._lock:
+            self._check_not_stopped()
+            pending = self._pending.get(run.id)
+            if pending is None:
+                pending = self._pending[run.id] = _PendingRun(
+                    dataclasses.replace(run), False
+                )
+            else:
+                pending.run = dataclasses.replace(run)
+            pending.fields.update(fields)
+            if finished:
+                pending.finished = True
+            self._on_enqueued()
+
+    def _check_not_stopped(self) -> None:
+        if self._stopped:
+            raise RuntimeError("Unable to write run changes: RunsWriter stopped.")
+
+    def _on_enqueued(self) -> None:
+        self._enqueued_seq += 1
+        self._lock.notify_all()
+
+    def get_pending_run(self, run_id: str) -> Optional["Run"]:
+        """
+        Returns:
+            A copy of the latest state of the run if it still wasn't committed
+            (or None if the db is up to date regarding this run).
+        """
+        with self._lock:
+            pending = self._pending.get(run_id) or self._committing.get(run_id)
+            if pending is None:
+                return None
+            return dataclasses.replace(pending.run)
+
+    def get_pending_run_by_request_id(self, request_id: str) -> Optional["Run"]:
+        with self._lock:
+            for pending_dict in (self._pending, self._committing):
+                for pending in pending_dict.values():
+                    if pending.run.request_id == request_id:
+                        return dataclasses.replace(pending.run)
+        return None
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits until all the changes enqueued up to now are committed.
+
+        Returns:
+            True if all the changes were committed and False if the timeout elapsed.
+        """
+        with self._lock:
+            target_seq = self._enqueued_seq
+            return self._lock.wait_for(
+                lambda: self._committed_seq >= target_seq or self._thread is None,
+                timeout,
+            )
+
+    def _run(self) -> None:
+        with self._db.connect():
+            while True:
+                with self._lock:
+                    self._lock.wait_for(lambda: self._pending or self._stopped)
+                    if not self._pending:
+                        # Stopped and nothing else to commit.
+                        self._committed_seq = self._enqueued_seq
+                        self._lock.notify_all()
+                        return
+
+                if not self._stopped:
+                    # Give some time for other changes to be grouped together.
+                    time.sleep(self.GROUP_COMMIT_INTERVAL)
+
+                with self._lock:
+                    self._committing = self._pending
+                    self._pending = {}
+                    seq = self._enqueued_seq
+                    max_numbered_id = self._next_numbered_id
+
+                self._commit(list(self._committing.values()), max_numbered_id)
+
+                with self._lock:
+                    self._committing = {}
+                    self._committed_seq = seq
+                    self._lock.notify_all()
+
+    def _commit(self, pending_runs: List[_PendingRun], max_numbered_id: int) -> None:
+        db = self._db
+        try:
+            with db.transaction():
+                for pending in pending_runs:
+                    self._write(pending)
+                self._update_counter(max_numbered_id)
+            return
+        except Exception:
+            log.exception(
+                "Error committing %s run change(s) in a group commit "
+                "(retrying each change in its own transaction).",
+                len(pending_runs),
+            )
+
+        for pending in pending_runs:
+            try:
+                with db.transaction():
+                    self._write(pending)
+            except Exception:
+                log.exception(f"Error writing changes of run: {pending.run.id}")
+
+        try:
+            with db.transaction():
+                self._update_counter(max_numbered_id)
+        except Exception:
+            log.exception("Error updating the runs counter.")
+
+    def _write(self, pending: _PendingRun) -> None:
+        from ._run_rollups import add_finished_run
+
+        if pending.insert:
+            self._db.insert(pending.run)
+        elif pending.fields:
+            self._db.update(pending.run, *pending.fields)
+
+        if pending.finished:
+            add_finished_run(self._db, pending.run)
+
+    def _update_counter(self, max_numbered_id: int) -> None:
+        from ._models import RUN_ID_COUNTER
+
+        if max_numbered_id > self._max_numbered_id:
+            self._db.execute(
+                "UPDATE counter SET value=MAX(value, ?) WHERE id=?",
+                [max_numbered_id, RUN_ID_COUNTER],
+            )
+            self._max_numbered_id = max_numbered_id
@@ -14,11 +14,17 @@ This module provides a full-featured embedded scheduler supporting:
 """
 
 import asyncio
+import copy
+import functools
+import heapq
 import json
 import logging
 from collections import defaultdict
 from datetime import datetime, timedelta, timezone
-from typing import Any, Callable, Dict, List, Optional, Set
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from sema4ai.action_server._db_executor import run_in_db_executor
+from sema4ai.action_server._rate_limiter import RateLimit, get_rate_limiter
 
 log = logging.getLogger(__name__)
 
@@ -51,6 +57,71 @@ def _get_pytz():
             )
 
 
+@functools.lru_cache(maxsize=256)
+def _get_timezone(timezone_str: str):
+    """Get the timezone object for an IANA timezone name (cached)."""
+    try:
+        import pytz
+        return pytz.timezone(timezone_str)
+    except ImportError:
+        from zoneinfo import ZoneInfo
+        return ZoneInfo(timezone_str)
+
+
+@functools.lru_cache(maxsize=1024)
+def _get_compiled_cron(cron_expression: str, timezone_str: str):
+    """
+    Get a croniter with the cron expression already parsed (cached).
+
+    Note: a croniter is stateful, so, it must be copied before being used.
+    """
+    croniter = _get_croniter()
+    return croniter(cron_expression, datetime.now(_get_timezone(timezone_str)))
+
+
+def _iter_cron_next(
+    cron_expression: str,
+    timezone_str: str,
+    after: datetime,
+) -> Iterator[datetime]:
+    """Iterate over the (UTC) fire times of a cron expression after a given time."""
+    tz = _get_timezone(timezone_str)
+
+    # Convert to local timezone for cron calculation
+    if after.tzinfo is None:
+        after = after.replace(tzinfo=timezone.utc)
+
+    cron = copy.copy(_get_compiled_cron(cron_expression, timezone_str))
+    cron.set_current(after.astimezone(tz), force=True)
+    while True:
+        next_local = cron.get_next(datetime)
+
+        # Convert back to UTC
+        if next_local.tzinfo is not None:
+            yield next_local.astimezone(timezone.utc)
+        else:
+            # Handle naive datetime
+            yield next_local.replace(tzinfo=timezone.utc)
+
+
+def _is_running_in_loop(loop: asyncio.AbstractEventLoop) -> bool:
+    try:
+        return asyncio.get_running_loop() is loop
+    except RuntimeError:
+        return False
+
+
+# Maximum number of schedule ids in a single `IN (...)` query.
+_MAX_IDS_PER_QUERY = 500
+
+
+def _str_to_utc_datetime(value: str) -> datetime:
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
 class ScheduleType:
     """Schedule type constants."""
     CRON = "cron"
@@ -80,7 +151,9 @@ class SchedulerEngine:
         Initialize the scheduler engine.
 
         Args:
-            check_interval: How often to check for due schedules (seconds)
+            check_interval: Maximum time the scheduler sleeps (seconds). The
+                scheduler wakes up exactly when the next schedule is due (or
+                when a schedule is changed), so, this is just an upper bound.
             max_concurrent_global: Maximum concurrent executions across all schedules
         """
         self._check_interval = check_interval
@@ -92,8 +165,23 @@ class SchedulerEngine:
         self._running_executions: Dict[str, Set[str]] = defaultdict(set)
         self._global_running_count = 0
 
-        # Rate limit tracker: schedule_id -> list of execution timestamps
-        self._rate_limit_tracker: Dict[str, List[datetime]] = defaultdict(list)
+        # Tasks dispatched by the scheduler loop (each due schedule is
+        # processed in its own task so that a slow action doesn't delay others).
+        self._dispatched_tasks: Set[asyncio.Task] = set()
+
+        # Upcoming runs: schedule_id -> next run and a min-heap with
+        # (next run, schedule_id). The db is only loaded on start (afterwards
+        # it's kept up to date through `set_next_run`). Heap entries which
+        # don't match `_next_runs` are stale and are discarded lazily.
+        self._next_runs: Dict[str, datetime] = {}
+        self._next_runs_heap: List[Tuple[datetime, str]] = []
+
+        # Set to wake up the scheduler loop (a schedule changed or a slot
+        # was released).
+        self._wakeup = asyncio.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self._rate_limiter = get_rate_limiter()
 
         # Notification callbacks
         self._on_execution_complete: List[Callable] = []
@@ -108,6 +196,8 @@ class SchedulerEngine:
             return
 
         self._running = True
+        self._loop = asyncio.get_running_loop()
+        await self._load_next_runs()
         self._task = asyncio.create_task(self._run_loop())
         log.info(
             f"Scheduler engine started (check_interval={self._check_interval}s, "
@@ -128,58 +218,289 @@ class SchedulerEngine:
                 pass
             self._task = None
 
+        dispatched_tasks = list(self._dispatched_tasks)
+        for task in dispatched_tasks:
+            task.cancel()
+        if dispatched_tasks:
+            await asyncio.gather(*dispatched_tasks, return_exceptions=True)
+
         log.info("Scheduler engine stopped")
 
     def is_running(self) -> bool:
         """Check if the scheduler is running."""
         return self._running
 
+    async def _load_next_runs(self) -> None:
+        """Load the upcoming runs from the db (the durable source)."""
+        from sema4ai.action_server._models import Schedule, get_db
+
+        def select_schedules() -> List[Schedule]:
+            db = get_db()
+            with db.connect():
+                return db.select(
+                    Schedule,
+                    """
+                    SELECT * FROM schedule
+                    WHERE enabled = 1 AND next_run_at IS NOT NULL
+                    """,
+                )
+
+        schedules = await run_in_db_executor(select_schedules)
+
+        self._next_runs.clear()
+        self._next_runs_heap.clear()
+        for schedule in schedules:
+            self.set_next_run(schedule.id, schedule.next_run_at)
+
+    def set_next_run(self, schedule_id: str, next_run_at: Optional[str]) -> None:
+        """
+        Updates the next run of a schedule in the upcoming runs.
+
+        Must be called whenever the `next_run_at` of a schedule changes or the
+        schedule is enabled/disabled/deleted (if called from another thread,
+        i.e.: the db executor, the change is applied in the scheduler loop).
+
+        Args:
+            schedule_id: The schedule which changed.
+            next_run_at: The new `next_run_at` (None if the schedule shouldn't
+                run anymore, i.e.: disabled or deleted).
+        """
+        loop = self._loop
+        if loop is not None and not _is_running_in_loop(loop):
+            try:
+                loop.call_soon_threadsafe(self._set_next_run, schedule_id, next_run_at)
+            except RuntimeError:
+                pass  # The loop is already closed.
+            return
+        self._set_next_run(schedule_id, next_run_at)
+
+    def _set_next_run(self, schedule_id: str, next_run_at: Optional[str]) -> None:
+        if next_run_at is None:
+            self._next_runs.pop(schedule_id, None)
+            return
+
+        next_run = _str_to_utc_datetime(next_run_at)
+        if self._next_runs.get(schedule_id) == next_run:
+            return
+
+        self._next_runs[schedule_id] = next_run
+        heap = self._next_runs_heap
+        heapq.heappush(heap, (next_run, schedule_id))
+
+        if len(heap) > 2 * len(self._next_runs) + 64:
+            # Too many stale entries: rebuild it.
+            heap[:] = [(v, k) for k, v in self._next_runs.items()]
+            heapq.heapify(heap)
+
+        if heap[0] == (next_run, schedule_id):
+            # It's now the first one: the loop must recompute its sleep time.
+            self._wakeup.set()
+
+    def _peek_next_run(self) -> Optional[datetime]:
+        heap = self._next_runs_heap
+        while heap:
+            next_run, schedule_id = heap[0]
+            if self._next_runs.get(schedule_id) == next_run:
+                return next_run
+            heapq.heappop(heap)
+        return None
+
+    def _pop_due_next_runs(self, now: datetime) -> List[Tuple[datetime, str]]:
+        """
+        Returns:
+            The (next run, schedule id) of the schedules which are due (which
+            are removed from the upcoming runs).
+        """
+        heap = self._next_runs_heap
+        due: List[Tuple[datetime, str]] = []
+        while True:
+            next_run = self._peek_next_run()
+            if next_run is None or next_run > now:
+                return due
+            entry = heapq.heappop(heap)
+            del self._next_runs[entry[1]]
+            due.append(entry)
+
+    def _restore_next_runs(self, next_runs: List[Tuple[datetime, str]]) -> None:
+        """
+        Adds back the given (next run, schedule id) to the upcoming runs (unless
+        the schedule next run was changed in the meanwhile).
+        """
+        for next_run, schedule_id in next_runs:
+            if schedule_id not in self._next_runs:
+                self._next_runs[schedule_id] = next_run
+                heapq.heappush(self._next_runs_heap, (next_run, schedule_id))
+
+    def _get_sleep_time(self) -> float:
+        if self._global_running_count >= self._max_concurrent_global:
+            # Nothing can be dispatched until a slot is released.
+            return self._check_interval
+
+        next_run = self._peek_next_run()
+        if next_run is None:
+            return self._check_interval
+
+        delay = (next_run - datetime.now(timezone.utc)).total_seconds()
+        return min(delay, self._check_interval)
+
     async def _run_loop(self) -> None:
         """Main scheduler loop."""
         while self._running:
             try:
+                self._wakeup.clear()
+                sleep_time = self._get_sleep_time()
+                if sleep_time > 0:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), sleep_time)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
                 await self._check_and_execute_schedules()
             except asyncio.CancelledError:
                 break
             except Exception:
                 log.exception("Error in scheduler loop")
-
-            await asyncio.sleep(self._check_interval)
+                await asyncio.sleep(self._check_interval)
 
     async def _check_and_execute_schedules(self) -> None:
-        """Check for due schedules and execute them."""
+        """
+        Check for due schedules and dispatch their execution.
+
+        Each due schedule is claimed (its `next_run_at` is advanced right away)
+        and then processed in its own task (bounded by `max_concurrent_global`),
+        so, this doesn't wait for the executions to finish.
+        """
         from sema4ai.action_server._database import datetime_to_str
         from sema4ai.action_server._models import Schedule, get_db
 
         now = datetime.now(timezone.utc)
-        now_str = datetime_to_str(now)
+        due_next_runs = self._pop_due_next_runs(now)
+        if not due_next_runs:
+            return
+        due_schedule_ids = [schedule_id for _, schedule_id in due_next_runs]
 
-        db = get_db()
-        with db.connect():
-            # Find all enabled schedules where next_run_at <= now
-            schedules = db.select(
-                Schedule,
-                """
-                SELECT * FROM schedule
-                WHERE enabled = 1
-                  AND next_run_at IS NOT NULL
-                  AND next_run_at <= ?
-                ORDER BY priority DESC, next_run_at ASC
-                """,
-                [now_str],
-            )
+        def select_schedules() -> List[Schedule]:
+            schedules: List[Schedule] = []
+            db = get_db()
+            with db.connect():
+                for i in range(0, len(due_schedule_ids), _MAX_IDS_PER_QUERY):
+                    chunk = due_schedule_ids[i : i + _MAX_IDS_PER_QUERY]
+                    schedules.extend(
+                        db.select(
+                            Schedule,
+                            f"""
+                            SELECT * FROM schedule
+                            WHERE id IN ({", ".join("?" * len(chunk))})
+                            """,
+                            chunk,
+                        )
+                    )
+            return schedules
 
+        try:
+            schedules = await run_in_db_executor(select_schedules)
+        except BaseException:
+            # i.e.: database is locked: they must still be checked afterwards.
+            self._restore_next_runs(due_next_runs)
+            raise
+
+        schedules.sort(key=lambda schedule: (-schedule.priority, schedule.next_run_at))
         for schedule in schedules:
+            if not schedule.enabled or not schedule.next_run_at:
+                continue
+
+            if _str_to_utc_datetime(schedule.next_run_at) > now:
+                # Changed in the meanwhile (it's not due anymore).
+                self.set_next_run(schedule.id, schedule.next_run_at)
+                continue
+
+            # Check global concurrent limit (schedules which are not claimed
+            # are kept due and are dispatched when a slot is released).
+            if self._global_running_count >= self._max_concurrent_global:
+                log.debug(
+                    f"Schedule {schedule.id}: not dispatched - global limit reached"
+                )
+                self.set_next_run(schedule.id, schedule.next_run_at)
+                continue
+
             try:
-                await self._process_schedule(schedule, now)
+                if not await run_in_db_executor(self._claim_schedule, schedule, now):
+                    continue
             except Exception:
-                log.exception(f"Error processing schedule {schedule.id} ({schedule.name})")
+                log.exception(f"Error claiming schedule {schedule.id} ({schedule.name})")
+                # Retried after the check interval (its `next_run_at` is in the
+                # past, so, retrying right away would just spin on db errors).
+                retry_at = now + timedelta(seconds=self._check_interval)
+                self.set_next_run(schedule.id, datetime_to_str(retry_at))
+                continue
+
+            # The slot is reserved right away (and released when the
+            # dispatched task finishes).
+            self._global_running_count += 1
+            task = asyncio.create_task(self._dispatch_schedule(schedule, now))
+            self._dispatched_tasks.add(task)
+            task.add_done_callback(self._dispatched_tasks.discard)
+
+    def _claim_schedule(self, schedule: "Schedule", now: datetime) -> bool:
+        """
+        Claims a due schedule by advancing its `next_run_at` (only if it still
+        has the `next_run_at` which was loaded, so, a tick is never claimed
+        more than once).
+
+        Note: blocking (should be called in the db executor).
+
+        Returns:
+            True if the schedule was claimed and should be processed.
+        """
+        from sema4ai.action_server._database import datetime_to_str
+        from sema4ai.action_server._models import Schedule, get_db
+
+        next_run = self.compute_next_run(schedule, now)
+        next_run_at = datetime_to_str(next_run) if next_run else None
+
+        db = get_db()
+        with db.connect():
+            with db.transaction(), db.cursor() as cursor:
+                db.execute_update_returning(
+                    cursor,
+                    """
+                    UPDATE schedule SET next_run_at = ?, updated_at = ?
+                    WHERE id = ? AND enabled = 1 AND next_run_at = ?
+                    """,
+                    [next_run_at, datetime_to_str(now), schedule.id, schedule.next_run_at],
+                )
+                claimed = cursor.rowcount == 1
+
+            if not claimed:
+                # Changed by someone else: resync with the db.
+                log.debug(f"Schedule {schedule.id}: already claimed")
+                current = db.select(
+                    Schedule, "SELECT * FROM schedule WHERE id = ?", [schedule.id]
+                )
+                if current and current[0].enabled:
+                    self.set_next_run(schedule.id, current[0].next_run_at)
+                return False
+
+        self.set_next_run(schedule.id, next_run_at)
+        return True
+
+    async def _dispatch_schedule(self, schedule: "Schedule", now: datetime) -> None:
+        """Process a claimed schedule (the global slot is already reserved)."""
+        try:
+            await self._process_schedule(schedule, now)
+        except Exception:
+            log.exception(f"Error processing schedule {schedule.id} ({schedule.name})")
+        finally:
+            self._global_running_count -= 1
+            self._wakeup.set()
 
     async def _process_schedule(
         self, schedule: "Schedule", now: datetime
     ) -> None:
         """
-        Process a single schedule - check constraints and execute if allowed.
+        Process a single (claimed) schedule - check constraints and execute
+        if allowed.
 
         Args:
             schedule: The schedule to process
@@ -196,13 +517,6 @@ class SchedulerEngine:
         from sema4ai.action_server._database import datetime_to_str
         from sema4ai.action_server._gen_ids import gen_uuid
 
-        schedule_id = schedule.id
-
-        # Check global concurrent limit
-        if self._global_running_count >= self._max_concurrent_global:
-            log.debug(f"Schedule {schedule_id}: skipped - global limit reached")
-            return
-
         # Check concurrent execution limit for this schedule
         if not await self._check_concurrent_limit(schedule):
             await self._record_skip(
@@ -226,7 +540,7 @@ class SchedulerEngine:
 
         # All checks passed - execute the schedule
         execution_id = gen_uuid("schedule_execution")
-        await self._execute_schedule(schedule, execution_id, now)
+        await self._execute_schedule(schedule, execution_id, now, claimed=True)
 
     async def _check_concurrent_limit(self, schedule: "Schedule") -> bool:
         """Check if the schedule's concurrent execution limit allows execution."""
@@ -245,40 +559,28 @@ class SchedulerEngine:
         self, schedule: "Schedule", now: datetime
     ) -> bool:
         """Check if the schedule's rate limits allow execution."""
-        if not schedule.rate_limit_enabled:
+        limits = self._get_rate_limits(schedule)
+        if not limits:
             return True
 
-        # Clean up old entries
-        hour_ago = now - timedelta(hours=1)
-        day_ago = now - timedelta(days=1)
-
-        timestamps = self._rate_limit_tracker[schedule.id]
-        self._rate_limit_tracker[schedule.id] = [
-            ts for ts in timestamps if ts > day_ago
-        ]
-        timestamps = self._rate_limit_tracker[schedule.id]
-
-        # Check hourly limit
-        if schedule.rate_limit_max_per_hour:
-            hourly_count = sum(1 for ts in timestamps if ts > hour_ago)
-            if hourly_count >= schedule.rate_limit_max_per_hour:
-                log.debug(
-                    f"Schedule {schedule.id}: hourly rate limit reached "
-                    f"({hourly_count}/{schedule.rate_limit_max_per_hour})"
-                )
-                return False
-
-        # Check daily limit
-        if schedule.rate_limit_max_per_day:
-            daily_count = len(timestamps)
-            if daily_count >= schedule.rate_limit_max_per_day:
-                log.debug(
-                    f"Schedule {schedule.id}: daily rate limit reached "
-                    f"({daily_count}/{schedule.rate_limit_max_per_day})"
-                )
-                return False
+        rate_limit = self._rate_limiter.check(
+            get_schedule_rate_limit_key(schedule.id), limits, now.timestamp()
+        )
+        if not rate_limit.allowed:
+            log.debug(
+                f"Schedule {schedule.id}: rate limit reached "
+                f"(limit: {rate_limit.limit}, resets in {rate_limit.reset_after:.0f}s)"
+            )
+        return rate_limit.allowed
 
-        return True
+    def _get_rate_limits(self, schedule: "Schedule") -> List[RateLimit]:
+        limits: List[RateLimit] = []
+        if schedule.rate_limit_enabled:
+            if schedule.rate_limit_max_per_hour:
+                limits.append(RateLimit(schedule.rate_limit_max_per_hour, 3600))
+            if schedule.rate_limit_max_per_day:
+                limits.append(RateLimit(schedule.rate_limit_max_per_day, 86400))
+        return limits
 
     async def _check_dependencies(self, schedule: "Schedule") -> bool:
         """Check if the schedule's dependency requirements are met."""
@@ -291,19 +593,22 @@ class SchedulerEngine:
             get_db,
         )
 
-        db = get_db()
-        with db.connect():
-            # Get the most recent execution of the dependency
-            executions = db.select(
-                ScheduleExecution,
-                """
-                SELECT * FROM schedule_execution
-                WHERE schedule_id = ?
-                ORDER BY actual_start_time DESC
-                LIMIT 1
-                """,
-                [schedule.depends_on_schedule_id],
-            )
+        def select_last_execution() -> List[ScheduleExecution]:
+            db = get_db()
+            with db.connect():
+                # Get the most recent execution of the dependency
+                return db.select(
+                    ScheduleExecution,
+                    """
+                    SELECT * FROM schedule_execution
+                    WHERE schedule_id = ?
+                    ORDER BY actual_start_time DESC
+                    LIMIT 1
+                    """,
+                    [schedule.depends_on_schedule_id],
+                )
+
+        executions = await run_in_db_executor(select_last_execution)
 
         if not executions:
             log.debug(
@@ -353,33 +658,25 @@ class SchedulerEngine:
         execution_id = gen_uuid("schedule_execution")
         db = get_db()
 
-        with db.connect():
-            with db.transaction():
-                execution = ScheduleExecution(
-                    id=execution_id,
-                    schedule_id=schedule.id,
-                    run_id=None,
-                    work_item_id=None,
-                    scheduled_time=schedule.next_run_at or datetime_to_str(now),
-                    actual_start_time=datetime_to_str(now),
-                    actual_end_time=datetime_to_str(now),
-                    duration_ms=0,
-                    status=ScheduleExecutionStatus.SKIPPED,
-                    skip_reason=reason,
-                )
-                db.insert(execution)
-
-                # Update next_run_at even when skipped
-                next_run = self.compute_next_run(schedule, now)
-                if next_run:
-                    db.update_by_id(
-                        type(schedule),
-                        schedule.id,
-                        {
-                            "next_run_at": datetime_to_str(next_run),
-                            "updated_at": datetime_to_str(now),
-                        },
+        def insert_execution() -> None:
+            with db.connect():
+                with db.transaction():
+                    execution = ScheduleExecution(
+                        id=execution_id,
+                        schedule_id=schedule.id,
+                        run_id=None,
+                        work_item_id=None,
+                        scheduled_time=schedule.next_run_at or datetime_to_str(now),
+                        actual_start_time=datetime_to_str(now),
+                        actual_end_time=datetime_to_str(now),
+                        duration_ms=0,
+                        status=ScheduleExecutionStatus.SKIPPED,
+                        skip_reason=reason,
                     )
+                    db.insert(execution)
+                    # Note: next_run_at was already advanced when claimed.
+
+        await run_in_db_executor(insert_execution)
 
         log.info(
             f"Schedule {schedule.id} ({schedule.name}) skipped: {reason}"
@@ -390,8 +687,16 @@ class SchedulerEngine:
         schedule: "Schedule",
         execution_id: str,
         now: datetime,
+        claimed: bool = False,
     ) -> None:
-        """Execute a schedule with retry support."""
+        """
+        Execute a schedule with retry support.
+
+        Args:
+            claimed: True if the schedule was claimed by the scheduler loop (in
+                which case `next_run_at` was already advanced and the global
+                slot was already reserved).
+        """
         from sema4ai.action_server._database import datetime_to_str
         from sema4ai.action_server._models import (
             Schedule,
@@ -403,28 +708,38 @@ class SchedulerEngine:
         # Track this execution
         async with self._lock:
             self._running_executions[schedule.id].add(execution_id)
-            self._global_running_count += 1
-            self._rate_limit_tracker[schedule.id].append(now)
+            if not claimed:
+                self._global_running_count += 1
+
+        limits = self._get_rate_limits(schedule)
+        if limits:
+            self._rate_limiter.hit(
+                get_schedule_rate_limit_key(schedule.id), limits, now.timestamp()
+            )
 
         db = get_db()
 
         try:
             # Create initial execution record
-            with db.connect():
-                with db.transaction():
-                    execution = ScheduleExecution(
-                        id=execution_id,
-                        schedule_id=schedule.id,
-                        run_id=None,
-                        work_item_id=None,
-                        scheduled_time=schedule.next_run_at or datetime_to_str(now),
-                        actual_start_time=datetime_to_str(now),
-                        actual_end_time=None,
-                        duration_ms=None,
-                        status=ScheduleExecutionStatus.RUNNING,
-                        attempt_number=1,
-                    )
-                    db.insert(execution)
+            execution = ScheduleExecution(
+                id=execution_id,
+                schedule_id=schedule.id,
+                run_id=None,
+                work_item_id=None,
+                scheduled_time=schedule.next_run_at or datetime_to_str(now),
+                actual_start_time=datetime_to_str(now),
+                actual_end_time=None,
+                duration_ms=None,
+                status=ScheduleExecutionStatus.RUNNING,
+                attempt_number=1,
+            )
+
+            def insert_execution() -> None:
+                with db.connect():
+                    with db.transaction():
+                        db.insert(execution)
+
+            await run_in_db_executor(insert_execution)
 
             # Execute with retry logic
             success, result, error = await self._execute_with_retry(
@@ -435,40 +750,46 @@ class SchedulerEngine:
             end_time = datetime.now(timezone.utc)
             duration_ms = int((end_time - now).total_seconds() * 1000)
 
-            with db.connect():
-                with db.transaction():
-                    update_fields = {
-                        "actual_end_time": datetime_to_str(end_time),
-                        "duration_ms": duration_ms,
-                        "status": (
-                            ScheduleExecutionStatus.COMPLETED
-                            if success
-                            else ScheduleExecutionStatus.FAILED
-                        ),
-                    }
-
-                    if result is not None:
-                        update_fields["result_json"] = json.dumps(result)
-                    if error:
-                        update_fields["error_message"] = str(error)
-
-                    db.update_by_id(ScheduleExecution, execution_id, update_fields)
-
-                    # Update schedule timestamps
-                    next_run = self.compute_next_run(schedule, end_time)
-                    schedule_updates = {
-                        "last_run_at": datetime_to_str(now),
-                        "updated_at": datetime_to_str(end_time),
-                    }
-                    if next_run:
-                        schedule_updates["next_run_at"] = datetime_to_str(next_run)
-                    else:
-                        # One-time schedule or no more runs
-                        schedule_updates["next_run_at"] = None
-                        if schedule.schedule_type == ScheduleType.ONCE:
-                            schedule_updates["enabled"] = False
+            update_fields = {
+                "actual_end_time": datetime_to_str(end_time),
+                "duration_ms": duration_ms,
+                "status": (
+                    ScheduleExecutionStatus.COMPLETED
+                    if success
+                    else ScheduleExecutionStatus.FAILED
+                ),
+            }
+
+            if result is not None:
+                update_fields["result_json"] = json.dumps(result)
+            if error:
+                update_fields["error_message"] = str(error)
+
+            # Update schedule timestamps
+            schedule_updates: Dict[str, Any] = {
+                "last_run_at": datetime_to_str(now),
+                "updated_at": datetime_to_str(end_time),
+            }
+            if schedule.schedule_type == ScheduleType.ONCE:
+                # One-time schedule: no more runs
+                schedule_updates["next_run_at"] = None
+                schedule_updates["enabled"] = False
+            elif not claimed:
+                next_run = self.compute_next_run(schedule, end_time)
+                schedule_updates["next_run_at"] = (
+                    datetime_to_str(next_run) if next_run else None
+                )
+
+            def update_execution_and_schedule() -> None:
+                with db.connect():
+                    with db.transaction():
+                        db.update_by_id(ScheduleExecution, execution_id, update_fields)
+                        db.update_by_id(Schedule, schedule.id, schedule_updates)
+
+            await run_in_db_executor(update_execution_and_schedule)
 
-                    db.update_by_id(Schedule, schedule.id, schedule_updates)
+            if "next_run_at" in schedule_updates:
+                self.set_next_run(schedule.id, schedule_updates["next_run_at"])
 
             # Send notifications
             await self._send_notifications(schedule, execution, success, error)
@@ -483,7 +804,8 @@ class SchedulerEngine:
             # Clean up tracking
             async with self._lock:
                 self._running_executions[schedule.id].discard(execution_id)
-                self._global_running_count -= 1
+                if not claimed:
+                    self._global_running_count -= 1
 
     async def _execute_with_retry(
         self,
@@ -513,17 +835,21 @@ class SchedulerEngine:
             try:
                 # Update attempt number
                 if attempt > 1:
-                    db = get_db()
-                    with db.connect():
-                        with db.transaction():
-                            db.update_by_id(
-                                ScheduleExecution,
-                                execution_id,
-                                {
-                                    "attempt_number": attempt,
-                                    "status": ScheduleExecutionStatus.RETRYING,
-                                },
-                            )
+
+                    def update_attempt(attempt: int = attempt) -> None:
+                        db = get_db()
+                        with db.connect():
+                            with db.transaction():
+                                db.update_by_id(
+                                    ScheduleExecution,
+                                    execution_id,
+                                    {
+                                        "attempt_number": attempt,
+                                        "status": ScheduleExecutionStatus.RETRYING,
+                                    },
+                                )
+
+                    await run_in_db_executor(update_attempt)
 
                 # Execute the action
                 result = await self._trigger_action(schedule)
@@ -575,45 +901,51 @@ class SchedulerEngine:
         if not schedule.action_id:
             raise ValueError("Schedule has no action_id configured")
 
-        db = get_db()
-        with db.connect():
-            try:
-                action = db.first(
-                    Action,
-                    "SELECT * FROM action WHERE id = ?",
-                    [schedule.action_id],
-                )
-            except KeyError:
-                raise ValueError(f"Action not found: {schedule.action_id}")
-
-            if not action.enabled:
-                raise ValueError(f"Action {action.id} is disabled")
-
-            # Get the action package
-            try:
-                action_package = db.first(
-                    ActionPackage,
-                    "SELECT * FROM action_package WHERE id = ?",
-                    [action.action_package_id],
-                )
-            except KeyError:
-                raise ValueError(f"Action package not found: {action.action_package_id}")
-
         # Parse inputs
         inputs = json.loads(schedule.inputs_json) if schedule.inputs_json else {}
-
-        # Create the run
         run_id = gen_uuid("run")
-        relative_artifacts_dir = _create_run_artifacts_dir(action, run_id)
 
-        with db.connect():
-            run = _create_run(
-                action=action,
-                run_id=run_id,
-                inputs=inputs,
-                relative_artifacts_dir=relative_artifacts_dir,
-                request_id=f"schedule:{schedule.id}",
-            )
+        def create_run():
+            db = get_db()
+            with db.connect():
+                try:
+                    action = db.first(
+                        Action,
+                        "SELECT * FROM action WHERE id = ?",
+                        [schedule.action_id],
+                    )
+                except KeyError:
+                    raise ValueError(f"Action not found: {schedule.action_id}")
+
+                if not action.enabled:
+                    raise ValueError(f"Action {action.id} is disabled")
+
+                # Get the action package
+                try:
+                    action_package = db.first(
+                        ActionPackage,
+                        "SELECT * FROM action_package WHERE id = ?",
+                        [action.action_package_id],
+                    )
+                except KeyError:
+                    raise ValueError(
+                        f"Action package not found: {action.action_package_id}"
+                    )
+
+                # Create the run
+                relative_artifacts_dir = _create_run_artifacts_dir(action, run_id)
+                _create_run(
+                    action=action,
+                    run_id=run_id,
+                    inputs=inputs,
+                    relative_artifacts_dir=relative_artifacts_dir,
+                    request_id=f"schedule:{schedule.id}",
+                )
+            return action, action_package, relative_artifacts_dir
+
+        action, action_package, relative_artifacts_dir = await run_in_db_executor(
+            create_run
+        )
 
         log.info(
             f"Schedule {schedule.id}: executing run {run_id} for action {action.name}"
@@ -655,7 +987,7 @@ class SchedulerEngine:
         inputs["_scheduled_at"] = datetime.now(timezone.utc).isoformat()
 
         try:
-            from actions.work_items import create_adapter, init, seed_input
+            from actions.work_items import create_adapter
 
             # Create adapter targeting the action server's work items storage
             from sema4ai.action_server._settings import get_settings
@@ -665,16 +997,19 @@ class SchedulerEngine:
             db_path = str(settings.datadir / "workitems.db")
             files_dir = str(settings.datadir / "work_item_files")
 
-            adapter = create_adapter(
-                adapter_type="sqlite",
-                db_path=db_path,
-                queue_name=queue_name,
-                files_dir=files_dir,
-            )
-            init(adapter)
+            def seed_work_item() -> str:
+                adapter = create_adapter(
+                    adapter_type="sqlite",
+                    db_path=db_path,
+                    queue_name=queue_name,
+                    files_dir=files_dir,
+                )
 
-            # Seed the work item
-            work_item_id = seed_input(payload=inputs)
+                # Seed the work item (with the local adapter: the global one
+                # set with `init()` is shared by concurrent invocations).
+                return adapter.seed_input(payload=inputs)
+
+            work_item_id = await run_in_db_executor(seed_work_item)
 
             log.info(
                 f"Schedule {schedule.id}: created work item {work_item_id} "
@@ -739,17 +1074,20 @@ class SchedulerEngine:
         if schedule.notification_webhook_url or schedule.notification_email:
             from sema4ai.action_server._models import ScheduleExecution, get_db
 
-            db = get_db()
-            with db.connect():
-                with db.transaction():
-                    db.update_by_id(
-                        ScheduleExecution,
-                        execution.id,
-                        {
-                            "notification_sent": notification_error is None,
-                            "notification_error": notification_error,
-                        },
-                    )
+            def update_notification_status() -> None:
+                db = get_db()
+                with db.connect():
+                    with db.transaction():
+                        db.update_by_id(
+                            ScheduleExecution,
+                            execution.id,
+                            {
+                                "notification_sent": notification_error is None,
+                                "notification_error": notification_error,
+                            },
+                        )
+
+            await run_in_db_executor(update_notification_status)
 
     async def _send_webhook_notification(
         self,
@@ -873,6 +1211,103 @@ Duration: {execution.duration_ms}ms
             log.warning(f"Unknown schedule type: {schedule_type}")
             return None
 
+    def compute_next_runs(
+        self,
+        schedule: "Schedule",
+        after: Optional[datetime] = None,
+        count: int = 10,
+        until: Optional[datetime] = None,
+    ) -> List[datetime]:
+        """
+        Compute the next `count` run times for a schedule (in a window).
+
+        Args:
+            schedule: The schedule to compute next runs for
+            after: Base time for calculation (defaults to now)
+            count: Maximum number of run times to compute
+            until: If given, only run times up to (and including) it are provided
+
+        Returns:
+            Next run times in UTC (empty if no more runs)
+        """
+        if after is None:
+            after = datetime.now(timezone.utc)
+
+        next_runs: List[datetime] = []
+        if count <= 0:
+            return next_runs
+
+        if schedule.schedule_type == ScheduleType.CRON:
+            # The parsed expression is reused for all the computations.
+            it: Iterator[datetime] = _iter_cron_next(
+                schedule.cron_expression, schedule.timezone, after
+            )
+        else:
+            it = self._iter_next_runs(schedule, after)
+
+        for next_run in it:
+            if until is not None and next_run > until:
+                break
+            next_runs.append(next_run)
+            if len(next_runs) >= count:
+                break
+        return next_runs
+
+    def _iter_next_runs(
+        self, schedule: "Schedule", after: datetime
+    ) -> Iterator[datetime]:
+        while True:
+            next_run = self.compute_next_run(schedule, after)
+            if next_run is None:
+                return
+            yield next_run
+            after = next_run
+
+    def compute_next_run_batch(
+        self,
+        schedules: Sequence["Schedule"],
+        after: Optional[datetime] = None,
+    ) -> Dict[str, Optional[datetime]]:
+        """
+        Compute the next run time for many schedules at once (schedules with
+        the same configuration are only computed once).
+
+        Args:
+            schedules: The schedules to compute next run for
+            after: Base time for calculation (defaults to now)
+
+        Returns:
+            Schedule id -> next run time in UTC (None if no more runs or if
+            it couldn't be computed).
+        """
+        if after is None:
+            after = datetime.now(timezone.utc)
+
+        computed: Dict[tuple, Optional[datetime]] = {}
+        ret: Dict[str, Optional[datetime]] = {}
+        for schedule in schedules:
+            key = (
+                schedule.schedule_type,
+                schedule.cron_expression,
+                schedule.interval_seconds,
+                schedule.weekday_config_json,
+                schedule.timezone,
+            )
+            try:
+                next_run = computed[key]
+            except KeyError:
+                try:
+                    next_run = self.compute_next_run(schedule, after)
+                except Exception:
+                    log.exception(
+                        f"Error computing next run for schedule {schedule.id} "
+                        f"({schedule.name})"
+                    )
+                    next_run = None
+                computed[key] = next_run
+            ret[schedule.id] = next_run
+        return ret
+
     def _compute_cron_next(
         self,
         cron_expression: str,
@@ -880,29 +1315,7 @@ Duration: {execution.duration_ms}ms
         after: datetime,
     ) -> datetime:
         """Compute next run time from cron expression."""
-        croniter = _get_croniter()
-
-        try:
-            import pytz
-            tz = pytz.timezone(timezone_str)
-        except ImportError:
-            from zoneinfo import ZoneInfo
-            tz = ZoneInfo(timezone_str)
-
-        # Convert to local timezone for cron calculation
-        if after.tzinfo is None:
-            after = after.replace(tzinfo=timezone.utc)
-        local_after = after.astimezone(tz)
-
-        cron = croniter(cron_expression, local_after)
-        next_local = cron.get_next(datetime)
-
-        # Convert back to UTC
-        if hasattr(next_local, 'astimezone'):
-            return next_local.astimezone(timezone.utc)
-        else:
-            # Handle naive datetime
-            return next_local.replace(tzinfo=timezone.utc)
+        return next(_iter_cron_next(cron_expression, timezone_str, after))
 
     def _compute_interval_next(
         self,
@@ -926,12 +1339,7 @@ Duration: {execution.duration_ms}ms
         if not days:
             raise ValueError("Weekday schedule has no days configured")
 
-        try:
-            import pytz
-            tz = pytz.timezone(timezone_str)
-        except ImportError:
-            from zoneinfo import ZoneInfo
-            tz = ZoneInfo(timezone_str)
+        tz = _get_timezone(timezone_str)
 
         # Parse time
         hour, minute = map(int, time_str.split(":"))
@@ -959,10 +1367,29 @@ Duration: {execution.duration_ms}ms
         return current.astimezone(timezone.utc)
 
 
+def get_schedule_rate_limit_key(schedule_id: str) -> str:
+    """The key of the schedule in the rate limiter."""
+    return f"schedule:{schedule_id}"
+
+
 # Global scheduler instance
 _global_scheduler: Optional[SchedulerEngine] = None
 
 
+def notify_schedule_changed(schedule_id: str, next_run_at: Optional[str]) -> None:
+    """
+    Updates the upcoming runs of the global scheduler (if any) after a
+    schedule is created/updated/enabled/disabled/deleted.
+
+    Args:
+        next_run_at: The new `next_run_at` of the schedule (None if it's
+            disabled or was deleted).
+    """
+    scheduler = get_scheduler()
+    if scheduler is not None:
+        scheduler.set_next_run(schedule_id, next_run_at)
+
+
 def get_scheduler() -> Optional[SchedulerEngine]:
     """Get the global scheduler instance."""
     return _global_scheduler
@@ -987,31 +1414,39 @@ async def initialize_schedule_next_runs() -> None:
     if scheduler is None:
         return
 
-    db = get_db()
     now = datetime.now(timezone.utc)
+    now_str = datetime_to_str(now)
 
-    with db.connect():
-        # Find schedules without next_run_at
-        schedules = db.select(
-            Schedule,
-            """
-            SELECT * FROM schedule
-            WHERE enabled = 1 AND next_run_at IS NULL
-            """,
-        )
+    def initialize_next_runs() -> Optional[int]:
+        db = get_db()
+        with db.connect():
+            # Find schedules without next_run_at
+            schedules = db.select(
+                Schedule,
+                """
+                SELECT * FROM schedule
+                WHERE enabled = 1 AND next_run_at IS NULL
+                """,
+            )
+            if not schedules:
+                return None
 
-        for schedule in schedules:
-            next_run = scheduler.compute_next_run(schedule, now)
-            if next_run:
-                with db.transaction():
-                    db.update_by_id(
-                        Schedule,
-                        schedule.id,
-                        {
-                            "next_run_at": datetime_to_str(next_run),
-                            "updated_at": datetime_to_str(now),
-                        },
-                    )
-                log.info(
-                    f"Initialized next_run_at for schedule {schedule.id}: {next_run}"
-                )
+            next_runs = scheduler.compute_next_run_batch(schedules, now)
+            with db.transaction():
+                for schedule_id, next_run in next_runs.items():
+                    if next_run:
+                        db.update_by_id(
+                            Schedule,
+                            schedule_id,
+                            {
+                                "next_run_at": datetime_to_str(next_run),
+                                "updated_at": now_str,
+                            },
+                        )
+
+        return sum(1 for next_run in next_runs.values() if next_run)
+
+    initialized = await run_in_db_executor(initialize_next_runs)
+    if initialized is None:
+        return
+    log.info(f"Initialized next_run_at for {initialized} schedule(s)")
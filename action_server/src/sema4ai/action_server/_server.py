@@ -187,10 +187,16 @@ def start_server(
     if start_args.auto_reload:
         _reload_lock = threading.Lock()
 
-        def do_reload(explicit: bool = False) -> bool:
+        def do_reload(
+            explicit: bool = False, changed_paths: set[str] | None = None
+        ) -> bool:
             """
             Internal function to do a reload of the actions.
 
+            Args:
+                changed_paths: The paths which changed (if given, just the
+                    action packages with changes are reimported).
+
             Returns:
                 True if the reload was successful and False otherwise.
             """
@@ -198,19 +204,35 @@ def start_server(
             from sema4ai.action_server._models import get_db
             from sema4ai.action_server._server_websockets import report_mtime_changed
 
+            from ._watcher import get_changed_action_package_dirs
+
             db = get_db()
             with _reload_lock, db.connect():
                 # This is run in a thread. We can't have 2 reloads at the same
                 # time, so, a lock is required.
 
+                changed_dirs: list[str] | None = None
                 if explicit:
                     log.info("Reload explicitly called!")
                 else:
-                    log.info("File-changes detected: auto-reloading!")
+                    if changed_paths is not None:
+                        changed_dirs = get_changed_action_package_dirs(
+                            start_args.dir, changed_paths
+                        )
+                    if changed_dirs is None:
+                        log.info("File-changes detected: auto-reloading!")
+                    else:
+                        log.info(
+                            "File-changes detected: auto-reloading: %s",
+                            ", ".join(changed_dirs),
+                        )
+                imported_action_package_ids: list[str] = []
                 code = _import_actions(
                     start_args,
                     settings,
                     disable_not_imported=True,
+                    action_package_dirs=changed_dirs,
+                    imported_action_package_ids=imported_action_package_ids,
                 )
                 if code != 0:
                     log.info(
@@ -218,13 +240,20 @@ def start_server(
                     )
                     return False
 
-                action_routes.unregister_actions()
-                action_routes.register_actions()
+                # Just the routes of the action packages whose actions (metadata)
+                # actually changed are swapped.
+                changed_action_package_ids = action_routes.reload_actions()
+                if not changed_action_package_ids:
+                    log.info("Auto-reload: no changes found in the actions metadata.")
 
+                # The processes of all the reimported action packages must be
+                # recycled (i.e.: the body of an action or a module it imports
+                # may have changed without changing its metadata).
                 actions_process_pool = _actions_process_pool.get_actions_process_pool()
                 actions_process_pool.on_reload(
                     action_routes.action_package_id_to_action_package,
                     action_routes.actions,
+                    changed_action_package_ids.union(imported_action_package_ids),
                 )
                 app.update_mtime_uuid()
                 assert _LoopHolder.loop is not None
@@ -576,6 +605,75 @@ def start_server(
     if settings.enable_scheduler:
         app.custom_lifespan.register(_scheduler_lifespan)
 
+    @asynccontextmanager
+    async def _work_items_lease_sweeper_lifespan(app: FastAPI):
+        """
+        Lifespan handler which requeues the work items with expired leases.
+        """
+        from sema4ai.action_server._api_work_items import sweep_expired_leases
+
+        task = asyncio.create_task(
+            sweep_expired_leases(
+                settings.work_items_sweep_interval, settings.work_items_max_attempts
+            )
+        )
+        try:
+            yield
+        finally:
+            task.cancel()
+
+    app.custom_lifespan.register(_work_items_lease_sweeper_lifespan)
+
+    @asynccontextmanager
+    async def _rate_limits_persistence_lifespan(app: FastAPI):
+        """
+        Lifespan handler which loads/persists the rate limits state.
+        """
+        from sema4ai.action_server._rate_limiter import persist_rate_limits
+
+        task = asyncio.create_task(
+            persist_rate_limits(settings.rate_limits_flush_interval)
+        )
+        try:
+            yield
+        finally:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    if settings.persist_rate_limits:
+        app.custom_lifespan.register(_rate_limits_persistence_lifespan)
+
+    @asynccontextmanager
+    async def _webhook_inbox_lifespan(app: FastAPI):
+        """
+        Lifespan handler which drains the webhook inbox (webhooks of triggers
+        which are acknowledged before being executed).
+        """
+        from sema4ai.action_server._webhook_inbox import (
+            WebhookInbox,
+            set_webhook_inbox,
+        )
+
+        inbox = WebhookInbox(
+            max_workers=settings.webhook_inbox_workers,
+            max_attempts=settings.webhook_inbox_max_attempts,
+            retry_backoff=settings.webhook_inbox_retry_backoff,
+            retention_seconds=settings.webhook_inbox_retention_seconds,
+        )
+        set_webhook_inbox(inbox)
+        await inbox.start()
+        try:
+            yield
+        finally:
+            await inbox.stop()
+            set_webhook_inbox(None)
+
+    if settings.enable_triggers:
+        app.custom_lifespan.register(_webhook_inbox_lifespan)
+
     with _actions_process_pool.setup_actions_process_pool(
         settings,
         action_routes.action_package_id_to_action_package,
@@ -586,4 +684,9 @@ def start_server(
         server = uvicorn.Server(config)
         server._log_started_message = _on_started_message  # type: ignore[assignment]
 
-        asyncio.run(server.serve())
+        try:
+            asyncio.run(server.serve())
+        finally:
+            from sema4ai.action_server._db_executor import shutdown_db_executor
+
+            shutdown_db_executor()
@@ -1,10 +1,24 @@
 import asyncio
 import itertools
+import json
 import logging
+import threading
 import typing
+from collections import deque
 from dataclasses import asdict
 from functools import partial
-from typing import Any, Callable, Dict, Optional, Sequence, Set
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
 from fastapi.routing import APIRouter
 from starlette.websockets import WebSocket, WebSocketDisconnect
@@ -17,6 +31,115 @@ log = logging.getLogger(__name__)
 
 websocket_api_router = APIRouter(prefix="/api/ws")
 
+# Run change events received in this window are coalesced and sent in a
+# single frame.
+RUN_EVENTS_BATCH_WINDOW = 0.05  # seconds
+
+# Max number of changed runs sent to a client resuming the run events (if more
+# runs changed, all the current runs are sent instead).
+MAX_RESUMED_RUNS = 200
+
+# Max number of broadcast frames pending to be sent to a client. If a client
+# is slower than that, its pending broadcast frames are dropped and it's
+# resynchronized afterwards (see: `SocketServer`).
+CLIENT_MAX_PENDING_FRAMES = 256
+
+
+class _ClientWriter:
+    """
+    Sends the frames to a client websocket in its own task (so, a slow
+    client doesn't block the server nor the other clients).
+    """
+
+    def __init__(
+        self,
+        sid: str,
+        websocket: WebSocket,
+        max_pending_frames: int,
+        on_resync: Callable[[str], Awaitable[None]],
+    ) -> None:
+        self.sid = sid
+        self.websocket = websocket
+        self._max_pending_frames = max_pending_frames
+        self._on_resync = on_resync
+
+        # (droppable, frame)
+        self._frames: Deque[Tuple[bool, str]] = deque()
+        self._droppable_count = 0
+        self._needs_resync = False
+        self._closed = False
+        self._frames_available = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._write_loop())
+
+    async def stop(self) -> None:
+        self._closed = True
+        self._frames.clear()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def send(self, frame: str, droppable: bool) -> None:
+        """
+        Adds a frame to be sent to the client.
+
+        Args:
+            droppable: Whether the frame may be dropped if the client is too
+                slow (in which case the client is resynchronized afterwards).
+        """
+        if self._closed:
+            return
+
+        if droppable:
+            if self._needs_resync:
+                # Will be resynchronized anyways.
+                return
+
+            if self._droppable_count >= self._max_pending_frames:
+                log.info(
+                    f"Websocket client {self.sid} is too slow: dropping "
+                    f"{self._droppable_count} pending frames (it'll be "
+                    "resynchronized)."
+                )
+                self._frames = deque(f for f in self._frames if not f[0])
+                self._droppable_count = 0
+                self._needs_resync = True
+                self._frames_available.set()
+                return
+
+            self._droppable_count += 1
+
+        self._frames.append((droppable, frame))
+        self._frames_available.set()
+
+    async def _write_loop(self) -> None:
+        try:
+            while True:
+                await self._frames_available.wait()
+                self._frames_available.clear()
+
+                while self._frames:
+                    droppable, frame = self._frames.popleft()
+                    if droppable:
+                        self._droppable_count -= 1
+                    await self.websocket.send_text(frame)
+
+                if self._needs_resync:
+                    self._needs_resync = False
+                    await self._on_resync(self.sid)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # The client disconnected (the receiving side handles it).
+            log.debug(f"Error sending to websocket client: {self.sid}")
+            self._closed = True
+
 
 class SocketServer:
     """
@@ -47,16 +170,26 @@ class SocketServer:
     await ws.accept()
     await socket_server.manage_websocket(ws)
     ```
+
+    Each client has its own send queue (and task writing to it), so, emitting
+    doesn't wait for the clients to receive the events. When more than
+    `max_pending_frames` broadcast events are pending for a client, those are
+    dropped and the `resync` event is notified for that client afterwards (its
+    handler should send the current state to the client).
+
+    Multiple events may be sent to the client in a single frame as a `batch`
+    event (whose data is the list of `{"event": ..., "data": ...}` events).
     """
 
-    def __init__(self) -> None:
+    def __init__(self, max_pending_frames: int = CLIENT_MAX_PENDING_FRAMES) -> None:
         self.event_handlers: dict = {}
         self._rooms: Dict[str, Set[str]] = {}
 
         # List just to hold the callback called to notify that a change happened.
         self.on_run_change_callback: Optional[Callable[..., Any]] = None
         self._next_id = partial(next, itertools.count(0))
-        self._sid_to_websocket: Dict[str, WebSocket] = {}
+        self._max_pending_frames = max_pending_frames
+        self._sid_to_writer: Dict[str, _ClientWriter] = {}
 
     def enter_room(self, sid: str, room: str) -> None:
         """
@@ -103,14 +236,38 @@ class SocketServer:
         """
         Emits an event which is sent to the user.
 
+        Note: the event is just added to the send queue of the clients (it
+        doesn't wait for the clients to receive it).
+
         Args:
             to: The client(s) to which the event should be emitted. If not
                 specified the event is sent to all clients.
         """
+        self.emit_batch([(event, data)], to=to)
+
+    def emit_batch(
+        self,
+        events: Sequence[Tuple[str, Any]],
+        *,
+        to: Optional[str | Sequence[str]] = None,
+    ) -> None:
+        """
+        Emits the given `(event, data)` events in a single frame.
+
+        Note: must be called in the event loop.
+
+        Args:
+            to: The client(s) to which the events should be emitted. If not
+                specified the events are sent to all clients (and may be
+                dropped for clients which are too slow).
+        """
+        if not events:
+            return
+
         notify: Sequence[str]
         if to is None:
             # Notify all
-            notify = tuple(self._sid_to_websocket.keys())
+            notify = tuple(self._sid_to_writer.keys())
 
         elif isinstance(to, str):
             # Notify single
@@ -118,18 +275,33 @@ class SocketServer:
 
         else:
             # Notify list of ids.
-            pass
+            notify = to
+
+        if not notify:
+            return
+
+        dcts = []
+        for event, data in events:
+            dct = {"event": event}
+            if data is not None:
+                dct["data"] = data
+            dcts.append(dct)
 
+        try:
+            # Serialized just once for all the clients.
+            if len(dcts) == 1:
+                frame = json.dumps(dcts[0])
+            else:
+                frame = json.dumps({"event": "batch", "data": dcts})
+        except Exception:
+            log.exception(f"Error serializing events: {[e[0] for e in events]}")
+            return
+
+        droppable = to is None
         for sid in notify:
-            try:
-                ws = self._sid_to_websocket.get(sid)
-                if ws is not None:
-                    dct = {"event": event}
-                    if data is not None:
-                        dct["data"] = data
-                    await ws.send_json(dct)
-            except Exception:
-                log.exception(f"Error notifying client: {sid}")
+            writer = self._sid_to_writer.get(sid)
+            if writer is not None:
+                writer.send(frame, droppable)
 
     async def manage_websocket(self, websocket: WebSocket):
         """
@@ -137,7 +309,11 @@ class SocketServer:
         it from the server.
         """
         sid = self._gen_id()
-        self._sid_to_websocket[sid] = websocket
+        writer = _ClientWriter(
+            sid, websocket, self._max_pending_frames, self._notify_resync
+        )
+        writer.start()
+        self._sid_to_writer[sid] = writer
         await self._notify("connect", sid)
 
         try:
@@ -165,7 +341,12 @@ class SocketServer:
             log.exception("Unexpected exception from websocket.")
         finally:
             await self._notify("disconnect", sid)
-            self._sid_to_websocket.pop(sid, None)
+            self._sid_to_writer.pop(sid, None)
+            await writer.stop()
+
+    async def _notify_resync(self, sid: str) -> None:
+        if sid in self._sid_to_writer:
+            await self._notify("resync", sid)
 
     async def _notify(self, event: str, sid: str, *args):
         handlers = self.event_handlers.get(event)
@@ -202,6 +383,23 @@ async def handle_disconnect(sid: str):
                 _socket_server.on_run_change_callback = None
 
 
+@_socket_server.on("resync")
+async def handle_resync(sid: str):
+    # Events were dropped because the client was too slow: send the current
+    # runs (if it's listening to those) and ask it to refetch the other data.
+    from sema4ai.action_server._runs_state_cache import get_global_runs_state
+
+    global_runs_state = get_global_runs_state()
+
+    with global_runs_state.semaphore:
+        sids_listening = _socket_server.get_room_sids("clients_listening_runs")
+        if sids_listening and sid in sids_listening:
+            runs = global_runs_state.get_current_run_state()
+            await _report_runs(sid, runs)
+
+    await _socket_server.emit("mtime_changed", [], to=sid)
+
+
 @_socket_server.on("echo")
 async def handle_echo(sid: str, data):
     # Just echo something (testing)
@@ -239,21 +437,30 @@ async def handle_request(sid: str, request_data):
 
 
 @_socket_server.on("start_listen_run_events")
-async def handle_start_listen_run_events(sid: str):
+async def handle_start_listen_run_events(sid: str, data: Optional[dict] = None):
+    """
+    Args:
+        data: May have a `since` with the last run `change_seq` known by the
+            client (i.e.: when reconnecting), in which case just the runs
+            changed after it are sent (in `runs_changed_since`) instead of all
+            the current runs (in `runs_collected`).
+    """
     from sema4ai.action_server._runs_state_cache import get_global_runs_state
 
     global_runs_state = get_global_runs_state()
     loop = asyncio.get_running_loop()
+    since = data.get("since") if isinstance(data, dict) else None
 
     with global_runs_state.semaphore:
-        runs = global_runs_state.get_current_run_state()
-        await _report_runs(sid, runs)
+        if since is None or not await _report_runs_changed_since(sid, since):
+            runs = global_runs_state.get_current_run_state()
+            await _report_runs(sid, runs)
         if not _socket_server.get_room_sids("clients_listening_runs"):
             # Start listening if this is the first client added.
             if _socket_server.on_run_change_callback is None:
-                _socket_server.on_run_change_callback = partial(
-                    _on_run_change_found_in_thread, loop
-                )
+                _socket_server.on_run_change_callback = _RunChangeEventsBatcher(
+                    loop, RUN_EVENTS_BATCH_WINDOW
+                ).on_run_change_found_in_thread
                 global_runs_state.register(_socket_server.on_run_change_callback)
 
         _socket_server.enter_room(sid, "clients_listening_runs")
@@ -263,35 +470,113 @@ async def _report_runs(sid: str, runs: list["Run"]):
     await _socket_server.emit("runs_collected", [asdict(run) for run in runs], to=sid)
 
 
-def _on_run_change_found_in_thread(loop, run_change_event: "RunChangeEvent"):
+async def _report_runs_changed_since(sid: str, since: Any) -> bool:
     """
-    Note that this callback is called from a different thread.
+    Reports the runs changed after the given `change_seq`.
+
+    Note: the runs state semaphore must be acquired.
+
+    Returns:
+        False if it wasn't possible to report just the changed runs (in which
+        case all the current runs must be reported).
     """
-    asyncio.run_coroutine_threadsafe(_report_change_event(run_change_event), loop)
+    from sema4ai.action_server._runs_state_cache import get_global_runs_state
 
+    if not isinstance(since, int) or since < 0:
+        log.info(f"Invalid `since` to listen run events: {since!r}")
+        return False
 
-async def _report_change_event(run_change_event: "RunChangeEvent"):
-    try:
-        # i.e.: send the notification to all connected websockets when found.
-        notify_all = None
+    global_runs_state = get_global_runs_state()
+    if since > global_runs_state.get_last_change_seq():
+        # The client got it from another database (i.e.: it was reset).
+        return False
 
-        if run_change_event.ev == "added":
-            await _socket_server.emit(
-                "run_added", {"run": asdict(run_change_event.run)}, to=notify_all
+    runs = global_runs_state.get_runs_changed_since(since, MAX_RESUMED_RUNS + 1)
+    if len(runs) > MAX_RESUMED_RUNS:
+        return False
+
+    await _socket_server.emit(
+        "runs_changed_since",
+        {
+            "since": since,
+            "change_seq": max([since] + [run.change_seq for run in runs]),
+            "runs": [asdict(run) for run in runs],
+        },
+        to=sid,
+    )
+    return True
+
+
+class _RunChangeEventsBatcher:
+    """
+    Collects the run change events (found in the run threads) and reports all
+    the events found in a short window in a single frame.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, window: float) -> None:
+        self._loop = loop
+        self._window = window
+        self._lock = threading.Lock()
+        self._pending: List["RunChangeEvent"] = []
+
+    def on_run_change_found_in_thread(self, run_change_event: "RunChangeEvent"):
+        """
+        Note that this callback is called from a different thread.
+        """
+        with self._lock:
+            self._pending.append(run_change_event)
+            if len(self._pending) > 1:
+                # The flush is already scheduled.
+                return
+
+        self._loop.call_soon_threadsafe(
+            self._loop.call_later, self._window, self._report_pending
+        )
+
+    def _report_pending(self) -> None:
+        with self._lock:
+            run_change_events = self._pending
+            self._pending = []
+
+        try:
+            # i.e.: send the notification to all connected websockets.
+            notify_all = None
+            _socket_server.emit_batch(
+                _coalesce_run_change_events(run_change_events), to=notify_all
             )
+        except Exception:
+            log.exception("Error reporting change events to json.")
+
+
+def _coalesce_run_change_events(
+    run_change_events: Sequence["RunChangeEvent"],
+) -> List[Tuple[str, Any]]:
+    """
+    Converts the run change events to the `(event, data)` to be emitted.
+
+    Multiple changes to the same run are merged in a single `run_changed`
+    (changes after a `run_added` are still reported after it).
+    """
+    events: List[Tuple[str, Any]] = []
+    run_id_to_changes: Dict[str, Dict[str, Any]] = {}
+
+    for run_change_event in run_change_events:
+        run_id = run_change_event.run.id
+        if run_change_event.ev == "added":
+            events.append(("run_added", {"run": asdict(run_change_event.run)}))
+            run_id_to_changes.pop(run_id, None)
+
         elif run_change_event.ev == "changed":
-            await _socket_server.emit(
-                "run_changed",
-                {
-                    "run_id": run_change_event.run.id,
-                    "changes": run_change_event.changes,
-                },
-                to=notify_all,
-            )
+            changes = run_id_to_changes.get(run_id)
+            if changes is None:
+                changes = run_id_to_changes[run_id] = {}
+                events.append(("run_changed", {"run_id": run_id, "changes": changes}))
+            changes.update(run_change_event.changes or {})
+
         else:
             log.critical(f"Unexpected run change event: {run_change_event}.")
-    except Exception:
-        log.exception("Error reporting change event to json.")
+
+    return events
 
 
 async def _report_mtime_changed():
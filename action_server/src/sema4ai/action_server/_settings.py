@@ -31,6 +31,9 @@ HEADER_ACTION_SERVER_RUN_ID = "x-action-server-run-id"
 # Set to "1" in the response if the action will finish asynchronously.
 HEADER_ACTION_ASYNC_COMPLETION = "x-action-async-completion"
 
+# An integer with the priority of the run when waiting for a process (higher values are served first, default is 0).
+HEADER_ACTIONS_PRIORITY = "x-actions-priority"
+
 # A context that will be passed to the action with information on the request (agent id, thread id, etc).
 HEADER_ACTION_INVOCATION_CONTEXT = "x-action-invocation-context"
 
@@ -269,6 +272,41 @@ class Settings:
     min_processes: int = 2
     max_processes: int = 20
     reuse_processes: bool = False
+    # The maximum number of runs which may be waiting for a process when all
+    # the processes are in use (0 means no limit).
+    max_queued_runs: int = 0
+    # The min/max idle processes kept warm for specific action packages (in the
+    # format `<action package name>=<min>:<max>`).
+    action_package_processes: tuple[str, ...] = ()
+    # Idle processes (above `min_processes`) of action packages which received
+    # no requests in this time (in seconds) are retired.
+    idle_process_ttl: float = 300.0
+    # Recycling policies of the reused processes (0 means no limit): a process
+    # is replaced when it ran `max_process_runs` times, when its RSS (in MB,
+    # including its subprocesses) reaches `max_process_rss` or when it's older
+    # than `max_process_age` (in seconds).
+    max_process_runs: int = 0
+    max_process_rss: int = 0
+    max_process_age: float = 0
+    # When set (Linux only), the action processes are forked from a process
+    # (one per environment) which has the actions library already imported.
+    fork_server: bool = False
+    # Additional modules pre-imported in the fork server.
+    fork_server_preload: tuple[str, ...] = ()
+
+    # When set, the action inputs/result are sent inline through the socket used
+    # to communicate with the action process (instead of through json files in
+    # the run artifacts directory).
+    inline_action_io: bool = False
+    # When `inline_action_io` is set, the inputs/result json files are only
+    # written to the run artifacts directory if this is also set (audit/debug).
+    persist_action_io: bool = False
+
+    # How the runs state (run creation/status changes) is written to the db:
+    # 'strict': each change is committed before the request proceeds.
+    # 'group': changes are queued to a single writer thread which coalesces them
+    # into group commits (done every few milliseconds).
+    db_durability: str = "strict"
 
     full_openapi_spec: bool = False
 
@@ -289,9 +327,32 @@ class Settings:
     scheduler_check_interval: float = 10.0  # seconds
     scheduler_max_concurrent_global: int = 10
 
+    # Work items settings
+    # For how long a reserved work item is kept in progress without being
+    # released or having its lease renewed.
+    work_items_lease_seconds: float = 1800.0
+    # Items whose lease expired after this number of reservations are moved to
+    # the dead-letter queue (instead of being returned to their queue).
+    work_items_max_attempts: int = 3
+    work_items_sweep_interval: float = 30.0  # seconds
+
+    # Rate limits (of triggers and schedules) settings
+    # Whether the rate limits state is persisted in the database (so that
+    # it's kept on a restart).
+    persist_rate_limits: bool = True
+    rate_limits_flush_interval: float = 5.0  # seconds
+
     # Trigger settings
     enable_triggers: bool = True
     trigger_webhook_base_url: Optional[str] = None  # For generating webhook URLs
+    # Inbox of the webhooks of triggers with `async_ack` set.
+    webhook_inbox_workers: int = 4  # Max entries executed concurrently
+    webhook_inbox_max_attempts: int = 3
+    # Delay before retrying a failed entry (doubled on each attempt).
+    webhook_inbox_retry_backoff: float = 5.0  # seconds
+    # For how long processed entries are kept (redeliveries are deduplicated
+    # during this time).
+    webhook_inbox_retention_seconds: float = 86400.0
 
     # Notification settings
     smtp_host: Optional[str] = None
@@ -364,6 +425,17 @@ class Settings:
             "min_processes",
             "max_processes",
             "reuse_processes",
+            "max_queued_runs",
+            "idle_process_ttl",
+            "fork_server",
+            "max_process_runs",
+            "max_process_rss",
+            "max_process_age",
+            "inline_action_io",
+            "persist_action_io",
+            "db_durability",
+            "work_items_lease_seconds",
+            "work_items_max_attempts",
             "full_openapi_spec",
             "ssl_self_signed",
             "ssl_keyfile",
@@ -378,6 +450,18 @@ class Settings:
             if hasattr(args, attr):
                 setattr(settings, attr, getattr(args, attr))
 
+        if getattr(args, "action_package_processes", None):
+            from sema4ai.action_server._process_pool_warmer import (
+                parse_action_package_processes,
+            )
+
+            settings.action_package_processes = tuple(args.action_package_processes)
+            # Validate early (raises ActionServerValidationError if not valid).
+            parse_action_package_processes(settings.action_package_processes)
+
+        if getattr(args, "fork_server_preload", None):
+            settings.fork_server_preload = tuple(args.fork_server_preload)
+
         if hasattr(args, "https"):
             settings.use_https = args.https
 
@@ -0,0 +1,173 @@
+"""
+Compiles the inputs templates of triggers.
+
+A template is a json value where strings may reference variables:
+
+- `{{payload.field}}` - Access webhook body fields
+- `{{headers.X-Header}}` - Access request headers
+- `{{meta.trigger_id}}` - Trigger metadata
+- `{{meta.timestamp}}` - Invocation timestamp
+
+If a string is a single variable reference, the actual value is used,
+otherwise the (string) values are interpolated.
+
+The template json is parsed and the variable paths are resolved just once
+(in `compile_template`), which provides a function that just walks the
+payload/headers to render the inputs of an invocation.
+"""
+
+import json
+import re
+import typing
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+if typing.TYPE_CHECKING:
+    from sema4ai.action_server._models import Trigger
+
+_VARIABLE_RE = re.compile(r"\{\{(.+?)\}\}")
+
+_PAYLOAD = 0
+_HEADERS = 1
+_META = 2
+_ROOTS = {"payload": _PAYLOAD, "headers": _HEADERS, "meta": _META}
+
+
+class _RenderContext:
+    __slots__ = ["roots", "trigger"]
+
+    def __init__(self, payload: Any, headers: Dict[str, str], trigger: "Trigger"):
+        # The meta is only computed if used.
+        self.roots: List[Any] = [payload, headers, None]
+        self.trigger = trigger
+
+    def get_root(self, root: int) -> Any:
+        if root == _META:
+            meta = self.roots[_META]
+            if meta is None:
+                meta = self.roots[_META] = {
+                    "trigger_id": self.trigger.id,
+                    "trigger_name": self.trigger.name,
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                }
+            return meta
+        return self.roots[root]
+
+
+_Renderer = Callable[[_RenderContext], Any]
+
+# Renders the inputs given the payload, headers and trigger.
+CompiledTemplate = Callable[[Any, Dict[str, str], "Trigger"], Dict[str, Any]]
+
+
+def _compile_path(path: str) -> _Renderer:
+    parts = path.split(".")
+    root = _ROOTS.get(parts[0])
+    if root is None:
+        return lambda ctx: None
+
+    # (key, index): the key is used for dicts and the index for lists.
+    steps: List[Tuple[str, Optional[int]]] = []
+    for part in parts[1:]:
+        try:
+            index: Optional[int] = int(part)
+        except ValueError:
+            index = None
+        steps.append((part, index))
+
+    def render(ctx: _RenderContext) -> Any:
+        obj = ctx.get_root(root)
+        for key, index in steps:
+            if isinstance(obj, dict):
+                obj = obj.get(key)
+            elif isinstance(obj, list):
+                if index is None:
+                    return None
+                try:
+                    obj = obj[index]
+                except IndexError:
+                    return None
+            else:
+                return None
+
+            if obj is None:
+                return None
+        return obj
+
+    return render
+
+
+def _compile_string(template: str) -> _Renderer:
+    # Check if entire string is a single variable
+    match = _VARIABLE_RE.fullmatch(template.strip())
+    if match:
+        return _compile_path(match.group(1).strip())
+
+    parts = _VARIABLE_RE.split(template)
+    if len(parts) == 1:
+        return lambda ctx: template
+
+    # String interpolation for mixed content (the odd parts are the variables).
+    compiled_parts: List[Any] = [
+        _compile_path(part.strip()) if i % 2 else part for i, part in enumerate(parts)
+    ]
+
+    def render(ctx: _RenderContext) -> str:
+        ret = []
+        for part in compiled_parts:
+            if isinstance(part, str):
+                ret.append(part)
+            else:
+                value = part(ctx)
+                if value is not None:
+                    ret.append(str(value))
+        return "".join(ret)
+
+    return render
+
+
+def _compile(template: Any) -> _Renderer:
+    if isinstance(template, str):
+        return _compile_string(template)
+
+    # Note: new dicts/lists are always created (the inputs may be changed
+    # afterwards).
+    elif isinstance(template, dict):
+        items = [(k, _compile(v)) for k, v in template.items()]
+        return lambda ctx: {k: render(ctx) for k, render in items}
+
+    elif isinstance(template, list):
+        renderers = [_compile(item) for item in template]
+        return lambda ctx: [render(ctx) for render in renderers]
+
+    else:
+        return lambda ctx: template
+
+
+def compile_template(template_json: str) -> CompiledTemplate:
+    """
+    Compiles the given template.
+
+    Args:
+        template_json: The template (json). If empty, the payload is used
+            as the inputs (if it's a dict, otherwise it's used as `payload`).
+
+    Raises:
+        ValueError: if the template is not valid json.
+    """
+    if not template_json:
+
+        def apply_no_template(payload, headers, trigger):
+            # No template - use payload as-is if it's a dict
+            if isinstance(payload, dict):
+                return payload
+            return {"payload": payload}
+
+        return apply_no_template
+
+    render = _compile(json.loads(template_json))
+
+    def apply_template(payload, headers, trigger):
+        return render(_RenderContext(payload, headers, trigger))
+
+    return apply_template
@@ -8,11 +8,17 @@ import hashlib
 import hmac
 import json
 import logging
-import re
 import secrets
-from collections import defaultdict
-from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from sema4ai.action_server._db_executor import run_in_db_executor
+from sema4ai.action_server._rate_limiter import (
+    RateLimit,
+    RateLimitResult,
+    get_rate_limiter,
+)
+from sema4ai.action_server._trigger_templates import CompiledTemplate, compile_template
 
 log = logging.getLogger(__name__)
 
@@ -24,13 +30,15 @@ class TriggerEngine:
     Features:
     - HMAC signature validation
     - Rate limiting
-    - Payload templating
+    - Payload templating (compiled once per trigger)
     """
 
     def __init__(self):
         """Initialize the trigger engine."""
-        # Rate limit tracker: trigger_id -> list of invocation timestamps
-        self._rate_limit_tracker: Dict[str, List[datetime]] = defaultdict(list)
+        self._rate_limiter = get_rate_limiter()
+
+        # trigger_id -> (template json, compiled template)
+        self._compiled_templates: Dict[str, Tuple[str, CompiledTemplate]] = {}
 
     async def handle_webhook(
         self,
@@ -49,13 +57,14 @@ class TriggerEngine:
             source_ip: Source IP address
 
         Returns:
-            Dict with status and any created run/work_item IDs
+            Dict with status and any created run/work_item IDs (and the
+            `RateLimitResult` in "rate_limit" if the trigger is rate limited).
+            If the trigger has `async_ack` set, the status is "queued" (or
+            "duplicate") and the execution is done by the inbox workers.
         """
-        from sema4ai.action_server._database import datetime_to_str
         from sema4ai.action_server._gen_ids import gen_uuid
         from sema4ai.action_server._models import (
             Trigger,
-            TriggerInvocation,
             TriggerInvocationStatus,
             get_db,
         )
@@ -66,18 +75,21 @@ class TriggerEngine:
         db = get_db()
 
         # Get the trigger
-        with db.connect():
-            try:
-                trigger = db.first(
+        def get_trigger() -> Trigger:
+            with db.connect():
+                return db.first(
                     Trigger,
                     "SELECT * FROM trigger WHERE id = ?",
                     [trigger_id],
                 )
-            except KeyError:
-                return {
-                    "status": "error",
-                    "message": f"Trigger not found: {trigger_id}",
-                }
+
+        try:
+            trigger = await run_in_db_executor(get_trigger)
+        except KeyError:
+            return {
+                "status": "error",
+                "message": f"Trigger not found: {trigger_id}",
+            }
 
         # Check if trigger is enabled
         if not trigger.enabled:
@@ -105,7 +117,8 @@ class TriggerEngine:
                 }
 
         # Check rate limit
-        if not self._check_rate_limit(trigger, now):
+        rate_limit = self._check_rate_limit(trigger, now)
+        if rate_limit is not None and not rate_limit.allowed:
             await self._record_invocation(
                 invocation_id,
                 trigger_id,
@@ -119,16 +132,166 @@ class TriggerEngine:
             return {
                 "status": "rate_limited",
                 "message": "Rate limit exceeded",
+                "rate_limit": rate_limit,
             }
 
-        # Apply payload template to get inputs
+        if trigger.async_ack:
+            return await self._enqueue_webhook(
+                trigger, invocation_id, now, source_ip, payload, headers, rate_limit
+            )
+
+        result = await self._execute_trigger(
+            trigger, invocation_id, now, source_ip, payload, headers
+        )
+        if rate_limit is not None:
+            result["rate_limit"] = rate_limit
+        return result
+
+    async def _enqueue_webhook(
+        self,
+        trigger: "Trigger",
+        invocation_id: str,
+        now: datetime,
+        source_ip: Optional[str],
+        payload: Any,
+        headers: Dict[str, str],
+        rate_limit: Optional[RateLimitResult],
+    ) -> Dict[str, Any]:
+        """
+        Stores the webhook in the inbox (a single write) to be executed by the
+        inbox workers (redeliveries with the same delivery id are ignored).
+        """
+        from sema4ai.action_server._database import datetime_to_str
+        from sema4ai.action_server._models import (
+            WebhookInboxEntry,
+            WebhookInboxStatus,
+        )
+        from sema4ai.action_server._webhook_inbox import (
+            enqueue_webhook,
+            get_delivery_id,
+            notify_webhook_enqueued,
+        )
+
+        delivery_id = get_delivery_id(trigger, headers)
+        entry = WebhookInboxEntry(
+            id=invocation_id,
+            trigger_id=trigger.id,
+            dedup_key=f"{trigger.id}:{delivery_id}" if delivery_id else None,
+            received_at=datetime_to_str(now),
+            source_ip=source_ip,
+            payload_json=_to_json(payload),
+            headers_json=json.dumps(dict(headers)) if headers else None,
+            status=WebhookInboxStatus.PENDING,
+        )
+
+        if await run_in_db_executor(enqueue_webhook, entry):
+            notify_webhook_enqueued()
+            result: Dict[str, Any] = {
+                "status": "queued",
+                "invocation_id": invocation_id,
+            }
+        else:
+            log.info(
+                f"Trigger {trigger.id}: ignoring redelivery of {delivery_id!r}"
+            )
+            result = {
+                "status": "duplicate",
+                "message": f"Delivery already received: {delivery_id}",
+            }
+        if rate_limit is not None:
+            result["rate_limit"] = rate_limit
+        return result
+
+    async def process_inbox_entry(self, entry: "WebhookInboxEntry") -> Dict[str, Any]:
+        """
+        Executes a webhook stored in the inbox.
+
+        Returns:
+            Dict with status and any created run/work_item IDs
+        """
+        from sema4ai.action_server._database import str_to_datetime
+        from sema4ai.action_server._models import (
+            Trigger,
+            TriggerInvocationStatus,
+            get_db,
+        )
+
+        def get_trigger() -> Trigger:
+            db = get_db()
+            with db.connect():
+                return db.first(
+                    Trigger,
+                    "SELECT * FROM trigger WHERE id = ?",
+                    [entry.trigger_id],
+                )
+
         try:
-            inputs = self._apply_template(
-                trigger.inputs_template_json,
+            trigger = await run_in_db_executor(get_trigger)
+        except KeyError:
+            # Deleted in the meanwhile (and its invocations with it).
+            return {
+                "status": "rejected",
+                "message": f"Trigger not found: {entry.trigger_id}",
+            }
+
+        received_at = str_to_datetime(entry.received_at)
+        payload = None
+        if entry.payload_json:
+            try:
+                payload = json.loads(entry.payload_json)
+            except ValueError:
+                payload = entry.payload_json
+        headers = json.loads(entry.headers_json) if entry.headers_json else {}
+
+        if not trigger.enabled:
+            await self._record_invocation(
+                entry.id,
+                trigger.id,
+                received_at,
+                entry.source_ip,
                 payload,
                 headers,
-                trigger,
+                TriggerInvocationStatus.REJECTED,
+                error_message="Trigger is disabled",
+                replace=True,
             )
+            return {
+                "status": "rejected",
+                "message": "Trigger is disabled",
+            }
+
+        return await self._execute_trigger(
+            trigger,
+            entry.id,
+            received_at,
+            entry.source_ip,
+            payload,
+            headers,
+            replace_invocation=True,
+        )
+
+    async def _execute_trigger(
+        self,
+        trigger: "Trigger",
+        invocation_id: str,
+        now: datetime,
+        source_ip: Optional[str],
+        payload: Any,
+        headers: Dict[str, str],
+        replace_invocation: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Applies the template and creates the run/work item for a (validated)
+        webhook, recording the invocation.
+        """
+        from sema4ai.action_server._database import datetime_to_str
+        from sema4ai.action_server._models import TriggerInvocationStatus, get_db
+
+        trigger_id = trigger.id
+
+        # Apply payload template to get inputs
+        try:
+            inputs = self._apply_template(trigger, payload, headers)
         except Exception as e:
             await self._record_invocation(
                 invocation_id,
@@ -139,10 +302,13 @@ class TriggerEngine:
                 headers,
                 TriggerInvocationStatus.ERROR,
                 error_message=f"Template error: {e}",
+                replace=replace_invocation,
             )
+            # Retrying would just fail again.
             return {
                 "status": "error",
                 "message": f"Failed to apply template: {e}",
+                "retryable": False,
             }
 
         # Execute the trigger
@@ -166,22 +332,25 @@ class TriggerEngine:
                 TriggerInvocationStatus.ACCEPTED,
                 run_id=run_id,
                 work_item_id=work_item_id,
+                replace=replace_invocation,
             )
 
-            # Update trigger stats
-            with db.connect():
-                with db.transaction():
-                    db.update_by_id(
-                        Trigger,
-                        trigger_id,
-                        {
-                            "last_triggered_at": datetime_to_str(now),
-                            "trigger_count": trigger.trigger_count + 1,
-                            "updated_at": datetime_to_str(now),
-                        },
-                    )
-
-            result = {
+            # Update trigger stats (the count is incremented in the db as
+            # invocations may be executed concurrently).
+            def update_trigger_stats() -> None:
+                db = get_db()
+                with db.connect():
+                    with db.transaction():
+                        db.execute(
+                            "UPDATE trigger SET last_triggered_at = ?, "
+                            "trigger_count = trigger_count + 1, updated_at = ? "
+                            "WHERE id = ?",
+                            [datetime_to_str(now), datetime_to_str(now), trigger_id],
+                        )
+
+            await run_in_db_executor(update_trigger_stats)
+
+            result: Dict[str, Any] = {
                 "status": "accepted",
                 "invocation_id": invocation_id,
             }
@@ -205,10 +374,13 @@ class TriggerEngine:
                 headers,
                 TriggerInvocationStatus.ERROR,
                 error_message=str(e),
+                replace=replace_invocation,
             )
             return {
                 "status": "error",
                 "message": str(e),
+                # i.e.: no action configured or the action is disabled.
+                "retryable": not isinstance(e, ValueError),
             }
 
     def _validate_signature(
@@ -288,32 +460,45 @@ class TriggerEngine:
         self,
         trigger: "Trigger",
         now: datetime,
-    ) -> bool:
-        """Check if the trigger's rate limit allows invocation."""
+    ) -> Optional[RateLimitResult]:
+        """
+        Check if the trigger's rate limit allows invocation (recording it if it
+        does).
+
+        Returns None if the trigger is not rate limited.
+        """
         if not trigger.rate_limit_enabled:
-            return True
+            return None
 
-        # Clean up old entries (keep last minute)
-        minute_ago = now - timedelta(minutes=1)
-        self._rate_limit_tracker[trigger.id] = [
-            ts for ts in self._rate_limit_tracker[trigger.id]
-            if ts > minute_ago
-        ]
+        return self._rate_limiter.acquire(
+            get_trigger_rate_limit_key(trigger.id),
+            [RateLimit(trigger.rate_limit_max_per_minute, 60)],
+            now.timestamp(),
+        )
 
-        # Check limit
-        if len(self._rate_limit_tracker[trigger.id]) >= trigger.rate_limit_max_per_minute:
-            return False
+    def get_compiled_template(self, trigger: "Trigger") -> CompiledTemplate:
+        """
+        Provides the compiled inputs template of the trigger (compiled just
+        once as long as the template isn't changed).
+        """
+        template_json = trigger.inputs_template_json
+        cached = self._compiled_templates.get(trigger.id)
+        if cached is not None and cached[0] == template_json:
+            return cached[1]
 
-        # Record this invocation
-        self._rate_limit_tracker[trigger.id].append(now)
-        return True
+        compiled = compile_template(template_json)
+        self._compiled_templates[trigger.id] = (template_json, compiled)
+        return compiled
+
+    def invalidate_template(self, trigger_id: str) -> None:
+        """Discards the compiled template (the trigger was updated/deleted)."""
+        self._compiled_templates.pop(trigger_id, None)
 
     def _apply_template(
         self,
-        template_json: str,
+        trigger: "Trigger",
         payload: Any,
         headers: Dict[str, str],
-        trigger: "Trigger",
     ) -> Dict[str, Any]:
         """
         Apply payload template to create action inputs.
@@ -324,110 +509,7 @@ class TriggerEngine:
         - {{meta.trigger_id}} - Trigger metadata
         - {{meta.timestamp}} - Invocation timestamp
         """
-        if not template_json:
-            # No template - use payload as-is if it's a dict
-            if isinstance(payload, dict):
-                return payload
-            return {"payload": payload}
-
-        template = json.loads(template_json)
-        return self._resolve_template(template, payload, headers, trigger)
-
-    def _resolve_template(
-        self,
-        template: Any,
-        payload: Any,
-        headers: Dict[str, str],
-        trigger: "Trigger",
-    ) -> Any:
-        """Recursively resolve template variables."""
-        if isinstance(template, str):
-            return self._resolve_string_template(template, payload, headers, trigger)
-        elif isinstance(template, dict):
-            return {
-                k: self._resolve_template(v, payload, headers, trigger)
-                for k, v in template.items()
-            }
-        elif isinstance(template, list):
-            return [
-                self._resolve_template(item, payload, headers, trigger)
-                for item in template
-            ]
-        else:
-            return template
-
-    def _resolve_string_template(
-        self,
-        template: str,
-        payload: Any,
-        headers: Dict[str, str],
-        trigger: "Trigger",
-    ) -> Any:
-        """
-        Resolve a string that may contain template variables.
-
-        If the entire string is a single variable reference, return the actual value.
-        Otherwise, perform string interpolation.
-        """
-        # Check if entire string is a single variable
-        match = re.fullmatch(r"\{\{(.+?)\}\}", template.strip())
-        if match:
-            path = match.group(1).strip()
-            return self._get_template_value(path, payload, headers, trigger)
-
-        # String interpolation for mixed content
-        def replace_var(m):
-            path = m.group(1).strip()
-            value = self._get_template_value(path, payload, headers, trigger)
-            return str(value) if value is not None else ""
-
-        return re.sub(r"\{\{(.+?)\}\}", replace_var, template)
-
-    def _get_template_value(
-        self,
-        path: str,
-        payload: Any,
-        headers: Dict[str, str],
-        trigger: "Trigger",
-    ) -> Any:
-        """Get a value from the template context by path."""
-        parts = path.split(".")
-
-        if not parts:
-            return None
-
-        root = parts[0]
-        rest = parts[1:]
-
-        if root == "payload":
-            obj = payload
-        elif root == "headers":
-            obj = headers
-        elif root == "meta":
-            obj = {
-                "trigger_id": trigger.id,
-                "trigger_name": trigger.name,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-            }
-        else:
-            return None
-
-        # Navigate the path
-        for part in rest:
-            if isinstance(obj, dict):
-                obj = obj.get(part)
-            elif isinstance(obj, list):
-                try:
-                    obj = obj[int(part)]
-                except (ValueError, IndexError):
-                    return None
-            else:
-                return None
-
-            if obj is None:
-                return None
-
-        return obj
+        return self.get_compiled_template(trigger)(payload, headers, trigger)
 
     async def _record_invocation(
         self,
@@ -441,38 +523,45 @@ class TriggerEngine:
         run_id: Optional[str] = None,
         work_item_id: Optional[str] = None,
         error_message: Optional[str] = None,
+        replace: bool = False,
     ) -> None:
-        """Record a trigger invocation in the database."""
+        """
+        Record a trigger invocation in the database.
+
+        If `replace` is True, a previous record with the same id is updated
+        (an inbox entry may be executed more than once).
+        """
         from sema4ai.action_server._database import datetime_to_str
         from sema4ai.action_server._models import TriggerInvocation, get_db
 
         db = get_db()
 
         # Serialize payload and headers
-        payload_json = None
-        if payload is not None:
-            try:
-                payload_json = json.dumps(payload)
-            except (TypeError, ValueError):
-                payload_json = str(payload)
-
+        payload_json = _to_json(payload)
         headers_json = json.dumps(dict(headers)) if headers else None
 
-        with db.connect():
-            with db.transaction():
-                invocation = TriggerInvocation(
-                    id=invocation_id,
-                    trigger_id=trigger_id,
-                    invoked_at=datetime_to_str(now),
-                    source_ip=source_ip,
-                    payload_json=payload_json,
-                    headers_json=headers_json,
-                    status=status,
-                    run_id=run_id,
-                    work_item_id=work_item_id,
-                    error_message=error_message,
-                )
-                db.insert(invocation)
+        invocation = TriggerInvocation(
+            id=invocation_id,
+            trigger_id=trigger_id,
+            invoked_at=datetime_to_str(now),
+            source_ip=source_ip,
+            payload_json=payload_json,
+            headers_json=headers_json,
+            status=status,
+            run_id=run_id,
+            work_item_id=work_item_id,
+            error_message=error_message,
+        )
+
+        def insert_invocation() -> None:
+            with db.connect():
+                with db.transaction():
+                    if replace:
+                        db.insert_or_update(invocation)
+                    else:
+                        db.insert(invocation)
+
+        await run_in_db_executor(insert_invocation)
 
     async def _create_action_run(
         self,
@@ -490,32 +579,35 @@ class TriggerEngine:
         if not trigger.action_id:
             raise ValueError("Trigger has no action_id configured")
 
-        db = get_db()
-        with db.connect():
-            try:
-                action = db.first(
-                    Action,
-                    "SELECT * FROM action WHERE id = ?",
-                    [trigger.action_id],
-                )
-            except KeyError:
-                raise ValueError(f"Action not found: {trigger.action_id}")
+        run_id = gen_uuid("run")
 
-            if not action.enabled:
-                raise ValueError(f"Action {action.id} is disabled")
+        def create_run() -> Action:
+            db = get_db()
+            with db.connect():
+                try:
+                    action = db.first(
+                        Action,
+                        "SELECT * FROM action WHERE id = ?",
+                        [trigger.action_id],
+                    )
+                except KeyError:
+                    raise ValueError(f"Action not found: {trigger.action_id}")
 
-        # Create the run
-        run_id = gen_uuid("run")
-        relative_artifacts_dir = _create_run_artifacts_dir(action, run_id)
+                if not action.enabled:
+                    raise ValueError(f"Action {action.id} is disabled")
 
-        with db.connect():
-            run = _create_run(
-                action=action,
-                run_id=run_id,
-                inputs=inputs,
-                relative_artifacts_dir=relative_artifacts_dir,
-                request_id=f"trigger:{trigger.id}",
-            )
+                # Create the run
+                relative_artifacts_dir = _create_run_artifacts_dir(action, run_id)
+                _create_run(
+                    action=action,
+                    run_id=run_id,
+                    inputs=inputs,
+                    relative_artifacts_dir=relative_artifacts_dir,
+                    request_id=f"trigger:{trigger.id}",
+                )
+            return action
+
+        action = await run_in_db_executor(create_run)
 
         log.info(
             f"Trigger {trigger.id}: created run {run_id} for action {action.name}"
@@ -546,7 +638,7 @@ class TriggerEngine:
         inputs["_triggered_at"] = datetime.now(timezone.utc).isoformat()
 
         try:
-            from actions.work_items import create_adapter, init, seed_input
+            from actions.work_items import create_adapter
 
             # Create adapter targeting the action server's work items storage
             from sema4ai.action_server._settings import get_settings
@@ -556,16 +648,19 @@ class TriggerEngine:
             db_path = str(settings.datadir / "workitems.db")
             files_dir = str(settings.datadir / "work_item_files")
 
-            adapter = create_adapter(
-                adapter_type="sqlite",
-                db_path=db_path,
-                queue_name=queue_name,
-                files_dir=files_dir,
-            )
-            init(adapter)
+            def seed_work_item() -> str:
+                adapter = create_adapter(
+                    adapter_type="sqlite",
+                    db_path=db_path,
+                    queue_name=queue_name,
+                    files_dir=files_dir,
+                )
 
-            # Seed the work item
-            work_item_id = seed_input(payload=inputs)
+                # Seed the work item (with the local adapter: the global one
+                # set with `init()` is shared by concurrent invocations).
+                return adapter.seed_input(payload=inputs)
+
+            work_item_id = await run_in_db_executor(seed_work_item)
 
             log.info(
                 f"Trigger {trigger.id}: created work item {work_item_id} "
@@ -590,6 +685,20 @@ class TriggerEngine:
         return secrets.token_urlsafe(length)
 
 
+def _to_json(payload: Any) -> Optional[str]:
+    if payload is None:
+        return None
+    try:
+        return json.dumps(payload)
+    except (TypeError, ValueError):
+        return str(payload)
+
+
+def get_trigger_rate_limit_key(trigger_id: str) -> str:
+    """The key of the trigger in the rate limiter."""
+    return f"trigger:{trigger_id}"
+
+
 # Global trigger engine instance
 _global_trigger_engine: Optional[TriggerEngine] = None
 
@@ -1,10 +1,44 @@
+import os
 import threading
+from typing import Iterable, Optional, Sequence
+
+
+def get_changed_action_package_dirs(
+    action_package_dirs: Sequence[str], changed_paths: Iterable[str]
+) -> Optional[list[str]]:
+    """
+    Provides the action package directories affected by the given changes.
+
+    Returns:
+        The affected directories (in the same order as `action_package_dirs`)
+        or None if all the action packages must be reloaded (i.e.: a
+        `package.yaml` changed, which may change the action package name or
+        its pythonpath, or some change could not be mapped to a directory).
+    """
+    dirs = [os.path.abspath(d) for d in action_package_dirs]
+    normalized_dirs = [os.path.normcase(d) for d in dirs]
+    changed_dirs: set[str] = set()
+    for path in changed_paths:
+        path = os.path.normcase(os.path.abspath(path))
+        if os.path.basename(path) == "package.yaml":
+            return None
+
+        found = False
+        for d in normalized_dirs:
+            if path == d or path.startswith(os.path.join(d, "")):
+                changed_dirs.add(d)
+                found = True
+        if not found:
+            return None
+
+    return [d for d, n in zip(dirs, normalized_dirs) if n in changed_dirs]
 
 
 class ActionServerFileWatcher(threading.Thread):
     """
     Thread which starts watching files and calls the 'do_reload' method
-    when a change is detected in a .py or .yaml file.
+    when a change is detected in a .py or .yaml file (with the paths which
+    changed).
     """
 
     def __init__(self, dirs, do_reload):
@@ -15,8 +49,6 @@ class ActionServerFileWatcher(threading.Thread):
         self._stop_event = threading.Event()
 
     def run(self):
-        import os
-
         from watchfiles.filters import PythonFilter
 
         watch_dirs = [
@@ -25,13 +57,13 @@ class ActionServerFileWatcher(threading.Thread):
 
         import watchfiles
 
-        for _changes in watchfiles.watch(
+        for changes in watchfiles.watch(
             *watch_dirs,
             watch_filter=PythonFilter(extra_extensions=(".yaml",)),
             stop_event=self._stop_event,
             ignore_permission_denied=True,
         ):
-            self._do_reload()
+            self._do_reload(changed_paths=set(path for _change, path in changes))
 
     def stop(self):
         self._stop_event.set()
@@ -0,0 +1,392 @@
+"""
+Durable inbox for the webhooks of triggers with `async_ack` set.
+
+When a webhook is received for such a trigger, it's just validated (signature
+and rate limit) and appended to the inbox (`webhook_inbox_entry` table) in a
+single write, after which the sender gets a `202` right away (so, bursty
+senders such as GitHub or Stripe don't time out and retry).
+
+The `WebhookInbox` workers then drain the inbox, executing each entry (applying
+the template and creating the run/work item) through the `TriggerEngine`.
+
+Failed entries are retried (up to `max_attempts`, with an exponential backoff)
+unless the failure is deterministic (i.e.: the template can't be applied), in
+which case the entry is marked as an error right away.
+
+Redeliveries are deduplicated by the delivery id header (the entries are kept
+for `retention_seconds` after being processed for that).
+
+Note: the execution is at-least-once: an entry being processed when the server
+is stopped is processed again on the next start.
+"""
+
+import asyncio
+import logging
+import typing
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set
+
+from sema4ai.action_server._db_executor import run_in_db_executor
+
+if typing.TYPE_CHECKING:
+    from sema4ai.action_server._models import Trigger, WebhookInboxEntry
+
+log = logging.getLogger(__name__)
+
+# Headers checked for the delivery id when the trigger doesn't specify one
+# (lowercase).
+WELL_KNOWN_DELIVERY_ID_HEADERS = (
+    "x-delivery-id",
+    "x-github-delivery",
+    "x-gitlab-event-uuid",
+    "x-shopify-webhook-id",
+    "webhook-id",  # Standard Webhooks
+    "idempotency-key",
+)
+
+# How often the processed entries are pruned.
+_PRUNE_INTERVAL = 600.0  # seconds
+
+# Max delay before retrying a failed entry.
+_MAX_RETRY_BACKOFF = 300.0  # seconds
+
+
+def get_delivery_id(trigger: "Trigger", headers: Dict[str, str]) -> Optional[str]:
+    """
+    Provides the delivery id of a webhook (from its headers), or None if it's
+    not available.
+    """
+    lower_headers = {k.lower(): v for k, v in headers.items()}
+    if trigger.delivery_id_header:
+        return lower_headers.get(trigger.delivery_id_header.lower()) or None
+
+    for header in WELL_KNOWN_DELIVERY_ID_HEADERS:
+        delivery_id = lower_headers.get(header)
+        if delivery_id:
+            return delivery_id
+    return None
+
+
+def enqueue_webhook(entry: "WebhookInboxEntry") -> bool:
+    """
+    Appends the given entry to the inbox.
+
+    Note: blocking (should be called in the db executor).
+
+    Returns:
+        False if an entry with the same `dedup_key` is already in the inbox
+        (i.e.: it's a redelivery) and True otherwise.
+    """
+    from sema4ai.action_server._models import get_db
+
+    db = get_db()
+    with db.connect():
+        with db.transaction(), db.cursor() as cursor:
+            db.execute_update_returning(
+                cursor,
+                """
+                INSERT OR IGNORE INTO webhook_inbox_entry(
+                    id, trigger_id, dedup_key, received_at, source_ip,
+                    payload_json, headers_json, status, attempts
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    entry.id,
+                    entry.trigger_id,
+                    entry.dedup_key,
+                    entry.received_at,
+                    entry.source_ip,
+                    entry.payload_json,
+                    entry.headers_json,
+                    entry.status,
+                    entry.attempts,
+                ],
+            )
+            return cursor.rowcount == 1
+
+
+class WebhookInbox:
+    """
+    Drains the webhook inbox, executing up to `max_workers` entries
+    concurrently.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        max_attempts: int = 3,
+        retention_seconds: float = 86400.0,
+        poll_interval: float = 30.0,
+        retry_backoff: float = 5.0,
+    ):
+        self._max_workers = max_workers
+        self._max_attempts = max_attempts
+        self._retry_backoff = retry_backoff
+        self._retention_seconds = retention_seconds
+        self._poll_interval = poll_interval
+
+        self._running = False
+        self._task: Optional[asyncio.Task] = None
+        self._worker_tasks: Set[asyncio.Task] = set()
+
+        # Set when new entries are available or a worker is freed.
+        self._wakeup = asyncio.Event()
+
+    async def start(self) -> None:
+        """Start draining the inbox."""
+        if self._running:
+            log.warning("Webhook inbox is already running")
+            return
+
+        self._running = True
+        # Entries which were being processed when the server was stopped.
+        requeued = await run_in_db_executor(self._requeue_processing)
+        if requeued:
+            log.info(f"Webhook inbox: requeued {requeued} interrupted entries")
+        self._task = asyncio.create_task(self._run_loop())
+        log.info(f"Webhook inbox started (max_workers={self._max_workers})")
+
+    async def stop(self) -> None:
+        """Stop draining the inbox (the entries being processed are cancelled)."""
+        if not self._running:
+            return
+
+        self._running = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        worker_tasks = list(self._worker_tasks)
+        for task in worker_tasks:
+            task.cancel()
+        if worker_tasks:
+            await asyncio.gather(*worker_tasks, return_exceptions=True)
+
+        log.info("Webhook inbox stopped")
+
+    def notify(self) -> None:
+        """Notifies that new entries were added (must be called in the loop)."""
+        self._wakeup.set()
+
+    async def _run_loop(self) -> None:
+        last_prune = 0.0
+        loop = asyncio.get_running_loop()
+        while self._running:
+            self._wakeup.clear()
+            try:
+                free_workers = self._max_workers - len(self._worker_tasks)
+                if free_workers > 0:
+                    entries = await run_in_db_executor(self._claim, free_workers)
+                    for entry in entries:
+                        task = asyncio.create_task(self._process(entry))
+                        self._worker_tasks.add(task)
+                        # If all the workers are busy, more pending entries
+                        # are claimed when a worker is freed.
+                        task.add_done_callback(self._on_worker_done)
+
+                if loop.time() - last_prune > _PRUNE_INTERVAL:
+                    last_prune = loop.time()
+                    await run_in_db_executor(self._prune)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                log.exception("Error in the webhook inbox loop")
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self._poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def _on_worker_done(self, task: asyncio.Task) -> None:
+        self._worker_tasks.discard(task)
+        self._wakeup.set()
+
+    async def _process(self, entry: "WebhookInboxEntry") -> None:
+        from sema4ai.action_server._triggers import get_trigger_engine
+
+        retryable = True
+        try:
+            result = await get_trigger_engine().process_inbox_entry(entry)
+            error = None
+            if result["status"] == "error":
+                error = result.get("message", "Error")
+                retryable = result.get("retryable", True)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.exception(f"Error processing webhook inbox entry {entry.id}")
+            error = str(e)
+
+        retry_delay: Optional[float] = None
+        if error is not None and retryable and entry.attempts < self._max_attempts:
+            retry_delay = min(
+                self._retry_backoff * 2 ** (entry.attempts - 1), _MAX_RETRY_BACKOFF
+            )
+        try:
+            await run_in_db_executor(self._complete, entry.id, error, retry_delay)
+        except Exception:
+            log.exception(f"Error completing webhook inbox entry {entry.id}")
+            return
+
+        if retry_delay is not None:
+            # Claimed again when the delay elapses.
+            asyncio.get_running_loop().call_later(retry_delay, self._wakeup.set)
+
+    def _claim(self, limit: int) -> List["WebhookInboxEntry"]:
+        """
+        Marks (up to `limit`) pending entries (oldest first) as being processed
+        (entries to be retried are only claimed after their backoff elapses).
+
+        Note: blocking (should be called in the db executor).
+        """
+        from sema4ai.action_server._database import datetime_to_str
+        from sema4ai.action_server._models import (
+            WebhookInboxEntry,
+            WebhookInboxStatus,
+            get_db,
+        )
+
+        db = get_db()
+        with db.connect():
+            entries = db.select(
+                WebhookInboxEntry,
+                """
+                SELECT * FROM webhook_inbox_entry
+                WHERE status = ?
+                AND (next_attempt_at IS NULL OR next_attempt_at <= ?)
+                ORDER BY received_at
+                LIMIT ?
+                """,
+                [
+                    WebhookInboxStatus.PENDING,
+                    datetime_to_str(datetime.now(timezone.utc)),
+                    limit,
+                ],
+            )
+            if not entries:
+                return []
+
+            ids = [entry.id for entry in entries]
+            with db.transaction():
+                db.execute(
+                    f"""
+                    UPDATE webhook_inbox_entry
+                    SET status = ?, attempts = attempts + 1
+                    WHERE id IN ({", ".join("?" * len(ids))})
+                    """,
+                    [WebhookInboxStatus.PROCESSING, *ids],
+                )
+        for entry in entries:
+            entry.status = WebhookInboxStatus.PROCESSING
+            entry.attempts += 1
+        return entries
+
+    def _complete(
+        self, entry_id: str, error: Optional[str], retry_delay: Optional[float]
+    ) -> None:
+        """
+        Args:
+            retry_delay: If given, the (failed) entry is retried after this
+                delay (in seconds), otherwise it's done (or an error).
+
+        Note: blocking (should be called in the db executor).
+        """
+        from sema4ai.action_server._database import datetime_to_str
+        from sema4ai.action_server._models import (
+            WebhookInboxEntry,
+            WebhookInboxStatus,
+            get_db,
+        )
+
+        now = datetime.now(timezone.utc)
+        next_attempt_at = None
+        if error is None:
+            status = WebhookInboxStatus.DONE
+        elif retry_delay is not None:
+            status = WebhookInboxStatus.PENDING
+            next_attempt_at = datetime_to_str(now + timedelta(seconds=retry_delay))
+        else:
+            status = WebhookInboxStatus.ERROR
+
+        db = get_db()
+        with db.connect():
+            with db.transaction():
+                db.update_by_id(
+                    WebhookInboxEntry,
+                    entry_id,
+                    {
+                        "status": status,
+                        "processed_at": datetime_to_str(now),
+                        "error_message": error,
+                        "next_attempt_at": next_attempt_at,
+                    },
+                )
+
+    def _requeue_processing(self) -> int:
+        """
+        Note: blocking (should be called in the db executor).
+        """
+        from sema4ai.action_server._models import WebhookInboxStatus, get_db
+
+        db = get_db()
+        with db.connect():
+            with db.transaction(), db.cursor() as cursor:
+                db.execute_update_returning(
+                    cursor,
+                    "UPDATE webhook_inbox_entry SET status = ? WHERE status = ?",
+                    [WebhookInboxStatus.PENDING, WebhookInboxStatus.PROCESSING],
+                )
+                return cursor.rowcount
+
+    def _prune(self) -> None:
+        """
+        Removes the processed entries older than the retention.
+
+        Note: blocking (should be called in the db executor).
+        """
+        from sema4ai.action_server._database import datetime_to_str
+        from sema4ai.action_server._models import WebhookInboxStatus, get_db
+
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self._retention_seconds)
+        db = get_db()
+        with db.connect():
+            with db.transaction():
+                db.execute(
+                    """
+                    DELETE FROM webhook_inbox_entry
+                    WHERE status IN (?, ?) AND received_at < ?
+                    """,
+                    [
+                        WebhookInboxStatus.DONE,
+                        WebhookInboxStatus.ERROR,
+                        datetime_to_str(cutoff),
+                    ],
+                )
+
+
+# Global webhook inbox instance
+_global_webhook_inbox: Optional[WebhookInbox] = None
+
+
+def get_webhook_inbox() -> Optional[WebhookInbox]:
+    """Get the global webhook inbox instance."""
+    return _global_webhook_inbox
+
+
+def set_webhook_inbox(inbox: Optional[WebhookInbox]) -> None:
+    """Set the global webhook inbox instance."""
+    global _global_webhook_inbox
+    _global_webhook_inbox = inbox
+
+
+def notify_webhook_enqueued() -> None:
+    """
+    Wakes up the global webhook inbox (if any) after a webhook is added to it.
+    """
+    inbox = get_webhook_inbox()
+    if inbox is not None:
+        inbox.notify()
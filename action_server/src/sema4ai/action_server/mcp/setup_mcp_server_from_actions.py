@@ -395,8 +395,55 @@ class McpServerSetupHelper:
                 output_schema_kind=output_schema_kind,
             )
 
-    def unregister_actions(self):
-        self._init_state()
+    def unregister_actions(self, action_package_ids: set[str] | None = None):
+        """
+        Args:
+            action_package_ids: If given, just the actions of these action
+                packages are unregistered.
+        """
+        if action_package_ids is None:
+            self._init_state()
+            return
+
+        def is_kept(action_info: ActionInfo) -> bool:
+            return action_info.action.action_package_id not in action_package_ids
+
+        self._tool_name_to_action_info = {
+            k: v for k, v in self._tool_name_to_action_info.items() if is_kept(v)
+        }
+        self._tools = [
+            tool for tool in self._tools if tool.name in self._tool_name_to_action_info
+        ]
+
+        self._resource_to_action_info = {
+            k: v for k, v in self._resource_to_action_info.items() if is_kept(v)
+        }
+        kept_urls = set(AnyUrl(uri) for uri in self._resource_to_action_info)
+        self._resources = {
+            url: resource
+            for url, resource in self._resources.items()
+            if url in kept_urls
+        }
+
+        self._resource_template_to_action_info = {
+            k: v
+            for k, v in self._resource_template_to_action_info.items()
+            if is_kept(v)
+        }
+        self._resource_templates = [
+            template
+            for template in self._resource_templates
+            if template.uriTemplate in self._resource_template_to_action_info
+        ]
+
+        self._prompt_name_to_action_info = {
+            k: v for k, v in self._prompt_name_to_action_info.items() if is_kept(v)
+        }
+        self._prompts = [
+            prompt
+            for prompt in self._prompts
+            if prompt.name in self._prompt_name_to_action_info
+        ]
 
     def _init_state(self):
         self._tools = []
@@ -41,6 +41,14 @@ MIGRATION_ID_TO_NAME: Dict[int, str] = {
     9: "add_robot_run_columns",
     # we'll look for a 'migration_add_schedules' module based on this.
     10: "add_schedules",
+    # we'll look for a 'migration_add_rate_limit_state' module based on this.
+    11: "add_rate_limit_state",
+    # we'll look for a 'migration_add_webhook_inbox' module based on this.
+    12: "add_webhook_inbox",
+    # we'll look for a 'migration_add_run_change_seq' module based on this.
+    13: "add_run_change_seq",
+    # we'll look for a 'migration_add_run_rollups' module based on this.
+    14: "add_run_rollups",
 }
 
 CURRENT_VERSION: int = max(MIGRATION_ID_TO_NAME.keys())
@@ -78,7 +86,9 @@ def migrate_db(
         return True  # It's already correct
 
     import shutil
+    import sqlite3
     import time
+    from contextlib import closing
 
     path = Path(db_path)
     # Ok, we need to do a migration. The first thing is creating a backup,
@@ -89,13 +99,18 @@ def migrate_db(
     backup_file = parent_dir / f"{name}-pre-migration-{to_version}-{time.time()}.bak"
     log.info("Creating backup at: %s", backup_file)
 
+    # The db may be in WAL mode: make sure that the contents of the write-ahead
+    # log are in the db file before copying it.
+    with closing(sqlite3.connect(path)) as conn:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
     shutil.copyfile(path, backup_file)
 
     from sema4ai.action_server._database import Database
     from sema4ai.action_server._models import get_all_model_classes
 
     db = Database(db_path)
-    with db.connect():
+    with closing(db), db.connect():
         with db.transaction():
             db.initialize(get_all_model_classes())
             if "migration" not in db.list_table_names():
@@ -169,7 +184,10 @@ def db_migration_status(db_path: Union[Path, str]) -> MigrationStatus:
 
     # Ok, it already exists. Check the migration status.
     db = Database(db_path)
-    with db.connect():
-        log.info("Checking migration status for database at: %s", db_path)
-        db.log_internal_info()
-        return _db_migration_status(db)
+    try:
+        with db.connect():
+            log.info("Checking migration status for database at: %s", db_path)
+            db.log_internal_info()
+            return _db_migration_status(db)
+    finally:
+        db.close()
@@ -0,0 +1,34 @@
+"""
+Migration 11: Add the table with the (persisted) state of the rate limits of
+triggers and schedules.
+"""
+
+from sema4ai.action_server._database import Database
+from sema4ai.action_server.migrations import Migration
+
+
+def migrate(db: Database) -> None:
+    from sema4ai.action_server.migrations import MIGRATION_ID_TO_NAME
+
+    sqls = [
+        """
+CREATE TABLE IF NOT EXISTS rate_limit_state(
+    id TEXT NOT NULL PRIMARY KEY,
+    key TEXT NOT NULL,
+    window_seconds REAL NOT NULL,
+    window_start REAL NOT NULL,
+    current_count INTEGER NOT NULL,
+    previous_count INTEGER NOT NULL  
+)
+""",
+        """
+CREATE UNIQUE INDEX rate_limit_state_id_index ON rate_limit_state(id);
+""",
+        """
+CREATE INDEX rate_limit_state_key_non_unique_index ON rate_limit_state(key);
+""",
+    ]
+    for sql in sqls:
+        db.execute(sql)
+
+    db.insert(Migration(id=11, name=MIGRATION_ID_TO_NAME[11]))
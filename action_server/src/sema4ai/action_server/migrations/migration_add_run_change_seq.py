@@ -0,0 +1,27 @@
+"""
+Migration 13: Add the change sequence to runs (existing runs get their
+numbered id as the change sequence).
+"""
+
+from sema4ai.action_server._database import Database
+from sema4ai.action_server.migrations import Migration
+
+
+def migrate(db: Database) -> None:
+    from sema4ai.action_server.migrations import MIGRATION_ID_TO_NAME
+
+    sqls = [
+        """
+ALTER TABLE run ADD COLUMN change_seq INTEGER NOT NULL DEFAULT 0;
+""",
+        """
+UPDATE run SET change_seq = numbered_id;
+""",
+        """
+CREATE INDEX run_change_seq_non_unique_index ON run(change_seq);
+""",
+    ]
+    for sql in sqls:
+        db.execute(sql)
+
+    db.insert(Migration(id=13, name=MIGRATION_ID_TO_NAME[13]))
@@ -0,0 +1,45 @@
+"""
+Migration 14: Add the rollups of the finished runs used by the analytics
+(backfilled from the existing runs).
+"""
+
+from sema4ai.action_server._database import Database
+from sema4ai.action_server.migrations import Migration
+
+
+def migrate(db: Database) -> None:
+    from sema4ai.action_server._run_rollups import backfill_run_rollups
+    from sema4ai.action_server.migrations import MIGRATION_ID_TO_NAME
+
+    sqls = [
+        """
+CREATE TABLE IF NOT EXISTS run_rollup(
+    id TEXT NOT NULL PRIMARY KEY,
+    day TEXT NOT NULL,
+    action_id TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    run_count INTEGER NOT NULL,
+    run_time_count INTEGER NOT NULL,
+    run_time_sum REAL NOT NULL,
+    run_time_min REAL,
+    run_time_max REAL,
+    run_time_histogram TEXT NOT NULL  
+)
+""",
+        """
+CREATE UNIQUE INDEX run_rollup_id_index ON run_rollup(id);
+""",
+        """
+CREATE INDEX run_rollup_day_non_unique_index ON run_rollup(day);
+""",
+        """
+CREATE INDEX run_rollup_action_id_non_unique_index ON run_rollup(action_id);
+""",
+    ]
+    for sql in sqls:
+        db.execute(sql)
+
+    # One-time backfill with the runs which already finished.
+    backfill_run_rollups(db)
+
+    db.insert(Migration(id=14, name=MIGRATION_ID_TO_NAME[14]))
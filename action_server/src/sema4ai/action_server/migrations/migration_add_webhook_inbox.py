@@ -0,0 +1,52 @@
+"""
+Migration 12: Add the webhook inbox (for triggers which acknowledge webhooks
+before executing them).
+"""
+
+from sema4ai.action_server._database import Database
+from sema4ai.action_server.migrations import Migration
+
+
+def migrate(db: Database) -> None:
+    from sema4ai.action_server.migrations import MIGRATION_ID_TO_NAME
+
+    sqls = [
+        """
+ALTER TABLE trigger ADD COLUMN async_ack INTEGER CHECK(async_ack IN (0, 1)) NOT NULL DEFAULT 0;
+""",
+        """
+ALTER TABLE trigger ADD COLUMN delivery_id_header TEXT DEFAULT NULL;
+""",
+        """
+CREATE TABLE IF NOT EXISTS webhook_inbox_entry(
+    id TEXT NOT NULL PRIMARY KEY,
+    trigger_id TEXT NOT NULL,
+    dedup_key TEXT,
+    received_at TEXT NOT NULL,
+    source_ip TEXT,
+    payload_json TEXT,
+    headers_json TEXT,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    processed_at TEXT DEFAULT NULL,
+    error_message TEXT DEFAULT NULL,
+    next_attempt_at TEXT DEFAULT NULL
+)
+""",
+        """
+CREATE UNIQUE INDEX webhook_inbox_entry_id_index ON webhook_inbox_entry(id);
+""",
+        """
+CREATE UNIQUE INDEX webhook_inbox_entry_dedup_key_index ON webhook_inbox_entry(dedup_key);
+""",
+        """
+CREATE INDEX webhook_inbox_entry_trigger_id_non_unique_index ON webhook_inbox_entry(trigger_id);
+""",
+        """
+CREATE INDEX webhook_inbox_entry_status_non_unique_index ON webhook_inbox_entry(status);
+""",
+    ]
+    for sql in sqls:
+        db.execute(sql)
+
+    db.insert(Migration(id=12, name=MIGRATION_ID_TO_NAME[12]))
@@ -0,0 +1,89 @@
+import os
+import socket
+import sys
+from pathlib import Path
+
+import pytest
+
+from sema4ai.action_server._actions_fork_server import (
+    ForkServers,
+    is_fork_server_supported,
+)
+
+
+@pytest.mark.skipif(
+    not is_fork_server_supported(), reason="Fork server is only supported on Linux."
+)
+def test_actions_fork_server(tmpdir) -> None:
+    from sema4ai.action_server import _preload_actions
+    from sema4ai.action_server._robo_utils.process import is_process_alive
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = str(Path(_preload_actions.__file__).parent)
+    env.pop("SEMA4AI_ACTION_SERVER_PARENT_PID", None)
+    subprocess_kwargs = {"cwd": str(tmpdir), "env": env}
+
+    server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server_socket.bind(("127.0.0.1", 0))
+    server_socket.listen(5)
+    server_socket.settimeout(30)
+    host, port = server_socket.getsockname()
+
+    fork_servers = ForkServers(preload=["json", "module_which_does_not_exist"])
+    try:
+        forked = [
+            fork_servers.fork("key", sys.executable, subprocess_kwargs, host, port)
+            for _i in range(2)
+        ]
+        connections = [server_socket.accept()[0] for _forked in forked]
+        pids = set()
+        for forked_process in forked:
+            assert forked_process is not None
+            assert forked_process.poll() is None
+            assert is_process_alive(forked_process.pid)
+            pids.add(forked_process.pid)
+        assert len(pids) == 2
+        assert os.getpid() not in pids
+
+        # The forked processes have their own stdout/stderr: when the
+        # connection is closed the process exits (and its pipes are closed).
+        for connection, forked_process in zip(connections, forked):
+            assert forked_process is not None
+            connection.close()
+            forked_process.stderr.read()
+            forked_process.stdout.read()
+
+        # The fork server is kept running for the key.
+        assert fork_servers.fork("key", sys.executable, subprocess_kwargs, host, port)
+        server_socket.accept()[0].close()
+
+        # A new one is started for another key (and stale ones are disposed).
+        fork_servers.dispose_stale({"key2"})
+        assert fork_servers.fork("key2", sys.executable, subprocess_kwargs, host, port)
+        server_socket.accept()[0].close()
+    finally:
+        fork_servers.dispose()
+        server_socket.close()
+
+
+@pytest.mark.skipif(
+    not is_fork_server_supported(), reason="Fork server is only supported on Linux."
+)
+def test_actions_fork_server_unable_to_start(tmpdir) -> None:
+    fork_servers = ForkServers()
+    try:
+        # When the fork server can't be used None is returned (and it's not
+        # retried for the same key).
+        assert (
+            fork_servers.fork(
+                "key",
+                str(Path(str(tmpdir)) / "python-does-not-exist"),
+                {"cwd": str(tmpdir)},
+                "127.0.0.1",
+                0,
+            )
+            is None
+        )
+        assert fork_servers._failed_keys == {"key"}
+    finally:
+        fork_servers.dispose()
@@ -0,0 +1,145 @@
+from pathlib import Path
+
+
+def test_actions_metadata_cache(tmpdir) -> None:
+    from sema4ai.action_server._actions_metadata_cache import (
+        compute_cache_key,
+        compute_sources_hash,
+        load_cached_metadata,
+        store_cached_metadata,
+    )
+
+    datadir = Path(str(tmpdir)) / "datadir"
+    package = Path(str(tmpdir)) / "package"
+    (package / "actions").mkdir(parents=True)
+    (package / "package.yaml").write_text("name: my-package")
+    (package / "actions" / "my_action.py").write_text("# v1")
+
+    initial_hash = compute_sources_hash([package])
+    assert compute_sources_hash([package]) == initial_hash
+
+    # Non-source files and ignored directories don't change the hash.
+    (package / "README.md").write_text("readme")
+    (package / "actions" / "__pycache__").mkdir()
+    (package / "actions" / "__pycache__" / "my_action.py").write_text("cached")
+    (package / ".venv").mkdir()
+    (package / ".venv" / "lib.py").write_text("lib")
+    assert compute_sources_hash([package]) == initial_hash
+
+    (package / "actions" / "my_action.py").write_text("# v2")
+    changed_hash = compute_sources_hash([package])
+    assert changed_hash != initial_hash
+
+    key = compute_cache_key(changed_hash, "condahash", skip_lint=False)
+    assert key != compute_cache_key(changed_hash, "other-condahash", skip_lint=False)
+    assert key != compute_cache_key(changed_hash, "condahash", skip_lint=True)
+
+    assert load_cached_metadata(datadir, package, key) is None
+    metadata = {
+        "actions_library": "sema4ai.actions",
+        "actions_library_version": [1, 3, 0],
+        "actions_list_result": [{"name": "my_action"}],
+        "data_package_metadata": None,
+        "stderr": "",
+    }
+    store_cached_metadata(datadir, package, key, metadata)  # type: ignore
+    assert load_cached_metadata(datadir, package, key) == metadata
+
+    # Only the entry for the current key is available.
+    new_key = compute_cache_key(initial_hash, "condahash", skip_lint=False)
+    assert load_cached_metadata(datadir, package, new_key) is None
+    assert load_cached_metadata(datadir, package / "actions", key) is None
+
+
+def test_import_action_packages_in_order(tmpdir, monkeypatch) -> None:
+    import threading
+    import time
+
+    from sema4ai.action_server import _actions_import
+    from sema4ai.action_server._actions_import import _CollectedActionPackage
+    from sema4ai.action_server._models import Action, ActionPackage, create_db
+
+    collected_in_threads = set()
+
+    def collect(*, datadir, action_package_dir, skip_lint, whitelist):
+        collected_in_threads.add(threading.get_ident())
+        name = Path(action_package_dir).name
+        # The first ones are the slowest (written in the given order anyway).
+        time.sleep(0.2 if name == "pkg0" else 0.05)
+        return _CollectedActionPackage(
+            ActionPackage(
+                id=f"{name}-id",
+                name=name,
+                directory=action_package_dir,
+                conda_hash="condahash",
+                env_json="{}",
+            ),
+            Path(action_package_dir),
+            [
+                {
+                    "name": f"{name}_action",
+                    "docs": "",
+                    "file": f"{action_package_dir}/actions.py",
+                    "line": 1,
+                    "input_schema": {},
+                    "output_schema": {},
+                }
+            ],  # type: ignore
+            None,
+        )
+
+    monkeypatch.setattr(_actions_import, "_collect_action_package", collect)
+
+    datadir = Path(str(tmpdir))
+    with create_db(datadir / "server.db") as db, db.connect():
+        dirs = [str(datadir / f"pkg{i}") for i in range(4)]
+        _actions_import.import_action_packages(
+            datadir=datadir,
+            action_package_dirs=dirs,
+            disable_not_imported=True,
+            skip_lint=False,
+            whitelist="",
+        )
+        assert len(collected_in_threads) > 1
+        assert [p.name for p in db.all(ActionPackage)] == [
+            "pkg0",
+            "pkg1",
+            "pkg2",
+            "pkg3",
+        ]
+        # All the imported actions are enabled.
+        assert all(action.enabled for action in db.all(Action))
+
+        # Reimport without some packages: their actions are disabled.
+        _actions_import.import_action_packages(
+            datadir=datadir,
+            action_package_dirs=dirs[1:3],
+            disable_not_imported=True,
+            skip_lint=False,
+            whitelist="",
+        )
+        name_to_enabled = {a.name: a.enabled for a in db.all(Action)}
+        assert name_to_enabled == {
+            "pkg0_action": False,
+            "pkg1_action": True,
+            "pkg2_action": True,
+            "pkg3_action": False,
+        }
+
+        # Partial reimport: the actions of other packages are kept as is.
+        imported_ids = _actions_import.import_action_packages(
+            datadir=datadir,
+            action_package_dirs=dirs[3:],
+            disable_not_imported=True,
+            skip_lint=False,
+            whitelist="",
+            partial=True,
+        )
+        assert imported_ids == ["pkg3-id"]
+        name_to_enabled = {a.name: a.enabled for a in db.all(Action)}
+        assert name_to_enabled == {
+            "pkg0_action": False,
+            "pkg1_action": True,
+            "pkg2_action": True,
+            "pkg3_action": True,
+        }
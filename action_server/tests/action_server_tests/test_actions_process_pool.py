@@ -1,3 +1,4 @@
+import itertools
 import json
 import logging
 import sys
@@ -185,6 +186,39 @@ def test_actions_process_pool_run(actions_process_pool: ActionsProcessPool, tmpd
             assert run_info.result_json.exists()
 
 
+@pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="Fork server is Linux only."
+)
+def test_actions_process_pool_fork_server(
+    actions_process_pool: ActionsProcessPool, tmpdir
+) -> None:
+    import dataclasses
+
+    settings = dataclasses.replace(actions_process_pool._settings, fork_server=True)
+    pool = ActionsProcessPool(
+        settings,
+        actions_process_pool.action_package_id_to_action_package,
+        actions_process_pool.actions,
+    )
+    try:
+        assert pool._fork_servers is not None
+        action = next(iter(pool.actions))
+        pids = set()
+        for i in range(3):
+            with _create_run(tmpdir, pool, action, i) as run_info:
+                assert run_info.future.result() == 0
+                assert run_info.output_file.exists()
+                assert run_info.result_json.exists()
+                pids.add(run_info.process_handle.pid)
+
+        # The processes were forked from the same fork server.
+        assert len(pool._fork_servers._key_to_fork_server) == 1
+        fork_server = next(iter(pool._fork_servers._key_to_fork_server.values()))
+        assert fork_server.pid not in pids
+    finally:
+        pool.dispose()
+
+
 def test_actions_process_pool_process_crash(
     actions_process_pool: ActionsProcessPool, tmpdir
 ):
@@ -298,3 +332,122 @@ def test_actions_process_pool_basic(actions_process_pool: ActionsProcessPool):
 
                 assert actions_process_pool.get_idle_processes_count() == 0
                 assert actions_process_pool.get_running_processes_count() == 3
+
+
+def test_actions_process_pool_warm_processes(
+    actions_process_pool: ActionsProcessPool,
+) -> None:
+    from sema4ai.action_server._process_pool_warmer import (
+        parse_action_package_processes,
+    )
+
+    action = next(iter(actions_process_pool.actions))
+    assert actions_process_pool.get_idle_processes_count() == 2
+
+    # The min idle processes of the action package are spawned by the warmer.
+    actions_process_pool._action_package_processes = parse_action_package_processes(
+        ["action_package=3:3"]
+    )
+    actions_process_pool.adjust_warm_processes()
+    assert actions_process_pool.get_idle_processes_count() == 3
+
+    # The max idle processes of the action package are respected when processes
+    # are returned to the pool.
+    actions_process_pool._action_package_processes = parse_action_package_processes(
+        ["action_package=0:1"]
+    )
+    with actions_process_pool.obtain_process_for_action(action):
+        assert actions_process_pool.get_idle_processes_count() == 2
+    assert actions_process_pool.get_idle_processes_count() == 2
+
+    # Idle processes above `min_processes` are retired after the idle TTL.
+    actions_process_pool._settings.idle_process_ttl = 0
+    actions_process_pool._action_package_processes = {}
+    actions_process_pool._settings.min_processes = 1
+    actions_process_pool.adjust_warm_processes()
+    assert actions_process_pool.get_idle_processes_count() == 1
+
+
+def test_actions_process_pool_recycle(
+    actions_process_pool: ActionsProcessPool,
+) -> None:
+    import time
+
+    from sema4ai.action_server._process_recycling import ProcessRecyclePolicy
+
+    actions_process_pool._recycle_policy = ProcessRecyclePolicy(max_runs=1)
+    action = next(iter(actions_process_pool.actions))
+
+    with actions_process_pool.obtain_process_for_action(action) as p1:
+        pass
+
+    # Recycled in the background: the process is only killed after its
+    # replacement is available.
+    timeout_at = time.monotonic() + 20
+    while p1.is_alive():
+        assert time.monotonic() < timeout_at, "Process not recycled."
+        time.sleep(0.1)
+
+    assert actions_process_pool.get_idle_processes_count() == 2
+    with actions_process_pool._lock:
+        idle = set(
+            itertools.chain.from_iterable(actions_process_pool._idle_processes.values())
+        )
+    assert p1 not in idle
+
+
+def test_actions_process_pool_inline_io(
+    actions_process_pool: ActionsProcessPool, tmpdir
+) -> None:
+    import datetime
+
+    from sema4ai.action_server._database import datetime_to_str
+    from sema4ai.action_server._models import Run, RunStatus
+
+    actions = actions_process_pool.actions
+    assert len(actions) == 1
+    action = next(iter(actions))
+    action_package = actions_process_pool.action_package_id_to_action_package[
+        action.action_package_id
+    ]
+
+    robot_artifacts = Path(tmpdir) / "artifacts_inline"
+    robot_artifacts.mkdir(parents=True, exist_ok=True)
+    output_file = robot_artifacts / "output.txt"
+
+    run: Run = Run(
+        id="run-id",
+        numbered_id=1,
+        status=RunStatus.NOT_RUN,
+        action_id=action.id,
+        start_time=datetime_to_str(datetime.datetime.now(datetime.timezone.utc)),
+        run_time=None,
+        inputs=json.dumps({}),
+        result=None,
+        error_message=None,
+        relative_artifacts_dir="rel-artifacts-dir",
+    )
+
+    for name in ("John", "Jane"):
+        with actions_process_pool.obtain_process_for_action(action) as process_handle:
+            returncode = process_handle.run_action(
+                run,
+                action_package,
+                action,
+                None,
+                robot_artifacts,
+                output_file,
+                None,
+                {},
+                {},
+                actions_process_pool._reuse_processes,
+                inputs={"name": name},
+            )
+            assert returncode == 0
+            result_contents = process_handle.pop_inline_result_contents()
+            assert result_contents is not None
+            assert result_contents["result"] == f"Hello Mr. {name}."
+            assert process_handle.pop_inline_result_contents() is None
+
+    # Nothing related to the inputs/result should've been written.
+    assert not list(robot_artifacts.glob("*.json"))
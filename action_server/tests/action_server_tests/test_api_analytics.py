@@ -21,6 +21,7 @@ from sema4ai.action_server._models import (
     RunStatus,
     create_db,
 )
+from sema4ai.action_server._run_rollups import backfill_run_rollups
 
 
 @pytest.fixture
@@ -118,6 +119,9 @@ def populated_db(tmp_path):
             for run in runs:
                 db.insert(run)
 
+            # The analytics are read from the rollups.
+            backfill_run_rollups(db)
+
         yield db
 
 
@@ -234,3 +238,70 @@ def test_runs_by_action_dataclass():
     assert run.passed == 90
     assert run.failed == 10
     assert run.avg_duration_ms == 250.5
+
+
+def test_run_rollups_incremental_matches_backfill(populated_db):
+    """Test that the rollups updated as runs finish match the backfill."""
+    from sema4ai.action_server._models import RunRollup
+    from sema4ai.action_server._run_rollups import add_finished_run
+
+    db = populated_db
+    with db.connect():
+        backfilled = sorted(db.all(RunRollup), key=lambda r: r.id)
+        with db.transaction():
+            db.execute("DELETE FROM run_rollup")
+            for run in db.all(Run):
+                add_finished_run(db, run)
+        incremental = sorted(db.all(RunRollup), key=lambda r: r.id)
+
+    assert len(incremental) == 3
+    assert incremental == backfilled
+
+    rollup = [r for r in incremental if r.action_id == "action-002"][0]
+    assert rollup.run_count == 2
+    assert (rollup.run_time_min, rollup.run_time_max) == (1.0, 2.0)
+    assert rollup.run_time_sum == 3.0
+
+
+def test_analytics_with_unfinished_runs(populated_db):
+    """Test that runs still not finished are counted (but have no duration)."""
+    db = populated_db
+    with db.connect():
+        with db.transaction():
+            db.insert(
+                _create_test_run(
+                    "run-005",
+                    "action-001",
+                    RunStatus.RUNNING,
+                    datetime.now().isoformat(),
+                    None,
+                    5,
+                )
+            )
+
+    summary = get_analytics_summary()
+    assert summary.total_runs == 5
+    assert summary.runs_today == 3
+    assert summary.success_rate == 75.0
+    assert summary.avg_duration_ms == 1250.0
+
+    by_action = {r.action_name: r for r in get_runs_by_action()}
+    assert by_action["test_action_1"].total == 3
+    assert by_action["test_action_1"].avg_duration_ms == 1000.0
+
+
+def test_run_time_histogram(populated_db):
+    """Test the run time histogram."""
+    from sema4ai.action_server._api_analytics import get_run_time_histogram
+    from sema4ai.action_server._run_rollups import RUN_TIME_HISTOGRAM_BOUNDS
+
+    histogram = get_run_time_histogram(days=30)
+    assert histogram.bounds_ms == [b * 1000 for b in RUN_TIME_HISTOGRAM_BOUNDS]
+    assert sum(histogram.counts) == 4
+    # 0.5s, 1.0s, 1.5s and 2.0s
+    assert histogram.counts[RUN_TIME_HISTOGRAM_BOUNDS.index(0.5)] == 1
+    assert histogram.counts[RUN_TIME_HISTOGRAM_BOUNDS.index(1)] == 1
+    assert histogram.counts[RUN_TIME_HISTOGRAM_BOUNDS.index(2.5)] == 2
+
+    histogram = get_run_time_histogram(days=30, action_id="action-001")
+    assert sum(histogram.counts) == 2
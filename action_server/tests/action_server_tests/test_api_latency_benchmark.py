@@ -0,0 +1,81 @@
+"""
+Benchmark for the latency of `/api/runs` while other (database heavy) endpoints
+are being hammered (the database accesses of those must not block the event
+loop, otherwise the latency of every request goes up with the load).
+
+The p50/p99 latencies are printed (run with `-s` to see it) and a (very
+conservative) upper bound is checked so that big regressions are caught.
+"""
+import threading
+import time
+from typing import List
+
+import pytest
+
+from action_server_tests.fixtures import ActionServerClient
+
+N_REQUESTS = 200
+N_LOAD_THREADS = 8
+
+# p99 under load may be at most this many times the idle p99 (plus some slack
+# for slow CI machines).
+MAX_P99_RATIO = 5
+P99_SLACK_SECONDS = 0.25
+
+
+def _percentile(timings: List[float], percentile: float) -> float:
+    timings = sorted(timings)
+    index = min(len(timings) - 1, int(round(percentile / 100 * len(timings))))
+    return timings[index]
+
+
+def _measure_runs_latency(client: ActionServerClient) -> List[float]:
+    timings = []
+    for _i in range(N_REQUESTS):
+        initial_time = time.monotonic()
+        client.get_json("api/runs")
+        timings.append(time.monotonic() - initial_time)
+    return timings
+
+
+@pytest.mark.integration_test
+def test_api_runs_latency_under_load(
+    base_case,
+    client: ActionServerClient,
+) -> None:
+    for i in range(20):
+        client.post_get_str("api/actions/greeter/greet/run", {"name": f"Foo{i}"})
+
+    idle_timings = _measure_runs_latency(client)
+
+    stop = threading.Event()
+    load_requests = [0]
+
+    def load(url: str) -> None:
+        while not stop.is_set():
+            client.get_str(url)
+            load_requests[0] += 1
+
+    load_urls = ["api/schedules/stats", "api/work-items?limit=100"]
+    threads = [
+        threading.Thread(target=load, args=(load_urls[i % len(load_urls)],))
+        for i in range(N_LOAD_THREADS)
+    ]
+    for t in threads:
+        t.start()
+    try:
+        loaded_timings = _measure_runs_latency(client)
+    finally:
+        stop.set()
+        for t in threads:
+            t.join()
+
+    idle_p50, idle_p99 = _percentile(idle_timings, 50), _percentile(idle_timings, 99)
+    p50, p99 = _percentile(loaded_timings, 50), _percentile(loaded_timings, 99)
+    print(
+        f"\n/api/runs latency: idle p50={idle_p50 * 1000:.1f}ms "
+        f"p99={idle_p99 * 1000:.1f}ms | under load p50={p50 * 1000:.1f}ms "
+        f"p99={p99 * 1000:.1f}ms ({load_requests[0]} load requests, "
+        f"{N_LOAD_THREADS} threads)"
+    )
+    assert p99 < idle_p99 * MAX_P99_RATIO + P99_SLACK_SECONDS
@@ -0,0 +1,99 @@
+"""
+Benchmark for the throughput of the database when creating/updating runs
+(which is what's done in the database for each action run).
+
+The runs/second are printed (run with `-s` to see it) and a (very conservative)
+lower bound is checked so that big regressions are caught.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+N_CONCURRENT_RUNS = 8
+RUNS_PER_THREAD = 50
+
+# Very conservative (a regular machine should do much better than that).
+MIN_RUNS_PER_SECOND = 20
+
+
+@pytest.fixture(params=["strict", "group"])
+def runs_db(tmpdir, request):
+    from sema4ai.action_server import _settings
+    from sema4ai.action_server._models import Action, create_db
+    from sema4ai.action_server._runs_state_cache import use_runs_state_ctx
+    from sema4ai.action_server._settings import Settings
+
+    datadir = Path(str(tmpdir)) / "datadir"
+    datadir.mkdir(parents=True, exist_ok=True)
+    settings = Settings(
+        datadir=datadir,
+        artifacts_dir=datadir / "artifacts",
+        base_url="http://localhost:8080",
+    )
+
+    action = Action(
+        id="action1",
+        action_package_id="action_package1",
+        name="greet",
+        docs="",
+        file="action.py",
+        lineno=0,
+        input_schema="{}",
+        output_schema="{}",
+    )
+
+    old_settings = _settings._global_settings
+    _settings._global_settings = settings
+    try:
+        with create_db(datadir / "server.db") as db, use_runs_state_ctx(
+            db, group_commit=request.param == "group"
+        ) as runs_state:
+            yield db, action, runs_state
+    finally:
+        _settings._global_settings = old_settings
+
+
+def test_database_runs_throughput(runs_db) -> None:
+    from sema4ai.action_server._actions_run import (
+        _create_run,
+        _set_run_as_finished_ok,
+        _set_run_as_running,
+    )
+    from sema4ai.action_server._gen_ids import gen_uuid
+    from sema4ai.action_server._models import Run, RunStatus
+
+    db, action, runs_state = runs_db
+
+    def do_runs() -> int:
+        with db.connect():
+            for _i in range(RUNS_PER_THREAD):
+                run_id = gen_uuid("run")
+                initial_time = time.monotonic()
+                run = _create_run(action, run_id, {"name": "John"}, run_id, "")
+                _set_run_as_running(run, initial_time)
+                _set_run_as_finished_ok(run, '"Hello"', initial_time)
+        return RUNS_PER_THREAD
+
+    initial_time = time.monotonic()
+    with ThreadPoolExecutor(max_workers=N_CONCURRENT_RUNS) as executor:
+        futures = [executor.submit(do_runs) for _i in range(N_CONCURRENT_RUNS)]
+        total_runs = sum(f.result() for f in futures)
+    if runs_state.runs_writer is not None:
+        runs_state.runs_writer.flush()
+    elapsed = time.monotonic() - initial_time
+
+    runs_per_second = total_runs / elapsed
+    print(
+        f"\nDatabase throughput: {runs_per_second:.1f} runs/second "
+        f"({total_runs} runs, {N_CONCURRENT_RUNS} concurrent, {elapsed:.2f}s, "
+        f"{'group' if runs_state.runs_writer else 'strict'} durability)"
+    )
+
+    with db.connect():
+        runs = db.all(Run)
+    assert len(runs) == total_runs
+    assert all(run.status == RunStatus.PASSED for run in runs)
+    assert sorted(run.numbered_id for run in runs) == list(range(1, total_runs + 1))
+    assert runs_per_second > MIN_RUNS_PER_SECOND
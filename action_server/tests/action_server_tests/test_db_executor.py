@@ -0,0 +1,66 @@
+import asyncio
+import contextvars
+import threading
+import time
+
+import pytest
+
+
+def test_db_executor_does_not_block_loop() -> None:
+    from sema4ai.action_server._db_executor import run_in_db_executor
+
+    ctx_var: contextvars.ContextVar[str] = contextvars.ContextVar("ctx_var")
+
+    def blocking_call(value: int) -> tuple:
+        time.sleep(0.3)
+        return value, ctx_var.get(), threading.current_thread().name
+
+    def failing_call() -> None:
+        raise KeyError("not found")
+
+    async def check():
+        ctx_var.set("from-caller")
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+        try:
+            results = await asyncio.gather(
+                *(run_in_db_executor(blocking_call, i) for i in range(4))
+            )
+        finally:
+            ticker.cancel()
+
+        # The loop kept running while the calls were blocked.
+        assert ticks > 10
+        for i, (value, ctx_value, thread_name) in enumerate(results):
+            assert value == i
+            assert ctx_value == "from-caller"
+            assert thread_name.startswith("DBExecutor")
+
+        with pytest.raises(KeyError):
+            await run_in_db_executor(failing_call)
+
+    asyncio.run(check())
+
+
+def test_db_executor_shutdown() -> None:
+    from sema4ai.action_server._db_executor import (
+        get_db_executor,
+        run_in_db_executor,
+        shutdown_db_executor,
+    )
+
+    executor = get_db_executor()
+    assert get_db_executor() is executor
+    shutdown_db_executor()
+
+    # A new one is created on demand.
+    assert asyncio.run(run_in_db_executor(lambda: 1)) == 1
+    assert get_db_executor() is not executor
+    shutdown_db_executor()
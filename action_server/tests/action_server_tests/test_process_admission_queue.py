@@ -0,0 +1,100 @@
+import threading
+import time
+from concurrent.futures import CancelledError
+
+import pytest
+
+from sema4ai.action_server._process_admission_queue import (
+    ProcessAdmissionQueue,
+    ProcessQueueFullError,
+)
+from sema4ai.action_server._runs_state_cache import RunRuntimeInfo
+
+
+def _wait_for(condition, timeout=5):
+    initial_time = time.monotonic()
+    while not condition():
+        if time.monotonic() - initial_time > timeout:
+            raise AssertionError("Condition not satisfied in the given timeout.")
+        time.sleep(0.01)
+
+
+def _start_waiter(queue, acquired_order, name, priority=0, runtime_info=None):
+    errors = []
+
+    def target():
+        try:
+            queue.acquire(priority, runtime_info, name)
+        except BaseException as e:
+            errors.append(e)
+        else:
+            acquired_order.append(name)
+
+    t = threading.Thread(target=target, daemon=True)
+    t.start()
+    return t, errors
+
+
+def test_admission_queue_fifo_and_priority():
+    queue = ProcessAdmissionQueue(max_slots=1)
+    queue.acquire(0, None, "first")
+
+    acquired_order: list = []
+    threads = []
+    for i, (name, priority) in enumerate((("a", 0), ("b", 0), ("c", 5), ("d", 0))):
+        threads.append(_start_waiter(queue, acquired_order, name, priority)[0])
+        _wait_for(lambda: queue.get_queued_count() == i + 1)
+
+    for i in range(4):
+        queue.release()
+        _wait_for(lambda: len(acquired_order) == i + 1)
+
+    for t in threads:
+        t.join(5)
+
+    # Higher priority first, then FIFO.
+    assert acquired_order == ["c", "a", "b", "d"]
+    stats = queue.get_stats()
+    assert stats["queued"] == 0
+    assert stats["wait_time_seconds"]["count"] == 5
+    assert stats["queue_length"]["count"] == 5
+
+
+def test_admission_queue_max_depth():
+    queue = ProcessAdmissionQueue(max_slots=1, max_queue_depth=1)
+    queue.acquire(0, None, "first")
+
+    acquired_order: list = []
+    t, errors = _start_waiter(queue, acquired_order, "queued")
+    _wait_for(lambda: queue.get_queued_count() == 1)
+
+    with pytest.raises(ProcessQueueFullError):
+        queue.acquire(0, None, "rejected")
+    assert queue.get_stats()["rejected"] == 1
+
+    queue.release()
+    t.join(5)
+    assert acquired_order == ["queued"]
+    assert not errors
+
+
+def test_admission_queue_cancel_wakes_up_immediately():
+    queue = ProcessAdmissionQueue(max_slots=1)
+    queue.acquire(0, None, "first")
+
+    runtime_info = RunRuntimeInfo("run-id")
+    acquired_order: list = []
+    t, errors = _start_waiter(queue, acquired_order, "cancelled", 0, runtime_info)
+    _wait_for(lambda: queue.get_queued_count() == 1)
+
+    initial_time = time.monotonic()
+    runtime_info.cancel()
+    t.join(5)
+    assert time.monotonic() - initial_time < 2
+    assert len(errors) == 1 and isinstance(errors[0], CancelledError)
+    assert queue.get_queued_count() == 0
+
+    # The slot released must not be given to the cancelled waiter.
+    queue.release()
+    queue.acquire(0, None, "after-cancel")
+    assert queue.get_stats()["free_slots"] == 0
@@ -0,0 +1,58 @@
+import pytest
+
+
+def test_key_demand() -> None:
+    from sema4ai.action_server._process_pool_warmer import KeyDemand
+
+    demand = KeyDemand()
+    # No requests: nothing to keep warm.
+    assert demand.get_target_idle(now=0, idle_ttl=300) == 0
+
+    demand.on_request(0)
+    assert demand.get_target_idle(now=1, idle_ttl=300) == 1
+
+    # A burst of requests with a slow spawn: more processes are kept warm.
+    for i in range(120):
+        demand.on_request(i * 0.5)
+    demand.on_spawned(10.0)
+    now = 60
+    rate = demand.get_request_rate(now)
+    assert rate > 1
+    target = demand.get_target_idle(now, idle_ttl=300)
+    assert target > 1
+
+    # Requests waiting for processes to be spawned: one more is kept warm.
+    demand.on_acquired(2.0)
+    assert demand.get_target_idle(now, idle_ttl=300) == target + 1
+
+    # The rate decays and the key is cold after the idle TTL.
+    assert demand.get_request_rate(now + 600) < rate / 100
+    assert demand.get_target_idle(now + 301, idle_ttl=300) == 0
+
+
+def test_parse_action_package_processes() -> None:
+    from sema4ai.action_server._errors_action_server import (
+        ActionServerValidationError,
+    )
+    from sema4ai.action_server._process_pool_warmer import (
+        ActionPackageProcesses,
+        parse_action_package_processes,
+    )
+
+    parsed = parse_action_package_processes(
+        ["pkg-a=1:3", "pkg-b=2", "pkg-c=:4", " pkg-d = 0:0"]
+    )
+    assert parsed == {
+        "pkg-a": ActionPackageProcesses(1, 3),
+        "pkg-b": ActionPackageProcesses(2, None),
+        "pkg-c": ActionPackageProcesses(0, 4),
+        "pkg-d": ActionPackageProcesses(0, 0),
+    }
+    assert parsed["pkg-a"].bound(0) == 1
+    assert parsed["pkg-a"].bound(10) == 3
+    assert parsed["pkg-b"].bound(10) == 10
+    assert parsed["pkg-d"].bound(10) == 0
+
+    for invalid in ("pkg-a", "=1:2", "pkg-a=x", "pkg-a=3:1", "pkg-a=-1:"):
+        with pytest.raises(ActionServerValidationError):
+            parse_action_package_processes([invalid])
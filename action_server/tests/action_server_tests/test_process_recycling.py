@@ -0,0 +1,57 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+@pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="RSS is only available on Linux."
+)
+def test_get_process_rss() -> None:
+    from sema4ai.action_server._process_recycling import get_process_rss
+
+    rss = get_process_rss(os.getpid())
+    assert rss is not None and rss > 0
+
+    # The subprocesses are included.
+    process = subprocess.Popen(
+        [sys.executable, "-c", "import sys;sys.stdin.read()"], stdin=subprocess.PIPE
+    )
+    try:
+        own_rss = get_process_rss(process.pid)
+        assert own_rss is not None
+        rss_with_subprocess = get_process_rss(os.getpid())
+        assert rss_with_subprocess is not None
+        if os.path.exists(f"/proc/{os.getpid()}/task/{os.getpid()}/children"):
+            assert rss_with_subprocess >= own_rss
+    finally:
+        process.communicate(b"")
+
+    assert get_process_rss(process.pid) is None
+
+
+def test_process_recycle_policy() -> None:
+    from sema4ai.action_server._process_recycling import ProcessRecyclePolicy
+
+    mb = 1024 * 1024
+    policy = ProcessRecyclePolicy()
+    assert not policy.is_enabled()
+    assert policy.get_recycle_reason(1000 * mb, run_count=1000, age=1000) is None
+
+    policy = ProcessRecyclePolicy(max_runs=3)
+    assert policy.is_enabled()
+    assert policy.get_recycle_reason(None, run_count=2, age=1000) is None
+    reason = policy.get_recycle_reason(None, run_count=3, age=0)
+    assert reason is not None and "ran 3 times" in reason
+
+    policy = ProcessRecyclePolicy(max_age=60)
+    assert policy.get_recycle_reason(None, run_count=1000, age=59) is None
+    reason = policy.get_recycle_reason(None, run_count=0, age=60)
+    assert reason is not None and "age" in reason
+
+    policy = ProcessRecyclePolicy(max_rss=100 * mb)
+    assert policy.get_recycle_reason(None, run_count=0, age=0) is None
+    assert policy.get_recycle_reason(99 * mb, run_count=0, age=0) is None
+    reason = policy.get_recycle_reason(100 * mb, run_count=0, age=0)
+    assert reason is not None and "RSS: 100MB" in reason
@@ -0,0 +1,102 @@
+from pathlib import Path
+
+
+def test_rate_limiter_sliding_window() -> None:
+    from sema4ai.action_server._rate_limiter import RateLimit, RateLimiter
+
+    rate_limiter = RateLimiter()
+    limits = [RateLimit(10, 60)]
+
+    # Start of a window: 10 allowed, then denied.
+    now = 6000.0
+    for i in range(10):
+        result = rate_limiter.acquire("key", limits, now)
+        assert result.allowed
+        assert result.remaining == 9 - i
+    result = rate_limiter.acquire("key", limits, now + 1)
+    assert not result.allowed
+    assert result.remaining == 0
+    assert result.limit == 10
+    assert result.reset_after == 59
+
+    # Other keys are independent.
+    assert rate_limiter.acquire("other", limits, now).allowed
+
+    # Half of the next window: half of the previous hits still count.
+    now = 6090.0
+    for _i in range(5):
+        assert rate_limiter.acquire("key", limits, now).allowed
+    assert not rate_limiter.acquire("key", limits, now).allowed
+
+    # 2 windows later, nothing counts anymore.
+    now = 6240.0
+    assert rate_limiter.check("key", limits, now).remaining == 10
+
+
+def test_rate_limiter_multiple_limits() -> None:
+    from sema4ai.action_server._rate_limiter import RateLimit, RateLimiter
+
+    rate_limiter = RateLimiter()
+    limits = [RateLimit(3, 3600), RateLimit(5, 86400)]
+
+    now = 86400.0
+    for _i in range(3):
+        assert rate_limiter.acquire("key", limits, now).allowed
+    result = rate_limiter.check("key", limits, now)
+    assert not result.allowed
+    # The most restrictive limit is reported.
+    assert (result.limit, result.remaining) == (3, 0)
+
+    # `hit` records even when not allowed (and `check` doesn't record).
+    rate_limiter.hit("key", limits, now + 7200)
+    rate_limiter.hit("key", limits, now + 7200)
+    result = rate_limiter.check("key", limits, now + 7200)
+    assert not result.allowed
+    assert (result.limit, result.remaining) == (5, 0)
+
+    rate_limiter.remove("key")
+    assert rate_limiter.check("key", limits, now + 7200).allowed
+
+
+def test_rate_limiter_burst_is_constant_memory() -> None:
+    from sema4ai.action_server._rate_limiter import RateLimit, RateLimiter
+
+    rate_limiter = RateLimiter()
+    limits = [RateLimit(1000, 60)]
+
+    now = 0.0
+    allowed = 0
+    for i in range(20000):
+        allowed += rate_limiter.acquire("key", limits, now + i * 0.001).allowed
+    assert allowed == 1000
+
+    shard = rate_limiter._get_shard("key")
+    assert len(shard.counters["key"]) == 1
+
+
+def test_rate_limiter_persistence(tmpdir) -> None:
+    from sema4ai.action_server._models import RateLimitState, create_db
+    from sema4ai.action_server._rate_limiter import RateLimit, RateLimiter
+
+    limits = [RateLimit(3, 60)]
+    now = 600.0
+    db_path = Path(str(tmpdir)) / "server.db"
+    with create_db(db_path) as db:
+        rate_limiter = RateLimiter()
+        for _i in range(3):
+            rate_limiter.acquire("key1", limits, now)
+        rate_limiter.acquire("key2", limits, now)
+        with db.connect():
+            rate_limiter.flush(db)
+            assert len(db.all(RateLimitState)) == 2
+
+            # Only changes are written.
+            rate_limiter.remove("key2")
+            rate_limiter.flush(db)
+            assert [s.key for s in db.all(RateLimitState)] == ["key1"]
+
+        new_rate_limiter = RateLimiter()
+        with db.connect():
+            new_rate_limiter.load(db)
+        assert not new_rate_limiter.acquire("key1", limits, now + 1).allowed
+        assert new_rate_limiter.acquire("key2", limits, now + 1).allowed
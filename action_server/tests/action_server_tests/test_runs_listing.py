@@ -0,0 +1,97 @@
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def runs_state(tmpdir):
+    from sema4ai.action_server._models import create_db
+    from sema4ai.action_server._runs_state_cache import use_runs_state_ctx
+
+    db_path = Path(str(tmpdir)) / "server.db"
+    with create_db(db_path) as db, use_runs_state_ctx(db) as runs_state:
+        yield db, runs_state
+
+
+def _insert_run(db, runs_state, i: int, run_type: str = "action"):
+    from sema4ai.action_server._models import Run, RunStatus
+
+    run = Run(
+        id=f"run-{i}",
+        status=RunStatus.NOT_RUN,
+        action_id="action-id",
+        start_time="2024-01-01T00:00:00+00:00",
+        run_time=None,
+        inputs='{"large": "input"}',
+        result=None,
+        error_message=None,
+        relative_artifacts_dir=f"run-{i}",
+        numbered_id=i,
+        run_type=run_type,
+        change_seq=runs_state.next_change_seq(),
+    )
+    with db.connect():
+        with db.transaction():
+            db.insert(run)
+    return run
+
+
+def _update_run(db, runs_state, run, **changes):
+    for k, v in changes.items():
+        setattr(run, k, v)
+    run.change_seq = runs_state.next_change_seq()
+    with db.connect():
+        with db.transaction():
+            db.update(run, *changes.keys(), "change_seq")
+
+
+def test_runs_changed_since(runs_state) -> None:
+    from sema4ai.action_server._models import RunStatus
+
+    db, runs_state = runs_state
+    runs = [_insert_run(db, runs_state, i) for i in range(1, 6)]
+    assert [run.change_seq for run in runs] == [1, 2, 3, 4, 5]
+
+    _update_run(db, runs_state, runs[1], status=RunStatus.RUNNING)
+    _update_run(db, runs_state, runs[1], status=RunStatus.PASSED)
+    _update_run(db, runs_state, runs[0], status=RunStatus.FAILED)
+
+    with runs_state.semaphore:
+        assert runs_state.get_last_change_seq() == 8
+        changed = runs_state.get_runs_changed_since(5, limit=10)
+        assert [(r.id, r.status, r.change_seq) for r in changed] == [
+            ("run-2", RunStatus.PASSED, 7),
+            ("run-1", RunStatus.FAILED, 8),
+        ]
+        assert [r.id for r in runs_state.get_runs_changed_since(3, limit=2)] == [
+            "run-4",
+            "run-5",
+        ]
+        assert runs_state.get_runs_changed_since(8, limit=10) == []
+
+
+def test_list_runs_keyset_and_projection(runs_state) -> None:
+    db, runs_state = runs_state
+    for i in range(1, 8):
+        _insert_run(db, runs_state, i, run_type="robot" if i % 2 else "action")
+
+    with runs_state.semaphore:
+        page = runs_state.list_runs(limit=3)
+        assert [r["numbered_id"] for r in page] == [7, 6, 5]
+        assert page[0]["inputs"] == '{"large": "input"}'
+
+        page = runs_state.list_runs(before=page[-1]["numbered_id"], limit=3)
+        assert [r["numbered_id"] for r in page] == [4, 3, 2]
+
+        page = runs_state.list_runs(before=2, limit=3)
+        assert [r["numbered_id"] for r in page] == [1]
+
+        page = runs_state.list_runs(run_type="action", fields=["status", "id"])
+        assert page == [
+            {"id": "run-6", "status": 0},
+            {"id": "run-4", "status": 0},
+            {"id": "run-2", "status": 0},
+        ]
+
+        with pytest.raises(ValueError):
+            runs_state.list_runs(fields=["id", "1; DROP TABLE run"])
@@ -0,0 +1,118 @@
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def group_commit_runs_state(tmpdir):
+    from sema4ai.action_server._models import create_db
+    from sema4ai.action_server._runs_state_cache import use_runs_state_ctx
+
+    db_path = Path(str(tmpdir)) / "server.db"
+    with create_db(db_path) as db, use_runs_state_ctx(
+        db, group_commit=True
+    ) as runs_state:
+        yield db, runs_state
+
+
+def _new_run(runs_writer, i: int, request_id: str = ""):
+    from sema4ai.action_server._models import Run, RunStatus
+
+    return Run(
+        id=f"run-{i}",
+        status=RunStatus.NOT_RUN,
+        action_id="action-id",
+        start_time="2024-01-01T00:00:00+00:00",
+        run_time=None,
+        inputs="{}",
+        result=None,
+        error_message=None,
+        relative_artifacts_dir=f"run-{i}",
+        numbered_id=runs_writer.next_numbered_id(),
+        request_id=request_id,
+    )
+
+
+def test_runs_writer_read_your_writes(group_commit_runs_state) -> None:
+    from sema4ai.action_server._models import Counter, Run, RunStatus
+
+    db, runs_state = group_commit_runs_state
+    runs_writer = runs_state.runs_writer
+    assert runs_writer is not None
+
+    runs = [_new_run(runs_writer, i, request_id=f"req-{i}") for i in range(20)]
+    for run in runs:
+        runs_writer.insert_run(run)
+        run.status = RunStatus.RUNNING
+        runs_writer.update_run(run, ["status"])
+
+    # Changes done afterwards must not be seen (a snapshot is written).
+    runs[0].result = "changed-after"
+
+    with runs_state.semaphore:
+        # Available right away (even if still not committed).
+        run = runs_state.get_run_from_id("run-3")
+        assert run.status == RunStatus.RUNNING
+        assert run.result is None
+        assert runs_state.get_run_from_request_id("req-4").id == "run-4"
+
+        # Listing waits for the pending changes.
+        listed = runs_state.get_current_run_state()
+        assert [r.id for r in listed] == [f"run-{i}" for i in reversed(range(20))]
+
+    assert runs_writer.flush(timeout=5)
+    assert runs_writer.get_pending_run("run-3") is None
+    with db.connect():
+        db_runs = db.all(Run)
+        counter = db.first(Counter, "SELECT * FROM counter WHERE id = 'run_id'")
+    assert len(db_runs) == 20
+    assert all(r.status == RunStatus.RUNNING and r.result is None for r in db_runs)
+    assert counter.value == 20
+
+
+def test_runs_writer_commits_on_stop(tmpdir) -> None:
+    from sema4ai.action_server._models import Run, RunStatus, create_db
+    from sema4ai.action_server._runs_state_cache import use_runs_state_ctx
+
+    db_path = Path(str(tmpdir)) / "server.db"
+    with create_db(db_path) as db:
+        with use_runs_state_ctx(db, group_commit=True) as runs_state:
+            runs_writer = runs_state.runs_writer
+            run = _new_run(runs_writer, 0)
+            runs_writer.insert_run(run)
+            run.status = RunStatus.PASSED
+            run.result = '"ok"'
+            runs_writer.update_run(run, ["status", "result"])
+
+        with db.connect():
+            db_run = db.first(Run, "SELECT * FROM run WHERE id = ?", ["run-0"])
+        assert db_run.status == RunStatus.PASSED
+        assert db_run.result == '"ok"'
+
+        with pytest.raises(RuntimeError):
+            runs_writer.insert_run(_new_run(runs_writer, 1))
+
+
+def test_runs_writer_finished_runs_rollups(group_commit_runs_state) -> None:
+    from sema4ai.action_server._models import RunRollup, RunStatus
+
+    db, runs_state = group_commit_runs_state
+    runs_writer = runs_state.runs_writer
+    assert runs_writer is not None
+
+    runs = [_new_run(runs_writer, i) for i in range(3)]
+    for run in runs:
+        runs_writer.insert_run(run)
+        run.status = RunStatus.PASSED
+        run.run_time = 0.2
+        runs_writer.update_run(run, ["status", "run_time"], finished=True)
+    # Not finished: not in the rollups.
+    runs[0].result = "changed"
+    runs_writer.update_run(runs[0], ["result"])
+
+    assert runs_writer.flush(timeout=5)
+    with db.connect():
+        rollups = db.all(RunRollup)
+    assert len(rollups) == 1
+    assert rollups[0].status == RunStatus.PASSED
+    assert rollups[0].run_count == 3
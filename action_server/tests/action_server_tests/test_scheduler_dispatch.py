@@ -0,0 +1,238 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def scheduler_db(tmpdir):
+    from sema4ai.action_server._models import create_db
+
+    with create_db(Path(str(tmpdir)) / "server.db") as db:
+        yield db
+
+
+def _insert_interval_schedule(db, schedule_id: str, next_run_at: datetime):
+    from sema4ai.action_server._database import datetime_to_str
+    from sema4ai.action_server._models import Schedule
+
+    schedule = Schedule(
+        id=schedule_id,
+        name=schedule_id,
+        description=None,
+        action_id=None,
+        execution_mode="run",
+        work_item_queue=None,
+        inputs_json="{}",
+        schedule_type="interval",
+        cron_expression=None,
+        interval_seconds=60,
+        weekday_config_json=None,
+        once_at=None,
+        timezone="UTC",
+        next_run_at=datetime_to_str(next_run_at),
+    )
+    with db.connect(), db.transaction():
+        db.insert(schedule)
+
+
+def test_scheduler_dispatch_is_concurrent_and_claims_once(scheduler_db) -> None:
+    from sema4ai.action_server._models import Schedule
+    from sema4ai.action_server._scheduler import SchedulerEngine
+
+    db = scheduler_db
+    due = datetime.now(timezone.utc) - timedelta(seconds=1)
+    for i in range(3):
+        _insert_interval_schedule(db, f"schedule-{i}", due)
+
+    async def check():
+        scheduler = SchedulerEngine(max_concurrent_global=2)
+        started = []
+        release = asyncio.Event()
+
+        async def slow_trigger_action(schedule):
+            started.append(schedule.id)
+            await release.wait()
+            return None
+
+        scheduler._trigger_action = slow_trigger_action
+        await scheduler._load_next_runs()
+
+        # The check doesn't wait for the (slow) executions.
+        await asyncio.wait_for(scheduler._check_and_execute_schedules(), 2)
+        await asyncio.sleep(0.1)
+        assert len(started) == 2  # Bounded by max_concurrent_global.
+
+        # All the due ticks were claimed: checking again doesn't fire them again.
+        await scheduler._check_and_execute_schedules()
+        await asyncio.sleep(0.1)
+        assert len(started) == 2
+
+        release.set()
+        await asyncio.gather(*scheduler._dispatched_tasks)
+        assert scheduler._global_running_count == 0
+
+        # The slot is free now: the schedule which wasn't claimed is dispatched.
+        await scheduler._check_and_execute_schedules()
+        await asyncio.gather(*scheduler._dispatched_tasks)
+        assert len(started) == 3
+        assert len(set(started)) == 3
+
+    asyncio.run(check())
+
+    with db.connect():
+        schedules = db.all(Schedule)
+    for schedule in schedules:
+        assert schedule.last_run_at is not None
+        next_run_at = datetime.fromisoformat(schedule.next_run_at)
+        assert next_run_at > datetime.now(timezone.utc)
+
+
+def test_scheduler_sleeps_until_next_run(scheduler_db) -> None:
+    from sema4ai.action_server._database import datetime_to_str
+    from sema4ai.action_server._scheduler import SchedulerEngine
+
+    db = scheduler_db
+    # Only loaded from the db on start.
+    _insert_interval_schedule(
+        db, "schedule-later", datetime.now(timezone.utc) + timedelta(hours=1)
+    )
+
+    async def check():
+        scheduler = SchedulerEngine(check_interval=60)
+        fired = asyncio.Event()
+
+        async def trigger_action(schedule):
+            fired.set()
+            return None
+
+        scheduler._trigger_action = trigger_action
+        await scheduler.start()
+        try:
+            assert list(scheduler._next_runs) == ["schedule-later"]
+
+            # Added while the scheduler is sleeping (would take 60 seconds
+            # to be noticed with polling).
+            next_run = datetime.now(timezone.utc) + timedelta(seconds=0.2)
+            _insert_interval_schedule(db, "schedule-soon", next_run)
+            scheduler.set_next_run("schedule-soon", datetime_to_str(next_run))
+
+            await asyncio.wait_for(fired.wait(), 5)
+            assert datetime.now(timezone.utc) >= next_run
+            await asyncio.gather(*scheduler._dispatched_tasks)
+
+            # Rescheduled in memory (interval of 60 seconds).
+            assert scheduler._next_runs["schedule-soon"] > next_run
+
+            # Disabled/deleted schedules are removed.
+            scheduler.set_next_run("schedule-later", None)
+            assert list(scheduler._next_runs) == ["schedule-soon"]
+        finally:
+            await scheduler.stop()
+
+    asyncio.run(check())
+
+
+def test_initialize_schedule_next_runs_off_loop(scheduler_db, monkeypatch) -> None:
+    import threading
+
+    from sema4ai.action_server import _scheduler
+    from sema4ai.action_server._models import Schedule
+    from sema4ai.action_server._scheduler import (
+        SchedulerEngine,
+        initialize_schedule_next_runs,
+    )
+
+    db = scheduler_db
+    _insert_interval_schedule(db, "schedule", datetime.now(timezone.utc))
+    with db.connect(), db.transaction():
+        db.update_by_id(Schedule, "schedule", {"next_run_at": None})
+
+    scheduler = SchedulerEngine()
+    compute_threads = []
+    compute_next_run_batch = scheduler.compute_next_run_batch
+
+    def compute_in_thread(*args, **kwargs):
+        compute_threads.append(threading.current_thread())
+        return compute_next_run_batch(*args, **kwargs)
+
+    monkeypatch.setattr(scheduler, "compute_next_run_batch", compute_in_thread)
+    monkeypatch.setattr(_scheduler, "get_scheduler", lambda: scheduler)
+
+    async def check():
+        loop_thread = threading.current_thread()
+        await initialize_schedule_next_runs()
+        # The db work is done in the db executor (not in the event loop).
+        assert compute_threads and compute_threads[0] is not loop_thread
+
+    asyncio.run(check())
+
+    with db.connect():
+        schedule = db.first(
+            Schedule, "SELECT * FROM schedule WHERE id = ?", ["schedule"]
+        )
+    assert schedule.next_run_at is not None
+
+
+def test_scheduler_keeps_due_schedules_on_db_error(scheduler_db, monkeypatch) -> None:
+    from sema4ai.action_server import _models
+    from sema4ai.action_server._scheduler import SchedulerEngine
+
+    db = scheduler_db
+    due = datetime.now(timezone.utc) - timedelta(seconds=1)
+    _insert_interval_schedule(db, "schedule", due)
+
+    async def check():
+        scheduler = SchedulerEngine()
+        started = []
+
+        async def trigger_action(schedule):
+            started.append(schedule.id)
+            return None
+
+        scheduler._trigger_action = trigger_action
+        await scheduler._load_next_runs()
+
+        def get_db_locked():
+            raise RuntimeError("database is locked")
+
+        with monkeypatch.context() as m:
+            m.setattr(_models, "get_db", get_db_locked)
+            with pytest.raises(RuntimeError):
+                await scheduler._check_and_execute_schedules()
+
+        # Still due (and dispatched once the db is available again).
+        assert list(scheduler._next_runs) == ["schedule"]
+        await scheduler._check_and_execute_schedules()
+        await asyncio.gather(*scheduler._dispatched_tasks)
+        assert started == ["schedule"]
+
+    asyncio.run(check())
+
+
+def test_scheduler_claim_error_retried_after_check_interval(scheduler_db) -> None:
+    from sema4ai.action_server._scheduler import SchedulerEngine
+
+    db = scheduler_db
+    due = datetime.now(timezone.utc) - timedelta(seconds=1)
+    _insert_interval_schedule(db, "schedule", due)
+
+    async def check():
+        scheduler = SchedulerEngine(check_interval=30)
+
+        def claim_schedule(schedule, now):
+            raise RuntimeError("database is locked")
+
+        scheduler._claim_schedule = claim_schedule
+        await scheduler._load_next_runs()
+
+        before = datetime.now(timezone.utc)
+        await scheduler._check_and_execute_schedules()
+        assert not scheduler._dispatched_tasks
+
+        # Not due right away (which would make the scheduler loop spin).
+        assert scheduler._next_runs["schedule"] >= before + timedelta(seconds=29)
+        assert scheduler._get_sleep_time() > 0
+
+    asyncio.run(check())
@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta, timezone
+
+
+def _schedule(schedule_id: str, schedule_type: str, **kwargs):
+    from sema4ai.action_server._models import Schedule
+
+    values = dict(
+        id=schedule_id,
+        name=schedule_id,
+        description=None,
+        action_id=None,
+        execution_mode="run",
+        work_item_queue=None,
+        inputs_json="{}",
+        schedule_type=schedule_type,
+        cron_expression=None,
+        interval_seconds=None,
+        weekday_config_json=None,
+        once_at=None,
+        timezone="UTC",
+    )
+    values.update(kwargs)
+    return Schedule(**values)
+
+
+def test_compute_next_runs() -> None:
+    from sema4ai.action_server._scheduler import SchedulerEngine, _get_compiled_cron
+
+    scheduler = SchedulerEngine()
+    after = datetime(2024, 3, 9, 12, 0, 30, tzinfo=timezone.utc)
+
+    schedule = _schedule(
+        "cron", "cron", cron_expression="0 9 * * *", timezone="America/New_York"
+    )
+    _get_compiled_cron.cache_clear()
+    next_runs = scheduler.compute_next_runs(schedule, after, count=3)
+    # DST starts in 2024-03-10 in New York (09:00 is 14:00 UTC before it and
+    # 13:00 UTC afterwards).
+    assert next_runs == [
+        datetime(2024, 3, 9, 14, 0, tzinfo=timezone.utc),
+        datetime(2024, 3, 10, 13, 0, tzinfo=timezone.utc),
+        datetime(2024, 3, 11, 13, 0, tzinfo=timezone.utc),
+    ]
+    assert next_runs[0] == scheduler.compute_next_run(schedule, after)
+    # The parsed expression is reused.
+    assert _get_compiled_cron.cache_info().currsize == 1
+    assert _get_compiled_cron.cache_info().hits >= 1
+
+    # Bounded by the window.
+    assert (
+        scheduler.compute_next_runs(
+            schedule, after, count=10, until=after + timedelta(days=1)
+        )
+        == next_runs[:1]
+    )
+
+    interval = _schedule("interval", "interval", interval_seconds=60)
+    assert scheduler.compute_next_runs(interval, after, count=2) == [
+        after + timedelta(seconds=60),
+        after + timedelta(seconds=120),
+    ]
+
+    once = _schedule("once", "once", once_at=after.isoformat())
+    assert scheduler.compute_next_runs(once, after, count=2) == []
+
+
+def test_compute_next_run_batch() -> None:
+    from sema4ai.action_server._scheduler import SchedulerEngine
+
+    scheduler = SchedulerEngine()
+    after = datetime(2024, 1, 1, 0, 0, tzinfo=timezone.utc)
+
+    schedules = [
+        _schedule(f"cron-{i}", "cron", cron_expression="*/5 * * * *")
+        for i in range(1000)
+    ]
+    schedules.append(_schedule("interval", "interval", interval_seconds=30))
+    schedules.append(_schedule("invalid", "cron", cron_expression="not a cron"))
+
+    next_runs = scheduler.compute_next_run_batch(schedules, after)
+    assert len(next_runs) == 1002
+    assert next_runs["cron-0"] == next_runs["cron-999"] == after + timedelta(minutes=5)
+    assert next_runs["interval"] == after + timedelta(seconds=30)
+    assert next_runs["invalid"] is None
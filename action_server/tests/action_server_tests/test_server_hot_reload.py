@@ -76,3 +76,176 @@ def calculator_subtract(v1: float, v2: float) -> float:
             )
 
     run_async_in_new_thread(check_mcp_tools_after_reload)
+
+
+@pytest.mark.integration_test
+def test_server_hot_reload_body_change(
+    action_server_process: ActionServerProcess, client: ActionServerClient, tmpdir
+) -> None:
+    from pathlib import Path
+
+    from devutils.fixtures import wait_for_non_error_condition
+
+    package_dir = Path(tmpdir) / "calculator"
+    package_dir.mkdir(parents=True, exist_ok=True)
+    helper = package_dir / "calculator_helper.py"
+    helper.write_text(
+        """
+def factor():
+    return 1
+"""
+    )
+    calculator = package_dir / "action_calculator.py"
+    calculator.write_text(
+        """
+from sema4ai.actions import action
+from calculator_helper import factor
+
+@action
+def calculator_op(v1: float, v2: float) -> float:
+    return (v1 + v2) * factor()
+"""
+    )
+
+    action_server_process.start(
+        actions_sync=True,
+        cwd=package_dir,
+        db_file="server.db",
+        additional_args=["--auto-reload", "--reuse-processes"],
+    )
+
+    def run_op() -> float:
+        return float(
+            client.post_get_str(
+                "api/actions/calculator/calculator-op/run", {"v1": 2.0, "v2": 3.0}
+            )
+        )
+
+    assert run_op() == 5.0
+
+    # Just the body of the action changes (its metadata is the same): the
+    # (reused) processes must still be recycled.
+    calculator.write_text(
+        """
+from sema4ai.actions import action
+from calculator_helper import factor
+
+@action
+def calculator_op(v1: float, v2: float) -> float:
+    return (v1 * v2) * factor()
+"""
+    )
+
+    def check_body_reloaded():
+        assert run_op() == 6.0
+
+    wait_for_non_error_condition(check_body_reloaded)
+
+    # Just a helper module imported by the action changes.
+    helper.write_text(
+        """
+def factor():
+    return 10
+"""
+    )
+
+    def check_helper_reloaded():
+        assert run_op() == 60.0
+
+    wait_for_non_error_condition(check_helper_reloaded)
+
+
+def test_get_changed_action_package_dirs(tmpdir) -> None:
+    import os
+
+    from sema4ai.action_server._watcher import get_changed_action_package_dirs
+
+    pkg1 = os.path.join(str(tmpdir), "pkg1")
+    pkg2 = os.path.join(str(tmpdir), "pkg2")
+    pkg10 = os.path.join(str(tmpdir), "pkg10")
+    dirs = [pkg1, pkg2, pkg10]
+
+    assert get_changed_action_package_dirs(
+        dirs, {os.path.join(pkg10, "actions.py")}
+    ) == [pkg10]
+    assert get_changed_action_package_dirs(
+        dirs,
+        {os.path.join(pkg2, "sub", "actions.py"), os.path.join(pkg1, "actions.py")},
+    ) == [pkg1, pkg2]
+
+    # A package.yaml change (or a change outside of the packages) requires a
+    # full reload.
+    assert (
+        get_changed_action_package_dirs(dirs, {os.path.join(pkg1, "package.yaml")})
+        is None
+    )
+    assert (
+        get_changed_action_package_dirs(
+            dirs, {os.path.join(str(tmpdir), "other", "actions.py")}
+        )
+        is None
+    )
+
+
+def test_get_changed_action_package_ids() -> None:
+    from sema4ai.action_server._api_action_routes import (
+        _get_changed_action_package_ids,
+    )
+    from sema4ai.action_server._models import Action, ActionPackage
+
+    def create_package(name: str, env_json: str = "{}") -> ActionPackage:
+        return ActionPackage(
+            id=f"{name}-id",
+            name=name,
+            directory=name,
+            conda_hash="hash",
+            env_json=env_json,
+        )
+
+    def create_action(package: str, name: str, docs: str = "") -> Action:
+        return Action(
+            id=f"{package}-{name}-id",
+            action_package_id=f"{package}-id",
+            name=name,
+            docs=docs,
+            file="actions.py",
+            lineno=1,
+            input_schema="{}",
+            output_schema="{}",
+            enabled=True,
+            is_consequential=None,
+            managed_params_schema="",
+            options="",
+        )
+
+    packages = {p.id: p for p in [create_package("pkg1"), create_package("pkg2")]}
+    actions = [create_action("pkg1", "a1"), create_action("pkg2", "a2")]
+    assert (
+        _get_changed_action_package_ids(packages, actions, packages, actions) == set()
+    )
+
+    # Action changed
+    new_actions = [create_action("pkg1", "a1", docs="changed"), actions[1]]
+    assert _get_changed_action_package_ids(
+        packages, actions, packages, new_actions
+    ) == {"pkg1-id"}
+
+    # Action added (in a different order)
+    new_actions = [create_action("pkg2", "a3")] + actions
+    assert _get_changed_action_package_ids(
+        packages, actions, packages, new_actions
+    ) == {"pkg2-id"}
+
+    # Package env changed / package removed
+    new_packages = {
+        "pkg1-id": packages["pkg1-id"],
+        "pkg3-id": create_package("pkg3"),
+    }
+    assert _get_changed_action_package_ids(
+        packages, actions, new_packages, actions[:1]
+    ) == {"pkg2-id", "pkg3-id"}
+    new_packages = dict(packages)
+    new_packages["pkg2-id"] = create_package("pkg2", env_json='{"A": "1"}')
+    assert _get_changed_action_package_ids(
+        packages, actions, new_packages, actions
+    ) == {"pkg2-id"}
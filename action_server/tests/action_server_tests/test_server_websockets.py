@@ -66,6 +66,8 @@ def build_ws_url(action_server_process, url="api/ws"):
 class SocketClient:
     def __init__(self, ws):
         self.ws = ws
+        # Events received in a batch which weren't returned yet.
+        self._pending: list = []
 
     async def emit(self, event, data=None):
         msg = {"event": event}
@@ -74,7 +76,14 @@ class SocketClient:
         await self.ws.send(json.dumps(msg))
 
     async def receive(self):
-        received = json.loads(await self.ws.recv())
+        if not self._pending:
+            received = json.loads(await self.ws.recv())
+            if received["event"] == "batch":
+                self._pending.extend(received["data"])
+            else:
+                self._pending.append(received)
+
+        received = self._pending.pop(0)
         return received["event"], received.get("data")
 
 
@@ -111,6 +120,7 @@ async def check_websocket_runs(
             event, added = await sio.receive()
             assert tuple(added.keys()) == ("run",)
             assert added["run"]["numbered_id"] == 1
+            assert added["run"]["change_seq"] > 0
             assert event == "run_added"
 
             # Run was changed (running -> complete)
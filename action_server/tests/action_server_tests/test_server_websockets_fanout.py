@@ -0,0 +1,129 @@
+import asyncio
+import json
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class _Run:
+    id: str
+    status: int = 0
+
+
+@dataclass
+class _RunChangeEvent:
+    ev: str
+    run: _Run
+    changes: Optional[dict] = None
+
+
+class _FakeWebSocket:
+    def __init__(self, blocked: bool = False) -> None:
+        self.sent: list = []
+        self.can_send = asyncio.Event()
+        if not blocked:
+            self.can_send.set()
+        self.to_receive: asyncio.Queue = asyncio.Queue()
+
+    async def send_text(self, text: str) -> None:
+        await self.can_send.wait()
+        self.sent.append(json.loads(text))
+
+    async def receive_json(self):
+        from starlette.websockets import WebSocketDisconnect
+
+        data = await self.to_receive.get()
+        if data is None:
+            raise WebSocketDisconnect()
+        return data
+
+
+async def _wait_for(condition, timeout: float = 5) -> None:
+    async def wait():
+        while not condition():
+            await asyncio.sleep(0.005)
+
+    await asyncio.wait_for(wait(), timeout)
+
+
+def test_coalesce_run_change_events() -> None:
+    from sema4ai.action_server._server_websockets import (
+        _coalesce_run_change_events,
+    )
+
+    run1 = _Run("run-1")
+    run2 = _Run("run-2")
+    events = _coalesce_run_change_events(
+        [
+            _RunChangeEvent("changed", run2, {"status": 1}),
+            _RunChangeEvent("added", run1),
+            _RunChangeEvent("changed", run1, {"status": 1}),
+            _RunChangeEvent("changed", run2, {"status": 2, "result": "ok"}),
+            _RunChangeEvent("changed", run1, {"status": 2}),
+        ]
+    )
+    assert events == [
+        ("run_changed", {"run_id": "run-2", "changes": {"status": 2, "result": "ok"}}),
+        ("run_added", {"run": {"id": "run-1", "status": 0}}),
+        ("run_changed", {"run_id": "run-1", "changes": {"status": 2}}),
+    ]
+
+
+def test_socket_server_batch_and_slow_client() -> None:
+    from sema4ai.action_server._server_websockets import SocketServer
+
+    async def check():
+        server = SocketServer(max_pending_frames=3)
+        sids: list = []
+        resyncs: list = []
+
+        @server.on("connect")
+        async def on_connect(sid):
+            sids.append(sid)
+
+        @server.on("resync")
+        async def on_resync(sid):
+            resyncs.append(sid)
+            await server.emit("state", "current", to=sid)
+
+        fast = _FakeWebSocket()
+        slow = _FakeWebSocket(blocked=True)
+        tasks = [
+            asyncio.create_task(server.manage_websocket(ws)) for ws in (fast, slow)
+        ]
+        await _wait_for(lambda: len(sids) == 2)
+        _fast_sid, slow_sid = sids
+
+        server.emit_batch([("a", 1), ("b", None)])
+        for i in range(10):
+            await server.emit("ev", i)
+            # Let the writers run.
+            await asyncio.sleep(0)
+        await server.emit("response", "direct", to=slow_sid)
+
+        # The fast client receives everything (without waiting for the slow one).
+        await _wait_for(lambda: len(fast.sent) == 11)
+        assert fast.sent[0] == {
+            "event": "batch",
+            "data": [{"event": "a", "data": 1}, {"event": "b"}],
+        }
+        assert [m["data"] for m in fast.sent[1:]] == list(range(10))
+        assert slow.sent == []
+
+        # The slow client had broadcast events dropped (but not the ones
+        # directed to it) and is resynchronized.
+        slow.can_send.set()
+        await _wait_for(lambda: resyncs and slow.sent[-1]["event"] == "state")
+        assert resyncs == [slow_sid]
+        assert len([m for m in slow.sent if m["event"] == "ev"]) < 10
+        assert [m["event"] for m in slow.sent if m["event"] != "ev"][-2:] == [
+            "response",
+            "state",
+        ]
+
+        for ws in (fast, slow):
+            ws.to_receive.put_nowait(None)
+        await asyncio.gather(*tasks)
+        assert not server._sid_to_writer
+
+    asyncio.run(check())
@@ -0,0 +1,83 @@
+import json
+
+
+class _Trigger:
+    def __init__(self, inputs_template_json: str, id: str = "trigger-1"):
+        self.id = id
+        self.name = "My trigger"
+        self.inputs_template_json = inputs_template_json
+
+
+def test_trigger_template_render() -> None:
+    from sema4ai.action_server._trigger_templates import compile_template
+
+    template = {
+        "name": "{{payload.user.name}}",
+        "first_tag": "{{ payload.tags.0 }}",
+        "bad_index": "{{payload.tags.x}}",
+        "missing": "{{payload.user.missing.deep}}",
+        "count": "{{payload.count}}",
+        "message": "Hello {{payload.user.name}} ({{payload.count}}){{payload.none}}!",
+        "event": "{{headers.x-event}}",
+        "trigger": ["{{meta.trigger_id}}", "{{meta.trigger_name}}", 1, None, True],
+        "unknown_root": "{{other.value}}",
+        "literal": "no variables",
+    }
+    trigger = _Trigger(json.dumps(template))
+    render = compile_template(trigger.inputs_template_json)
+
+    payload = {"user": {"name": "John"}, "tags": ["a", "b"], "count": 2}
+    inputs = render(payload, {"x-event": "push"}, trigger)
+    assert inputs == {
+        "name": "John",
+        "first_tag": "a",
+        "bad_index": None,
+        "missing": None,
+        "count": 2,
+        "message": "Hello John (2)!",
+        "event": "push",
+        "trigger": ["trigger-1", "My trigger", 1, None, True],
+        "unknown_root": None,
+        "literal": "no variables",
+    }
+
+    # A new object is rendered each time (may be changed by the caller).
+    inputs["name"] = "changed"
+    inputs["trigger"].append("changed")
+    assert render(payload, {}, trigger)["trigger"] == [
+        "trigger-1",
+        "My trigger",
+        1,
+        None,
+        True,
+    ]
+
+    timestamp = compile_template('"{{meta.timestamp}}"')(None, {}, trigger)
+    assert isinstance(timestamp, str) and timestamp
+
+
+def test_trigger_template_no_template() -> None:
+    from sema4ai.action_server._trigger_templates import compile_template
+
+    render = compile_template("")
+    assert render({"a": 1}, {}, _Trigger("")) == {"a": 1}
+    assert render("raw", {}, _Trigger("")) == {"payload": "raw"}
+
+
+def test_trigger_engine_template_cache() -> None:
+    from sema4ai.action_server._triggers import TriggerEngine
+
+    engine = TriggerEngine()
+    trigger = _Trigger('{"a": "{{payload.a}}"}')
+
+    compiled = engine.get_compiled_template(trigger)
+    assert engine.get_compiled_template(trigger) is compiled
+    assert engine._apply_template(trigger, {"a": 1}, {}) == {"a": 1}
+
+    # A changed template is recompiled (even without an explicit invalidation).
+    trigger.inputs_template_json = '{"b": "{{payload.a}}"}'
+    assert engine._apply_template(trigger, {"a": 1}, {}) == {"b": 1}
+
+    new_compiled = engine.get_compiled_template(trigger)
+    engine.invalidate_template(trigger.id)
+    assert engine.get_compiled_template(trigger) is not new_compiled
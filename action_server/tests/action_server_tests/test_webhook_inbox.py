@@ -0,0 +1,200 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def triggers_db(tmpdir):
+    from sema4ai.action_server._models import Trigger, create_db
+    from sema4ai.action_server._triggers import TriggerEngine, set_trigger_engine
+
+    class _TriggerEngine(TriggerEngine):
+        fail_next = 0
+
+        async def _create_action_run(self, trigger, inputs) -> str:
+            if self.fail_next:
+                self.fail_next -= 1
+                raise RuntimeError("Failed to create run")
+            return f"run-for-{inputs['id']}"
+
+    db_path = Path(str(tmpdir)) / "server.db"
+    with create_db(db_path) as db:
+        trigger = Trigger(
+            id="trigger-1",
+            name="Trigger 1",
+            description=None,
+            action_id=None,
+            execution_mode="run",
+            work_item_queue=None,
+            inputs_template_json='{"id": "{{payload.id}}"}',
+            trigger_type="webhook",
+            webhook_secret=None,
+            webhook_method="POST",
+            created_at="2024-01-01T00:00:00+00:00",
+            updated_at="2024-01-01T00:00:00+00:00",
+            async_ack=True,
+        )
+        with db.connect():
+            with db.transaction():
+                db.insert(trigger)
+
+        engine = _TriggerEngine()
+        set_trigger_engine(engine)
+        try:
+            yield db, engine
+        finally:
+            set_trigger_engine(None)
+
+
+def _wait_inbox_drained(db, timeout=5) -> None:
+    import time
+
+    from sema4ai.action_server._models import WebhookInboxEntry, WebhookInboxStatus
+
+    timeout_at = time.monotonic() + timeout
+    while time.monotonic() < timeout_at:
+        with db.connect():
+            entries = db.all(WebhookInboxEntry)
+        if all(
+            e.status in (WebhookInboxStatus.DONE, WebhookInboxStatus.ERROR)
+            for e in entries
+        ):
+            return
+        time.sleep(0.05)
+    raise AssertionError(f"Inbox not drained: {entries}")
+
+
+def test_webhook_inbox_ack_dedup_and_drain(triggers_db) -> None:
+    from sema4ai.action_server._models import (
+        Trigger,
+        TriggerInvocation,
+        TriggerInvocationStatus,
+        WebhookInboxEntry,
+        WebhookInboxStatus,
+    )
+    from sema4ai.action_server._webhook_inbox import WebhookInbox, set_webhook_inbox
+
+    db, engine = triggers_db
+
+    async def check():
+        results = []
+        for delivery_id in ["d1", "d2", "d1"]:
+            results.append(
+                await engine.handle_webhook(
+                    "trigger-1",
+                    {"id": delivery_id},
+                    {"X-GitHub-Delivery": delivery_id},
+                )
+            )
+        # No delivery id: can't be deduplicated.
+        results.append(await engine.handle_webhook("trigger-1", {"id": "d3"}, {}))
+
+        assert [r["status"] for r in results] == [
+            "queued",
+            "queued",
+            "duplicate",
+            "queued",
+        ]
+
+        # Just acknowledged (nothing executed still).
+        with db.connect():
+            assert len(db.all(WebhookInboxEntry)) == 3
+            assert db.all(TriggerInvocation) == []
+
+        engine.fail_next = 1
+        inbox = WebhookInbox(
+            max_workers=2, max_attempts=2, poll_interval=0.1, retry_backoff=0.1
+        )
+        set_webhook_inbox(inbox)
+        try:
+            await inbox.start()
+            await asyncio.to_thread(_wait_inbox_drained, db)
+        finally:
+            await inbox.stop()
+            set_webhook_inbox(None)
+        return results
+
+    results = asyncio.run(check())
+
+    with db.connect():
+        entries = db.all(WebhookInboxEntry)
+        invocations = db.all(TriggerInvocation)
+        trigger = db.first(Trigger, "SELECT * FROM trigger WHERE id = ?", ["trigger-1"])
+
+    assert all(e.status == WebhookInboxStatus.DONE for e in entries)
+    # One of the entries failed the first time and was retried.
+    assert sorted(e.attempts for e in entries) == [1, 1, 2]
+
+    # The invocation id is the one returned when acknowledged.
+    queued_ids = {r["invocation_id"] for r in results if r["status"] == "queued"}
+    assert {i.id for i in invocations} == queued_ids
+    assert all(i.status == TriggerInvocationStatus.ACCEPTED for i in invocations)
+    assert sorted(i.run_id for i in invocations) == [
+        "run-for-d1",
+        "run-for-d2",
+        "run-for-d3",
+    ]
+    assert trigger.trigger_count == 3
+
+
+def test_webhook_inbox_retry_backoff_and_template_errors(triggers_db) -> None:
+    from sema4ai.action_server._models import (
+        Trigger,
+        WebhookInboxEntry,
+        WebhookInboxStatus,
+    )
+    from sema4ai.action_server._webhook_inbox import WebhookInbox
+
+    db, engine = triggers_db
+    with db.connect():
+        trigger = db.first(Trigger, "SELECT * FROM trigger WHERE id = ?", ["trigger-1"])
+        with db.transaction():
+            trigger.id = "trigger-bad-template"
+            trigger.inputs_template_json = "{not json"
+            db.insert(trigger)
+
+    def get_entry(entry_id) -> WebhookInboxEntry:
+        with db.connect():
+            return db.first(
+                WebhookInboxEntry,
+                "SELECT * FROM webhook_inbox_entry WHERE id = ?",
+                [entry_id],
+            )
+
+    async def check():
+        bad = await engine.handle_webhook("trigger-bad-template", {"id": "b1"}, {})
+        failing = await engine.handle_webhook("trigger-1", {"id": "f1"}, {})
+
+        engine.fail_next = 1
+        inbox = WebhookInbox(max_attempts=3, retry_backoff=60)
+
+        # The template can't be applied: not retried.
+        for entry in await asyncio.to_thread(inbox._claim, 10):
+            await inbox._process(entry)
+        entry = get_entry(bad["invocation_id"])
+        assert entry.status == WebhookInboxStatus.ERROR
+        assert entry.attempts == 1
+
+        # The failed entry is only claimed again after its backoff.
+        entry = get_entry(failing["invocation_id"])
+        assert entry.status == WebhookInboxStatus.PENDING
+        assert entry.next_attempt_at is not None
+        assert await asyncio.to_thread(inbox._claim, 10) == []
+
+    asyncio.run(check())
+
+
+def test_webhook_inbox_delivery_id() -> None:
+    from sema4ai.action_server._webhook_inbox import get_delivery_id
+
+    class _Trigger:
+        delivery_id_header = None
+
+    trigger = _Trigger()
+    assert get_delivery_id(trigger, {"Webhook-Id": "msg_1"}) == "msg_1"
+    assert get_delivery_id(trigger, {"Content-Type": "application/json"}) is None
+
+    trigger.delivery_id_header = "X-Custom-Id"
+    assert get_delivery_id(trigger, {"x-custom-id": "c1", "webhook-id": "w1"}) == "c1"
+    assert get_delivery_id(trigger, {"webhook-id": "w1"}) is None
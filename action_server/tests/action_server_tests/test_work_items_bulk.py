@@ -0,0 +1,79 @@
+import pytest
+
+
+def _parse(chunks, ndjson):
+    from sema4ai.action_server._api_work_items import _BulkItemsParser
+
+    parser = _BulkItemsParser(ndjson=ndjson)
+    items = []
+    for chunk in chunks:
+        items.extend(parser.feed(chunk))
+    items.extend(parser.close())
+    return items
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1000])
+def test_bulk_items_parser_json_array(chunk_size):
+    body = '[{"a": 1}, null , {"b": "xéy"}, 12, {"c": 3}]'.encode("utf-8")
+    chunks = [body[i : i + chunk_size] for i in range(0, len(body), chunk_size)]
+
+    items = _parse(chunks, ndjson=False)
+    assert [(index, payload) for index, payload, error in items if not error] == [
+        (0, {"a": 1}),
+        (1, None),
+        (2, {"b": "xéy"}),
+        (4, {"c": 3}),
+    ]
+    assert [index for index, _payload, error in items if error] == [3]
+
+
+def test_bulk_items_parser_ndjson():
+    items = _parse([b'{"a": 1}\n\n{"b"', b': 2}\nbad\n{"c": 3}'], ndjson=True)
+    assert [(index, payload) for index, payload, error in items if not error] == [
+        (0, {"a": 1}),
+        (1, {"b": 2}),
+        (3, {"c": 3}),
+    ]
+    assert [index for index, _payload, error in items if error] == [2]
+
+
+def test_bulk_items_parser_errors():
+    with pytest.raises(ValueError):
+        _parse([b'{"a": 1}'], ndjson=False)
+
+    items = _parse([b'[{"a": 1} {"b": 2}]'], ndjson=False)
+    assert items[0] == (0, {"a": 1}, None)
+    assert items[1][0] == 1 and items[1][2]
+
+    items = _parse([b'[{"a": 1}, {"b":'], ndjson=False)
+    assert items[0] == (0, {"a": 1}, None)
+    assert items[1][0] == 1 and items[1][2]
+
+
+def test_lease_sweeper_does_not_create_work_items_db(tmpdir) -> None:
+    import asyncio
+    from pathlib import Path
+
+    from sema4ai.action_server import _api_work_items, _settings
+    from sema4ai.action_server._settings import Settings
+
+    datadir = Path(str(tmpdir))
+    settings = Settings(datadir=datadir, artifacts_dir=datadir / "artifacts")
+    old_settings = _settings._global_settings
+    _settings._global_settings = settings
+    try:
+        assert _api_work_items._adapter is None
+
+        async def run_sweeper():
+            task = asyncio.create_task(
+                _api_work_items.sweep_expired_leases(0.01, max_attempts=3)
+            )
+            await asyncio.sleep(0.1)
+            assert not task.done()
+            task.cancel()
+
+        asyncio.run(run_sweeper())
+        assert not (datadir / "workitems.db").exists()
+        assert not (datadir / "work_item_files").exists()
+    finally:
+        _settings._global_settings = old_settings
@@ -403,9 +403,31 @@ _methods_marked_as_actions_found: List[Tuple[Callable, Dict]] = []
 _found_as_set: Set[Tuple[str, str]] = set()
 
 
+# When the same process is reused to run actions many times (i.e.: in the
+# action server preloaded processes) the actions collected from a given file
+# are cached (keyed by the file and glob) and reused while the file stat
+# (mtime/size) is unchanged. Enabled with S4_ACTIONS_CACHE_COLLECTED_ACTIONS=1.
+_collected_actions_cache: Dict[
+    Tuple[str, Optional[str]], Tuple[Tuple[int, int], List[Tuple[Callable, Dict]]]
+] = {}
+
+
 def clear_previously_collected_actions():
     _methods_marked_as_actions_found.clear()
     _found_as_set.clear()
+    _collected_actions_cache.clear()
+
+
+def _is_collected_actions_cache_enabled() -> bool:
+    return os.environ.get("S4_ACTIONS_CACHE_COLLECTED_ACTIONS", "") in ("true", "1")
+
+
+def _get_file_stat_key(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
 
 
 def collect_actions(
@@ -428,11 +450,18 @@ def collect_actions(
 
     _hooks.before_collect_actions(path, action_names_as_set)
 
-    def accept_action(action: IAction):
-        if not action_names:
-            return True
-
-        return action.name in action_names
+    cache_key = (str(path), glob)
+    stat_key: Optional[Tuple[int, int]] = None
+    methods_found: List[Tuple[Callable, Dict]]
+    if _is_collected_actions_cache_enabled() and path.is_file():
+        stat_key = _get_file_stat_key(path)
+        cached = _collected_actions_cache.get(cache_key)
+        if cached is not None and stat_key is not None and cached[0] == stat_key:
+            # Warm path: the file didn't change, so, skip the import machinery
+            # and just create the actions from what was previously found.
+            methods_found = cached[1]
+            yield from _create_actions(pm, methods_found, action_names)
+            return
 
     def on_func_found(func, options: Dict):
         from sema4ai.actions._exceptions import ActionsError
@@ -506,18 +535,37 @@ def collect_actions(
 
             raise ActionsCollectError(f"Expected {path} to map to a directory or file.")
 
+    methods_found = list(_methods_marked_as_actions_found)
+    if stat_key is not None:
+        _collected_actions_cache[cache_key] = (stat_key, methods_found)
+
+    yield from _create_actions(pm, methods_found, action_names)
+
+
+def _create_actions(
+    pm: PluginManager,
+    methods_found: List[Tuple[Callable, Dict]],
+    action_names: Sequence[str],
+) -> Iterator[IAction]:
+    """
+    Creates the actions (new instances are always created as the action
+    keeps the state of a run) for the methods found which match the given names.
+    """
+    from sema4ai.actions import _hooks
     from sema4ai.actions._action import Action
 
     all_actions: List[IAction] = []
-    for method, options in _methods_marked_as_actions_found:
+    for method, options in methods_found:
+        if action_names and method.__code__.co_name not in action_names:
+            continue
+
         module_name = method.__module__
         module_file = method.__code__.co_filename
 
         action = Action(pm, module_name, module_file, method, options=options)
 
-        if accept_action(action):
-            all_actions.append(action)
-            yield action
+        all_actions.append(action)
+        yield action
 
     _hooks.after_collect_actions(all_actions)
 
@@ -6,6 +6,7 @@ import sys
 import time
 import traceback
 import typing
+import weakref
 from argparse import ArgumentParser, ArgumentTypeError
 from ast import FunctionDef
 from io import StringIO
@@ -371,10 +372,7 @@ def run(
     import copy
 
     from robocorp.log import ConsoleMessageKind, console, redirect
-    from robocorp.log.pyproject_config import (
-        read_pyproject_toml,
-        read_robocorp_auto_log_config,
-    )
+    from robocorp.log.pyproject_config import read_robocorp_auto_log_config
 
     from sema4ai.actions._action import Context, set_current_action
     from sema4ai.actions._collect_actions import collect_actions
@@ -479,7 +477,7 @@ def run(
         action_or_actions = "action" if len(action_names) == 1 else "actions"
 
     config: log.AutoLogConfigBase
-    pyproject_path_and_contents = read_pyproject_toml(p)
+    pyproject_path_and_contents = _read_pyproject_toml(p)
     pyproject_toml_contents: dict
     if pyproject_path_and_contents is None:
         config = log.DefaultAutoLogConfig()
@@ -782,6 +780,36 @@ def run(
             t.start()
 
 
+# Path -> (pyproject.toml stat, pyproject info) (only used when the collected
+# actions are also cached).
+_pyproject_cache: Dict[str, tuple] = {}
+
+
+def _read_pyproject_toml(p: Path):
+    from robocorp.log.pyproject_config import read_pyproject_toml
+
+    from sema4ai.actions._collect_actions import (
+        _get_file_stat_key,
+        _is_collected_actions_cache_enabled,
+    )
+
+    if not _is_collected_actions_cache_enabled():
+        return read_pyproject_toml(p)
+
+    cached = _pyproject_cache.get(str(p))
+    if cached is not None:
+        stat_key, pyproject_info = cached
+        if stat_key == _get_file_stat_key(pyproject_info.pyproject):
+            return pyproject_info
+
+    pyproject_info = read_pyproject_toml(p)
+    if pyproject_info is not None:
+        stat_key = _get_file_stat_key(pyproject_info.pyproject)
+        if stat_key is not None:
+            _pyproject_cache[str(p)] = (stat_key, pyproject_info)
+    return pyproject_info
+
+
 class _CustomArgumentParser(ArgumentParser):
     def error(self, msg):
         raise RuntimeError(msg)
@@ -801,19 +829,41 @@ def check_boolean(value):
     return str_to_bool(value)
 
 
+# Method -> (signature, type hints): computing those is relatively slow and
+# the same action may be run many times in the same process.
+_signature_and_type_hints_cache: "weakref.WeakKeyDictionary" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_signature_and_type_hints(
+    method,
+) -> tuple[inspect.Signature, Dict[str, Any]]:
+    from typing import get_type_hints
+
+    try:
+        return _signature_and_type_hints_cache[method]
+    except (KeyError, TypeError):
+        pass
+
+    ret = inspect.signature(method), get_type_hints(method)
+    try:
+        _signature_and_type_hints_cache[method] = ret
+    except TypeError:
+        pass  # Not weak-referenceable.
+    return ret
+
+
 def _validate_and_convert_kwargs(
     pm: PluginManager, action: IAction, kwargs: Dict[str, Any]
 ) -> tuple[Dict[str, Any], Optional["RequestContexts"]]:
-    from typing import get_type_hints
-
     from sema4ai.actions._exceptions import InvalidArgumentsError
     from sema4ai.actions._variables_scope import (
         create_validate_and_convert_kwargs_scope,
     )
 
     target_method = action.method
-    sig = inspect.signature(target_method)
-    type_hints = get_type_hints(target_method)
+    sig, type_hints = _get_signature_and_type_hints(target_method)
     method_name = target_method.__code__.co_name
     new_kwargs: Dict[str, Any] = {}
 
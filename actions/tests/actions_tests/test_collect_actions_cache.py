@@ -0,0 +1,66 @@
+import os
+from pathlib import Path
+
+
+def test_collect_actions_cache(tmpdir, monkeypatch) -> None:
+    from sema4ai.actions import _collect_actions
+    from sema4ai.actions._collect_actions import (
+        clear_previously_collected_actions,
+        collect_actions,
+    )
+    from sema4ai.actions._customization._plugin_manager import PluginManager
+
+    monkeypatch.setenv("S4_ACTIONS_CACHE_COLLECTED_ACTIONS", "1")
+    action_file = Path(str(tmpdir)) / "cached_actions_module.py"
+    action_file.write_text(
+        """
+from sema4ai.actions import action
+
+@action
+def first() -> str:
+    return "first"
+
+@action
+def second() -> str:
+    return "second"
+"""
+    )
+
+    pm = PluginManager()
+    clear_previously_collected_actions()
+    try:
+        actions = list(collect_actions(pm, action_file, ["second"]))
+        assert [a.name for a in actions] == ["second"]
+
+        def fail_import(*args, **kwargs):
+            raise AssertionError("Not expected to import while the file is unchanged.")
+
+        # Warm path: no import is done and new action instances are provided.
+        with monkeypatch.context() as m:
+            m.setattr(_collect_actions, "import_path", fail_import)
+            cached = list(collect_actions(pm, action_file, ["second"]))
+            assert [a.name for a in cached] == ["second"]
+            assert cached[0] is not actions[0]
+            assert cached[0].method is actions[0].method
+
+            all_cached = list(collect_actions(pm, action_file))
+            assert sorted(a.name for a in all_cached) == ["first", "second"]
+
+        # Changing the file makes it be collected again.
+        import_calls = []
+        original_import_path = _collect_actions.import_path
+
+        def track_import(*args, **kwargs):
+            import_calls.append(args)
+            return original_import_path(*args, **kwargs)
+
+        stat = action_file.stat()
+        os.utime(action_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        with monkeypatch.context() as m:
+            m.setattr(_collect_actions, "import_path", track_import)
+            assert [a.name for a in collect_actions(pm, action_file, ["first"])] == [
+                "first"
+            ]
+        assert len(import_calls) == 1
+    finally:
+        clear_previously_collected_actions()
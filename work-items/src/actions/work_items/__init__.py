@@ -48,6 +48,7 @@ Environment Variables:
         RC_WORKITEM_QUEUE_NAME: Input queue name (default: default)
         RC_WORKITEM_OUTPUT_QUEUE_NAME: Output queue name (default: {queue}_output)
         RC_WORKITEM_FILES_DIR: File attachments directory (default: ./work_item_files)
+        RC_WORKITEM_LEASE_SECONDS: Lease of reserved inputs in seconds (default: 1800)
 
     For FileAdapter:
         RC_WORKITEM_INPUT_PATH: Input directory (default: ./output/work-items-in)
@@ -152,6 +153,9 @@ def _create_sqlite_adapter(**kwargs) -> SQLiteAdapter:
         "RC_WORKITEM_OUTPUT_QUEUE_NAME", f"{queue_name}_output"
     )
     files_dir = kwargs.pop("files_dir", None) or os.environ.get("RC_WORKITEM_FILES_DIR", "./work_item_files")
+    lease_seconds = os.environ.get("RC_WORKITEM_LEASE_SECONDS")
+    if lease_seconds and "lease_seconds" not in kwargs:
+        kwargs["lease_seconds"] = float(lease_seconds)
 
     return SQLiteAdapter(
         db_path=db_path,
@@ -4,10 +4,12 @@ Base adapter interface for work item storage.
 Based on robocorp-workitems (Apache 2.0 License).
 """
 
+import time
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
+from .._exceptions import EmptyQueue
 from .._types import ExceptionType, JSONType, State
 
 
@@ -33,6 +35,54 @@ class BaseAdapter(ABC):
         """
         pass
 
+    def reserve_input_blocking(self, timeout: float) -> str:
+        """
+        Reserve the next available input work item, waiting for up to
+        `timeout` seconds for one to be available.
+
+        Adapters which can be notified about new items should override this
+        (the default implementation polls the adapter).
+
+        Args:
+            timeout: Maximum time to wait (in seconds).
+
+        Returns:
+            Work item ID.
+
+        Raises:
+            EmptyQueue: If no work items became available in the given timeout.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                return self.reserve_input()
+            except EmptyQueue:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise
+                time.sleep(min(remaining, 0.5))
+
+    def reserve_inputs(self, count: int) -> List[str]:
+        """
+        Reserve up to `count` available input work items.
+
+        Adapters which can claim multiple items at once should override this
+        (the default implementation reserves the items one by one).
+
+        Args:
+            count: Maximum number of work items to reserve.
+
+        Returns:
+            Work item IDs (empty if no work items are available).
+        """
+        item_ids: List[str] = []
+        for _ in range(count):
+            try:
+                item_ids.append(self.reserve_input())
+            except EmptyQueue:
+                break
+        return item_ids
+
     @abstractmethod
     def release_input(
         self,
@@ -51,9 +101,28 @@ class BaseAdapter(ABC):
             exception_type: Type of exception if failed.
             code: Error code if failed.
             message: Error message if failed.
+
+        Raises:
+            ValueError: If the work item is no longer reserved (adapters with
+                leases: its lease expired and it was reserved again).
         """
         pass
 
+    def renew_lease(self, item_id: str, lease_seconds: Optional[float] = None) -> None:
+        """
+        Extend the lease of a reserved input work item.
+
+        Args:
+            item_id: Work item ID.
+            lease_seconds: New lease duration from now (None for the
+                adapter default).
+
+        Raises:
+            ValueError: If the work item is no longer reserved.
+            NotImplementedError: If the adapter doesn't support leases.
+        """
+        raise NotImplementedError("Leases are not supported by this adapter")
+
     @abstractmethod
     def create_output(
         self,
@@ -177,6 +246,28 @@ class BaseAdapter(ABC):
         """
         raise NotImplementedError("seed_input not implemented by this adapter")
 
+    def seed_inputs(
+        self,
+        payloads: Iterable[Optional[JSONType]],
+        queue_name: Optional[str] = None,
+        chunk_size: int = 1000,
+    ) -> List[str]:
+        """
+        Seed multiple input work items into the queue.
+
+        Adapters which can insert multiple items at once should override
+        this (the default implementation seeds the items one by one).
+
+        Args:
+            payloads: Initial payload data of each work item.
+            queue_name: Optional queue name override.
+            chunk_size: Number of items written at once (if supported).
+
+        Returns:
+            New work item IDs (in the same order as the payloads).
+        """
+        return [self.seed_input(payload, None, queue_name) for payload in payloads]
+
     def list_items(
         self,
         queue_name: Optional[str] = None,
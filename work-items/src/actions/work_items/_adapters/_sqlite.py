@@ -10,10 +10,12 @@ import json
 import logging
 import os
 import sqlite3
+import threading
+import time
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from .._exceptions import EmptyQueue
 from .._types import ExceptionType, JSONType, State
@@ -22,6 +24,46 @@ from ._base import BaseAdapter
 log = logging.getLogger(__name__)
 
 
+class _ChangeNotifier:
+    """
+    Notifies the consumers waiting for new items in a database (in the
+    current process).
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self.seq = 0
+
+    def notify(self) -> None:
+        with self._cond:
+            self.seq += 1
+            self._cond.notify_all()
+
+    def wait(self, seq: int, timeout: float) -> bool:
+        """
+        Wait until the sequence changes from `seq` (or the timeout elapses).
+
+        Returns:
+            True if some change was notified.
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: self.seq != seq, timeout)
+
+
+# Database path -> notifier (shared by all the adapters of the same database).
+_notifiers: Dict[str, _ChangeNotifier] = {}
+_notifiers_lock = threading.Lock()
+
+
+def _get_notifier(db_path: Path) -> _ChangeNotifier:
+    key = os.path.normcase(str(db_path.absolute()))
+    with _notifiers_lock:
+        notifier = _notifiers.get(key)
+        if notifier is None:
+            notifier = _notifiers[key] = _ChangeNotifier()
+        return notifier
+
+
 class SQLiteAdapter(BaseAdapter):
     """
     SQLite-based storage adapter for work items.
@@ -32,14 +74,31 @@ class SQLiteAdapter(BaseAdapter):
     - FIFO ordering
     - File attachments
     - Full lifecycle tracking
+    - Multiple consumers (in different threads/processes) sharing the same
+      database (items are reserved atomically)
+    - Leases: reserved items must be released (or have their lease renewed)
+      before `lease_seconds` elapse, otherwise `requeue_expired` returns them
+      to the queue (or to the dead-letter queue after too many attempts)
     """
 
+    # Suffix of the queue where items are moved after too many expired leases.
+    DEAD_LETTER_SUFFIX = "_dead_letter"
+
+    # Interval (in seconds) used to check whether another process changed the
+    # database while waiting for an item (a cheap check which doesn't query
+    # any table).
+    CHANGE_POLL_INTERVAL = 0.025
+
+    # UPDATE ... RETURNING is only available in SQLite 3.35.0 onwards.
+    _SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
     def __init__(
         self,
         db_path: str = "./workitems.db",
         queue_name: str = "default",
         output_queue_name: Optional[str] = None,
         files_dir: str = "./work_item_files",
+        lease_seconds: float = 1800.0,
     ):
         """
         Initialize the SQLite adapter.
@@ -49,11 +108,24 @@ class SQLiteAdapter(BaseAdapter):
             queue_name: Name of the input queue.
             output_queue_name: Name of the output queue (default: {queue_name}_output).
             files_dir: Directory for file attachments.
+            lease_seconds: For how long a reserved input is kept IN_PROGRESS
+                without being released or having its lease renewed.
         """
         self._db_path = Path(db_path)
         self._queue_name = queue_name
         self._output_queue_name = output_queue_name or f"{queue_name}_output"
         self._files_dir = Path(files_dir)
+        self._lease_seconds = lease_seconds
+
+        # Connections are kept per-thread (and reused in each call).
+        self._tlocal = threading.local()
+
+        # Item id -> `attempts` when it was reserved by this adapter (used as
+        # the reservation token: an item reserved again after its lease
+        # expired has a different value).
+        self._reservations: Dict[str, int] = {}
+        self._reservations_lock = threading.Lock()
+        self._notifier = _get_notifier(self._db_path)
 
         # Ensure directories exist
         self._db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -63,11 +135,25 @@ class SQLiteAdapter(BaseAdapter):
         self._init_db()
 
     def _get_conn(self) -> sqlite3.Connection:
-        """Get a database connection."""
-        conn = sqlite3.connect(str(self._db_path), timeout=30.0)
-        conn.row_factory = sqlite3.Row
+        """Get the database connection for the current thread."""
+        conn = getattr(self._tlocal, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self._db_path), timeout=30.0)
+            conn.row_factory = sqlite3.Row
+            # WAL allows readers to proceed while another connection is writing
+            # (with it, synchronous=NORMAL is still safe against corruption).
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._tlocal.conn = conn
         return conn
 
+    def close(self) -> None:
+        """Close the database connection of the current thread (if any)."""
+        conn = getattr(self._tlocal, "conn", None)
+        if conn is not None:
+            self._tlocal.conn = None
+            conn.close()
+
     def _init_db(self) -> None:
         """Initialize the database schema."""
         with self._get_conn() as conn:
@@ -84,11 +170,17 @@ class SQLiteAdapter(BaseAdapter):
                     created_at TEXT NOT NULL,
                     updated_at TEXT NOT NULL,
                     reserved_at TEXT,
-                    completed_at TEXT
+                    completed_at TEXT,
+                    reserved_until TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0
                 );
 
-                CREATE INDEX IF NOT EXISTS idx_work_items_queue_state
-                ON work_items(queue_name, state);
+                -- Covers the lookup of the next items to reserve in a queue
+                -- (supersedes the previous index on (queue_name, state)).
+                DROP INDEX IF EXISTS idx_work_items_queue_state;
+
+                CREATE INDEX IF NOT EXISTS idx_work_items_queue_state_created
+                ON work_items(queue_name, state, created_at);
 
                 CREATE INDEX IF NOT EXISTS idx_work_items_parent
                 ON work_items(parent_id);
@@ -109,46 +201,262 @@ class SQLiteAdapter(BaseAdapter):
                 CREATE UNIQUE INDEX IF NOT EXISTS idx_work_item_files_name
                 ON work_item_files(work_item_id, name);
             """)
+
+            # Columns added afterwards (databases created by older versions).
+            columns = {
+                row["name"]
+                for row in conn.execute("PRAGMA table_info(work_items)").fetchall()
+            }
+            if "reserved_until" not in columns:
+                conn.execute("ALTER TABLE work_items ADD COLUMN reserved_until TEXT")
+            if "attempts" not in columns:
+                conn.execute(
+                    "ALTER TABLE work_items "
+                    "ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0"
+                )
+
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_work_items_state_lease
+                ON work_items(state, reserved_until)
+            """)
+
+            # Used for the (keyset) pagination of the items in a queue.
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_work_items_queue_created
+                ON work_items(queue_name, created_at, id)
+            """)
             conn.commit()
 
+        self._init_counts()
+
+    def _init_counts(self) -> None:
+        """
+        Create the table with the number of items per queue/state (kept up to
+        date by triggers, so that the stats don't need to scan the items).
+        """
+        conn = self._get_conn()
+        cursor = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'trigger' "
+            "AND name = 'work_item_counts_update'"
+        )
+        if cursor.fetchone() is not None:
+            return
+
+        with conn:
+            # Take the write lock and check again (another process may be
+            # doing the same thing).
+            conn.execute("BEGIN IMMEDIATE")
+            cursor = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'trigger' "
+                "AND name = 'work_item_counts_update'"
+            )
+            if cursor.fetchone() is not None:
+                return
+
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS work_item_counts (
+                    queue_name TEXT NOT NULL,
+                    state TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    PRIMARY KEY (queue_name, state)
+                )
+            """)
+            conn.execute("DELETE FROM work_item_counts")
+            conn.execute("""
+                INSERT INTO work_item_counts (queue_name, state, count)
+                SELECT queue_name, state, COUNT(*) FROM work_items
+                GROUP BY queue_name, state
+            """)
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS work_item_counts_insert
+                AFTER INSERT ON work_items
+                BEGIN
+                    INSERT INTO work_item_counts (queue_name, state, count)
+                    VALUES (NEW.queue_name, NEW.state, 1)
+                    ON CONFLICT (queue_name, state) DO UPDATE SET count = count + 1;
+                END
+            """)
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS work_item_counts_delete
+                AFTER DELETE ON work_items
+                BEGIN
+                    UPDATE work_item_counts SET count = count - 1
+                    WHERE queue_name = OLD.queue_name AND state = OLD.state;
+                END
+            """)
+            # Note: this one must be the last one created (it's used to check
+            # whether the counts are already in place).
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS work_item_counts_update
+                AFTER UPDATE OF queue_name, state ON work_items
+                WHEN OLD.queue_name IS NOT NEW.queue_name OR OLD.state IS NOT NEW.state
+                BEGIN
+                    UPDATE work_item_counts SET count = count - 1
+                    WHERE queue_name = OLD.queue_name AND state = OLD.state;
+                    INSERT INTO work_item_counts (queue_name, state, count)
+                    VALUES (NEW.queue_name, NEW.state, 1)
+                    ON CONFLICT (queue_name, state) DO UPDATE SET count = count + 1;
+                END
+            """)
+
     def _now(self) -> str:
         """Get current timestamp as ISO string."""
         return datetime.now(timezone.utc).isoformat()
 
+    def _lease_deadline(self, lease_seconds: Optional[float] = None) -> str:
+        """Get the timestamp (as ISO string) until which a new lease is valid."""
+        if lease_seconds is None:
+            lease_seconds = self._lease_seconds
+        deadline = datetime.now(timezone.utc) + timedelta(seconds=lease_seconds)
+        # Always with microseconds so that the strings can be compared.
+        return deadline.isoformat(timespec="microseconds")
+
     def reserve_input(self) -> str:
         """Reserve the next available input work item."""
-        with self._get_conn() as conn:
-            # Get next pending item (FIFO order)
-            cursor = conn.execute(
-                """
-                SELECT id FROM work_items
-                WHERE queue_name = ? AND state = ?
-                ORDER BY created_at ASC
-                LIMIT 1
-                """,
-                (self._queue_name, State.PENDING.value),
-            )
-            row = cursor.fetchone()
+        item_ids = self.reserve_inputs(1)
+        if not item_ids:
+            raise EmptyQueue(f"No work items available in queue: {self._queue_name}")
+        return item_ids[0]
 
-            if row is None:
-                raise EmptyQueue(f"No work items available in queue: {self._queue_name}")
+    def reserve_input_blocking(self, timeout: float) -> str:
+        """
+        Reserve the next available input work item, waiting for one to be
+        available for up to `timeout` seconds.
 
-            item_id = row["id"]
-            now = self._now()
+        Items added in this process wake up the waiting consumers right away
+        and changes done by other processes are detected through the
+        `data_version` of the database.
+        """
+        deadline = time.monotonic() + timeout
+        conn = self._get_conn()
+        while True:
+            # Get the change markers before trying to reserve so that no
+            # change done in the meanwhile is missed.
+            seq = self._notifier.seq
+            data_version = self._data_version(conn)
+            try:
+                return self.reserve_input()
+            except EmptyQueue:
+                if not self._wait_for_change(conn, seq, data_version, deadline):
+                    raise
+
+    def _data_version(self, conn: sqlite3.Connection) -> int:
+        # Changes when another connection commits changes to the database.
+        return conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _wait_for_change(
+        self,
+        conn: sqlite3.Connection,
+        seq: int,
+        data_version: int,
+        deadline: float,
+    ) -> bool:
+        """
+        Wait until the database is changed (or the deadline is reached).
 
-            # Mark as in progress
-            conn.execute(
-                """
-                UPDATE work_items
-                SET state = ?, reserved_at = ?, updated_at = ?
-                WHERE id = ?
-                """,
-                (State.IN_PROGRESS.value, now, now, item_id),
+        Returns:
+            True if some change was detected.
+        """
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            if self._notifier.wait(seq, min(remaining, self.CHANGE_POLL_INTERVAL)):
+                return True
+            if self._data_version(conn) != data_version:
+                return True
+
+    def reserve_inputs(self, count: int) -> List[str]:
+        """
+        Atomically reserve up to `count` input work items (in FIFO order).
+
+        The items are claimed with a single statement, so, multiple consumers
+        (threads or processes) sharing the same database never reserve the
+        same item.
+        """
+        if count <= 0:
+            return []
+
+        now = self._now()
+        params = (
+            State.IN_PROGRESS.value,
+            now,
+            now,
+            self._lease_deadline(),
+            self._queue_name,
+            State.PENDING.value,
+            count,
+        )
+        conn = self._get_conn()
+        with conn:
+            if self._SUPPORTS_RETURNING:
+                cursor = conn.execute(
+                    """
+                    UPDATE work_items
+                    SET state = ?, reserved_at = ?, updated_at = ?,
+                        reserved_until = ?, attempts = attempts + 1
+                    WHERE id IN (
+                        SELECT id FROM work_items
+                        WHERE queue_name = ? AND state = ?
+                        ORDER BY created_at ASC, rowid ASC
+                        LIMIT ?
+                    )
+                    RETURNING id, created_at, rowid, attempts
+                    """,
+                    params,
+                )
+                rows = cursor.fetchall()
+            else:
+                # Take the write lock before selecting so that no other
+                # connection can reserve the same items.
+                conn.execute("BEGIN IMMEDIATE")
+                rows = conn.execute(
+                    """
+                    SELECT id, created_at, rowid, attempts + 1 AS attempts
+                    FROM work_items
+                    WHERE queue_name = ? AND state = ?
+                    ORDER BY created_at ASC, rowid ASC
+                    LIMIT ?
+                    """,
+                    params[4:],
+                ).fetchall()
+                conn.executemany(
+                    """
+                    UPDATE work_items
+                    SET state = ?, reserved_at = ?, updated_at = ?,
+                        reserved_until = ?, attempts = attempts + 1
+                    WHERE id = ?
+                    """,
+                    [params[:4] + (row["id"],) for row in rows],
+                )
+
+        # The order of the rows in RETURNING is not guaranteed.
+        rows = sorted(rows, key=lambda row: (row["created_at"], row["rowid"]))
+        item_ids = [row["id"] for row in rows]
+        with self._reservations_lock:
+            for row in rows:
+                self._reservations[row["id"]] = row["attempts"]
+        if item_ids:
+            log.debug(
+                f"Reserved work item(s) {', '.join(item_ids)} "
+                f"from queue {self._queue_name}"
             )
-            conn.commit()
+        return item_ids
 
-            log.debug(f"Reserved work item {item_id} from queue {self._queue_name}")
-            return item_id
+    def _reservation_where(self, item_id: str) -> Tuple[str, List[Any]]:
+        """
+        Provides the WHERE clause which matches the given item only while it's
+        still reserved (and if it was reserved by this adapter, only while it
+        wasn't reserved again by someone else after its lease expired).
+        """
+        where = "id = ? AND state = ?"
+        params: List[Any] = [item_id, State.IN_PROGRESS.value]
+        with self._reservations_lock:
+            attempts = self._reservations.get(item_id)
+        if attempts is not None:
+            where += " AND attempts = ?"
+            params.append(attempts)
+        return where, params
 
     def release_input(
         self,
@@ -158,16 +466,23 @@ class SQLiteAdapter(BaseAdapter):
         code: Optional[str] = None,
         message: Optional[str] = None,
     ) -> None:
-        """Release a reserved input work item."""
+        """
+        Release a reserved input work item.
+
+        Raises:
+            ValueError: If the work item is no longer reserved (i.e.: its lease
+                expired and it was requeued or reserved by another consumer).
+        """
         now = self._now()
+        where, where_params = self._reservation_where(item_id)
 
         with self._get_conn() as conn:
-            conn.execute(
-                """
+            cursor = conn.execute(
+                f"""
                 UPDATE work_items
                 SET state = ?, exception_type = ?, error_code = ?, error_message = ?,
-                    completed_at = ?, updated_at = ?
-                WHERE id = ?
+                    completed_at = ?, updated_at = ?, reserved_until = NULL
+                WHERE {where}
                 """,
                 (
                     state.value,
@@ -177,13 +492,42 @@ class SQLiteAdapter(BaseAdapter):
                     message,
                     now,
                     now,
-                    item_id,
+                    *where_params,
                 ),
             )
             conn.commit()
 
+        with self._reservations_lock:
+            self._reservations.pop(item_id, None)
+
+        if cursor.rowcount == 0:
+            raise ValueError(
+                f"Work item {item_id} is not reserved (its lease may have expired)"
+            )
+
         log.debug(f"Released work item {item_id} with state {state.value}")
 
+    def renew_lease(self, item_id: str, lease_seconds: Optional[float] = None) -> None:
+        """Extend the lease of a reserved input work item."""
+        reserved_until = self._lease_deadline(lease_seconds)
+        where, where_params = self._reservation_where(item_id)
+
+        with self._get_conn() as conn:
+            cursor = conn.execute(
+                f"""
+                UPDATE work_items
+                SET reserved_until = ?, updated_at = ?
+                WHERE {where}
+                """,
+                (reserved_until, self._now(), *where_params),
+            )
+            if cursor.rowcount == 0:
+                raise ValueError(
+                    f"Work item {item_id} is not reserved (its lease may have expired)"
+                )
+
+        log.debug(f"Renewed lease of work item {item_id} until {reserved_until}")
+
     def create_output(
         self,
         parent_id: str,
@@ -214,6 +558,7 @@ class SQLiteAdapter(BaseAdapter):
             )
             conn.commit()
 
+        self._notifier.notify()
         log.debug(f"Created output work item {item_id} in queue {self._output_queue_name}")
         return item_id
 
@@ -372,16 +717,73 @@ class SQLiteAdapter(BaseAdapter):
             for name, content in files.items():
                 self.add_file(item_id, name, name, content)
 
+        self._notifier.notify()
+
         log.info(f"Seeded work item {item_id} into queue {target_queue}")
         return item_id
 
+    def seed_inputs(
+        self,
+        payloads: Iterable[Optional[JSONType]],
+        queue_name: Optional[str] = None,
+        chunk_size: int = 1000,
+    ) -> List[str]:
+        """
+        Seed multiple input work items into the queue.
+
+        The items are inserted in chunks of `chunk_size` items (each chunk in
+        a single transaction), so, `payloads` may be a generator producing
+        a large number of items.
+        """
+        target_queue = queue_name or self._queue_name
+        item_ids: List[str] = []
+        rows: List[tuple] = []
+
+        conn = self._get_conn()
+
+        def insert_rows() -> None:
+            with conn:
+                conn.executemany(
+                    """
+                    INSERT INTO work_items
+                    (id, queue_name, state, payload, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    rows,
+                )
+            self._notifier.notify()
+            rows.clear()
+
+        for payload in payloads:
+            item_id = str(uuid.uuid4())
+            now = self._now()
+            payload_json = json.dumps(payload) if payload is not None else None
+            rows.append(
+                (item_id, target_queue, State.PENDING.value, payload_json, now, now)
+            )
+            item_ids.append(item_id)
+            if len(rows) >= chunk_size:
+                insert_rows()
+
+        if rows:
+            insert_rows()
+
+        log.info(f"Seeded {len(item_ids)} work item(s) into queue {target_queue}")
+        return item_ids
+
     def list_items(
         self,
         queue_name: Optional[str] = None,
         state: Optional[State] = None,
         limit: int = 100,
+        before: Optional[Tuple[str, str]] = None,
     ) -> List[Dict[str, Any]]:
-        """List work items in a queue."""
+        """
+        List work items in a queue (newest first).
+
+        `before` is the (created_at, id) of the last item of the previous
+        page (to get the next page without scanning the previous ones).
+        """
         target_queue = queue_name or self._queue_name
 
         query = "SELECT * FROM work_items WHERE queue_name = ?"
@@ -391,22 +793,70 @@ class SQLiteAdapter(BaseAdapter):
             query += " AND state = ?"
             params.append(state.value)
 
-        query += " ORDER BY created_at DESC LIMIT ?"
+        if before is not None:
+            query += " AND (created_at, id) < (?, ?)"
+            params.extend(before)
+
+        query += " ORDER BY created_at DESC, id DESC LIMIT ?"
         params.append(limit)
 
         with self._get_conn() as conn:
             cursor = conn.execute(query, params)
-            items = []
-            for row in cursor.fetchall():
-                item = dict(row)
-                # Parse JSON payload
-                if item.get("payload"):
-                    try:
-                        item["payload"] = json.loads(item["payload"])
-                    except json.JSONDecodeError:
-                        pass
-                items.append(item)
-            return items
+            return [self._row_to_item(row) for row in cursor.fetchall()]
+
+    def iter_items(
+        self,
+        queue_name: Optional[str] = None,
+        state: Optional[State] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over all the work items in a queue (oldest first).
+
+        The items are fetched in batches (with keyset pagination), so, this
+        may be used to export queues of any size.
+        """
+        target_queue = queue_name or self._queue_name
+
+        query = "SELECT * FROM work_items WHERE queue_name = ?"
+        params: List[Any] = [target_queue]
+        if state is not None:
+            query += " AND state = ?"
+            params.append(state.value)
+
+        after: Optional[Tuple[str, str]] = None
+        while True:
+            if after is None:
+                rows = self._get_conn().execute(
+                    query + " ORDER BY created_at ASC, id ASC LIMIT ?",
+                    params + [batch_size],
+                ).fetchall()
+            else:
+                rows = self._get_conn().execute(
+                    query
+                    + " AND (created_at, id) > (?, ?)"
+                    + " ORDER BY created_at ASC, id ASC LIMIT ?",
+                    params + list(after) + [batch_size],
+                ).fetchall()
+
+            # Note: the batch is fully fetched before yielding (so that no
+            # statement is kept open while the caller processes the items).
+            for row in rows:
+                yield self._row_to_item(row)
+
+            if len(rows) < batch_size:
+                return
+            after = (rows[-1]["created_at"], rows[-1]["id"])
+
+    def _row_to_item(self, row: sqlite3.Row) -> Dict[str, Any]:
+        item = dict(row)
+        # Parse JSON payload
+        if item.get("payload"):
+            try:
+                item["payload"] = json.loads(item["payload"])
+            except json.JSONDecodeError:
+                pass
+        return item
 
     def get_item(self, item_id: str) -> Dict[str, Any]:
         """Get detailed info about a work item."""
@@ -468,12 +918,12 @@ class SQLiteAdapter(BaseAdapter):
         target_queue = queue_name or self._queue_name
 
         with self._get_conn() as conn:
+            # The counts are kept up to date by triggers (no need to scan).
             cursor = conn.execute(
                 """
-                SELECT state, COUNT(*) as count
-                FROM work_items
+                SELECT state, count
+                FROM work_item_counts
                 WHERE queue_name = ?
-                GROUP BY state
                 """,
                 (target_queue,),
             )
@@ -494,3 +944,71 @@ class SQLiteAdapter(BaseAdapter):
                 stats["total"] += count
 
             return stats
+
+    def requeue_expired(
+        self,
+        max_attempts: int = 3,
+        queue_name: Optional[str] = None,
+    ) -> Dict[str, int]:
+        """
+        Return reserved items whose lease expired to their queue.
+
+        Items which were already reserved `max_attempts` times are moved to
+        the dead-letter queue (`{queue_name}_dead_letter`) as FAILED instead.
+
+        Args:
+            max_attempts: Number of reservations after which an expired item
+                is dead-lettered.
+            queue_name: Only consider this queue (None for all queues).
+
+        Returns:
+            Dict with the number of items requeued and dead-lettered.
+        """
+        # Always with microseconds so that it can be compared with the leases.
+        now = datetime.now(timezone.utc).isoformat(timespec="microseconds")
+        where = "state = ? AND reserved_until < ?"
+        where_params: List[Any] = [State.IN_PROGRESS.value, now]
+        if queue_name is not None:
+            where += " AND queue_name = ?"
+            where_params.append(queue_name)
+
+        with self._get_conn() as conn:
+            dead_lettered = conn.execute(
+                f"""
+                UPDATE work_items
+                SET queue_name = queue_name || ?, state = ?, exception_type = ?,
+                    error_code = ?, error_message = ?, reserved_until = NULL,
+                    completed_at = ?, updated_at = ?
+                WHERE {where} AND attempts >= ?
+                """,
+                [
+                    self.DEAD_LETTER_SUFFIX,
+                    State.FAILED.value,
+                    ExceptionType.APPLICATION.value,
+                    "LEASE_EXPIRED",
+                    f"Lease expired after {max_attempts} attempt(s)",
+                    now,
+                    now,
+                    *where_params,
+                    max_attempts,
+                ],
+            ).rowcount
+
+            requeued = conn.execute(
+                f"""
+                UPDATE work_items
+                SET state = ?, reserved_at = NULL, reserved_until = NULL,
+                    updated_at = ?
+                WHERE {where}
+                """,
+                [State.PENDING.value, now, *where_params],
+            ).rowcount
+
+        if requeued:
+            self._notifier.notify()
+        if requeued or dead_lettered:
+            log.info(
+                f"Expired leases: {requeued} work item(s) requeued, "
+                f"{dead_lettered} moved to the dead-letter queue"
+            )
+        return {"requeued": requeued, "dead_lettered": dead_lettered}
@@ -38,6 +38,9 @@ class Inputs:
 
         # Reserve explicitly
         item = inputs.reserve()
+
+        # Wait for up to 30 seconds for an item to be available
+        item = inputs.reserve(timeout=30)
     """
 
     def __init__(self, adapter: "BaseAdapter"):
@@ -103,17 +106,24 @@ class Inputs:
         """
         return self._items[index]
 
-    def reserve(self) -> Input:
+    def reserve(self, timeout: Optional[float] = None) -> Input:
         """
         Reserve the next available input work item.
 
+        Args:
+            timeout: If given, wait for up to this number of seconds for a
+                work item to become available (by default, don't wait).
+
         Returns:
             Reserved Input work item.
 
         Raises:
             EmptyQueue: If no work items are available.
         """
-        item_id = self._adapter.reserve_input()
+        if timeout is None:
+            item_id = self._adapter.reserve_input()
+        else:
+            item_id = self._adapter.reserve_input_blocking(timeout)
         item = Input(self._adapter, item_id)
         self._current = item
         self._items.append(item)
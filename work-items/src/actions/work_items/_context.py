@@ -69,17 +69,24 @@ class WorkItemsContext:
             finally:
                 self._current_input = None
 
-    def get_input(self) -> Input:
+    def get_input(self, timeout: Optional[float] = None) -> Input:
         """
         Get the next input work item.
 
+        Args:
+            timeout: If given, wait for up to this number of seconds for a
+                work item to become available (by default, don't wait).
+
         Returns:
             Input work item.
 
         Raises:
             EmptyQueue: If no work items are available.
         """
-        item_id = self._adapter.reserve_input()
+        if timeout is None:
+            item_id = self._adapter.reserve_input()
+        else:
+            item_id = self._adapter.reserve_input_blocking(timeout)
         input_item = Input(self._adapter, item_id)
         self._current_input = input_item
         return input_item
@@ -206,6 +213,7 @@ def _create_adapter_from_env() -> "BaseAdapter":
         RC_WORKITEM_QUEUE_NAME: Input queue name (default: default)
         RC_WORKITEM_OUTPUT_QUEUE_NAME: Output queue name (default: {queue}_output)
         RC_WORKITEM_FILES_DIR: Files directory (default: ./work_item_files)
+        RC_WORKITEM_LEASE_SECONDS: Lease of reserved inputs in seconds (default: 1800)
 
     Returns:
         Configured adapter instance.
@@ -225,12 +233,14 @@ def _create_adapter_from_env() -> "BaseAdapter":
             f"{queue_name}_output"
         )
         files_dir = os.environ.get("RC_WORKITEM_FILES_DIR", "./work_item_files")
+        lease_seconds = float(os.environ.get("RC_WORKITEM_LEASE_SECONDS", "1800"))
 
         return SQLiteAdapter(
             db_path=db_path,
             queue_name=queue_name,
             output_queue_name=output_queue_name,
             files_dir=files_dir,
+            lease_seconds=lease_seconds,
         )
     else:
         # Dynamic import for custom adapters
@@ -255,16 +265,20 @@ def inputs() -> Iterator[Input]:
     return get_context().inputs()
 
 
-def get_input() -> Input:
+def get_input(timeout: Optional[float] = None) -> Input:
     """
     Get the next input work item.
 
     This is a convenience function that uses the global context.
 
+    Args:
+        timeout: If given, wait for up to this number of seconds for a
+            work item to become available (by default, don't wait).
+
     Returns:
         Input work item.
     """
-    return get_context().get_input()
+    return get_context().get_input(timeout)
 
 
 def create_output(
@@ -298,11 +298,35 @@ class Input(WorkItem):
         """Exception that caused this input to fail, if any."""
         return self._exception
 
+    def renew_lease(self, lease_seconds: Optional[float] = None) -> None:
+        """
+        Extend the reservation of this input (heartbeat).
+
+        Long-running consumers should call this periodically, otherwise the
+        input is returned to the queue once its lease expires.
+
+        Args:
+            lease_seconds: New lease duration from now (None for the
+                adapter default).
+
+        Raises:
+            RuntimeError: If the input was already released.
+            ValueError: If the input is no longer reserved (lease expired).
+            NotImplementedError: If the adapter doesn't support leases.
+        """
+        if self._released:
+            raise RuntimeError(f"Input {self._id} already released")
+
+        self._adapter.renew_lease(self._id, lease_seconds)
+
     def done(self) -> None:
         """
         Mark this input as successfully processed.
 
         After calling done(), the input is released and cannot be used.
+
+        Raises:
+            ValueError: If the input is no longer reserved (lease expired).
         """
         if self._released:
             log.warning(f"Input {self._id} already released")
@@ -327,6 +351,9 @@ class Input(WorkItem):
             exception_type: Type of failure (BUSINESS or APPLICATION).
             code: Error code.
             message: Error message.
+
+        Raises:
+            ValueError: If the input is no longer reserved (lease expired).
         """
         if self._released:
             log.warning(f"Input {self._id} already released")
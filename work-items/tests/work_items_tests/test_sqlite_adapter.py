@@ -4,8 +4,7 @@ import tempfile
 from pathlib import Path
 
 import pytest
-
-from actions.work_items import SQLiteAdapter, State, EmptyQueue
+from actions.work_items import EmptyQueue, SQLiteAdapter, State
 
 
 @pytest.fixture
@@ -153,12 +152,331 @@ def test_queue_stats(adapter):
     """Test queue statistics."""
     adapter.seed_input()
     adapter.seed_input()
-    item_id = adapter.seed_input()
+    adapter.seed_input()
 
-    adapter.reserve_input()
+    item_id = adapter.reserve_input()
     adapter.release_input(item_id, State.DONE)
 
     stats = adapter.get_queue_stats()
     assert stats["pending"] == 2
     assert stats["done"] == 1
     assert stats["total"] == 3
+
+
+def test_reserve_inputs_batch(adapter):
+    """Test reserving a batch of items (in FIFO order)."""
+    item_ids = [adapter.seed_input(payload={"id": i}) for i in range(5)]
+
+    assert adapter.reserve_inputs(3) == item_ids[:3]
+    assert adapter.reserve_inputs(3) == item_ids[3:]
+    assert adapter.reserve_inputs(3) == []
+
+    in_progress = adapter.list_items(state=State.IN_PROGRESS)
+    assert len(in_progress) == 5
+
+
+def test_reserve_inputs_no_returning(adapter, monkeypatch):
+    """Test the reservation used when UPDATE ... RETURNING isn't available."""
+    monkeypatch.setattr(SQLiteAdapter, "_SUPPORTS_RETURNING", False)
+    item_ids = [adapter.seed_input(payload={"id": i}) for i in range(3)]
+
+    assert adapter.reserve_inputs(2) == item_ids[:2]
+    assert adapter.reserve_input() == item_ids[2]
+    with pytest.raises(EmptyQueue):
+        adapter.reserve_input()
+
+
+def test_reserve_concurrent_consumers(tmp_path):
+    """Test that concurrent consumers never reserve the same item."""
+    import threading
+
+    def new_adapter():
+        return SQLiteAdapter(
+            db_path=str(tmp_path / "test.db"),
+            queue_name="test_queue",
+            files_dir=str(tmp_path / "files"),
+        )
+
+    producer = new_adapter()
+    seeded = {producer.seed_input(payload={"id": i}) for i in range(200)}
+
+    reserved: list = []
+    errors: list = []
+
+    def consume():
+        # Each consumer has its own adapter (as if in different processes).
+        consumer = new_adapter()
+        try:
+            while True:
+                item_ids = consumer.reserve_inputs(7)
+                if not item_ids:
+                    break
+                reserved.extend(item_ids)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            consumer.close()
+
+    threads = [threading.Thread(target=consume) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors
+    assert len(reserved) == len(seeded)
+    assert set(reserved) == seeded
+
+
+def test_lease_expired_requeue_and_dead_letter(adapter):
+    """Test that items with an expired lease are requeued/dead-lettered."""
+    from actions.work_items import Input
+
+    item_id = adapter.seed_input(payload={"data": "test"})
+
+    # Lease already expired: goes back to the queue.
+    assert adapter.reserve_input() == item_id
+    adapter.renew_lease(item_id, lease_seconds=-1)
+    assert adapter.requeue_expired(max_attempts=2) == {
+        "requeued": 1,
+        "dead_lettered": 0,
+    }
+    assert adapter.get_item(item_id)["state"] == "PENDING"
+
+    # Renewed lease: kept reserved.
+    item = Input(adapter, adapter.reserve_input())
+    item.renew_lease(60)
+    assert adapter.requeue_expired(max_attempts=2) == {
+        "requeued": 0,
+        "dead_lettered": 0,
+    }
+
+    # Expired again after max_attempts: goes to the dead-letter queue.
+    item.renew_lease(-1)
+    assert adapter.requeue_expired(max_attempts=2) == {
+        "requeued": 0,
+        "dead_lettered": 1,
+    }
+    info = adapter.get_item(item_id)
+    assert info["state"] == "FAILED"
+    assert info["queue_name"] == "test_queue_dead_letter"
+    assert info["attempts"] == 2
+    assert info["error_code"] == "LEASE_EXPIRED"
+
+    # The lease was lost, so, it can't be renewed anymore.
+    with pytest.raises(ValueError):
+        item.renew_lease()
+    with pytest.raises(EmptyQueue):
+        adapter.reserve_input()
+
+
+def test_lease_expired_release_is_fenced(tmp_path):
+    """Test that a consumer which lost its lease can't release the item."""
+    kwargs = dict(
+        db_path=str(tmp_path / "test.db"),
+        queue_name="test_queue",
+        files_dir=str(tmp_path / "files"),
+    )
+    slow_consumer = SQLiteAdapter(**kwargs)
+    other_consumer = SQLiteAdapter(**kwargs)
+
+    item_id = slow_consumer.seed_input(payload={"data": "test"})
+    assert slow_consumer.reserve_input() == item_id
+    slow_consumer.renew_lease(item_id, lease_seconds=-1)
+    assert other_consumer.requeue_expired(max_attempts=3)["requeued"] == 1
+    assert other_consumer.reserve_input() == item_id
+
+    # The slow consumer can no longer renew the lease nor release the item.
+    with pytest.raises(ValueError):
+        slow_consumer.renew_lease(item_id)
+    with pytest.raises(ValueError):
+        slow_consumer.release_input(item_id, State.FAILED, message="too late")
+    info = other_consumer.get_item(item_id)
+    assert info["state"] == "IN_PROGRESS"
+    assert info["error_message"] is None
+
+    # The new owner can.
+    other_consumer.renew_lease(item_id)
+    other_consumer.release_input(item_id, State.DONE)
+    assert other_consumer.get_item(item_id)["state"] == "DONE"
+
+    # Released items can't be released again.
+    with pytest.raises(ValueError):
+        other_consumer.release_input(item_id, State.FAILED)
+
+
+def test_file_adapter_lease_not_supported(tmp_path):
+    """Test that adapters without leases don't silently renew them."""
+    from actions.work_items import FileAdapter
+
+    adapter = FileAdapter(input_path=str(tmp_path / "input"))
+    with pytest.raises(NotImplementedError):
+        adapter.renew_lease("some-id")
+
+
+def test_lease_columns_added_to_old_database(tmp_path):
+    """Test that databases created without the lease columns are upgraded."""
+    import sqlite3
+
+    db_path = tmp_path / "test.db"
+    conn = sqlite3.connect(str(db_path))
+    conn.execute(
+        """
+        CREATE TABLE work_items (
+            id TEXT PRIMARY KEY,
+            queue_name TEXT NOT NULL,
+            parent_id TEXT,
+            state TEXT NOT NULL DEFAULT 'PENDING',
+            payload TEXT,
+            exception_type TEXT,
+            error_code TEXT,
+            error_message TEXT,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            reserved_at TEXT,
+            completed_at TEXT
+        )
+        """
+    )
+    conn.commit()
+    conn.close()
+
+    adapter = SQLiteAdapter(
+        db_path=str(db_path),
+        queue_name="test_queue",
+        files_dir=str(tmp_path / "files"),
+    )
+    item_id = adapter.seed_input()
+    assert adapter.reserve_input() == item_id
+    assert adapter.get_item(item_id)["attempts"] == 1
+
+
+def test_reserve_blocking(tmp_path):
+    """Test that a blocked consumer is woken up when an item is added."""
+    import threading
+    import time
+
+    from actions.work_items import Inputs
+
+    def new_adapter():
+        return SQLiteAdapter(
+            db_path=str(tmp_path / "test.db"),
+            queue_name="test_queue",
+            files_dir=str(tmp_path / "files"),
+        )
+
+    consumer = Inputs(new_adapter())
+
+    initial_time = time.monotonic()
+    with pytest.raises(EmptyQueue):
+        consumer.reserve(timeout=0.2)
+    assert time.monotonic() - initial_time >= 0.2
+
+    def seed_later(adapter):
+        time.sleep(0.2)
+        seeded.append(adapter.seed_input(payload={"late": True}))
+
+    # Seeded in the same process (notified) and as if it was seeded by another
+    # process (detected through the data_version of the db).
+    for notify in (True, False):
+        producer = new_adapter()
+        if not notify:
+            producer._notifier = type(producer._notifier)()
+
+        seeded: list = []
+        t = threading.Thread(target=seed_later, args=(producer,))
+        t.start()
+        item = consumer.reserve(timeout=10)
+        t.join()
+        assert [item.id] == seeded
+
+
+def test_seed_inputs_bulk(adapter):
+    """Test seeding items in bulk (in chunks)."""
+    item_ids = adapter.seed_inputs(({"id": i} for i in range(25)), chunk_size=10)
+    assert len(item_ids) == 25
+
+    assert adapter.get_queue_stats()["pending"] == 25
+    assert adapter.reserve_inputs(25) == item_ids
+    assert adapter.load_payload(item_ids[7]) == {"id": 7}
+
+    other_ids = adapter.seed_inputs([None, {"a": 1}], queue_name="other_queue")
+    assert adapter.get_item(other_ids[0])["queue_name"] == "other_queue"
+    assert adapter.seed_inputs([]) == []
+
+
+def test_list_items_keyset_pagination(adapter):
+    """Test paginating the items with the (created_at, id) of the last item."""
+    item_ids = adapter.seed_inputs({"id": i} for i in range(10))
+
+    pages = []
+    before = None
+    while True:
+        page = adapter.list_items(limit=4, before=before)
+        if not page:
+            break
+        pages.append([item["id"] for item in page])
+        before = (page[-1]["created_at"], page[-1]["id"])
+
+    assert [len(page) for page in pages] == [4, 4, 2]
+    listed = sum(pages, [])
+    assert sorted(listed) == sorted(item_ids)
+
+    exported = list(adapter.iter_items(batch_size=3))
+    # Exported oldest first (the reverse of the listing).
+    assert [item["id"] for item in exported] == list(reversed(listed))
+    assert sorted(item["payload"]["id"] for item in exported) == list(range(10))
+
+
+def test_queue_stats_counts_maintained(tmp_path):
+    """Test that the per-queue/state counts are kept in sync with the items."""
+    import sqlite3
+
+    def new_adapter():
+        return SQLiteAdapter(
+            db_path=str(tmp_path / "test.db"),
+            queue_name="test_queue",
+            files_dir=str(tmp_path / "files"),
+        )
+
+    adapter = new_adapter()
+    item_ids = adapter.seed_inputs([{"id": i} for i in range(5)])
+    reserved = adapter.reserve_inputs(3)
+    adapter.release_input(reserved[0], State.DONE)
+    adapter.release_input(reserved[1], State.FAILED)
+    adapter.delete_item(item_ids[4])
+    adapter.create_output(reserved[0], {"out": 1})
+
+    def real_counts():
+        conn = sqlite3.connect(str(tmp_path / "test.db"))
+        try:
+            return dict(
+                conn.execute(
+                    "SELECT queue_name || ':' || state, COUNT(*) FROM work_items "
+                    "GROUP BY queue_name, state"
+                ).fetchall()
+            )
+        finally:
+            conn.close()
+
+    assert adapter.get_queue_stats() == {
+        "pending": 1,
+        "in_progress": 1,
+        "done": 1,
+        "failed": 1,
+        "total": 4,
+    }
+    assert adapter.get_queue_stats("test_queue_output")["pending"] == 1
+
+    # Counts are rebuilt if the triggers are not there (i.e.: old database).
+    conn = sqlite3.connect(str(tmp_path / "test.db"))
+    conn.execute("DROP TRIGGER work_item_counts_update")
+    conn.execute("UPDATE work_item_counts SET count = 100")
+    conn.commit()
+    conn.close()
+
+    adapter = new_adapter()
+    stats = adapter.get_queue_stats()
+    assert stats["total"] == 4
+    counts = real_counts()
+    assert stats["pending"] == counts["test_queue:PENDING"]